@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+端到端性能基准测试
+使用本地模拟禅道服务（tests/support/fake_zentao.py），统计 ZenTaoHelperSkill.execute
+各意图在不同数据量下的耗时和请求数，结果保存为 JSON，可与基线对比发现性能回退
+
+用法:
+    python benchmarks/bench_skill.py                                  # 数据量 10/100/1000
+    python benchmarks/bench_skill.py --sizes 10 100 --repeat 5 --latency 0.005
+    python benchmarks/bench_skill.py --baseline benchmarks/results/baseline.json
+    python benchmarks/bench_skill.py --save-baseline                  # 保存为新基线
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SKILL_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(SKILL_ROOT / 'src'))
+sys.path.insert(0, str(SKILL_ROOT))
+
+from src.utils.config_loader import get_config
+from tests.support.fake_zentao import FakeZentaoServer, PRODUCT_TITLE
+
+RESULTS_DIR = SKILL_ROOT / 'benchmarks' / 'results'
+BASELINE_FILE = RESULTS_DIR / 'baseline.json'
+
+DEFAULT_SIZES = [10, 100, 1000]
+
+# 基准场景: (意图, 指令模板, 非交互参数)
+SCENARIOS = [
+    ('query_stories', '查看我的需求', {}),
+    ('query_unassigned_stories', '查看未分配的需求', {}),
+    ('query_tasks', '查看我的任务', {}),
+    ('split_task', '拆解需求#{story_id}', {'grade': 'A', 'assigned_to': 'user1'}),
+    ('assign_task', '把任务#{task_id}分配给 @user1', {}),
+]
+
+
+def _configure():
+    """基准测试使用独立配置：关闭本地缓存和常驻进程，响应缓存只用内存，按模拟数据设置产品/关键字过滤"""
+    config = get_config()
+    if config.config is None:
+        config.load()
+
+    settings = config.config
+    settings.setdefault('cache', {}).setdefault('local_store', {})['enabled'] = False
+    settings.setdefault('daemon', {})['enabled'] = False
+    zentao = settings.setdefault('zentao', {})
+    # 响应缓存只保存在内存中，每个数据量从冷缓存开始，不影响真实的缓存文件
+    zentao.setdefault('response_cache', {})['path'] = ''
+    story_query = zentao.setdefault('story_query', {})
+    story_query['products'] = [PRODUCT_TITLE]
+    story_query['keywords'] = []
+
+
+def create_skill(server: FakeZentaoServer):
+    """
+    创建连接到模拟禅道的 Skill 实例
+
+    Args:
+        server: 模拟禅道服务
+
+    Returns:
+        已登录的 ZenTaoHelperSkill 实例
+    """
+    _configure()
+    from skill import ZenTaoHelperSkill
+
+    skill = ZenTaoHelperSkill(interactive=False)
+    skill.api_client.base_url = server.base_url
+    login_result = skill.api_client.login('zhuxu', 'benchmark')
+    if not login_result.success:
+        raise RuntimeError(f"登录模拟禅道失败: {login_result.error.message}")
+    skill.api_client.mark_session_verified()
+
+    # 会话已在内存中建立，不读写本地会话文件
+    skill._ensure_session = lambda: True
+    return skill
+
+
+@contextmanager
+def _suppress_stdout(enabled: bool = True):
+    """屏蔽标准输出（进度条直接写入 stdout 文件描述符）"""
+    if not enabled:
+        yield
+        return
+
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, 1)
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def run_benchmarks(sizes: List[int] = None, repeat: int = 3, latency: float = 0.0,
+                   quiet: bool = True) -> Dict:
+    """
+    运行基准测试
+
+    每个数据量使用新的模拟禅道和 Skill 实例，每个意图执行 repeat 次，
+    第一次为冷启动（客户端缓存为空）
+
+    Args:
+        sizes: 数据量列表（需求数和任务数）
+        repeat: 每个意图的执行次数
+        latency: 模拟禅道每个请求的延迟（秒）
+        quiet: 是否屏蔽执行过程中的输出
+
+    Returns:
+        基准测试结果
+    """
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+
+    for size in sizes:
+        with FakeZentaoServer(story_count=size, task_count=size, latency=latency) as server:
+            skill = create_skill(server)
+
+            for intent, template, kwargs in SCENARIOS:
+                durations = []
+                request_counts = []
+                failures = []
+
+                for run in range(repeat):
+                    user_input = template.format(story_id=1000 + run, task_id=5000 + run)
+                    server.reset_counts()
+
+                    with _suppress_stdout(quiet):
+                        start = time.perf_counter()
+                        result = skill.execute(user_input, **kwargs)
+                        durations.append(time.perf_counter() - start)
+
+                    request_counts.append(sum(server.request_counts.values()))
+                    if not result.get('success'):
+                        failures.append(result.get('error', {}).get('message', '未知错误'))
+
+                results.append({
+                    'intent': intent,
+                    'size': size,
+                    'runs': [round(duration, 6) for duration in durations],
+                    'first': round(durations[0], 6),
+                    'median': round(statistics.median(durations), 6),
+                    'requests': request_counts,
+                    'failures': failures,
+                })
+
+    return {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'latency': latency,
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 1.2) -> List[Dict]:
+    """
+    与基线对比
+
+    Args:
+        current: 本次结果
+        baseline: 基线结果
+        threshold: 中位数耗时超过基线的倍数视为回退
+
+    Returns:
+        对比结果列表（只包含基线中存在的场景）
+    """
+    baseline_index = {(item['intent'], item['size']): item for item in baseline.get('results', [])}
+    comparisons = []
+    for item in current['results']:
+        base = baseline_index.get((item['intent'], item['size']))
+        if not base or not base['median']:
+            continue
+        ratio = item['median'] / base['median']
+        comparisons.append({
+            'intent': item['intent'],
+            'size': item['size'],
+            'baseline': base['median'],
+            'current': item['median'],
+            'ratio': round(ratio, 3),
+            'regressed': ratio > threshold,
+        })
+    return comparisons
+
+
+def format_report(report: Dict, comparisons: Optional[List[Dict]] = None) -> str:
+    """格式化基准测试结果"""
+    comparison_index = {(item['intent'], item['size']): item for item in comparisons or []}
+
+    lines = []
+    lines.append("=" * 88)
+    lines.append(f"{'意图':<26} {'数据量':>6} {'首次(ms)':>10} {'中位数(ms)':>11} {'请求数':>8} {'基线对比':>10}  失败")
+    lines.append("-" * 88)
+    for item in report['results']:
+        comparison = comparison_index.get((item['intent'], item['size']))
+        ratio = f"{comparison['ratio']:.2f}x{'!' if comparison['regressed'] else ''}" if comparison else '-'
+        lines.append(
+            f"{item['intent']:<26} {item['size']:>6} {item['first'] * 1000:>10.1f} "
+            f"{item['median'] * 1000:>11.1f} {max(item['requests']):>8} {ratio:>10}  {len(item['failures'])}"
+        )
+    lines.append("=" * 88)
+    return "\n".join(lines)
+
+
+def save_report(report: Dict, path: Path) -> Path:
+    """保存基准测试结果"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='ZenTao Helper 端到端性能基准测试')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help='数据量（需求数和任务数）')
+    parser.add_argument('--repeat', type=int, default=3, help='每个意图的执行次数')
+    parser.add_argument('--latency', type=float, default=0.0, help='模拟禅道每个请求的延迟（秒）')
+    parser.add_argument('--baseline', type=Path, help=f'对比的基线文件（默认 {BASELINE_FILE.relative_to(SKILL_ROOT)}，存在时自动对比）')
+    parser.add_argument('--threshold', type=float, default=1.2, help='中位数耗时超过基线的倍数视为回退')
+    parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+    parser.add_argument('--verbose', action='store_true', help='显示执行过程中的输出')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.latency, quiet=not args.verbose)
+
+    baseline_path = args.baseline or (BASELINE_FILE if BASELINE_FILE.exists() else None)
+    comparisons = None
+    if baseline_path:
+        comparisons = compare(report, json.loads(baseline_path.read_text(encoding='utf-8')), args.threshold)
+        report['baseline'] = str(baseline_path)
+        report['comparisons'] = comparisons
+
+    print(format_report(report, comparisons))
+
+    saved = save_report(report, RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"结果已保存: {saved}")
+    if args.save_baseline:
+        print(f"基线已保存: {save_report(report, BASELINE_FILE)}")
+
+    failed = [item for item in report['results'] if item['failures']]
+    regressed = [item for item in comparisons or [] if item['regressed']]
+    if failed:
+        print(f"有 {len(failed)} 个场景执行失败，首个错误: {failed[0]['failures'][0]}")
+    if regressed:
+        print(f"有 {len(regressed)} 个场景超过基线 {args.threshold} 倍")
+    return 1 if failed or regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,51 +3,134 @@ ZenTao Helper Skill 主入口
 Trae Skill 实现
 """
 
+import os
 import sys
 import getpass
+import functools
 from pathlib import Path
 
 # 添加 src 目录到 Python 路径
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+# 只在模块加载时导入轻量模块；网络（requests）、加密（keyring、cryptography）、
+# SQLite 等子系统在首次使用时才导入，帮助和指令解析不需要加载它们
 from src.utils.logger import get_logger
 from src.utils.config_loader import get_config
 from src.utils.response import ApiResponse, ErrorCode, ErrorMessage
-from src.auth.session_manager import SessionManager
-from src.zentao.api_client import ZentaoApiClient
-from src.nlp.command_parser import CommandParser
-from src.collectors.story_collector import StoryCollector
-from src.collectors.task_collector import TaskCollector
-from src.automators.task_splitter import TaskSplitter
-from src.automators.task_assigner import TaskAssigner
+from src.zentao.story_filter import StoryFilter
 from src.utils.progress_bar import ProgressBar
 
 
+def _with_metrics(func):
+    """
+    统计单次调用的禅道请求指标
+
+    调用前清空指标，调用后按配置导出到文件；传入 stats（table/json/prometheus）时
+    把本次的指标明细放在返回结果的 stats 字段中
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, stats: str = None, **kwargs) -> dict:
+        # 没有创建过 API 客户端时（如帮助指令）不为统计指标而创建
+        if 'api_client' in self.__dict__:
+            self.api_client.metrics.reset()
+        result = func(self, *args, **kwargs)
+        if 'api_client' in self.__dict__:
+            self._dump_metrics()
+        if stats:
+            if 'api_client' in self.__dict__:
+                result['stats'] = self.api_client.metrics.export(stats)
+            else:
+                # 本次调用没有请求禅道，输出空的指标
+                from src.zentao.metrics import RequestMetrics
+                result['stats'] = RequestMetrics().export(stats)
+        return result
+    return wrapper
+
+
 class ZenTaoHelperSkill:
     """
     禅道自动化助手 Skill
     符合 Trae Skill 规范
+
+    各子系统（会话、API 客户端、收集器、自动化操作器）在首次访问时创建
     """
 
-    def __init__(self):
+    def __init__(self, interactive: bool = True):
+        """
+        初始化 Skill
+
+        Args:
+            interactive: 是否允许在终端交互输入（常驻进程中为 False）
+        """
         self.logger = get_logger()
         self.config = get_config()
-
-        # 初始化各模块
-        self.session_manager = SessionManager()
-        self.api_client = ZentaoApiClient()
-        self.command_parser = CommandParser()
-
-        # 初始化收集器
-        self.story_collector = StoryCollector(self.api_client)
-        self.task_collector = TaskCollector(self.api_client)
-
-        # 初始化自动化操作器
-        self.task_splitter = TaskSplitter(self.api_client)
-        self.task_assigner = TaskAssigner(self.api_client)
+        self.interactive = interactive
 
         self.logger.info("ZenTao Helper Skill 初始化完成")
 
+    @functools.cached_property
+    def session_manager(self):
+        """会话管理器"""
+        from src.auth.session_manager import SessionManager
+        return SessionManager()
+
+    @functools.cached_property
+    def local_store(self):
+        """本地缓存（未启用时为 None）"""
+        from src.zentao.local_store import get_local_store
+        return get_local_store()
+
+    @functools.cached_property
+    def api_client(self):
+        """禅道 API 客户端"""
+        from src.zentao.api_client import ZentaoApiClient
+        api_client = ZentaoApiClient(local_store=self.local_store)
+        api_client.on_session_invalidated = lambda: self.session_manager.clear_verified()
+        return api_client
+
+    @functools.cached_property
+    def command_parser(self):
+        """自然语言指令解析器"""
+        from src.nlp.command_parser import CommandParser
+        return CommandParser()
+
+    @functools.cached_property
+    def story_collector(self):
+        """需求收集器"""
+        from src.collectors.story_collector import StoryCollector
+        return StoryCollector(self.api_client, self.local_store)
+
+    @functools.cached_property
+    def task_collector(self):
+        """任务收集器"""
+        from src.collectors.task_collector import TaskCollector
+        return TaskCollector(self.api_client, self.local_store)
+
+    @functools.cached_property
+    def task_splitter(self):
+        """任务拆解器"""
+        from src.automators.task_splitter import TaskSplitter
+        return TaskSplitter(self.api_client)
+
+    @functools.cached_property
+    def batch_task_splitter(self):
+        """批量任务拆解器"""
+        from src.automators.batch_task_splitter import BatchTaskSplitter
+        return BatchTaskSplitter(self.api_client, self.task_splitter)
+
+    @functools.cached_property
+    def task_assigner(self):
+        """任务分配器"""
+        from src.automators.task_assigner import TaskAssigner
+        return TaskAssigner(self.api_client)
+
+    @functools.cached_property
+    def bulk_task_assigner(self):
+        """批量任务分配器"""
+        from src.automators.bulk_task_assigner import BulkTaskAssigner
+        return BulkTaskAssigner(self.api_client)
+
+    @_with_metrics
     def execute(self, user_input: str, **kwargs) -> dict:
         """
         Skill 主入口方法
@@ -55,7 +138,7 @@ class ZenTaoHelperSkill:
 
         Args:
             user_input: 用户输入的自然语言指令
-            **kwargs: 额外参数（非交互模式参数）
+            **kwargs: 额外参数（非交互模式参数；stats 指定请求指标的输出格式）
 
         Returns:
             执行结果字典（符合 Trae 规范）
@@ -76,27 +159,36 @@ class ZenTaoHelperSkill:
 
             # 确保会话有效
             if not self._ensure_session():
+                # 非交互模式下无法登录，交给调用方在终端中登录
                 return ApiResponse.error_response(
-                    ErrorCode.SESSION_EXPIRED,
+                    ErrorCode.SESSION_EXPIRED if self.interactive else ErrorCode.INTERACTION_REQUIRED,
                     ErrorMessage.SESSION_EXPIRED
                 ).to_dict()
 
-            # 根据意图执行对应操作
-            if intent == 'query_stories':
-                result = self._handle_query_stories(entities)
-            elif intent == 'query_unassigned_stories':
-                result = self._handle_query_unassigned_stories(entities)
-            elif intent == 'query_tasks':
-                result = self._handle_query_tasks(entities)
-            elif intent == 'split_task':
-                result = self._handle_split_task(entities, user_input, **kwargs)
-            elif intent == 'assign_task':
-                result = self._handle_assign_task(entities, user_input)
-            else:
-                result = ApiResponse.error_response(
-                    ErrorCode.UNKNOWN_INTENT,
-                    ErrorMessage.UNKNOWN_INTENT
-                )
+            # 非交互模式下，需要交互输入的指令交给调用方在终端中执行
+            if not self.interactive and self._requires_interaction(intent, entities, **kwargs):
+                return ApiResponse.error_response(
+                    ErrorCode.INTERACTION_REQUIRED,
+                    ErrorMessage.INTERACTION_REQUIRED
+                ).to_dict()
+
+            # 根据意图执行对应操作（单次指令内共享需求快照，避免重复请求 story-view）
+            with self.api_client.story_cache_scope():
+                if intent == 'query_stories':
+                    result = self._handle_query_stories(entities)
+                elif intent == 'query_unassigned_stories':
+                    result = self._handle_query_unassigned_stories(entities)
+                elif intent == 'query_tasks':
+                    result = self._handle_query_tasks(entities)
+                elif intent == 'split_task':
+                    result = self._handle_split_task(entities, user_input, **kwargs)
+                elif intent == 'assign_task':
+                    result = self._handle_assign_task(entities, user_input)
+                else:
+                    result = ApiResponse.error_response(
+                        ErrorCode.UNKNOWN_INTENT,
+                        ErrorMessage.UNKNOWN_INTENT
+                    )
 
             return result.to_dict()
 
@@ -107,40 +199,183 @@ class ZenTaoHelperSkill:
                 f"执行失败: {str(e)}"
             ).to_dict()
 
+    @_with_metrics
+    def batch_split(self, story_ids: list = None, query: str = None, **kwargs) -> dict:
+        """
+        批量拆解需求
+
+        Args:
+            story_ids: 需求ID列表
+            query: 查询需求的指令（如"查看未分配的需求"），查询结果中的需求一并拆解
+            **kwargs: 任务参数（同拆解单个需求的非交互模式参数）
+
+        Returns:
+            执行结果字典，包含每个需求的处理结果
+        """
+        try:
+            if not self._ensure_session():
+                return ApiResponse.error_response(
+                    ErrorCode.SESSION_EXPIRED if self.interactive else ErrorCode.INTERACTION_REQUIRED,
+                    ErrorMessage.SESSION_EXPIRED
+                ).to_dict()
+
+            with self.api_client.story_cache_scope():
+                stories = []
+                if query:
+                    command = self.command_parser.parse(query)
+                    if command['intent'] == 'query_stories':
+                        query_result = self._handle_query_stories(command['entities'])
+                    elif command['intent'] == 'query_unassigned_stories':
+                        query_result = self._handle_query_unassigned_stories(command['entities'])
+                    else:
+                        return ApiResponse.error_response(
+                            ErrorCode.INVALID_PARAMETER,
+                            f"无法识别的需求查询: {query}"
+                        ).to_dict()
+
+                    if not query_result.success:
+                        return query_result.to_dict()
+                    stories = query_result.data.get('data', {}).get('stories', [])
+
+                ids = self.batch_task_splitter.collect_story_ids(story_ids, stories)
+                with ProgressBar(total=len(ids), desc="正在批量拆解需求") as pbar:
+                    def on_progress(story_result: dict):
+                        pbar.update(1)
+                        pbar.set_postfix(需求=f"#{story_result['story_id']}")
+
+                    result = self.batch_task_splitter.execute(
+                        story_ids=ids,
+                        on_progress=on_progress,
+                        **kwargs
+                    )
+
+            if result.success:
+                display_text = self.batch_task_splitter.format_display(result.data)
+                result = ApiResponse.success_response({
+                    'message': display_text,
+                    'data': result.data,
+                    'type': 'task_batch_create'
+                })
+
+            return result.to_dict()
+
+        except Exception as e:
+            self.logger.error(f"批量拆解需求时发生异常: {str(e)}", exc_info=True)
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                f"批量拆解失败: {str(e)}"
+            ).to_dict()
+
+    @_with_metrics
+    def bulk_assign(self, **kwargs) -> dict:
+        """
+        批量分配任务
+
+        Args:
+            **kwargs: 分配参数，见 BulkTaskAssigner.execute
+                (assignments, task_ids, username, status, keyword, csv_path)
+
+        Returns:
+            执行结果字典，包含每个任务的分配结果
+        """
+        try:
+            if not self._ensure_session():
+                return ApiResponse.error_response(
+                    ErrorCode.SESSION_EXPIRED if self.interactive else ErrorCode.INTERACTION_REQUIRED,
+                    ErrorMessage.SESSION_EXPIRED
+                ).to_dict()
+
+            result = self.bulk_task_assigner.execute(**kwargs)
+
+            if result.success:
+                display_text = self.bulk_task_assigner.format_display(result.data)
+                result = ApiResponse.success_response({
+                    'message': display_text,
+                    'data': result.data,
+                    'type': 'task_bulk_assign'
+                })
+
+            return result.to_dict()
+
+        except Exception as e:
+            self.logger.error(f"批量分配任务时发生异常: {str(e)}", exc_info=True)
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                f"批量分配失败: {str(e)}"
+            ).to_dict()
+
+    def _dump_metrics(self):
+        """按配置把本次请求指标导出到文件"""
+        metrics_config = self.config.get('zentao.metrics', {}) or {}
+        dump_path = metrics_config.get('dump_path')
+        if not dump_path:
+            return
+        try:
+            self.api_client.metrics.dump(Path(__file__).parent / dump_path, metrics_config.get('dump_format', 'json'))
+        except OSError as e:
+            self.logger.warning(f"导出请求指标失败: {str(e)}")
+
+    @staticmethod
+    def _requires_interaction(intent: str, entities: dict, **kwargs) -> bool:
+        """
+        判断指令是否需要交互输入
+
+        Args:
+            intent: 意图
+            entities: 实体
+            **kwargs: 额外参数（非交互模式参数）
+
+        Returns:
+            是否需要交互输入
+        """
+        if intent == 'split_task':
+            # 未提供任何非交互参数时，需要交互收集任务信息
+            return not any(kwargs.values())
+        if intent == 'assign_task':
+            # 未指定用户名时，需要交互输入
+            return not entities.get('username')
+        return False
+
     def _ensure_session(self) -> bool:
         """
         确保会话有效，无效则提示登录
         
         流程：
-        1. 检查本地会话文件是否存在且未过期
+        1. 加载本地会话文件（不存在或已过期则提示登录）
         2. 加载会话到 API 客户端
-        3. 验证服务器端会话是否有效
+        3. 验证服务器端会话是否有效（session.check_interval 内验证过则跳过）
         4. 如果服务器端会话无效，提示用户重新登录
 
         Returns:
             会话是否有效
         """
-        # 检查本地会话是否存在
-        if not self.session_manager.is_session_valid():
-            self.logger.debug("本地会话不存在或已过期")
-            return self._interactive_login()
-
-        # 加载会话到 API 客户端
+        # 加载本地会话
         session_data = self.session_manager.load_session()
         if not session_data:
-            self.logger.debug("加载会话失败")
+            self.logger.debug("本地会话不存在或已过期")
             return self._interactive_login()
 
+        if self.local_store:
+            self.local_store.bind_account(session_data.get('user', ''))
+        self.api_client.bind_account(session_data.get('user'))
+
         cookies = session_data.get('cookies', {})
         token = session_data.get('token')
         if token:
             self.api_client.session.headers.update({'Token': token})
         self.api_client.set_cookies(cookies)
 
+        # 上次调用已验证过的会话，在有效期内不再重复验证
+        verified_at = self.session_manager.get_verified_at(session_data)
+        if verified_at:
+            self.api_client.mark_session_verified(verified_at)
+
         # 验证服务器端会话是否有效
         self.logger.debug("验证服务器端会话...")
         if self.api_client.verify_session():
             self.logger.debug("会话验证成功")
+            if self.api_client.session_verified_at != verified_at:
+                self.session_manager.mark_verified(session_data, self.api_client.session_verified_at)
             return True
 
         # 服务器端会话已过期，清除本地会话并提示重新登录
@@ -155,6 +390,10 @@ class ZenTaoHelperSkill:
         Returns:
             是否登录成功
         """
+        if not self.interactive:
+            self.logger.info("非交互模式下无法登录，需要在终端中执行")
+            return False
+
         print("\n" + "="*50)
         print("需要登录禅道")
         print("="*50)
@@ -169,15 +408,21 @@ class ZenTaoHelperSkill:
             if result.success:
                 data = result.data
 
+                # 登录成功即视为服务器端会话已验证
+                self.api_client.mark_session_verified()
+
                 # 保存会话
                 session_data = {
                     'user': username,
                     'token': data.get('token'),
                     'cookies': data.get('cookies'),
-                    'user_info': data.get('user_info')
+                    'user_info': data.get('user_info'),
+                    'verified_at': self.api_client.session_verified_at
                 }
 
                 if self.session_manager.save_session(session_data):
+                    if self.local_store:
+                        self.local_store.bind_account(username)
                     print(f"\n登录成功！欢迎, {data.get('user_info', {}).get('realname', username)}")
                     return True
                 else:
@@ -209,15 +454,8 @@ class ZenTaoHelperSkill:
         除非用户明确指定了状态或要求查看所有需求
         支持过滤未创建任务的需求
         支持按标题关键字过滤
+        支持限制数量（如"前20个需求"），找到足够的需求后停止翻页
         """
-        # 首先验证会话是否有效
-        if not self.api_client.verify_session():
-            self.logger.warning("会话已过期，需要重新登录")
-            return ApiResponse.error_response(
-                ErrorCode.AUTH_ERROR,
-                "会话已过期，请使用 '登录禅道' 命令重新登录"
-            )
-
         status = entities.get('status')
         filter_no_task = entities.get('filter_no_task', False)
         keywords = entities.get('keywords', [])
@@ -229,66 +467,58 @@ class ZenTaoHelperSkill:
                 keywords = default_keywords
                 self.logger.debug(f"使用配置中的默认关键字: {keywords}")
 
-        # 获取所有需求
-        result = self.story_collector.collect(status=status)
+        # 阶段和关键字在逐页获取时过滤：如果用户没有指定状态，默认过滤已计划、已立项和未开始的需求，
+        # 要求查看所有需求或指定了具体状态时不按阶段过滤
+        stages = None if status else ['planned', 'projected', 'wait']
+        if keywords:
+            self.logger.debug(f"按关键字 {keywords} 过滤需求...")
+        story_filter = StoryFilter(stages=stages, keywords=keywords or None)
+        # 未创建任务的过滤需要逐个检查任务，数量上限在检查之后再应用
+        limit = entities.get('limit')
+
+        result = self.story_collector.collect(
+            status=status,
+            story_filter=story_filter,
+            limit=None if filter_no_task else limit
+        )
 
         if result.success:
-            stories = result.data.get('stories', [])
-
-            # 如果用户没有指定状态，默认过滤已计划、已立项和未开始的需求
-            if not status:
-                filtered_stories = [
-                    story for story in stories
-                    if story.get('stage') in ['planned', 'projected', 'wait']
-                ]
-
-                self.logger.debug(f"默认过滤后: {len(filtered_stories)} 个需求 (已计划/已立项/未开始)")
-            elif status == 'all':
-                # 用户要求查看所有需求，不过滤
-                filtered_stories = stories
-                self.logger.debug(f"显示所有需求: {len(filtered_stories)} 个")
-            else:
-                # 用户指定了具体状态，按状态过滤
-                filtered_stories = stories
-            
-            # 如果有关键字，按标题关键字过滤
-            if keywords:
-                self.logger.debug(f"按关键字 {keywords} 过滤需求...")
-                keyword_filtered_stories = []
-
-                for story in filtered_stories:
-                    title = story.get('title', '')
-                    # 检查标题是否包含任一关键字（不区分大小写）
-                    if any(keyword.lower() in title.lower() for keyword in keywords):
-                        keyword_filtered_stories.append(story)
-
-                filtered_stories = keyword_filtered_stories
-                self.logger.debug(f"关键字过滤后: {len(filtered_stories)} 个需求")
+            filtered_stories = result.data.get('stories', [])
+            self.logger.debug(f"过滤后: {len(filtered_stories)} 个需求")
 
             # 如果需要过滤未创建任务的需求
             if filter_no_task:
                 self.logger.debug(f"开始检查 {len(filtered_stories)} 个需求的任务创建情况...")
-                stories_no_task = []
-                
-                # 使用进度条显示检查进度
-                with ProgressBar(total=len(filtered_stories), desc="正在检查任务创建情况") as pbar:
-                    for story in filtered_stories:
-                        story_id = story.get('id', 0)
-                        task_count = self.api_client.get_story_task_count(story_id)
+                no_task_ids = set()
 
+                # 使用进度条显示检查进度（并发检查，完成一个更新一次）
+                with ProgressBar(total=len(filtered_stories), desc="正在检查任务创建情况") as pbar:
+                    def on_checked(story_id: int, task_count: int):
                         if task_count == 0:
-                            stories_no_task.append(story)
+                            no_task_ids.add(story_id)
                             self.logger.debug(f"需求 #{story_id} 未创建任务")
                         else:
                             self.logger.debug(f"需求 #{story_id} 已创建 {task_count} 个任务")
-                        
+
                         # 更新进度条
                         pbar.update(1)
-                        pbar.set_postfix(已检查=pbar.current, 未创建=len(stories_no_task))
+                        pbar.set_postfix(已检查=pbar.current, 未创建=len(no_task_ids))
 
-                filtered_stories = stories_no_task
+                    self.api_client.get_story_task_counts(
+                        [story.get('id', 0) for story in filtered_stories],
+                        on_progress=on_checked
+                    )
+
+                # 保持原有顺序
+                filtered_stories = [
+                    story for story in filtered_stories
+                    if story.get('id', 0) in no_task_ids
+                ]
                 self.logger.debug(f"过滤后: {len(filtered_stories)} 个未创建任务的需求")
-            
+
+            if limit:
+                filtered_stories = filtered_stories[:limit]
+
             result_data = {
                 'stories': filtered_stories,
                 'total': len(filtered_stories),
@@ -404,7 +634,8 @@ class ZenTaoHelperSkill:
         result = self.task_assigner.execute(
             task_id=task_id,
             username=username,
-            user_input=user_input
+            user_input=user_input,
+            interactive=self.interactive
         )
 
         if result.success:
@@ -420,18 +651,43 @@ class ZenTaoHelperSkill:
 
 
 # iFlow Skill 入口点
-def skill_main(user_input: str) -> dict:
+def skill_main(user_input: str, **kwargs) -> dict:
     """
     iFlow Skill 入口点函数
 
+    常驻进程运行时把指令转发给常驻进程执行；
+    常驻进程未运行、连接失败或指令需要交互输入时，在本地执行。
+    请求送达常驻进程后的失败（超时、连接中断等）直接返回错误，不在本地重复执行
+
     Args:
         user_input: 用户输入
+        **kwargs: 额外参数（非交互模式参数）
 
     Returns:
         执行结果字典
     """
+    if get_config().get('daemon.enabled', False):
+        from src.utils.daemon import forward_execute
+        result = forward_execute(user_input, **kwargs)
+        if result is not None and result.get('error', {}).get('code') != ErrorCode.INTERACTION_REQUIRED:
+            return result
+
     skill = ZenTaoHelperSkill()
-    return skill.execute(user_input)
+    return skill.execute(user_input, **kwargs)
+
+
+def serve_daemon():
+    """启动常驻进程，阻塞直到收到停止请求"""
+    from src.utils.daemon import SkillDaemon
+
+    # 常驻进程没有终端，避免交互输入阻塞
+    sys.stdin = open(os.devnull, 'r')
+
+    skill = ZenTaoHelperSkill(interactive=False)
+    daemon = SkillDaemon(skill.execute)
+    host, port = daemon.address
+    print(f"常驻进程已启动: {host}:{port}（python skill.py --stop 停止）")
+    daemon.serve_forever()
 
 
 # 命令行测试入口
@@ -447,15 +703,46 @@ if __name__ == "__main__":
     parser.add_argument('--assigned-to', '-a', help='任务执行人')
     parser.add_argument('--hours', type=float, help='任务时长（小时）')
     parser.add_argument('--deadline', '-d', help='任务截至时间（如：本周周五、下周周五）')
+    parser.add_argument('--batch-split', nargs='+', metavar='STORY_ID', help='批量拆解需求（需求ID，空格或逗号分隔）')
+    parser.add_argument('--batch-query', metavar='QUERY', help='批量拆解查询结果中的需求（如：查看未分配的需求）')
+    parser.add_argument('--bulk-assign', metavar='USER', help='批量分配任务给指定用户（配合 --task-ids 或 --task-status/--task-keyword）')
+    parser.add_argument('--task-ids', nargs='+', metavar='TASK_ID', help='批量分配的任务ID（空格或逗号分隔）')
+    parser.add_argument('--task-status', help='批量分配我的任务中指定状态的任务（wait, doing 等）')
+    parser.add_argument('--task-keyword', help='批量分配我的任务中标题包含关键字的任务')
+    parser.add_argument('--assign-csv', metavar='FILE', help='按 CSV 文件批量分配任务（每行: 任务ID,用户）')
+    parser.add_argument('--stats', nargs='?', const='table', choices=['table', 'json', 'prometheus'],
+                        help='执行后显示各接口族的请求耗时统计（默认 table）')
+    parser.add_argument('--serve', action='store_true', help='启动常驻进程')
+    parser.add_argument('--stop', action='store_true', help='停止常驻进程')
 
     args = parser.parse_args()
 
+    if args.serve:
+        serve_daemon()
+    elif args.stop:
+        from src.utils.daemon import stop_daemon
+        print("常驻进程已停止" if stop_daemon() else "常驻进程未运行")
     # 检查是否有命令行参数
-    if args.command:
-        # 从命令行参数获取指令
-        user_input = ' '.join(args.command)
-        skill = ZenTaoHelperSkill()
-        
+    elif args.bulk_assign or args.assign_csv:
+        task_ids = [
+            task_id for value in args.task_ids or []
+            for task_id in value.replace('，', ',').split(',') if task_id.strip()
+        ]
+        result = ZenTaoHelperSkill().bulk_assign(
+            task_ids=task_ids,
+            username=args.bulk_assign,
+            status=args.task_status,
+            keyword=args.task_keyword,
+            csv_path=args.assign_csv,
+            stats=args.stats
+        )
+        if result.get('success'):
+            print(result.get('data', {}).get('message', '操作成功'))
+        else:
+            print(f"错误: {result.get('error', {}).get('message', '未知错误')}")
+        if result.get('stats'):
+            print(result['stats'])
+    elif args.command or args.batch_split or args.batch_query:
         # 构建额外参数
         kwargs = {}
         if args.grade:
@@ -470,14 +757,27 @@ if __name__ == "__main__":
             kwargs['task_hours'] = args.hours
         if args.deadline:
             kwargs['deadline'] = args.deadline
-
-        result = skill.execute(user_input, **kwargs)
+        if args.stats:
+            kwargs['stats'] = args.stats
+
+        if args.batch_split or args.batch_query:
+            story_ids = [
+                story_id for value in args.batch_split or []
+                for story_id in value.replace('，', ',').split(',') if story_id.strip()
+            ]
+            result = ZenTaoHelperSkill().batch_split(story_ids=story_ids, query=args.batch_query, **kwargs)
+        else:
+            # 从命令行参数获取指令
+            user_input = ' '.join(args.command)
+            result = skill_main(user_input, **kwargs)
 
         if result.get('success'):
             print(result.get('data', {}).get('message', '操作成功'))
         else:
             error = result.get('error', {})
             print(f"错误: {error.get('message', '未知错误')}")
+        if result.get('stats'):
+            print(result['stats'])
     else:
         # 交互式模式
         print("ZenTao Helper Skill - 测试模式")
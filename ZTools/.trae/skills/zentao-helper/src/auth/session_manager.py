@@ -5,6 +5,7 @@
 
 import keyring
 import json
+import time
 from pathlib import Path
 from typing import Dict, Optional
 from cryptography.fernet import Fernet
@@ -69,13 +70,7 @@ class SessionManager:
             # 添加过期时间（默认24小时）
             session_data['expires_at'] = (datetime.utcnow() + timedelta(hours=24)).isoformat()
 
-            # 加密会话数据
-            session_json = json.dumps(session_data, ensure_ascii=False)
-            encrypted_data = self.cipher.encrypt(session_json.encode())
-
-            # 写入文件
-            with open(self.session_file, 'wb') as f:
-                f.write(encrypted_data)
+            self._write_session(session_data)
 
             self.logger.info("会话已保存", extra={'user': session_data.get('user', 'unknown')})
             return True
@@ -84,6 +79,19 @@ class SessionManager:
             self.logger.error(f"保存会话失败: {str(e)}")
             return False
 
+    def _write_session(self, session_data: Dict):
+        """
+        加密并写入会话文件
+
+        Args:
+            session_data: 会话数据
+        """
+        session_json = json.dumps(session_data, ensure_ascii=False)
+        encrypted_data = self.cipher.encrypt(session_json.encode())
+
+        with open(self.session_file, 'wb') as f:
+            f.write(encrypted_data)
+
     def load_session(self) -> Optional[Dict]:
         """
         加载会话信息
@@ -133,6 +141,68 @@ class SessionManager:
         session = self.load_session()
         return session is not None
 
+    def get_verified_at(self, session_data: Dict) -> Optional[float]:
+        """
+        获取服务器端会话最近一次验证通过的时间
+
+        超过 session.check_interval 的记录视为无效
+
+        Args:
+            session_data: 会话数据
+
+        Returns:
+            验证通过的时间戳，无有效记录时返回 None
+        """
+        verified_at = session_data.get('verified_at')
+        if not verified_at:
+            return None
+
+        check_interval = self.config.get_session_config().get('check_interval', 300)
+        if time.time() - float(verified_at) >= check_interval:
+            return None
+        return float(verified_at)
+
+    def mark_verified(self, session_data: Dict, verified_at: Optional[float] = None) -> bool:
+        """
+        记录服务器端会话验证通过的时间（不改变会话过期时间）
+
+        Args:
+            session_data: 会话数据（原地更新）
+            verified_at: 验证通过的时间戳，默认当前时间
+
+        Returns:
+            是否保存成功
+        """
+        if not self.cipher:
+            return False
+
+        try:
+            session_data['verified_at'] = verified_at or time.time()
+            self._write_session(session_data)
+            return True
+        except Exception as e:
+            self.logger.warning(f"保存会话验证时间失败: {str(e)}")
+            return False
+
+    def clear_verified(self) -> bool:
+        """
+        清除持久化的会话验证时间，下次使用时重新验证服务器端会话
+
+        Returns:
+            是否清除成功
+        """
+        session_data = self.load_session()
+        if not session_data or 'verified_at' not in session_data:
+            return True
+
+        try:
+            session_data.pop('verified_at')
+            self._write_session(session_data)
+            return True
+        except Exception as e:
+            self.logger.warning(f"清除会话验证时间失败: {str(e)}")
+            return False
+
     def clear_session(self) -> bool:
         """
         清除会话信息
@@ -4,7 +4,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from ..utils.logger import get_logger
 from ..utils.response import ApiResponse
@@ -45,4 +45,47 @@ class BaseAutomator(ABC):
             是否确认
         """
         # 在实际使用中，这里可以集成 iFlow 的确认机制
-        return True
\ No newline at end of file
+        return True
+
+    def _resolve_account(self, name: str, keep_unknown: bool = True) -> Tuple[Optional[str], List[Dict]]:
+        """
+        通过用户目录把账号、姓名或拼音首字母解析为禅道账号
+
+        Args:
+            name: 账号、姓名或拼音首字母
+            keep_unknown: 未找到用户时是否按原名称返回；为 False 时返回 (None, [])，由调用方报错
+
+        Returns:
+            (账号, 候选用户)：唯一匹配时返回其账号；匹配到多个用户时账号为 None，返回候选用户，
+            由调用方让用户选择或报错；未找到用户或用户列表获取失败时按原名称返回，交给禅道校验
+        """
+        search_result = self.api_client.search_user(name)
+        if not search_result.success:
+            self.logger.warning(f"获取用户列表失败，跳过用户校验，按输入的用户名处理: {name}")
+            return name, []
+
+        users = search_result.data
+        if not users:
+            self.logger.warning(f"未找到用户: {name}")
+            return (name if keep_unknown else None), []
+        if len(users) == 1:
+            return users[0].get('account', name), []
+        return None, users
+
+    @staticmethod
+    def _ambiguous_user_message(name: str, users: List[Dict], limit: int = 5) -> str:
+        """
+        匹配到多个用户时的提示
+
+        Args:
+            name: 输入的名称
+            users: 候选用户
+            limit: 最多列出的候选数
+
+        Returns:
+            提示信息
+        """
+        candidates = ', '.join(f"{user.get('realname', '')}({user.get('account', '')})" for user in users[:limit])
+        if len(users) > limit:
+            candidates += f" 等 {len(users)} 个"
+        return f"'{name}' 匹配到多个用户: {candidates}，请指定账号"
@@ -0,0 +1,293 @@
+"""
+批量任务创建器
+一次拆解多个需求：项目列表只获取一次，多个需求并发流经
+变更标题、评审、关联项目、创建任务四个阶段
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from .base import BaseAutomator
+from .task_splitter import TaskSplitter
+from ..utils.response import ApiResponse, ErrorCode
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+from ..utils.concurrency import bounded_map
+
+
+class BatchTaskSplitter(BaseAutomator):
+    """
+    批量任务创建器
+    只支持非交互模式，所有需求使用同一组任务参数
+    """
+
+    # 各阶段名称（用于结果汇总）
+    STAGE_FETCH = '获取需求'
+    STAGE_CHANGE = '变更标题'
+    STAGE_REVIEW = '评审需求'
+    STAGE_LINK = '关联项目'
+    STAGE_CREATE = '创建任务'
+
+    def __init__(self, api_client, task_splitter: Optional[TaskSplitter] = None):
+        super().__init__(api_client)
+        self.logger = get_logger()
+        self.task_splitter = task_splitter or TaskSplitter(api_client)
+        self.max_in_flight = get_config().get('zentao.task_creation.batch_max_in_flight', 4)
+
+    def execute(
+        self,
+        story_ids: Optional[List] = None,
+        stories: Optional[List[Dict]] = None,
+        grade: str = None,
+        priority: str = None,
+        online_time: str = None,
+        assigned_to: str = None,
+        task_hours: float = None,
+        deadline: str = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        **kwargs
+    ) -> ApiResponse:
+        """
+        批量从需求创建任务
+
+        Args:
+            story_ids: 需求ID列表
+            stories: 需求列表（如查询需求的结果），与 story_ids 合并去重
+            grade: 需求等级
+            priority: 需求优先级
+            online_time: 需求上线时间
+            assigned_to: 任务执行人
+            task_hours: 任务时长
+            deadline: 任务截至时间
+            on_progress: 每个需求处理完成时的回调，参数为该需求的处理结果
+            **kwargs: 其他参数
+
+        Returns:
+            汇总结果，包含每个需求的处理结果
+        """
+        ids = self.collect_story_ids(story_ids, stories)
+        if not ids:
+            return ApiResponse.error_response(
+                ErrorCode.MISSING_PARAMETER,
+                "请指定要拆解的需求ID，例如：--batch-split 101 102 103"
+            )
+
+        # 执行人（包括配置的默认执行人）可以是姓名或拼音首字母，开始拆解前解析一次
+        assigned_to = assigned_to or get_config().get('zentao.task_creation.default_assigned_to') or None
+        if assigned_to:
+            account, candidates = self._resolve_account(assigned_to)
+            if account is None:
+                return ApiResponse.error_response(
+                    ErrorCode.INVALID_PARAMETER,
+                    f"任务执行人{self._ambiguous_user_message(assigned_to, candidates)}"
+                )
+            assigned_to = account
+
+        task_params = {
+            'grade': grade or 'A',
+            'priority': priority or '非紧急',
+            'online_time': online_time or '下周周一',
+            'assigned_to': assigned_to,
+            'task_hours': task_hours,
+            'deadline': deadline or '本周周五'
+        }
+
+        default_execution = None
+        executions_error = None
+        index_result = self.api_client.get_execution_index()
+        if index_result.success:
+            default_project_name = get_config().get('zentao.task_creation.default_project_name')
+            if default_project_name and len(index_result.data):
+                default_execution = self.task_splitter.match_default_execution(
+                    index_result.data, default_project_name
+                )
+        else:
+            executions_error = index_result.error.message if index_result.error else '未知错误'
+            self.logger.warning(f"获取项目列表失败，未关联项目的需求将无法拆解: {executions_error}")
+
+        self.logger.info(f"开始批量拆解 {len(ids)} 个需求 (同时处理: {self.max_in_flight})")
+
+        def split_one(story_id: int) -> Dict:
+            return self._split_story(story_id, task_params, default_execution, executions_error)
+
+        def on_result(story_id: int, result: Optional[Dict]):
+            if on_progress:
+                on_progress(result or self._failed(story_id, self.STAGE_FETCH, "处理异常"))
+
+        # 单个需求的各阶段共享需求快照，避免重复请求 story-view
+        with self.api_client.story_cache_scope():
+            results = bounded_map(split_one, ids, max_workers=self.max_in_flight, on_result=on_result)
+
+        results = [
+            result or self._failed(story_id, self.STAGE_FETCH, "处理异常")
+            for story_id, result in zip(ids, results)
+        ]
+        succeeded = len([result for result in results if result['success']])
+
+        self.logger.info(f"批量拆解完成: 成功 {succeeded} 个，失败 {len(results) - succeeded} 个")
+
+        return ApiResponse.success_response({
+            'results': results,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        })
+
+    @staticmethod
+    def collect_story_ids(story_ids: Optional[List] = None, stories: Optional[List[Dict]] = None) -> List[int]:
+        """
+        合并需求ID（保持输入顺序并去重，忽略无法识别的ID）
+
+        Args:
+            story_ids: 需求ID列表，支持 "#123" 格式
+            stories: 需求列表
+
+        Returns:
+            需求ID列表
+        """
+        ids = []
+        for story_id in list(story_ids or []) + [story.get('id') for story in stories or []]:
+            try:
+                story_id = int(str(story_id).lstrip('#'))
+            except (TypeError, ValueError):
+                continue
+            if story_id not in ids:
+                ids.append(story_id)
+        return ids
+
+    @staticmethod
+    def _failed(story_id: int, stage: str, error: str, **fields) -> Dict:
+        """构造失败结果"""
+        return dict({
+            'story_id': story_id,
+            'success': False,
+            'stage': stage,
+            'error': error,
+            'warnings': []
+        }, **fields)
+
+    @staticmethod
+    def _error_message(result: ApiResponse) -> str:
+        return result.error.message if result.error else '未知错误'
+
+    def _split_story(self, story_id: int, task_params: Dict, default_execution: Optional[Dict],
+                     executions_error: Optional[str]) -> Dict:
+        """
+        拆解单个需求
+
+        变更标题、评审、关联项目失败时记录警告并继续（与单个拆解一致），
+        获取需求、确定项目、创建任务失败时该需求失败
+
+        Args:
+            story_id: 需求ID
+            task_params: 任务参数
+            default_execution: 配置的默认项目
+            executions_error: 获取项目列表失败的原因
+
+        Returns:
+            该需求的处理结果
+        """
+        warnings = []
+
+        story_result = self.api_client.get_story(story_id)
+        if not story_result.success:
+            return self._failed(story_id, self.STAGE_FETCH, self._error_message(story_result))
+        story = story_result.data
+
+        # 先确定项目，无法关联项目的需求不做任何修改
+        execution_id = story.get('execution', 0)
+        need_link = not execution_id
+        if need_link:
+            if not default_execution:
+                error = f"获取项目列表失败: {executions_error}" if executions_error else "未找到配置的默认项目"
+                return self._failed(story_id, self.STAGE_LINK, error)
+            execution_id = default_execution.get('id', 0)
+
+        task_info = self.task_splitter.interactive_input.collect_task_info_non_interactive(
+            story_title=story.get('title', ''),
+            **task_params
+        )
+        updated_title = task_info['updated_title']
+
+        # 阶段1: 变更需求标题
+        changed = False
+        if updated_title:
+            update_result = self.api_client.update_story_title(story_id, updated_title)
+            changed = update_result.success
+            if not changed:
+                warnings.append(f"{self.STAGE_CHANGE}失败: {self._error_message(update_result)}")
+
+        # 阶段2: 评审需求（标题变更成功后状态必然为已变更，直接评审，不再请求 story-view）
+        review_result = self.api_client.review_story(
+            story_id,
+            result='pass',
+            assigned_to=None,  # 不修改指派人
+            estimate=task_info.get('task_hours'),
+            comment='需求已拆解并评审通过，准备开发',
+            story_data=dict(story, status='changed') if changed else None
+        )
+        if not review_result.success:
+            warnings.append(f"{self.STAGE_REVIEW}失败: {self._error_message(review_result)}")
+
+        # 阶段3: 关联项目
+        if need_link:
+            link_result = self.api_client.link_story_to_execution(story_id, execution_id)
+            if not link_result.success:
+                warnings.append(f"{self.STAGE_LINK}失败: {self._error_message(link_result)}")
+
+        # 阶段4: 创建任务
+        task_name = f"【研发】{updated_title}"
+        create_result = self.api_client.create_task(
+            execution_id=execution_id,
+            name=task_name,
+            assigned_to=task_info['assigned_to'] if task_info['assigned_to'] else None,
+            estimate=task_info['task_hours'] if task_info['task_hours'] else 0,
+            deadline=self.task_splitter._calculate_deadline(task_info['deadline']),
+            story_id=story_id
+        )
+        if not create_result.success:
+            return self._failed(
+                story_id, self.STAGE_CREATE, self._error_message(create_result),
+                title=updated_title, warnings=warnings
+            )
+
+        self.logger.info(f"✓ 需求 #{story_id} 已创建任务 #{create_result.data.get('id')}")
+
+        return {
+            'story_id': story_id,
+            'success': True,
+            'title': updated_title,
+            'execution_id': execution_id,
+            'task_id': create_result.data.get('id'),
+            'task_name': task_name,
+            'warnings': warnings
+        }
+
+    def format_display(self, data: dict) -> str:
+        """
+        格式化显示批量拆解结果
+
+        Args:
+            data: 汇总结果数据
+
+        Returns:
+            格式化的显示文本
+        """
+        if not data or not data.get('results'):
+            return "没有需要拆解的需求"
+
+        lines = []
+        lines.append("=" * 60)
+        lines.append(f"批量拆解完成: 共 {data['total']} 个，成功 {data['succeeded']} 个，失败 {data['failed']} 个")
+        lines.append("=" * 60)
+
+        for result in data['results']:
+            if result['success']:
+                lines.append(f"✓ 需求 #{result['story_id']} → 任务 #{result.get('task_id') or 'N/A'} {result.get('task_name', '')}")
+            else:
+                lines.append(f"✗ 需求 #{result['story_id']} [{result['stage']}] {result['error']}")
+            for warning in result.get('warnings', []):
+                lines.append(f"    ! {warning}")
+
+        lines.append("=" * 60)
+
+        return "\n".join(lines)
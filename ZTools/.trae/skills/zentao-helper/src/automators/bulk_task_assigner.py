@@ -0,0 +1,242 @@
+"""
+批量任务分配器
+按任务ID列表、我的任务过滤结果或 CSV 文件批量分配任务，
+用户只校验一次，分配请求并发发送并限制速率
+"""
+
+import csv
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base import BaseAutomator
+from ..utils.response import ApiResponse, ErrorCode
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+from ..utils.concurrency import RateLimiter, bounded_map
+
+
+class BulkTaskAssigner(BaseAutomator):
+    """
+    批量任务分配器
+    """
+
+    def __init__(self, api_client):
+        super().__init__(api_client)
+        self.logger = get_logger()
+
+        assign_config = get_config().get('zentao.task_assignment', {}) or {}
+        self.max_workers = assign_config.get('bulk_max_workers', 4)
+        self.rate_limit = assign_config.get('bulk_rate_limit', 5)
+
+    def execute(
+        self,
+        assignments: Optional[List[Tuple[int, str]]] = None,
+        task_ids: Optional[List] = None,
+        username: str = None,
+        status: str = None,
+        keyword: str = None,
+        csv_path: str = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        **kwargs
+    ) -> ApiResponse:
+        """
+        批量分配任务
+
+        任务来源（可组合，同一任务只分配一次，先出现的优先）：
+        1. assignments: (任务ID, 用户) 列表
+        2. csv_path: CSV 文件，每行 "任务ID,用户"，可带表头
+        3. task_ids + username: 把指定任务分配给同一用户
+        4. status/keyword + username: 把我的任务中符合条件的任务分配给同一用户
+
+        Args:
+            assignments: (任务ID, 用户) 列表
+            task_ids: 任务ID列表
+            username: 分配给的用户（账号或姓名）
+            status: 按任务状态过滤我的任务 (wait, doing 等)
+            keyword: 按任务标题关键字过滤我的任务
+            csv_path: CSV 文件路径
+            on_progress: 每个任务分配完成时的回调，参数为该任务的分配结果
+            **kwargs: 其他参数
+
+        Returns:
+            汇总结果，包含每个任务的分配结果
+        """
+        try:
+            pairs = list(assignments or [])
+            if csv_path:
+                pairs.extend(self.parse_csv(csv_path))
+            if username:
+                pairs.extend((task_id, username) for task_id in task_ids or [])
+                if status or keyword:
+                    tasks_result = self._filter_my_tasks(status, keyword)
+                    if not tasks_result.success:
+                        return tasks_result
+                    pairs.extend((task['id'], username) for task in tasks_result.data)
+        except (OSError, ValueError) as e:
+            return ApiResponse.error_response(
+                ErrorCode.INVALID_PARAMETER,
+                f"读取分配列表失败: {str(e)}"
+            )
+
+        pairs = self._dedupe(pairs)
+        if not pairs:
+            return ApiResponse.error_response(
+                ErrorCode.MISSING_PARAMETER,
+                "没有需要分配的任务，请指定任务ID、过滤条件或 CSV 文件"
+            )
+
+        # 所有用户只校验一次（用户列表在客户端内缓存）
+        accounts = self._resolve_users({name for _, name in pairs})
+
+        results: Dict[int, Dict] = {}
+        jobs = []
+        for task_id, name in pairs:
+            account, error = accounts[name]
+            if error:
+                results[task_id] = self._result(task_id, name, False, error)
+                if on_progress:
+                    on_progress(results[task_id])
+            else:
+                jobs.append((task_id, account))
+
+        self.logger.info(f"开始批量分配 {len(jobs)} 个任务 (并发数: {self.max_workers}, 速率: {self.rate_limit}/秒)")
+
+        limiter = RateLimiter(self.rate_limit)
+
+        def assign(job: Tuple[int, str]) -> Dict:
+            task_id, account = job
+            limiter.acquire()
+            result = self.api_client.assign_task(task_id, account)
+            error = None if result.success else (result.error.message if result.error else '未知错误')
+            return self._result(task_id, account, result.success, error)
+
+        def on_result(job: Tuple[int, str], result: Optional[Dict]):
+            result = result or self._result(job[0], job[1], False, "分配异常")
+            results[job[0]] = result
+            if on_progress:
+                on_progress(result)
+
+        bounded_map(assign, jobs, max_workers=self.max_workers, on_result=on_result)
+
+        ordered = [results[task_id] for task_id, _ in pairs]
+        succeeded = len([result for result in ordered if result['success']])
+
+        self.logger.info(f"批量分配完成: 成功 {succeeded} 个，失败 {len(ordered) - succeeded} 个")
+
+        return ApiResponse.success_response({
+            'results': ordered,
+            'total': len(ordered),
+            'succeeded': succeeded,
+            'failed': len(ordered) - succeeded
+        })
+
+    @staticmethod
+    def parse_csv(csv_path: str) -> List[Tuple[int, str]]:
+        """
+        读取分配列表 CSV
+
+        每行 "任务ID,用户"，第一列不是数字的行（如表头）忽略
+
+        Args:
+            csv_path: CSV 文件路径
+
+        Returns:
+            (任务ID, 用户) 列表
+        """
+        pairs = []
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.reader(f):
+                if len(row) < 2:
+                    continue
+                task_id = row[0].strip().lstrip('#')
+                if task_id.isdigit() and row[1].strip():
+                    pairs.append((int(task_id), row[1].strip()))
+        return pairs
+
+    def _filter_my_tasks(self, status: Optional[str], keyword: Optional[str]) -> ApiResponse:
+        """按状态和标题关键字过滤指派给我的任务"""
+        result = self.api_client.get_my_tasks(status=status, with_detail=False)
+        if not result.success:
+            return result
+
+        tasks = result.data.get('tasks', [])
+        if keyword:
+            tasks = [task for task in tasks if keyword.lower() in task.get('title', '').lower()]
+        return ApiResponse.success_response(tasks)
+
+    def _dedupe(self, pairs: List[Tuple]) -> List[Tuple[int, str]]:
+        """任务ID去重（先出现的优先），忽略无法识别的任务ID"""
+        seen = {}
+        for task_id, name in pairs:
+            try:
+                task_id = int(str(task_id).lstrip('#'))
+            except (TypeError, ValueError):
+                self.logger.warning(f"忽略无法识别的任务ID: {task_id}")
+                continue
+            if task_id in seen:
+                self.logger.warning(f"任务 #{task_id} 重复出现，使用第一次指定的用户: {seen[task_id]}")
+                continue
+            seen[task_id] = str(name).strip()
+        return list(seen.items())
+
+    def _resolve_users(self, names: set) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        把用户名/姓名解析为禅道账号
+
+        批量分配不交给禅道校验未找到的用户，直接标记为失败
+
+        Args:
+            names: 用户名或姓名集合
+
+        Returns:
+            名称到 (账号, 错误信息) 的映射；用户列表获取失败时按原名称分配
+        """
+        resolved = {}
+        for name in names:
+            account, candidates = self._resolve_account(name, keep_unknown=False)
+            if account:
+                resolved[name] = (account, None)
+            elif candidates:
+                resolved[name] = (None, self._ambiguous_user_message(name, candidates))
+            else:
+                resolved[name] = (None, f"未找到用户: {name}")
+        return resolved
+
+    @staticmethod
+    def _result(task_id: int, username: str, success: bool, error: Optional[str] = None) -> Dict:
+        """构造单个任务的分配结果"""
+        return {
+            'task_id': task_id,
+            'assigned_to': username,
+            'success': success,
+            'error': error
+        }
+
+    def format_display(self, data: dict) -> str:
+        """
+        格式化显示批量分配结果
+
+        Args:
+            data: 汇总结果数据
+
+        Returns:
+            格式化后的文本
+        """
+        if not data or not data.get('results'):
+            return "没有需要分配的任务"
+
+        lines = []
+        lines.append("=" * 60)
+        lines.append(f"批量分配完成: 共 {data['total']} 个，成功 {data['succeeded']} 个，失败 {data['failed']} 个")
+        lines.append("=" * 60)
+        lines.append(f"{'结果':<4} {'任务':<10} {'分配给':<16} 说明")
+        lines.append("-" * 60)
+
+        for result in data['results']:
+            mark = '✓' if result['success'] else '✗'
+            lines.append(
+                f"{mark:<4} #{result['task_id']:<9} {result['assigned_to'] or '':<16} {result['error'] or ''}"
+            )
+
+        lines.append("=" * 60)
+
+        return "\n".join(lines)
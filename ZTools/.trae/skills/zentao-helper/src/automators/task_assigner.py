@@ -4,7 +4,7 @@
 """
 
 import sys
-from typing import Optional
+from typing import Dict, List, Optional
 
 from .base import BaseAutomator
 from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
@@ -21,14 +21,15 @@ class TaskAssigner(BaseAutomator):
         self.logger = get_logger()
 
     def execute(self, task_id: str = None, username: str = None,
-                user_input: str = None, **kwargs) -> ApiResponse:
+                user_input: str = None, interactive: bool = True, **kwargs) -> ApiResponse:
         """
         执行任务分配
 
         Args:
             task_id: 任务ID
-            username: 用户名
+            username: 用户名、姓名或拼音首字母
             user_input: 原始用户输入（用于提取用户名）
+            interactive: 是否允许交互输入（匹配到多个用户时让用户选择，否则返回候选用户）
             **kwargs: 其他参数
 
         Returns:
@@ -68,19 +69,16 @@ class TaskAssigner(BaseAutomator):
         task = task_result.data
         self.logger.info(f"开始分配任务 #{task_id}: {task.get('name', '')} 给 {username}")
 
-        # 搜索用户（可选，用于验证用户名）
-        user_search_result = self.api_client.search_user(username)
-        if user_search_result.success:
-            users = user_search_result.data
-            if len(users) == 0:
-                self.logger.warning(f"未找到用户: {username}")
-            elif len(users) > 1:
-                # 多个匹配，让用户选择（简化处理：使用第一个）
-                username = users[0].get('account', username)
-                self.logger.info(f"找到多个匹配用户，使用: {username}")
-            else:
-                # 精确匹配
-                username = users[0].get('account', username)
+        # 把姓名、拼音首字母解析为账号；匹配到多个用户时不替用户挑选
+        account, candidates = self._resolve_account(username)
+        if account is None:
+            account = self._select_user(candidates) if interactive else None
+            if not account:
+                return ApiResponse.error_response(
+                    ErrorCode.INVALID_PARAMETER,
+                    self._ambiguous_user_message(username, candidates)
+                )
+        username = account
 
         # 执行分配
         return self._perform_assign(int(task_id), username)
@@ -99,6 +97,32 @@ class TaskAssigner(BaseAutomator):
             print("\n输入已取消")
             return None
 
+    def _select_user(self, users: List[Dict]) -> Optional[str]:
+        """
+        匹配到多个用户时交互选择
+
+        Args:
+            users: 候选用户
+
+        Returns:
+            选中用户的账号，取消时返回 None
+        """
+        print("\n匹配到多个用户：")
+        for i, user in enumerate(users, 1):
+            print(f"  {i}. {user.get('realname', '')} ({user.get('account', '')})")
+
+        while True:
+            try:
+                choice = input(f"请选择 (1-{len(users)}, 直接回车取消): ").strip()
+                if not choice:
+                    return None
+                if choice.isdigit() and 1 <= int(choice) <= len(users):
+                    return users[int(choice) - 1].get('account')
+                print("无效选择，请重新输入")
+            except (EOFError, KeyboardInterrupt):
+                print("\n输入已取消")
+                return None
+
     def _perform_assign(self, task_id: int, username: str) -> ApiResponse:
         """
         执行实际的分配操作
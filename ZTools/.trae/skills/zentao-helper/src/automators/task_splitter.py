@@ -4,7 +4,7 @@
 """
 
 import sys
-from typing import Optional, List
+from typing import Optional
 
 from .base import BaseAutomator
 from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
@@ -12,6 +12,7 @@ from ..utils.logger import get_logger
 from ..utils.interactive_input import InteractiveInput
 from ..utils.story_title_updater import StoryTitleUpdater
 from ..utils.progress_bar import ProgressBar
+from ..zentao.executions import ExecutionIndex
 
 
 class TaskSplitter(BaseAutomator):
@@ -101,6 +102,16 @@ class TaskSplitter(BaseAutomator):
                     "已取消任务创建"
                 )
 
+        # 执行人（包括配置的默认执行人）可以是姓名或拼音首字母，修改需求前解析为账号
+        if task_info.get('assigned_to'):
+            account, candidates = self._resolve_account(task_info['assigned_to'])
+            if account is None:
+                return ApiResponse.error_response(
+                    ErrorCode.INVALID_PARAMETER,
+                    f"任务执行人{self._ambiguous_user_message(task_info['assigned_to'], candidates)}"
+                )
+            task_info['assigned_to'] = account
+
         # 从 task_info 获取更新后的需求标题
         updated_title = task_info['updated_title']
         
@@ -150,36 +161,29 @@ class TaskSplitter(BaseAutomator):
             default_project_name = config.get('task_creation', {}).get('default_project_name')
             
             # 获取所有可用的项目
-            executions_result = self.api_client.get_executions()
-            if not executions_result.success:
-                error_msg = f"获取项目列表失败: {executions_result.error.message if executions_result.error else '未知错误'}"
+            index_result = self.api_client.get_execution_index()
+            if not index_result.success:
+                error_msg = f"获取项目列表失败: {index_result.error.message if index_result.error else '未知错误'}"
                 self.logger.error(error_msg)
                 return ApiResponse.error_response(
                     ErrorCode.API_ERROR,
                     f"步骤3失败：{error_msg}，任务创建已中止"
                 )
             
-            executions = executions_result.data
+            index = index_result.data
+            executions = index.executions
             selected_execution = None
             
             # 如果配置了默认项目名称，尝试从项目列表中找到匹配的项目
             if default_project_name and executions:
-                for exec_data in executions:
-                    exec_name = exec_data.get('name', '')
-                    # 支持部分匹配：配置 "都江堰" 可以匹配 "都江堰项目"
-                    if default_project_name.lower() in exec_name.lower():
-                        selected_execution = exec_data
-                        self.logger.info(f"使用配置的默认项目: {exec_name} (ID: {exec_data.get('id')})")
-                        break
-                
-                if not selected_execution:
-                    self.logger.warning(f"配置的默认项目名称 '{default_project_name}' 未找到匹配的项目")
+                selected_execution = self.match_default_execution(index, default_project_name)
             
             # 如果没有找到匹配的项目，交互式让用户选择
             if not selected_execution:
                 selected_execution_id = self.interactive_input.select_execution(
                     executions,
-                    default_project_name=default_project_name
+                    default_project_name=default_project_name,
+                    index=index
                 )
                 
                 if not selected_execution_id:
@@ -236,32 +240,30 @@ class TaskSplitter(BaseAutomator):
         default_project_name = config.get('task_creation', {}).get('default_project_name')
 
         # 获取所有可用的项目
-        executions_result = self.api_client.get_executions()
-        if not executions_result.success:
+        index_result = self.api_client.get_execution_index()
+        if not index_result.success:
             return ApiResponse.error_response(
                 ErrorCode.API_ERROR,
-                f"获取项目列表失败: {executions_result.error.message if executions_result.error else '未知错误'}"
+                f"获取项目列表失败: {index_result.error.message if index_result.error else '未知错误'}"
             )
 
-        executions = executions_result.data
+        index = index_result.data
+        executions = index.executions
 
         # 如果配置了默认项目名称，尝试从项目列表中找到匹配的项目
         if default_project_name and executions:
-            for exec_data in executions:
-                exec_name = exec_data.get('name', '')
-                # 支持部分匹配：配置 "都江堰" 可以匹配 "都江堰项目"
-                if default_project_name.lower() in exec_name.lower():
-                    self.logger.info(f"使用配置的默认项目: {exec_name} (ID: {exec_data.get('id')})")
-                    return ApiResponse.success_response({
-                        'execution_id': exec_data.get('id'),
-                        'message': f'已选择项目: {exec_name}'
-                    })
-            self.logger.warning(f"配置的默认项目名称 '{default_project_name}' 未找到匹配的项目")
+            exec_data = self.match_default_execution(index, default_project_name)
+            if exec_data:
+                return ApiResponse.success_response({
+                    'execution_id': exec_data.get('id'),
+                    'message': f"已选择项目: {exec_data.get('name', '')}"
+                })
 
         # 选择项目
         selected_execution_id = self.interactive_input.select_execution(
             executions,
-            default_project_name=default_project_name
+            default_project_name=default_project_name,
+            index=index
         )
 
         if not selected_execution_id:
@@ -275,6 +277,28 @@ class TaskSplitter(BaseAutomator):
             'message': '已选择项目'
         })
 
+    def match_default_execution(self, index: ExecutionIndex, default_project_name: str) -> Optional[dict]:
+        """
+        按配置的默认项目名称匹配项目
+
+        依次精确、前缀、部分匹配：配置 "都江堰" 可以匹配 "都江堰项目"；
+        索引随项目列表缓存保存（get_execution_index），重复拆解时为 O(1) 查找
+
+        Args:
+            index: 项目名称索引
+            default_project_name: 配置的默认项目名称
+
+        Returns:
+            匹配的项目，未找到时返回 None
+        """
+        exec_data = index.find(default_project_name)
+        if exec_data:
+            self.logger.info(f"使用配置的默认项目: {exec_data.get('name', '')} (ID: {exec_data.get('id')})")
+            return exec_data
+
+        self.logger.warning(f"配置的默认项目名称 '{default_project_name}' 未找到匹配的项目")
+        return None
+
     def _perform_create(self, story_id: int, task_info: dict, updated_title: str, execution_id: int) -> ApiResponse:
         """
         执行实际的任务创建操作
@@ -17,9 +17,15 @@ class BaseCollector(ABC):
     定义收集器的通用接口
     """
 
-    def __init__(self, api_client: ZentaoApiClient):
+    def __init__(self, api_client: ZentaoApiClient, local_store=None):
+        """
+        Args:
+            api_client: 禅道 API 客户端
+            local_store: 本地缓存（LocalStore），为 None 时直接请求禅道
+        """
         self.logger = get_logger()
         self.api_client = api_client
+        self.local_store = local_store
 
     @abstractmethod
     def collect(self, **kwargs) -> ApiResponse:
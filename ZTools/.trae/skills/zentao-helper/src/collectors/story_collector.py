@@ -3,11 +3,16 @@
 收集指派给我的需求信息
 """
 
+import time
+from itertools import islice
 from typing import Optional
 
 from .base import BaseCollector
+from ..zentao.api_client import ZentaoApiClient
+from ..zentao.story_filter import StoryFilter, with_status
 from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
 from ..utils.progress_bar import ProgressBar
+from ..utils.config_loader import get_config
 
 
 class StoryCollector(BaseCollector):
@@ -36,12 +41,15 @@ class StoryCollector(BaseCollector):
         'released': '已发布'
     }
 
-    def collect(self, status: Optional[str] = None, **kwargs) -> ApiResponse:
+    def collect(self, status: Optional[str] = None, story_filter: Optional[StoryFilter] = None,
+                limit: Optional[int] = None, **kwargs) -> ApiResponse:
         """
         收集需求列表
 
         Args:
-            status: 需求状态过滤 (all, draft, active, closed, changed)
+            status: 需求状态 (all, draft, active, closed, changed) 或阶段 (wait、planned 等)
+            story_filter: 阶段、关键字等过滤条件（在获取时过滤）
+            limit: 最多收集的需求数，找到后不再请求后续页
             **kwargs: 其他参数
 
         Returns:
@@ -49,8 +57,17 @@ class StoryCollector(BaseCollector):
         """
         self.logger.info(f"收集需求列表, status: {status}")
 
+        # 本地缓存和直接请求禅道按相同的规则应用状态
+        status_filter = with_status(story_filter, status)
+
+        if self.local_store:
+            try:
+                return self._collect_from_local_store(status_filter, limit)
+            except Exception as e:
+                self.logger.warning(f"从本地缓存收集需求失败，改为直接请求禅道: {str(e)}")
+
         try:
-            result = self.api_client.get_my_stories(status)
+            result = self.api_client.get_my_stories(status, story_filter=story_filter, limit=limit)
 
             if result.success:
                 stories = result.data.get('stories', [])
@@ -70,6 +87,103 @@ class StoryCollector(BaseCollector):
         except Exception as e:
             raise
 
+    def _collect_from_local_store(self, story_filter: Optional[StoryFilter] = None,
+                                  limit: Optional[int] = None) -> ApiResponse:
+        """
+        增量同步后从本地缓存读取需求
+
+        Args:
+            story_filter: 过滤条件（已合并指令中的状态）
+            limit: 最多读取的需求数
+
+        Returns:
+            需求列表
+        """
+        self.sync_local_store()
+
+        configured_products = get_config().get('zentao.story_query.products', [])
+        # 标题关键字通过本地缓存的标题索引查找，不逐个扫描需求
+        keywords = story_filter.keywords if story_filter is not None else None
+        stories = self.local_store.list_stories(products=configured_products or None, keywords=keywords)
+        if story_filter is not None:
+            stories = list(story_filter.apply(stories, limit))
+        elif limit is not None:
+            stories = list(islice(stories, limit))
+
+        self.logger.info(f"从本地缓存收集 {len(stories)} 个需求")
+
+        return ApiResponse.success_response({
+            'stories': stories,
+            'total': len(stories),
+            'count': len(stories)
+        })
+
+    def sync_local_store(self, full: Optional[bool] = None) -> dict:
+        """
+        同步指派给我的需求到本地缓存
+
+        增量同步分两轮扫描，遇到已缓存且最后编辑时间未变化的需求即停止翻页：
+        - 按 ID 倒序扫描，发现新指派的需求
+        - 按最后编辑时间倒序扫描，发现被修改的需求
+        按 ID 倒序扫描到最后一页（没有提前停止翻页）时已获取完整列表，同时清理已不再指派给我的需求；
+        否则被转指派给他人的需求会在缓存中保留到下一次全量同步，
+        即最长 cache.local_store.full_sync_interval 秒
+
+        Args:
+            full: 是否全量同步，为 None 时按同步间隔自动判断
+
+        Returns:
+            同步统计 {'full': bool, 'fetched': int, 'updated': int, 'removed': int}
+        """
+        full_sync_interval = get_config().get('cache.local_store.full_sync_interval', 3600)
+        if full is None:
+            last_full_sync = self.local_store.get_meta('stories.last_full_sync')
+            full = not last_full_sync or time.time() - float(last_full_sync) > full_sync_interval
+
+        known_edit_dates = self.local_store.get_story_edit_dates()
+        seen_ids = set()
+        changed = {}
+
+        # 按 ID 倒序扫描是否获取了完整列表（全量同步，或增量同步一直翻到最后一页）
+        complete = False
+        passes = ['id_desc'] if full else ['id_desc', 'lastEditedDate_desc']
+        for order_by in passes:
+            stopped = False
+            for page in self.api_client.iter_my_story_pages(order_by=order_by, strict=True):
+                reached_known = False
+                for raw_story in page:
+                    story_id = int(raw_story.get('id', 0))
+                    last_edited = raw_story.get('lastEditedDate') or raw_story.get('openedDate') or ''
+                    seen_ids.add(story_id)
+
+                    if known_edit_dates.get(story_id) == last_edited:
+                        reached_known = True
+                        continue
+
+                    story = self.api_client.build_story_list_item(raw_story)
+                    story['product_id'] = raw_story.get('product', 0)
+                    changed[story_id] = (story, last_edited)
+
+                if reached_known and not full:
+                    # 不足一页说明已经是最后一页，列表仍然完整
+                    stopped = len(page) >= ZentaoApiClient.STORY_PAGE_LIMIT
+                    break
+            if order_by == 'id_desc':
+                complete = not stopped
+
+        updated = self.local_store.upsert_stories(changed.values())
+        removed = 0
+        if complete:
+            removed = self.local_store.retain_stories(seen_ids)
+        if full:
+            self.local_store.set_meta('stories.last_full_sync', time.time())
+
+        self.logger.info(
+            f"需求同步完成: {'全量' if full else '增量'}, 获取 {len(seen_ids)} 个, "
+            f"更新 {updated} 个, 删除 {removed} 个"
+        )
+        return {'full': full, 'fetched': len(seen_ids), 'updated': updated, 'removed': removed}
+
     def format_display(self, data: dict) -> str:
         """
         格式化显示需求列表
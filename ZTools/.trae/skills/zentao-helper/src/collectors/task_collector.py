@@ -3,11 +3,14 @@
 收集指派给我的任务信息
 """
 
-from typing import Optional
+import asyncio
+from typing import Dict, List, Optional
 
 from .base import BaseCollector
+from ..zentao.async_client import AsyncZentaoApiClient, aiohttp_available
 from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
 from ..utils.progress_bar import ProgressBar
+from ..utils.config_loader import get_config
 
 
 class TaskCollector(BaseCollector):
@@ -40,7 +43,12 @@ class TaskCollector(BaseCollector):
         self.logger.info(f"收集任务列表, status: {status}")
 
         try:
-            result = self.api_client.get_my_tasks(status)
+            if self.local_store:
+                result = self.api_client.get_my_tasks(status, with_detail=False)
+                if result.success:
+                    self._merge_task_details(result.data.get('tasks', []))
+            else:
+                result = self.api_client.get_my_tasks(status)
 
             if result.success:
                 tasks = result.data.get('tasks', [])
@@ -60,6 +68,54 @@ class TaskCollector(BaseCollector):
         except Exception as e:
             raise
 
+    def _merge_task_details(self, tasks: list):
+        """
+        合并任务详情，优先使用本地缓存中未过期的详情，只请求缺失的任务
+
+        Args:
+            tasks: 任务列表（原地更新）
+        """
+        task_ids = [task['id'] for task in tasks]
+        ttl = get_config().get('cache.local_store.task_detail_ttl', 300)
+
+        details = self.local_store.get_task_details(task_ids, max_age=ttl)
+        missing_ids = [task_id for task_id in task_ids if task_id not in details]
+
+        self.logger.info(f"任务详情命中本地缓存 {len(details)} 个，需请求 {len(missing_ids)} 个")
+
+        if missing_ids:
+            fetched = self._fetch_task_details(missing_ids)
+            fetched = {task_id: detail for task_id, detail in fetched.items() if detail}
+            self.local_store.save_task_details(fetched)
+            details.update(fetched)
+
+        for task in tasks:
+            detail = details.get(task['id'])
+            if detail:
+                task.update(detail)
+
+    def _fetch_task_details(self, task_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """
+        批量获取任务详情
+
+        安装了 aiohttp 且开启 zentao.concurrency.async_client 时使用异步客户端并发请求，
+        否则使用同步客户端的线程池
+
+        Args:
+            task_ids: 任务ID列表
+
+        Returns:
+            任务ID到详情的映射，获取失败的任务对应 None
+        """
+        if get_config().get('zentao.concurrency.async_client', False) and aiohttp_available():
+            return asyncio.run(self._fetch_task_details_async(task_ids))
+        return self.api_client.get_task_details(task_ids)
+
+    async def _fetch_task_details_async(self, task_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """使用异步客户端并发获取任务详情，完成后关闭 aiohttp 会话"""
+        async with AsyncZentaoApiClient(self.api_client) as client:
+            return await client.get_task_details(task_ids)
+
     def format_display(self, data: dict) -> str:
         """
         格式化显示任务列表
@@ -3,24 +3,41 @@
 将自然语言指令解析为结构化命令
 """
 
+import copy
+import threading
+from collections import OrderedDict
 from typing import Dict, Any
 
 from .intent_classifier import IntentClassifier
 from .entity_extractor import EntityExtractor
 from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
 
 
 class CommandParser:
     """
     命令解析器
     负责解析用户的自然语言指令
+
+    解析结果按输入文本缓存在有界的 LRU 中（常驻进程和批量执行时重复的指令不再重新解析），
+    返回的是缓存结果的副本，调用方修改不会影响缓存
     """
 
+    # 解析结果缓存的默认容量
+    DEFAULT_CACHE_SIZE = 256
+
     def __init__(self):
         self.logger = get_logger()
         self.intent_classifier = IntentClassifier()
         self.entity_extractor = EntityExtractor()
 
+        cache_size = get_config().get_nlp_config().get('parse_cache_size', self.DEFAULT_CACHE_SIZE)
+        self._cache_size = max(int(cache_size or 0), 0)
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        # 缓存对应的意图定义版本，动态添加意图后缓存作废
+        self._cache_revision = IntentClassifier.revision
+        self._cache_lock = threading.Lock()
+
     def parse(self, text: str) -> Dict[str, Any]:
         """
         解析用户指令
@@ -35,30 +52,78 @@ class CommandParser:
             - raw: 原始输入文本
             - confidence: 置信度（预留）
         """
-        # 分类意图
-        intent = self.intent_classifier.classify(text)
+        result = self._get_cached(text)
+        if result is None:
+            # 分类意图
+            intent = self.intent_classifier.classify(text)
 
-        # 提取实体
-        entities = self.entity_extractor.extract_all(text)
+            # 提取实体
+            entities = self.entity_extractor.extract_all(text)
 
-        # 构建解析结果
-        result = {
-            'intent': intent,
-            'entities': entities,
-            'raw': text,
-            'confidence': 0.9  # 默认置信度，预留
-        }
+            # 构建解析结果
+            result = {
+                'intent': intent,
+                'entities': entities,
+                'raw': text,
+                'confidence': 0.9  # 默认置信度，预留
+            }
+            self._put_cached(text, result)
 
         self.logger.info(
             f"命令解析: {text}",
             extra={
-                'intent': intent,
-                'entities': entities
+                'intent': result['intent'],
+                'entities': result['entities']
             }
         )
 
         return result
 
+    def clear_cache(self):
+        """清空解析结果缓存"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _get_cached(self, text: str):
+        """
+        获取缓存的解析结果
+
+        Args:
+            text: 用户输入的文本
+
+        Returns:
+            解析结果的副本，未缓存时返回 None
+        """
+        if not self._cache_size:
+            return None
+        with self._cache_lock:
+            if self._cache_revision != IntentClassifier.revision:
+                self._cache.clear()
+                self._cache_revision = IntentClassifier.revision
+                return None
+            result = self._cache.get(text)
+            if result is None:
+                return None
+            self._cache.move_to_end(text)
+        return copy.deepcopy(result)
+
+    def _put_cached(self, text: str, result: Dict[str, Any]):
+        """
+        缓存解析结果（保存副本），超过容量时淘汰最久未使用的结果
+
+        Args:
+            text: 用户输入的文本
+            result: 解析结果
+        """
+        if not self._cache_size:
+            return
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._cache[text] = result
+            self._cache.move_to_end(text)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
     def get_help(self) -> str:
         """
         获取帮助信息
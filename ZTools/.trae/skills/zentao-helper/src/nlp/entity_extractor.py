@@ -14,8 +14,77 @@ class EntityExtractor:
     """
     实体提取器
     提取各种实体：任务ID、用户名、需求ID等
+
+    正则表达式在类加载时编译，同一类实体的多个格式按顺序尝试（靠前的格式优先）
     """
 
+    # 任务ID：#123 或 任务#123、任务123、123号任务
+    TASK_ID_PATTERNS = (
+        re.compile(r'(?:任务|task|需求|story)?#(\d+)', re.IGNORECASE),
+        re.compile(r'(?:任务|task)\s*(\d+)', re.IGNORECASE),
+        re.compile(r'(\d+)\s*(?:号|编号|id)\s*(?:任务|task|需求|story)?', re.IGNORECASE),
+    )
+
+    # 需求ID：需求#123、需求123 或 需求 123、123号需求
+    STORY_ID_PATTERNS = (
+        re.compile(r'(?:需求|story)#(\d+)', re.IGNORECASE),
+        re.compile(r'(?:需求|story)\s*(\d+)', re.IGNORECASE),
+        re.compile(r'(\d+)\s*(?:号|编号|id)\s*(?:需求|story)', re.IGNORECASE),
+    )
+    STORY_ID_FALLBACK_PATTERN = re.compile(r'需求(\d+)')
+
+    # 用户名：@张三、给张三、指派给张三、指定张三
+    USERNAME_PATTERNS = (
+        re.compile(r'@(\w+)'),
+        re.compile(r'\b(?:给|指派|分配)\s*(?:给)?\s*(\w+)\b'),
+        re.compile(r'\b(?:指定|指定给)\s*(\w+)\b'),
+    )
+
+    # 子任务：拆成...、分解为...、拆分成...
+    SUBTASK_PATTERNS = (
+        re.compile(r'拆(?:成|分为|解成|解为)\s*(.+)'),
+        re.compile(r'分解为\s*(.+)'),
+        re.compile(r'拆分成\s*(.+)'),
+    )
+    SUBTASK_SEPARATOR_PATTERN = re.compile(r'[、,和与\s]+')
+
+    # 数量限制：前20个、top 20、最近20个
+    LIMIT_PATTERNS = (
+        re.compile(r'前\s*(\d+)\s*(?:个|条|项)?', re.IGNORECASE),
+        re.compile(r'top\s*(\d+)', re.IGNORECASE),
+        re.compile(r'(?:最近|最新)\s*(\d+)\s*(?:个|条|项)', re.IGNORECASE),
+    )
+
+    # 状态关键词（按顺序匹配，"已完成"优先于"完成"）
+    STATUS_MAP = {
+        '未开始': 'wait',
+        '待办': 'wait',
+        '进行中': 'doing',
+        '正在做': 'doing',
+        '已完成': 'done',
+        '完成': 'done',
+        '已关闭': 'closed',
+        '关闭': 'closed'
+    }
+
+    # 过滤未创建任务的需求：包含任一关键词即可，合并成一个正则扫描一遍
+    NO_TASK_PATTERN = re.compile('|'.join(
+        re.escape(keyword)
+        for keyword in ['未创建任务', '没有任务', '没建任务', '未建任务', '无任务', '未分配', '未分配任务']
+    ))
+
+    # 标题关键字的各种格式
+    QUOTED_KEYWORD_PATTERN = re.compile(r'包含["\']([^"\']+?)["\']')
+    CONTAIN_KEYWORD_PATTERN = re.compile(r'包含([^"\'\s]{2,20})(?:的?需求|的?标题|$|\s)')
+    KEYWORD_IS_PATTERN = re.compile(r'关键字是["\']?([^"\'\s]{2,}?)["\']?(?:的|需求|$|\s)')
+    ABOUT_KEYWORD_PATTERN = re.compile(r'关于["\']?([^"\'\s]{2,}?)["\']?的')
+    RELATED_KEYWORD_PATTERN = re.compile(r'([^\s"\']{2,20}?)相关')
+    TITLE_CONTAIN_PATTERN = re.compile(r'标题包含["\']?([^"\'\s]{2,}?)["\']?(?:的|需求|$|\s)')
+    KEYWORD_EXCLUDE_WORDS = ('未创建任务', '没有任务', '任务', '需求', '查询', '过滤')
+
+    # 任务ID、需求ID、数量限制都需要数字，不含数字的文本直接跳过这些格式
+    DIGIT_PATTERN = re.compile(r'\d')
+
     def __init__(self):
         self.logger = get_logger()
         self.config = get_config()
@@ -38,14 +107,11 @@ class EntityExtractor:
         Returns:
             任务ID字符串，如果未找到返回 None
         """
-        patterns = [
-            r'(?:任务|task|需求|story)?#(\d+)',  # #123 或 任务#123
-            r'(?:任务|task)\s*(\d+)',  # 任务123
-            r'(\d+)\s*(?:号|编号|id)\s*(?:任务|task|需求|story)?',  # 123号任务
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        if not self.DIGIT_PATTERN.search(text):
+            return None
+
+        for pattern in self.TASK_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 task_id = match.group(1)
                 if self.debug:
@@ -71,14 +137,11 @@ class EntityExtractor:
         Returns:
             需求ID字符串，如果未找到返回 None
         """
-        patterns = [
-            r'(?:需求|story)#(\d+)',  # 需求#123
-            r'(?:需求|story)\s*(\d+)',  # 需求123 或 需求 123
-            r'(\d+)\s*(?:号|编号|id)\s*(?:需求|story)',  # 123号需求
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        if not self.DIGIT_PATTERN.search(text):
+            return None
+
+        for pattern in self.STORY_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 story_id = match.group(1)
                 if self.debug:
@@ -86,8 +149,7 @@ class EntityExtractor:
                 return story_id
 
         # 检查是否包含"需求"和数字的组合（用于处理"需求11530，拆解任务"这种格式）
-        story_pattern = r'需求(\d+)'
-        match = re.search(story_pattern, text)
+        match = self.STORY_ID_FALLBACK_PATTERN.search(text)
         if match:
             story_id = match.group(1)
             if self.debug:
@@ -116,14 +178,8 @@ class EntityExtractor:
         if '未分配' in text:
             return None
         
-        patterns = [
-            r'@(\w+)',  # @张三
-            r'\b(?:给|指派|分配)\s*(?:给)?\s*(\w+)\b',  # 给张三、指派给张三
-            r'\b(?:指定|指定给)\s*(\w+)\b',  # 指定张三
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in self.USERNAME_PATTERNS:
+            match = pattern.search(text)
             if match:
                 username = match.group(1)
                 # 过滤常见的非用户名词汇
@@ -150,19 +206,13 @@ class EntityExtractor:
             子任务名称列表，如果未找到返回 None
         """
         # 尝试从"拆成/拆分为/分解为"等关键词后提取
-        patterns = [
-            r'拆(?:成|分为|解成|解为)\s*(.+)',  # 拆成...
-            r'分解为\s*(.+)',  # 分解为...
-            r'拆分成\s*(.+)',  # 拆分成...
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in self.SUBTASK_PATTERNS:
+            match = pattern.search(text)
             if match:
                 subtask_text = match.group(1)
 
                 # 按分隔符拆分：顿号、逗号、和、与
-                subtasks = re.split(r'[、,和与\s]+', subtask_text.strip())
+                subtasks = self.SUBTASK_SEPARATOR_PATTERN.split(subtask_text.strip())
                 subtasks = [s.strip() for s in subtasks if s.strip()]
 
                 if subtasks:
@@ -194,19 +244,8 @@ class EntityExtractor:
             if self.debug:
                 self.logger.debug(f"提取状态: {text} -> all")
             return 'all'
-        
-        status_map = {
-            '未开始': 'wait',
-            '待办': 'wait',
-            '进行中': 'doing',
-            '正在做': 'doing',
-            '已完成': 'done',
-            '完成': 'done',
-            '已关闭': 'closed',
-            '关闭': 'closed'
-        }
-
-        for cn_status, en_status in status_map.items():
+
+        for cn_status, en_status in self.STATUS_MAP.items():
             if cn_status in text:
                 if self.debug:
                     self.logger.debug(f"提取状态: {text} -> {en_status}")
@@ -214,6 +253,35 @@ class EntityExtractor:
 
         return None
 
+    def extract_limit(self, text: str) -> Optional[int]:
+        """
+        提取数量限制
+
+        支持格式：
+        - 前20个需求 / 前 20 条
+        - top 20 / top20
+        - 最近20个 / 最新20条
+
+        Args:
+            text: 用户输入的文本
+
+        Returns:
+            数量，如果未找到返回 None
+        """
+        if not self.DIGIT_PATTERN.search(text):
+            return None
+
+        for pattern in self.LIMIT_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                limit = int(match.group(1))
+                if limit > 0:
+                    if self.debug:
+                        self.logger.debug(f"提取数量限制: {text} -> {limit}")
+                    return limit
+
+        return None
+
     def extract_filter_no_task(self, text: str) -> bool:
         """
         提取是否过滤未创建任务的需求
@@ -232,12 +300,10 @@ class EntityExtractor:
         Returns:
             是否需要过滤未创建任务的需求
         """
-        keywords = ['未创建任务', '没有任务', '没建任务', '未建任务', '无任务', '未分配', '未分配任务']
-        for keyword in keywords:
-            if keyword in text:
-                if self.debug:
-                    self.logger.debug(f"提取过滤条件: {text} -> 未创建任务")
-                return True
+        if self.NO_TASK_PATTERN.search(text):
+            if self.debug:
+                self.logger.debug(f"提取过滤条件: {text} -> 未创建任务")
+            return True
         return False
 
     def extract_keywords(self, text: str) -> Optional[List[str]]:
@@ -261,8 +327,7 @@ class EntityExtractor:
         keywords = []
         
         # 1. 匹配 "包含'xxx'" 或 "包含\"xxx\"" 格式（带引号的关键字）
-        quoted_pattern = r'包含["\']([^"\']+?)["\']'
-        matches = re.findall(quoted_pattern, text)
+        matches = self.QUOTED_KEYWORD_PATTERN.findall(text)
         for match in matches:
             keyword = match.strip()
             if keyword and len(keyword) >= 2:
@@ -270,41 +335,35 @@ class EntityExtractor:
         
         # 2. 匹配 "包含xxx" 格式（不带引号，但xxx后面跟着"的需求"或结束）
         # 排除一些常见词
-        contain_pattern = r'包含([^"\'\s]{2,20})(?:的?需求|的?标题|$|\s)'
-        matches = re.findall(contain_pattern, text)
-        exclude_words = ['未创建任务', '没有任务', '任务', '需求', '查询', '过滤']
+        matches = self.CONTAIN_KEYWORD_PATTERN.findall(text)
         for match in matches:
             keyword = match.strip()
-            if keyword and keyword not in exclude_words:
+            if keyword and keyword not in self.KEYWORD_EXCLUDE_WORDS:
                 keywords.append(keyword)
         
         # 3. 匹配 "关键字是xxx" 格式
-        keyword_is_pattern = r'关键字是["\']?([^"\'\s]{2,}?)["\']?(?:的|需求|$|\s)'
-        match = re.search(keyword_is_pattern, text)
+        match = self.KEYWORD_IS_PATTERN.search(text)
         if match:
             keyword = match.group(1).strip()
             if keyword:
                 keywords.append(keyword)
         
         # 4. 匹配 "关于xxx的" 格式
-        about_pattern = r'关于["\']?([^"\'\s]{2,}?)["\']?的'
-        match = re.search(about_pattern, text)
+        match = self.ABOUT_KEYWORD_PATTERN.search(text)
         if match:
             keyword = match.group(1).strip()
             if keyword:
                 keywords.append(keyword)
         
         # 5. 匹配 "xxx相关" 格式（但排除常见词）
-        related_pattern = r'([^\s"\']{2,20}?)相关'
-        matches = re.findall(related_pattern, text)
+        matches = self.RELATED_KEYWORD_PATTERN.findall(text)
         for match in matches:
             keyword = match.strip()
-            if keyword and keyword not in exclude_words:
+            if keyword and keyword not in self.KEYWORD_EXCLUDE_WORDS:
                 keywords.append(keyword)
         
         # 6. 匹配 "标题包含xxx" 格式
-        title_contain_pattern = r'标题包含["\']?([^"\'\s]{2,}?)["\']?(?:的|需求|$|\s)'
-        match = re.search(title_contain_pattern, text)
+        match = self.TITLE_CONTAIN_PATTERN.search(text)
         if match:
             keyword = match.group(1).strip()
             if keyword:
@@ -342,5 +401,6 @@ class EntityExtractor:
             'username': self.extract_username(text),
             'status': self.extract_status(text),
             'filter_no_task': self.extract_filter_no_task(text),
-            'keywords': self.extract_keywords(text)
+            'keywords': self.extract_keywords(text),
+            'limit': self.extract_limit(text)
         }
\ No newline at end of file
@@ -5,8 +5,10 @@
 """
 
 import re
+import threading
 from typing import Dict, List, Optional
 
+from .keyword_matcher import KeywordMatcher
 from ..utils.logger import get_logger
 from ..utils.config_loader import get_config
 
@@ -45,6 +47,37 @@ class IntentClassifier:
         ]
     }
 
+    # 关键词权重（未列出的关键词权重为 1）
+    KEYWORD_WEIGHTS = {
+        '拆解': 2,
+        '分解': 2,
+        'split': 2,
+        '拆分': 2,
+        '拆成': 2,
+        '拆分为': 2,
+        '拆解成': 2,
+        '分解成': 2,
+        '分配': 2,
+        '指派': 2,
+        'assign': 2,
+        '给': 1,
+        '指派给': 2,
+        '分配给': 2,
+        # 未分配需求相关（高权重，优先于普通分配）
+        '未分配需求': 5,
+        '未分配的需求': 5,
+        '未指派需求': 5,
+        '没有任务的需求': 5,
+        '未创建任务的需求': 5
+    }
+
+    # 意图定义的版本，动态添加意图时递增（解析结果缓存据此失效）
+    revision = 0
+
+    # 所有意图的关键词编译成的匹配器（首次分类时创建，各实例共享）
+    _matcher: Optional[KeywordMatcher] = None
+    _matcher_lock = threading.Lock()
+
     def __init__(self):
         self.logger = get_logger()
         self.config = get_config()
@@ -101,48 +134,23 @@ class IntentClassifier:
         """
         使用关键词匹配分类
 
+        每个出现的关键词按权重计一次，被更长关键词包含的匹配不计分
+        （如"查看任务"中的"任务"、"指派给"中的"给"），分数最高的意图胜出
+
         Args:
             text: 用户输入的文本
 
         Returns:
             意图ID
         """
-        text_lower = text.lower()
+        scores = self._get_matcher().scores(text)
 
         best_intent = 'unknown'
         max_score = 0
 
-        # 关键词权重映射
-        keyword_weights = {
-            '拆解': 2,
-            '分解': 2,
-            'split': 2,
-            '拆分': 2,
-            '拆成': 2,
-            '拆分为': 2,
-            '拆解成': 2,
-            '分解成': 2,
-            '分配': 2,
-            '指派': 2,
-            'assign': 2,
-            '给': 1,
-            '指派给': 2,
-            '分配给': 2,
-            # 未分配需求相关（高权重，优先于普通分配）
-            '未分配需求': 5,
-            '未分配的需求': 5,
-            '未指派需求': 5,
-            '没有任务的需求': 5,
-            '未创建任务的需求': 5
-        }
-
-        for intent, keywords in self.INTENTS.items():
-            # 计算匹配分数（匹配的关键词数量，带权重）
-            score = 0
-            for kw in keywords:
-                if kw.lower() in text_lower:
-                    score += keyword_weights.get(kw, 1)
-
+        # 分数相同时按意图定义的顺序取前者
+        for intent in self.INTENTS:
+            score = scores.get(intent, 0)
             if score > max_score:
                 max_score = score
                 best_intent = intent
@@ -155,6 +163,24 @@ class IntentClassifier:
 
         return best_intent
 
+    @classmethod
+    def _get_matcher(cls) -> KeywordMatcher:
+        """获取关键词匹配器，首次调用时编译所有意图的关键词"""
+        if cls._matcher is None:
+            with cls._matcher_lock:
+                if cls._matcher is None:
+                    matcher = KeywordMatcher()
+                    for intent, keywords in cls.INTENTS.items():
+                        cls._add_keywords(matcher, intent, keywords)
+                    cls._matcher = matcher
+        return cls._matcher
+
+    @classmethod
+    def _add_keywords(cls, matcher: KeywordMatcher, intent: str, keywords: List[str]):
+        """把意图的关键词及权重加入匹配器"""
+        for kw in keywords:
+            matcher.add(kw, intent, cls.KEYWORD_WEIGHTS.get(kw, 1))
+
     def _classify_with_llm(self, text: str) -> str:
         """
         使用 LLM 分类（预留扩展）
@@ -195,4 +221,10 @@ class IntentClassifier:
             keywords: 关键词列表
         """
         self.INTENTS[intent_id] = keywords
+        IntentClassifier.revision += 1
+        # 匹配器已创建时只加入新关键词，未创建时首次分类会包含新意图
+        if self._matcher is not None:
+            matcher = self._get_matcher()
+            matcher.remove_label(intent_id)
+            self._add_keywords(matcher, intent_id, keywords)
         self.logger.info(f"添加新意图: {intent_id}")
\ No newline at end of file
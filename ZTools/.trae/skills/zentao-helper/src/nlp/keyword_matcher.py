@@ -0,0 +1,144 @@
+"""
+多关键词匹配器
+把所有意图的关键词编译成一个 Aho-Corasick 自动机，扫描一遍文本即可得到各意图的分数，
+不再对每个关键词分别做子串查找
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    带权重的多关键词匹配器（不区分大小写）
+
+    每个关键词可以属于多个标签（意图），并带有权重。
+    新增关键词只插入字典树的新节点，失败链接在下次匹配时重新计算
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 字典树：节点编号 -> {字符: 子节点编号}，0 为根节点
+        self._goto: List[Dict[str, int]] = [{}]
+        # 节点编号 -> 以该节点结尾的关键词
+        self._terminal: Dict[int, str] = {}
+        # 关键词 -> {标签: 权重}
+        self._weights: Dict[str, Dict[str, int]] = {}
+        # 编译结果：(转移表, 失败链接, 节点编号 -> 该节点可匹配的关键词)
+        # 转移表是字典树的副本，匹配时不受并发添加关键词的影响
+        self._compiled: Optional[Tuple[List[Dict[str, int]], List[int], List[Tuple[str, ...]]]] = None
+
+    def add(self, keyword: str, label: str, weight: int = 1):
+        """
+        添加关键词
+
+        Args:
+            keyword: 关键词
+            label: 所属标签（意图ID）
+            weight: 权重
+        """
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        with self._lock:
+            node = 0
+            for char in keyword:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._goto[node][char] = child
+                node = child
+            self._terminal[node] = keyword
+            self._weights.setdefault(keyword, {})[label] = weight
+            self._compiled = None
+
+    def remove_label(self, label: str):
+        """
+        移除标签下的所有关键词（字典树节点保留，只是不再计分）
+
+        Args:
+            label: 标签（意图ID）
+        """
+        with self._lock:
+            for labels in self._weights.values():
+                labels.pop(label, None)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        查找文本中出现的所有关键词（包括重叠的匹配）
+
+        Args:
+            text: 文本
+
+        Returns:
+            (起始位置, 结束位置, 关键词) 列表
+        """
+        goto, fail, outputs = self._compiled or self._compile()
+        matches = []
+        node = 0
+        for end, char in enumerate(text.lower(), 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in outputs[node]:
+                matches.append((end - len(keyword), end, keyword))
+        return matches
+
+    def scores(self, text: str, longest_match: bool = True) -> Dict[str, int]:
+        """
+        计算各标签的分数：每个出现的关键词按权重计一次
+
+        Args:
+            text: 文本
+            longest_match: 是否忽略被更长关键词包含的匹配（如"指派给"中的"给"）
+
+        Returns:
+            标签 -> 分数（只包含分数大于 0 的标签）
+        """
+        matches = self.find_all(text)
+        if longest_match:
+            matches = self._suppress_contained(matches)
+
+        result: Dict[str, int] = {}
+        for keyword in {keyword for _, _, keyword in matches}:
+            for label, weight in self._weights.get(keyword, {}).items():
+                result[label] = result.get(label, 0) + weight
+        return {label: score for label, score in result.items() if score > 0}
+
+    @staticmethod
+    def _suppress_contained(matches: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """去掉被其他更长匹配完全包含的匹配"""
+        kept = []
+        max_end = -1
+        # 按起始位置升序、结束位置降序排列，前面的匹配起始位置都不大于当前匹配
+        for start, end, keyword in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if end > max_end:
+                kept.append((start, end, keyword))
+                max_end = end
+        return kept
+
+    def _compile(self) -> Tuple[List[Dict[str, int]], List[int], List[Tuple[str, ...]]]:
+        """按广度优先计算失败链接和每个节点的输出"""
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+
+            goto = [dict(edges) for edges in self._goto]
+            fail = [0] * len(goto)
+            outputs: List[Tuple[str, ...]] = [()] * len(goto)
+            queue = deque(goto[0].values())
+            while queue:
+                node = queue.popleft()
+                own = (self._terminal[node],) if node in self._terminal else ()
+                outputs[node] = own + outputs[fail[node]]
+                for char, child in goto[node].items():
+                    state = fail[node]
+                    while state and char not in goto[state]:
+                        state = fail[state]
+                    fail[child] = goto[state].get(char, 0)
+                    queue.append(child)
+
+            self._compiled = (goto, fail, outputs)
+            return self._compiled
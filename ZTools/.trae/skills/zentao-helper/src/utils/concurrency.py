@@ -0,0 +1,250 @@
+"""
+并发工具模块
+为批量禅道请求提供有界并发执行、按序预取、限速和后台刷新的缓存
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from .logger import get_logger
+
+
+def bounded_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    on_result: Optional[Callable[[Any, Any], None]] = None
+) -> List[Any]:
+    """
+    有界并发执行，结果顺序与输入顺序一致
+
+    单个元素执行抛出异常时，对应位置的结果为 None，不影响其他元素
+
+    Args:
+        func: 对每个元素执行的函数
+        items: 输入元素
+        max_workers: 最大并发数（<=1 时退化为串行执行）
+        on_result: 每个元素完成时的回调 (item, result)，在调用线程中执行
+
+    Returns:
+        与输入顺序一致的结果列表
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+
+    if not items:
+        return results
+
+    if max_workers <= 1 or len(items) == 1:
+        for index, item in enumerate(items):
+            results[index] = _call_safely(func, item)
+            if on_result:
+                on_result(item, results[index])
+        return results
+
+    workers = min(max_workers, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_call_safely, func, item): index
+            for index, item in enumerate(items)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_result:
+                on_result(items[index], results[index])
+
+    return results
+
+
+def prefetch_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8
+) -> Iterator[Any]:
+    """
+    有界并发预取，按输入顺序逐个产出结果
+
+    最多同时执行 max_workers 个元素，调用方取走一个结果后才提交下一个；
+    调用方提前停止迭代时取消尚未开始的元素。单个元素抛出的异常在产出该元素时抛出
+
+    Args:
+        func: 对每个元素执行的函数
+        items: 输入元素
+        max_workers: 最大并发数（<=1 时退化为串行执行）
+
+    Yields:
+        与输入顺序一致的结果
+    """
+    items = iter(items)
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for item in islice(items, max_workers):
+            pending.append(executor.submit(func, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, 1):
+                pending.append(executor.submit(func, item))
+            yield result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _call_safely(func: Callable[[Any], Any], item: Any) -> Any:
+    """执行函数，异常时返回 None"""
+    try:
+        return func(item)
+    except Exception:
+        return None
+
+
+class RateLimiter:
+    """
+    速率限制器
+    按固定间隔放行请求，多个线程共享同一实例时总速率不超过 rate
+    """
+
+    def __init__(self, rate: Optional[float]):
+        """
+        Args:
+            rate: 每秒最多放行的请求数，为空或 <=0 表示不限制
+        """
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        """等待直到允许发送下一个请求"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class StaleWhileRevalidate:
+    """
+    过期后仍可用的缓存（stale-while-revalidate）
+
+    - 有效期内直接返回缓存
+    - 过期但未超过最长可用时间时返回旧数据，同时在后台线程刷新
+    - 没有数据或超过最长可用时间时同步加载
+
+    加载函数返回 ApiResponse，只缓存成功的结果；后台刷新失败时保留旧数据
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float = 300, max_stale: float = 86400,
+                 name: str = '缓存'):
+        """
+        Args:
+            loader: 加载函数，返回 ApiResponse
+            ttl: 有效期（秒）
+            max_stale: 最长可用时间（秒），超过后同步加载
+            name: 名称（用于日志）
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._result = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        # 每次失效递增，加载期间发生过失效的结果不写入缓存（如切换账号后丢弃旧账号的数据）
+        self._generation = 0
+
+    @property
+    def loaded_at(self) -> Optional[float]:
+        """数据加载时间，没有数据时返回 None"""
+        return self._loaded_at if self._result is not None else None
+
+    def seed(self, result: Any, loaded_at: float):
+        """
+        用已持久化的数据预热（如本地缓存中的数据）
+
+        Args:
+            result: 成功的 ApiResponse
+            loaded_at: 数据的加载时间戳
+        """
+        with self._lock:
+            if self._result is None or loaded_at > self._loaded_at:
+                self._result = result
+                self._loaded_at = loaded_at
+
+    def peek(self) -> Any:
+        """获取当前缓存的数据（不判断是否过期，不触发加载），没有数据时返回 None"""
+        with self._lock:
+            return self._result
+
+    def invalidate(self):
+        """丢弃缓存，下次获取时同步加载（正在进行的加载结果也不再写入）"""
+        with self._lock:
+            self._generation += 1
+            self._result = None
+            self._loaded_at = 0.0
+
+    def get(self) -> Any:
+        """
+        获取数据
+
+        Returns:
+            ApiResponse，同步加载失败时返回加载函数的失败结果
+        """
+        with self._lock:
+            result = self._result
+            age = time.time() - self._loaded_at
+            if result is not None and age < self.ttl:
+                return result
+            if result is not None and age < self.max_stale:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, daemon=True).start()
+                return result
+
+        # 同步加载，并发调用只加载一次
+        with self._load_lock:
+            with self._lock:
+                if self._result is not None and time.time() - self._loaded_at < self.ttl:
+                    return self._result
+            return self._load()
+
+    def _load(self) -> Any:
+        with self._lock:
+            generation = self._generation
+        result = self.loader()
+        if result.success:
+            with self._lock:
+                if generation == self._generation:
+                    self._result = result
+                    self._loaded_at = time.time()
+        return result
+
+    def _refresh(self):
+        """后台刷新"""
+        try:
+            with self._load_lock:
+                result = self._load()
+            if not result.success:
+                get_logger().warning(f"后台刷新{self.name}失败，继续使用旧数据")
+        except Exception as e:
+            get_logger().warning(f"后台刷新{self.name}异常，继续使用旧数据: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
@@ -0,0 +1,299 @@
+"""
+常驻进程模块
+在本机端口常驻一个已初始化的 Skill 实例，复用配置、HTTP 会话和缓存，
+skill_main 通过本模块把指令转发给常驻进程执行，省去每次启动的初始化开销
+
+通信协议：每个连接发送一行 JSON 请求，返回一行 JSON 响应
+    请求: {"token": "...", "op": "execute", "user_input": "...", "kwargs": {...}}
+    响应: {"ok": true, "result": {...}} 或 {"ok": false, "error": "..."}
+"""
+
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .logger import get_logger
+from .config_loader import get_config
+from .response import ApiResponse, ErrorCode
+
+
+SKILL_ROOT = Path(__file__).parent.parent.parent
+
+# 单个请求的最大字节数
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def _get_daemon_config() -> Dict[str, Any]:
+    """获取常驻进程配置"""
+    return get_config().get('daemon', {}) or {}
+
+
+def get_token_file() -> Path:
+    """
+    获取令牌文件路径
+
+    令牌文件由常驻进程启动时写入，记录监听地址和访问令牌，进程退出时删除
+
+    Returns:
+        令牌文件路径
+    """
+    return SKILL_ROOT / _get_daemon_config().get('token_file', '.daemon.token')
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """常驻进程请求处理器"""
+
+    # 读取请求的超时时间（秒），避免异常连接阻塞后续请求
+    timeout = 5
+
+    def handle(self):
+        try:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            request = json.loads(line.decode('utf-8'))
+        except (OSError, ValueError) as e:
+            self._reply({'ok': False, 'error': f"请求格式错误: {str(e)}"})
+            return
+
+        self._reply(self.server.skill_daemon.handle_request(request))
+
+    def _reply(self, response: Dict):
+        try:
+            data = json.dumps(response, ensure_ascii=False, default=str) + '\n'
+            self.wfile.write(data.encode('utf-8'))
+        except OSError:
+            pass
+
+
+class _DaemonServer(socketserver.TCPServer):
+    """
+    常驻进程 TCP 服务
+
+    请求逐个串行处理，Skill 实例不需要考虑多线程安全
+    """
+
+    allow_reuse_address = True
+
+
+class SkillDaemon:
+    """
+    Skill 常驻进程
+    只监听本机地址，通过令牌文件中的随机令牌校验请求来源
+    """
+
+    def __init__(
+        self,
+        execute: Callable[..., dict],
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        token_file: Optional[Path] = None
+    ):
+        """
+        初始化常驻进程
+
+        Args:
+            execute: 指令执行函数，签名同 ZenTaoHelperSkill.execute
+            host: 监听地址，默认读取 daemon.host
+            port: 监听端口，默认读取 daemon.port（0 表示随机端口）
+            token_file: 令牌文件路径，默认读取 daemon.token_file
+        """
+        self.logger = get_logger()
+        config = _get_daemon_config()
+
+        self.execute = execute
+        self.host = host or config.get('host', '127.0.0.1')
+        self.port = config.get('port', 47800) if port is None else port
+        self.token_file = Path(token_file) if token_file else get_token_file()
+        self.token = secrets.token_hex(16)
+
+        self.server = _DaemonServer((self.host, self.port), _DaemonRequestHandler)
+        self.server.skill_daemon = self
+
+    @property
+    def address(self) -> tuple:
+        """实际监听的地址 (host, port)"""
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        """启动服务，阻塞直到收到 shutdown 请求"""
+        self._write_token_file()
+        host, port = self.address
+        self.logger.info(f"常驻进程已启动: {host}:{port}")
+
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self._remove_token_file()
+            self.logger.info("常驻进程已退出")
+
+    def shutdown(self):
+        """停止服务（需在 serve_forever 之外的线程调用）"""
+        self.server.shutdown()
+
+    def handle_request(self, request: Dict) -> Dict:
+        """
+        处理单个请求
+
+        Args:
+            request: 请求字典
+
+        Returns:
+            响应字典
+        """
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "请求格式错误"}
+
+        token = str(request.get('token', ''))
+        if not hmac.compare_digest(token, self.token):
+            self.logger.warning("常驻进程收到令牌无效的请求，已拒绝")
+            return {'ok': False, 'error': "令牌无效"}
+
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'result': {'pid': os.getpid()}}
+
+        if op == 'shutdown':
+            # shutdown 会等待 serve_forever 退出，不能在处理请求的线程中直接调用
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True, 'result': {}}
+
+        if op == 'execute':
+            user_input = request.get('user_input', '')
+            kwargs = request.get('kwargs') or {}
+            try:
+                return {'ok': True, 'result': self.execute(user_input, **kwargs)}
+            except Exception as e:
+                self.logger.error(f"常驻进程执行指令异常: {str(e)}", exc_info=True)
+                return {'ok': False, 'error': str(e)}
+
+        return {'ok': False, 'error': f"未知操作: {op}"}
+
+    def _write_token_file(self):
+        """写入令牌文件（仅当前用户可读）"""
+        host, port = self.address
+        content = json.dumps({'host': host, 'port': port, 'token': self.token, 'pid': os.getpid()})
+
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.token_file), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def _remove_token_file(self):
+        """删除令牌文件"""
+        try:
+            self.token_file.unlink()
+        except OSError:
+            pass
+
+
+def send_request(
+    op: str,
+    token_file: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    **payload
+) -> Optional[Dict]:
+    """
+    向常驻进程发送请求
+
+    Args:
+        op: 操作类型 (ping, execute, shutdown)
+        token_file: 令牌文件路径，默认读取 daemon.token_file
+        timeout: 等待响应的超时时间（秒），默认读取 daemon.request_timeout
+        **payload: 其他请求字段
+
+    Returns:
+        响应字典；常驻进程未运行或连接失败（请求未送达）时返回 None。
+        请求发出后等待响应超时、连接中断或响应格式错误时返回
+        {"ok": false, "error": "...", "sent": true}，此时常驻进程可能已经执行了请求
+    """
+    config = _get_daemon_config()
+    token_file = Path(token_file) if token_file else get_token_file()
+
+    # 令牌文件不存在说明常驻进程未运行，直接返回，不尝试连接
+    try:
+        daemon_info = json.loads(token_file.read_text(encoding='utf-8'))
+        address = (daemon_info['host'], int(daemon_info['port']))
+        token = daemon_info['token']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    request = dict(payload, op=op, token=token)
+    connect_timeout = config.get('connect_timeout', 0.5)
+    if timeout is None:
+        timeout = config.get('request_timeout', 600)
+
+    try:
+        sock = socket.create_connection(address, timeout=connect_timeout)
+    except OSError as e:
+        get_logger().debug(f"连接常驻进程失败: {str(e)}")
+        return None
+
+    with sock:
+        try:
+            sock.settimeout(timeout)
+            data = json.dumps(request, ensure_ascii=False, default=str) + '\n'
+            sock.sendall(data.encode('utf-8'))
+        except OSError as e:
+            # 请求没有完整发出，常驻进程读不到完整的一行请求，不会执行
+            get_logger().debug(f"发送请求到常驻进程失败: {str(e)}")
+            return None
+
+        try:
+            with sock.makefile('rb') as f:
+                line = f.readline()
+            if not line:
+                raise ConnectionError("常驻进程关闭了连接")
+            return json.loads(line.decode('utf-8'))
+        except socket.timeout:
+            return {'ok': False, 'sent': True, 'timeout': True, 'error': f"等待常驻进程响应超时（{timeout} 秒）"}
+        except (OSError, ValueError) as e:
+            return {'ok': False, 'sent': True, 'error': f"常驻进程通信中断: {str(e)}"}
+
+
+def forward_execute(user_input: str, token_file: Optional[Path] = None, **kwargs) -> Optional[dict]:
+    """
+    把指令转发给常驻进程执行
+
+    只有请求未送达（常驻进程未运行、连接失败）时才返回 None 由调用方在本地执行；
+    请求送达后的任何失败都返回错误结果，避免拆解、分配等修改操作被执行两次
+
+    Args:
+        user_input: 用户输入的自然语言指令
+        token_file: 令牌文件路径，默认读取 daemon.token_file
+        **kwargs: 额外参数（非交互模式参数）
+
+    Returns:
+        执行结果字典，常驻进程不可用时返回 None（调用方应在本地执行）
+    """
+    response = send_request('execute', token_file=token_file, user_input=user_input, kwargs=kwargs)
+    if response is None:
+        return None
+    if response.get('ok'):
+        return response.get('result')
+
+    error = response.get('error')
+    get_logger().warning(f"常驻进程执行失败: {error}")
+    return ApiResponse.error_response(
+        ErrorCode.TIMEOUT if response.get('timeout') else ErrorCode.API_ERROR,
+        f"常驻进程未返回执行结果（{error}），指令可能已经执行，为避免重复执行不在本地重试，请确认后再操作"
+    ).to_dict()
+
+
+def stop_daemon(token_file: Optional[Path] = None) -> bool:
+    """
+    停止常驻进程
+
+    Args:
+        token_file: 令牌文件路径，默认读取 daemon.token_file
+
+    Returns:
+        是否已发送停止请求
+    """
+    response = send_request('shutdown', token_file=token_file, timeout=5)
+    return bool(response and response.get('ok'))
@@ -10,6 +10,7 @@ from typing import Optional, Dict, List
 
 from .logger import get_logger
 from .config_loader import get_config
+from ..zentao.executions import ExecutionIndex, normalize_name
 
 
 class InteractiveInput:
@@ -490,13 +491,41 @@ class InteractiveInput:
         }
         return time_map.get(rule, rule)
 
-    def select_execution(self, executions: List[Dict], default_project_name: str = None) -> Optional[int]:
+    def _match_execution(self, index: ExecutionIndex, name: str) -> Optional[Dict]:
+        """
+        按输入的项目名称匹配项目（前缀/部分/模糊匹配）
+
+        Args:
+            index: 项目名称索引
+            name: 输入的项目名称
+
+        Returns:
+            唯一匹配（或名称完全一致）的项目，没有或有多个匹配时打印提示并返回 None
+        """
+        candidates = index.search(name, limit=5)
+        if not candidates:
+            print(f"未找到匹配 '{name}' 的项目，请输入序号或项目名称")
+            return None
+
+        # 搜索结果按匹配程度排序，名称完全一致的项目排在最前
+        if len(candidates) == 1 or normalize_name(candidates[0].get('name', '')) == normalize_name(name):
+            return candidates[0]
+
+        print("匹配到多个项目，请输入序号或更完整的名称：")
+        for exec_data in candidates:
+            position = index.executions.index(exec_data) + 1
+            print(f"  {position}. {exec_data.get('name')} (ID: {exec_data.get('id')})")
+        return None
+
+    def select_execution(self, executions: List[Dict], default_project_name: str = None,
+                         index: Optional[ExecutionIndex] = None) -> Optional[int]:
         """
         选择执行/项目
 
         Args:
             executions: 执行/项目列表
             default_project_name: 默认项目名称（来自配置），支持部分匹配
+            index: executions 的名称索引（get_execution_index 的结果），不传时现场建立
 
         Returns:
             选中的执行ID，如果用户取消返回 None
@@ -521,14 +550,15 @@ class InteractiveInput:
                     print("无效的输入，请输入数字")
             return None
 
-        # 如果配置了默认项目名称，检查是否在列表中（支持部分匹配）
+        if index is None:
+            index = ExecutionIndex(executions)
+
+        # 如果配置了默认项目名称，检查是否在列表中（支持部分匹配：配置 "都江堰" 可以匹配 "都江堰项目"）
         if default_project_name:
-            for exec_data in executions:
-                exec_name = exec_data.get('name', '')
-                # 支持部分匹配：配置 "都江堰" 可以匹配 "都江堰项目"
-                if default_project_name.lower() in exec_name.lower():
-                    print(f"\n使用配置的默认项目: {exec_name} (ID: {exec_data.get('id')})")
-                    return exec_data.get('id')
+            exec_data = index.find(default_project_name)
+            if exec_data:
+                print(f"\n使用配置的默认项目: {exec_data.get('name', '')} (ID: {exec_data.get('id')})")
+                return exec_data.get('id')
             print(f"\n配置的默认项目名称 '{default_project_name}' 未找到匹配的项目")
 
         print("\n" + "=" * 60)
@@ -545,12 +575,19 @@ class InteractiveInput:
 
         while True:
             try:
-                choice = input("\n请选择 (输入序号，直接回车取消): ").strip()
+                choice = input("\n请选择 (输入序号或项目名称，直接回车取消): ").strip()
 
                 if not choice:
                     print("已取消项目选择")
                     return None
 
+                if not choice.isdigit():
+                    selected = self._match_execution(index, choice)
+                    if selected:
+                        print(f"\n已选择: {selected.get('name')} (ID: {selected.get('id')})")
+                        return selected.get('id')
+                    continue
+
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(executions):
                     selected = executions[choice_num - 1]
@@ -3,11 +3,16 @@
 使用 JSON 格式输出，便于日志分析和追踪
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
 import json
+import queue
 import sys
+import threading
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 
 # 添加项目根目录到 Python 路径
@@ -43,10 +48,151 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False)
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    有界队列日志处理器
+    调用线程只把日志记录放入队列，格式化和输出由 QueueListener 的后台线程完成；
+    队列满时按 overflow 丢弃日志，不阻塞调用线程
+    """
+
+    # 队列满时的处理方式
+    DROP_NEW = 'drop_new'
+    DROP_OLDEST = 'drop_oldest'
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = DROP_NEW):
+        """
+        Args:
+            log_queue: 有界队列
+            overflow: 队列满时丢弃新日志（drop_new）还是最早的日志（drop_oldest）
+        """
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        只合并消息参数，不在调用线程中格式化（父类会调用格式化器）
+
+        队列在进程内，异常信息等对象可以直接交给后台线程
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """放入队列，队列满时丢弃日志并计数，下次放入成功时补一条丢弃提示"""
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            self._put(self._dropped_record(record, dropped))
+        self._put(record)
+
+    def _put(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == self.DROP_OLDEST:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+                self._count_dropped()
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self._count_dropped()
+
+    def _count_dropped(self):
+        with self._dropped_lock:
+            self.dropped += 1
+
+    @staticmethod
+    def _dropped_record(record: logging.LogRecord, dropped: int) -> logging.LogRecord:
+        return logging.LogRecord(
+            record.name, logging.WARNING, __file__, 0,
+            f"日志队列已满，丢弃了 {dropped} 条日志", None, None
+        )
+
+
+class SizeTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    按时间和大小轮转的日志文件处理器
+
+    到达轮转时间或文件超过 max_bytes 时轮转；同一周期内多次按大小轮转的文件名追加序号
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, when: str = 'midnight',
+                 backup_count: int = 0, encoding: str = 'utf-8'):
+        """
+        Args:
+            filename: 日志文件路径
+            max_bytes: 单个文件的最大字节数，0 表示不按大小轮转
+            when: 轮转周期（同 TimedRotatingFileHandler，如 midnight、H）
+            backup_count: 保留的历史文件数
+            encoding: 文件编码
+        """
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.max_bytes
+
+    def rotation_filename(self, default_name: str) -> str:
+        # 同一周期内的文件已存在时追加序号，避免覆盖
+        name = super().rotation_filename(default_name)
+        index = 1
+        candidate = name
+        while Path(candidate).exists():
+            candidate = f"{name}.{index}"
+            index += 1
+        return candidate
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """后台输出线程，停止时等待队列腾出位置放入结束标记（队列满时父类会抛出 queue.Full）"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# 各日志器的后台输出线程（按日志器名称），重新创建日志器时停止旧线程
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _stop_listeners():
+    """停止所有后台输出线程（输出队列中剩余的日志）"""
+    for listener in list(_listeners.values()):
+        listener.stop()
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
 class Logger:
     """日志管理器，符合 AGENTS 要求的结构化日志"""
 
-    def __init__(self, name: str = "ZenTaoHelper", level: str = "INFO", format_type: str = "json"):
+    def __init__(self, name: str = "ZenTaoHelper", level: str = "INFO", format_type: str = "json",
+                 queue_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: 日志器名称
+            level: 日志级别
+            format_type: 终端日志格式（json、text）
+            queue_config: 异步日志配置（logging.queue），启用时日志经有界队列由后台线程输出，
+                并可同时写入按时间和大小轮转的 JSONL 文件
+        """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
@@ -56,6 +202,9 @@ class Logger:
         # 清除现有处理器，避免重复
         if self.logger.handlers:
             self.logger.handlers.clear()
+        listener = _listeners.pop(name, None)
+        if listener is not None:
+            listener.stop()
 
         # 控制台处理器
         handler = logging.StreamHandler(sys.stdout)
@@ -70,14 +219,62 @@ class Logger:
             )
 
         handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        queue_config = queue_config or {}
+        if queue_config.get('enabled', False):
+            self.logger.addHandler(self._start_queue(name, [handler] + self._file_handlers(queue_config),
+                                                     queue_config))
+        else:
+            self.logger.addHandler(handler)
         self.logger.propagate = False  # 防止日志重复输出
 
+    @staticmethod
+    def _file_handlers(queue_config: Dict[str, Any]) -> list:
+        """按配置创建 JSONL 文件处理器（未配置文件时为空）"""
+        path = queue_config.get('file')
+        if not path:
+            return []
+        handler = SizeTimedRotatingFileHandler(
+            str(Path(__file__).parent.parent.parent / path),
+            max_bytes=queue_config.get('max_bytes', 10 * 1024 * 1024),
+            when=queue_config.get('when', 'midnight'),
+            backup_count=queue_config.get('backup_count', 7)
+        )
+        handler.setFormatter(JsonFormatter())
+        return [handler]
+
+    @staticmethod
+    def _start_queue(name: str, handlers: list, queue_config: Dict[str, Any]) -> BoundedQueueHandler:
+        """启动后台输出线程，返回放入队列的处理器"""
+        log_queue = queue.Queue(maxsize=queue_config.get('max_size', 10000))
+        listener = _QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        return BoundedQueueHandler(log_queue, queue_config.get('overflow', BoundedQueueHandler.DROP_NEW))
+
+    def is_enabled_for(self, level: str) -> bool:
+        """
+        是否输出指定级别的日志
+
+        构造开销较大的日志内容（如 json.dumps 响应）前先判断，级别不够时跳过构造
+
+        Args:
+            level: 日志级别（debug、info 等）
+
+        Returns:
+            是否输出
+        """
+        return self.logger.isEnabledFor(getattr(logging, level.upper()))
+
     def _log(self, level: str, message: str, extra: Dict[str, Any] = None, trace_id: str = None):
         """通用日志方法"""
+        levelno = getattr(logging, level.upper())
+        # 级别不够时不创建日志记录
+        if not self.logger.isEnabledFor(levelno):
+            return
+
         record = self.logger.makeRecord(
             self.logger.name,
-            getattr(logging, level.upper()),
+            levelno,
             fn=None,
             lno=0,
             msg=message,
@@ -116,16 +313,48 @@ class Logger:
         self._log("critical", message, extra, trace_id)
 
 
+# 已创建的日志实例，键为 get_logger 的参数 (name, level, format_type)
+_loggers: Dict[Tuple[str, Optional[str], Optional[str]], Logger] = {}
+_loggers_lock = threading.Lock()
+
+
 def get_logger(name: str = "ZenTaoHelper", level: str = None, format_type: str = None) -> Logger:
-    """获取日志实例"""
-    # 从配置读取默认值
-    if level is None or format_type is None:
-        from .config_loader import get_config
-        config = get_config()
-        log_config = config.get_logging_config()
-        if level is None:
-            level = log_config.get('level', 'INFO')
-        if format_type is None:
-            format_type = log_config.get('format', 'json')
-
-    return Logger(name, level, format_type)
\ No newline at end of file
+    """
+    获取日志实例
+
+    相同参数的日志实例在进程内只创建一次，之后直接返回，不重复读取配置和重建处理器
+
+    Args:
+        name: 日志器名称
+        level: 日志级别，为空时读取 logging.level
+        format_type: 日志格式（json、text），为空时读取 logging.format
+        （异步日志按 logging.queue 配置）
+
+    Returns:
+        日志实例
+    """
+    key = (name, level, format_type)
+    logger = _loggers.get(key)
+    if logger is not None:
+        return logger
+
+    with _loggers_lock:
+        logger = _loggers.get(key)
+        if logger is None:
+            # 从配置读取默认值
+            from .config_loader import get_config
+            log_config = get_config().get_logging_config()
+            logger = Logger(
+                name,
+                level or log_config.get('level', 'INFO'),
+                format_type or log_config.get('format', 'json'),
+                log_config.get('queue')
+            )
+            _loggers[key] = logger
+    return logger
+
+
+def reset_loggers():
+    """清空已创建的日志实例（日志配置变化后调用，下次 get_logger 时按新配置创建）"""
+    with _loggers_lock:
+        _loggers.clear()
\ No newline at end of file
@@ -13,6 +13,8 @@ from typing import Optional, Dict, Any
 class ProgressBar:
     """
     简单进度条实现
+
+    update/set_postfix 为线程安全操作，可在并发回调中调用
     
     使用示例:
         with ProgressBar(total=100, desc="处理中") as pbar:
@@ -43,6 +45,7 @@ class ProgressBar:
         self.start_time = None
         self.postfix: Dict[str, Any] = {}
         self._closed = False
+        self._lock = threading.RLock()
         
     def __enter__(self):
         """上下文管理器入口"""
@@ -55,8 +58,9 @@ class ProgressBar:
         
     def start(self):
         """开始进度条"""
-        self.start_time = time.time()
-        self._print_progress()
+        with self._lock:
+            self.start_time = time.time()
+            self._print_progress()
         
     def update(self, n: int = 1):
         """
@@ -65,8 +69,9 @@ class ProgressBar:
         Args:
             n: 增加的进度值
         """
-        self.current += n
-        self._print_progress()
+        with self._lock:
+            self.current += n
+            self._print_progress()
         
     def set_postfix(self, **kwargs):
         """
@@ -75,15 +80,17 @@ class ProgressBar:
         Args:
             **kwargs: 键值对形式的后缀信息
         """
-        self.postfix.update(kwargs)
-        self._print_progress()
+        with self._lock:
+            self.postfix.update(kwargs)
+            self._print_progress()
         
     def close(self):
         """关闭进度条"""
-        if not self._closed:
-            self._closed = True
-            self.file.write("\n")
-            self.file.flush()
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self.file.write("\n")
+                self.file.flush()
             
     def _print_progress(self):
         """打印进度条"""
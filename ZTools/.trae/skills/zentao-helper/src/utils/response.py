@@ -79,6 +79,7 @@ class ErrorCode:
     PERMISSION_DENIED = "PERMISSION_DENIED"
     TIMEOUT = "TIMEOUT"
     USER_CANCELLED = "USER_CANCELLED"
+    INTERACTION_REQUIRED = "INTERACTION_REQUIRED"
 
 
 # 常用错误消息
@@ -97,3 +98,4 @@ class ErrorMessage:
     PERMISSION_DENIED = "没有权限执行此操作"
     TIMEOUT = "请求超时"
     USER_CANCELLED = "用户已取消操作"
+    INTERACTION_REQUIRED = "该操作需要在终端中交互输入"
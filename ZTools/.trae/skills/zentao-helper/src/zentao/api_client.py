@@ -5,17 +5,32 @@
 
 import requests
 import time
-import re
 import html
+import heapq
+import itertools
 import json
-from typing import Dict, List, Optional
+import copy
+import threading
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Dict, Iterator, List, Optional
 from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
 
 from ..utils.logger import get_logger
 from ..utils.config_loader import get_config
 from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
+from ..utils.concurrency import StaleWhileRevalidate, bounded_map, prefetch_map
 from .models import Task, Story, User, TaskListResult, StoryListResult
+from .circuit_breaker import CircuitBreakerRegistry
+from .transport import ZentaoHTTPAdapter
+from .metrics import RequestMetrics
+from .response_cache import ResponseCache, SKILL_ROOT
+from .users import UserDirectory
+from .story_filter import StoryFilter, with_status
+from .story_query import SOURCE_PRODUCT_BROWSE, StoryQueryPlan, plan_story_query
+from .story_tasks import StoryTaskIndex
+from .executions import ExecutionIndex
+from . import parsers
 
 
 class ZentaoApiClient:
@@ -25,38 +40,279 @@ class ZentaoApiClient:
     支持禅道 8.x 版本的 API 格式
     """
 
-    def __init__(self):
+    # ajaxGetUserTasks 查询任务使用的账号
+    DEFAULT_TASK_ACCOUNT = 'zhuxu'
+    # 需求列表每页条数（禅道上限 200）
+    STORY_PAGE_LIMIT = 200
+    # 项目任务列表每页条数
+    TASK_PAGE_LIMIT = 200
+    # 需要重试的响应状态码
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(self, local_store=None):
+        """
+        Args:
+            local_store: 本地缓存（LocalStore），用于持久化项目和用户列表，可选
+        """
         self.logger = get_logger()
         self.config = get_config()
         self.base_url = self.config.get_zentao_config().get('base_url', '').rstrip('/')
         self.timeout = self.config.get_zentao_config().get('timeout', 30)
         self.retry_times = self.config.get_zentao_config().get('retry_times', 3)
         self.retry_backoff = self.config.get_zentao_config().get('retry_backoff', 1)
-
+        concurrency_config = self.config.get_zentao_config().get('concurrency', {}) or {}
+        self.max_workers = concurrency_config.get('max_workers', 8)
+        self.story_check_workers = concurrency_config.get('story_check_workers', self.max_workers)
+        self.batch_request_timeout = concurrency_config.get('request_timeout') or self.timeout
+        # 需求列表的并发页数和需求数上限（每个需求在内存中约占 1KB）
+        story_query_config = self.config.get_zentao_config().get('story_query', {}) or {}
+        self.story_page_workers = story_query_config.get('page_workers', 4)
+        self.story_max_stories = story_query_config.get('max_stories', 10000)
+        # 是否把产品过滤下推到按产品浏览的接口
+        self.story_pushdown = story_query_config.get('pushdown', False)
+
+        # 服务器端会话验证结果的有效期（秒），期间内不重复验证
+        self.session_check_interval = self.config.get_session_config().get('check_interval', 300)
+        self._session_verified_at: Optional[float] = None
+        self._session_lock = threading.Lock()
+        # 会话验证状态失效时的回调（例如清除持久化的验证时间）
+        self.on_session_invalidated: Optional[Callable[[], None]] = None
+
+        # 熔断器按接口族统计，客户端内所有会话共享
+        breaker_config = self.config.get_zentao_config().get('circuit_breaker', {}) or {}
+        self.circuit_breakers: Optional[CircuitBreakerRegistry] = None
+        if breaker_config.get('enabled', True):
+            self.circuit_breakers = CircuitBreakerRegistry(
+                failure_threshold=breaker_config.get('failure_threshold', 5),
+                recovery_timeout=breaker_config.get('recovery_timeout', 30)
+            )
+        # 请求指标按接口族统计耗时、字节数和重试次数
+        metrics_config = self.config.get_zentao_config().get('metrics', {}) or {}
+        self.metrics = RequestMetrics(enabled=metrics_config.get('enabled', True))
+        self.response_cache = self._create_response_cache()
+        self._adapter: Optional[ZentaoHTTPAdapter] = None
+
+        self.local_store = local_store
+        # 当前登录账号（登录或恢复会话时绑定）
+        self.account: Optional[str] = None
         self.session = self._create_session()
-        self._users_cache: Dict[str, User] = {}
+        # 用户目录缓存（过期后后台刷新）
+        users_config = self.config.get_zentao_config().get('users_cache', {}) or {}
+        self._users_directory = StaleWhileRevalidate(
+            self._fetch_users,
+            ttl=users_config.get('ttl', 3600),
+            max_stale=users_config.get('max_stale', 604800),
+            name='用户列表'
+        )
+        # 产品列表缓存（需求查询按产品名称解析产品ID）
+        products_config = self.config.get_zentao_config().get('products_cache', {}) or {}
+        self._products_cache = StaleWhileRevalidate(
+            self._fetch_products,
+            ttl=products_config.get('ttl', 3600),
+            max_stale=products_config.get('max_stale', 604800),
+            name='产品列表'
+        )
+        # 需求与任务的关联索引（查询未创建任务的需求时使用，过期后后台刷新）
+        story_tasks_config = self.config.get_zentao_config().get('story_tasks', {}) or {}
+        self.story_task_index_enabled = story_tasks_config.get('enabled', False)
+        self.story_task_verify_missing = story_tasks_config.get('verify_missing', True)
+        self._story_task_index = StaleWhileRevalidate(
+            self._fetch_story_task_index,
+            ttl=story_tasks_config.get('ttl', 300),
+            max_stale=story_tasks_config.get('max_stale', 1800),
+            name='需求任务关联索引'
+        )
+        # 项目列表缓存（过期后后台刷新）
+        executions_config = self.config.get_zentao_config().get('executions_cache', {}) or {}
+        self._executions_cache = StaleWhileRevalidate(
+            self._fetch_executions,
+            ttl=executions_config.get('ttl', 300),
+            max_stale=executions_config.get('max_stale', 86400),
+            name='项目列表'
+        )
+        # 项目名称索引，与建立它的项目列表缓存条目一起保存：(条目, 索引)
+        self._execution_index: Optional[tuple] = None
+        self._execution_index_lock = threading.Lock()
+        # 请求作用域内的需求快照缓存（None 表示未开启作用域）
+        self._story_cache: Optional[Dict[int, Dict]] = None
 
     def _create_session(self) -> requests.Session:
         """
-        创建带重试机制的 HTTP 会话
+        创建带重试和熔断机制的 HTTP 会话
         实现指数退避重试策略（AGENTS 要求）
         """
         session = requests.Session()
+        self._mount_adapter(session)
+        session.hooks['response'].append(self._check_login_response)
+
+        return session
+
+    def _create_response_cache(self) -> Optional[ResponseCache]:
+        """
+        按配置创建只读接口的响应缓存
 
-        # 配置重试策略
-        retry_strategy = Retry(
-            total=self.retry_times,
-            backoff_factor=self.retry_backoff,
-            status_forcelist=[429, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE"],
-            raise_on_status=False
+        Returns:
+            ResponseCache 实例，未启用时返回 None
+        """
+        cache_config = self.config.get_zentao_config().get('response_cache', {}) or {}
+        if not cache_config.get('enabled', False):
+            return None
+
+        path = cache_config.get('path')
+        return ResponseCache(
+            ttls=cache_config.get('ttl', {}) or {},
+            db_path=str(SKILL_ROOT / path) if path else None,
+            max_entries=cache_config.get('max_entries', 2000),
+            max_age=cache_config.get('max_age', 86400)
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+    def bind_account(self, account: Optional[str]):
+        """
+        绑定当前登录账号（响应缓存按账号隔离，未绑定时不缓存；切换账号时清空项目列表缓存）
 
-        return session
+        Args:
+            account: 禅道账号
+        """
+        account = account or None
+        if account != self.account:
+            # 项目列表按账号区分（my-project），切换账号后重新获取
+            self._executions_cache.invalidate()
+        self.account = account
+        if self.response_cache is not None:
+            self.response_cache.account = account
+
+    def _mount_adapter(self, session: requests.Session):
+        """
+        为会话挂载连接适配器（所有会话共享同一个适配器，熔断状态不会因重新登录丢失）
+
+        Args:
+            session: HTTP 会话
+        """
+        if self._adapter is None:
+            # 配置重试策略
+            retry_strategy = Retry(
+                total=self.retry_times,
+                backoff_factor=self.retry_backoff,
+                status_forcelist=list(self.RETRY_STATUSES),
+                allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE"],
+                raise_on_status=False
+            )
+
+            # 连接池大小不小于并发数，避免并发请求时连接被丢弃
+            pool_size = max(10, self.max_workers)
+            self._adapter = ZentaoHTTPAdapter(
+                circuit_breakers=self.circuit_breakers,
+                metrics=self.metrics,
+                response_cache=self.response_cache,
+                max_retries=retry_strategy,
+                pool_connections=pool_size,
+                pool_maxsize=pool_size
+            )
+
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+
+    def _check_login_response(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """
+        响应钩子：检测登录跳转、401 或 JSON 接口返回的登录跳转脚本，使会话验证状态失效
+
+        Args:
+            response: HTTP 响应
+            **kwargs: 请求参数（流式响应不读取响应体）
+
+        Returns:
+            原响应
+        """
+        location = response.headers.get('Location', '') if response.is_redirect else ''
+        if response.status_code == 401 or 'user-login' in response.url or 'user-login' in location:
+            self.invalidate_session_verification()
+        elif (response.status_code == 200 and not kwargs.get('stream')
+              and parsers.is_login_script_page(
+                  response.url, response.headers.get('Content-Type'), response.content
+              )):
+            self.logger.info(f"接口返回登录跳转页面，会话已失效: {response.url}")
+            self.invalidate_session_verification()
+        return response
+
+    @property
+    def session_verified_at(self) -> Optional[float]:
+        """服务器端会话最近一次验证通过的时间戳"""
+        return self._session_verified_at
+
+    def mark_session_verified(self, verified_at: Optional[float] = None):
+        """
+        记录服务器端会话验证通过
+
+        Args:
+            verified_at: 验证通过的时间戳，默认当前时间（已有更新的记录时忽略）
+        """
+        verified_at = verified_at or time.time()
+        with self._session_lock:
+            if self._session_verified_at is None or verified_at > self._session_verified_at:
+                self._session_verified_at = verified_at
+
+    def invalidate_session_verification(self):
+        """使会话验证状态失效，下次 verify_session 会重新请求服务器（同时清除当前账号的响应缓存）"""
+        with self._session_lock:
+            was_verified = self._session_verified_at is not None
+            self._session_verified_at = None
+        self._clear_response_cache()
+
+        if was_verified:
+            self.logger.info("检测到登录跳转，会话验证状态已失效")
+            if self.on_session_invalidated:
+                try:
+                    self.on_session_invalidated()
+                except Exception as e:
+                    self.logger.warning(f"会话失效回调执行失败: {str(e)}")
+
+    def _clear_response_cache(self):
+        """清除当前账号的响应缓存（会话变化前缓存的可能是失效会话返回的页面）"""
+        if self.response_cache is not None:
+            self.response_cache.invalidate()
+
+    @contextmanager
+    def story_cache_scope(self):
+        """
+        开启请求作用域的需求快照缓存
+
+        作用域内多次调用 get_story 只请求一次 story-view，
+        story-change/story-review 等会修改需求的操作会使对应快照失效。
+        支持嵌套，由最外层作用域负责清理。
+        """
+        is_outermost = self._story_cache is None
+        if is_outermost:
+            self._story_cache = {}
+        try:
+            yield
+        finally:
+            if is_outermost:
+                self._story_cache = None
+
+    def invalidate_story_cache(self, story_id: int):
+        """
+        使指定需求的快照失效
+
+        Args:
+            story_id: 需求ID
+        """
+        if self._story_cache is not None:
+            self._story_cache.pop(int(story_id), None)
+
+    def _save_to_local_store(self, method: str, data: List[Dict]):
+        """
+        写入本地缓存（未启用本地缓存时忽略，写入失败不影响主流程）
+
+        Args:
+            method: LocalStore 的保存方法名
+            data: 要保存的数据
+        """
+        if not self.local_store:
+            return
+        try:
+            getattr(self.local_store, method)(data)
+        except Exception as e:
+            self.logger.warning(f"写入本地缓存失败: {str(e)}")
 
     def set_cookies(self, cookies: Dict[str, str]):
         """设置会话 cookies"""
@@ -66,15 +322,57 @@ class ZentaoApiClient:
         """获取当前会话 cookies"""
         return dict(self.session.cookies)
 
+    @property
+    def _users_cache(self) -> Dict[str, User]:
+        """当前缓存的用户ID到用户对象的映射（未加载时为空）"""
+        result = self._users_directory.peek()
+        return result.data.users if result is not None else {}
+
+    @_users_cache.setter
+    def _users_cache(self, users: Dict[str, User]):
+        """直接设置用户列表（替换用户目录）"""
+        if users:
+            self._users_directory.seed(ApiResponse.success_response(UserDirectory(users)), time.time())
+        else:
+            self._users_directory.invalidate()
+
+    def get_user_directory(self) -> ApiResponse:
+        """
+        获取用户目录（带缓存）
+
+        缓存有效期内直接返回；过期后先返回旧目录并在后台刷新，超过最长可用时间才同步请求。
+        首次获取时用本地缓存的用户列表预热
+
+        Returns:
+            用户目录（UserDirectory）
+        """
+        if self._users_directory.loaded_at is None and self.local_store:
+            try:
+                users, fetched_at = self.local_store.load_users()
+                if users and fetched_at:
+                    self._users_directory.seed(
+                        ApiResponse.success_response(UserDirectory.from_api(users)), fetched_at
+                    )
+            except Exception as e:
+                self.logger.warning(f"读取本地缓存的用户列表失败: {str(e)}")
+        return self._users_directory.get()
+
     def _get_users(self) -> Dict[str, User]:
         """
         获取用户列表（带缓存）
         Returns:
             用户ID到用户对象的映射
         """
-        if self._users_cache:
-            return self._users_cache
+        result = self.get_user_directory()
+        return result.data.users if result.success else {}
 
+    def _fetch_users(self) -> ApiResponse:
+        """
+        请求用户列表
+
+        Returns:
+            用户目录（UserDirectory）
+        """
         try:
             # 禅道 8.x 使用不同的 API 路径
             url = f"{self.base_url}/user-ajaxGetUser.json"
@@ -84,19 +382,46 @@ class ZentaoApiClient:
                 try:
                     data = response.json()
                     if data.get('status') == 'success' and 'users' in data:
-                        users = {}
-                        for user_data in data['users']:
-                            user = User.from_api(user_data)
-                            users[str(user.id)] = user
-                        self._users_cache = users
-                        return users
+                        self._save_to_local_store('save_users', data['users'])
+                        return ApiResponse.success_response(UserDirectory.from_api(data['users']))
                 except:
                     pass
 
         except Exception as e:
             self.logger.error(f"获取用户列表失败: {str(e)}")
 
-        return {}
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            "获取用户列表失败"
+        )
+
+    def search_user(self, keyword: str) -> ApiResponse:
+        """
+        按账号、姓名或姓名拼音首字母搜索用户（使用缓存的用户目录，不重复请求）
+
+        账号或姓名完全匹配时只返回完全匹配的用户，其次是拼音首字母完全匹配的用户（"zs" -> 张三），
+        否则返回账号、姓名或拼音首字母以关键字开头，以及账号或姓名包含关键字的用户
+
+        Args:
+            keyword: 账号、姓名或拼音首字母
+
+        Returns:
+            匹配的用户列表
+        """
+        result = self.get_user_directory()
+        if not result.success or not len(result.data):
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                "获取用户列表失败"
+            )
+
+        directory = result.data
+        matches = directory.resolve(keyword) or directory.search(keyword)
+
+        return ApiResponse.success_response([
+            {'id': user.id, 'account': user.account, 'realname': user.realname}
+            for user in matches
+        ])
 
     def login(self, username: str, password: str) -> ApiResponse:
         """
@@ -122,7 +447,7 @@ class ZentaoApiClient:
             self.logger.info(f"正在请求登录接口: {login_url}")
             
             # 创建一个新的 session，避免之前的 cookie 干扰
-            self.session = requests.Session()
+            self.session = self._create_session()
             self.session.headers.update({
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'application/json, text/javascript, */*; q=0.01',
@@ -145,6 +470,8 @@ class ZentaoApiClient:
                     
                     if result.get('status') == 'success' or result.get('result') == 'success':
                         # 登录成功
+                        self.bind_account(username)
+                        self._clear_response_cache()
                         user_info = self._get_current_user_v8()
                         if user_info:
                             return ApiResponse.success_response({
@@ -173,6 +500,8 @@ class ZentaoApiClient:
                     # 尝试获取当前用户信息来验证登录
                     user_info = self._get_current_user_v8()
                     if user_info:
+                        self.bind_account(username)
+                        self._clear_response_cache()
                         return ApiResponse.success_response({
                             'token': None,
                             'cookies': dict(self.session.cookies),
@@ -209,15 +538,25 @@ class ZentaoApiClient:
                 f"{ErrorMessage.API_ERROR}: {str(e)}"
             )
 
-    def verify_session(self) -> bool:
+    def verify_session(self, force: bool = False) -> bool:
         """
         验证服务器端会话是否有效
         
-        通过访问一个需要登录的 API 来验证会话是否有效
+        通过访问一个需要登录的 API 来验证会话是否有效。
+        距上次验证通过不超过 session.check_interval 秒时直接返回有效，
+        期间任何请求遇到登录跳转或 401 都会使验证状态失效
         
+        Args:
+            force: 是否忽略验证有效期，强制请求服务器
+
         Returns:
             会话是否有效
         """
+        verified_at = self._session_verified_at
+        if not force and verified_at is not None and time.time() - verified_at < self.session_check_interval:
+            self.logger.debug("会话在有效期内已验证，跳过服务器端验证")
+            return True
+
         try:
             # 访问我的需求页面来验证会话
             url = f"{self.base_url}/my-story-assignedTo-id_desc-9999-1-1.json"
@@ -234,6 +573,7 @@ class ZentaoApiClient:
                     # 如果返回成功状态，说明会话有效
                     if result.get('status') == 'success':
                         self.logger.debug("会话验证成功")
+                        self.mark_session_verified()
                         return True
                     else:
                         # 检查返回的数据是否包含登录页面的内容
@@ -283,20 +623,21 @@ class ZentaoApiClient:
 
         return None
 
-    def get_my_tasks(self, status: Optional[str] = None) -> ApiResponse:
+    def get_my_tasks(self, status: Optional[str] = None, with_detail: bool = True) -> ApiResponse:
         """
         获取指派给我的任务 (适配 8.x 版本)
         使用 ajaxGetUserTasks API，返回 HTML select 元素
 
         Args:
             status: 任务状态过滤 (all, wait, doing, done, closed)
+            with_detail: 是否获取每个任务的详细信息
 
         Returns:
             任务列表
         """
         try:
             # 从会话中获取用户名
-            account = 'zhuxu'  # 默认用户名
+            account = self.DEFAULT_TASK_ACCOUNT  # 默认用户名
             
             # 尝试从 session cookies 或配置中获取实际用户名
             # 禅道 8.x 通常使用登录时的用户名
@@ -312,14 +653,11 @@ class ZentaoApiClient:
                 # 8.x 版本返回 HTML select 元素，需要解析
                 # 使用正确的编码
                 response.encoding = 'utf-8'
-                tasks = self._parse_task_select_html(response.text)
+                tasks = parsers.parse_task_select_html(response.text)
                 
-                # 获取每个任务的详细信息
-                self.logger.info(f"开始获取 {len(tasks)} 个任务的详细信息")
-                for task in tasks:
-                    task_detail = self._get_task_detail(task['id'])
-                    if task_detail:
-                        task.update(task_detail)
+                # 并发获取每个任务的详细信息
+                if with_detail:
+                    self._enrich_tasks_with_detail(tasks)
                 
                 self.logger.info(f"成功获取 {len(tasks)} 个任务")
                 
@@ -348,6 +686,40 @@ class ZentaoApiClient:
                 f"{ErrorMessage.API_ERROR}: {str(e)}"
             )
 
+    def _enrich_tasks_with_detail(self, tasks: List[Dict]) -> None:
+        """
+        并发获取任务详情并合并到任务列表中
+
+        并发数由 zentao.concurrency.max_workers 配置，任务顺序保持不变，
+        单个任务获取失败时保留列表中的基础信息
+
+        Args:
+            tasks: 从任务选择框解析出的任务列表（原地更新）
+        """
+        if not tasks:
+            return
+
+        details = self.get_task_details([task['id'] for task in tasks])
+
+        for task in tasks:
+            task_detail = details.get(task['id'])
+            if task_detail:
+                task.update(task_detail)
+
+    def get_task_details(self, task_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """
+        并发获取多个任务的详细信息
+
+        Args:
+            task_ids: 任务ID列表
+
+        Returns:
+            任务ID到详情的映射，获取失败的任务对应 None
+        """
+        self.logger.info(f"开始获取 {len(task_ids)} 个任务的详细信息 (并发数: {self.max_workers})")
+        details = bounded_map(self._get_task_detail, task_ids, max_workers=self.max_workers)
+        return dict(zip(task_ids, details))
+
     def _get_task_detail(self, task_id: int) -> Optional[Dict]:
         """
         获取任务详细信息
@@ -365,31 +737,10 @@ class ZentaoApiClient:
             if response.status_code == 200:
                 response.encoding = 'utf-8'
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        # 解析 data 字段中的 JSON 字符串
-                        task_data = json.loads(result['data'])
-                        
-                        # 提取需要的字段
-                        detail = {}
-                        
-                        # 创建时间 - 从 task 对象中获取 openedDate
-                        if 'task' in task_data:
-                            task = task_data['task']
-                            detail['created_at'] = task.get('openedDate', '')
-                            
-                            # 截止时间 - 从 task 对象中获取
-                            deadline = task.get('deadline', '')
-                            if deadline and deadline != '0000-00-00':
-                                detail['deadline'] = deadline
-                            
-                            # 任务状态
-                            detail['status'] = task.get('status', 'unknown')
-                        
-                        # 禅道链接
-                        detail['url'] = f"{self.base_url}/task-view-{task_id}.html"
-                        
-                        return detail
+                    # 解析 data 字段中的 JSON 字符串
+                    task_data = parsers.unwrap_data(response.json())
+                    if task_data is not None:
+                        return parsers.parse_task_detail(task_data, f"{self.base_url}/task-view-{task_id}.html")
                         
                 except Exception as e:
                     self.logger.warning(f"解析任务 {task_id} 详情失败: {str(e)}")
@@ -409,139 +760,38 @@ class ZentaoApiClient:
         Returns:
             任务列表
         """
-        tasks = []
-        
-        # 匹配 <option value='taskID'>任务标题</option>
-        pattern = r"<option value='(\d+)'>(.*?)</option>"
-        matches = re.findall(pattern, html_text, re.DOTALL)
-        
-        for task_id, task_title in matches:
-            # 解码 HTML 实体
-            task_title = html.unescape(task_title.strip())
-            
-            # 尝试解析任务标题格式：项目 / 任务名称
-            parts = task_title.split(' / ', 1)
-            if len(parts) == 2:
-                project_name = parts[0]
-                task_name = parts[1]
-            else:
-                project_name = ''
-                task_name = task_title
-            
-            tasks.append({
-                'id': int(task_id),
-                'name': task_name,
-                'project_name': project_name,
-                'title': task_title,
-                'status': 'unknown',  # HTML 中不包含状态信息
-                'assignedTo': 'me'
-            })
-        
-        return tasks
+        return parsers.parse_task_select_html(html_text)
 
-    def get_my_stories(self, status: Optional[str] = None) -> ApiResponse:
+    def get_my_stories(self, status: Optional[str] = None, story_filter: Optional[StoryFilter] = None,
+                       limit: Optional[int] = None) -> ApiResponse:
         """
         获取指派给我的需求 (适配 8.x 版本)
         使用 /my-story-assignedTo-id_desc--{limit}-{page}.json API
-        支持分页，每页最多200条
+        支持分页，每页最多200条；逐页过滤，找到 limit 个需求后不再请求后续页
 
         Args:
-            status: 需求状态过滤 (all, draft, active, closed, changed)
+            status: 需求状态 (all, draft, active, closed, changed) 或阶段 (wait、planned 等)，
+                    与 story_filter 一起在获取时过滤
+            story_filter: 过滤条件，未指定产品时使用配置的产品列表
+            limit: 最多返回的需求数，为空则不限制
 
         Returns:
             需求列表
         """
+        story_filter = with_status(story_filter, status)
+
         try:
-            # 禅道 8.x my-story-assignedTo-id_desc-{total}-{limit}-{page}.json API
-            # 可以返回指定数量的需求，最多200条
-            # URL格式: /my-story-assignedTo-id_desc-{total}-{limit}-{page}.json
-            # total: 记录总数（使用一个较大的数字如9999让分页生效）
-            # limit: 分页大小（最大200）
-            # page: 页码（从1开始）
-            
-            all_stories = []
-            page = 1
-            limit = 200  # 每页最多200条
-            total = 9999  # 使用较大的数字让分页生效
-            
             # 从配置中获取要查询的产品列表
             from ..utils.config_loader import get_config
             config = get_config()
             configured_products = config.get('zentao.story_query.products', [])
-            
+            if story_filter.products is None and configured_products:
+                story_filter = replace(story_filter, products=configured_products)
+
             self.logger.info(f"开始获取指派给我的需求，配置的产品: {configured_products}")
-            
-            while True:
-                url = f"{self.base_url}/my-story-assignedTo-id_desc-{total}-{limit}-{page}.json"
-                self.logger.info(f"获取需求列表第 {page} 页: {url}")
-                
-                response = self.session.get(url, timeout=self.timeout)
-                response.encoding = 'utf-8'
-                
-                if response.status_code != 200:
-                    self.logger.error(f"获取需求列表失败: HTTP {response.status_code}")
-                    break
-                
-                try:
-                    result = response.json()
-                    if result.get('status') != 'success' or 'data' not in result:
-                        self.logger.warning(f"API返回错误: {result}")
-                        break
-                    
-                    data = json.loads(result['data'])
-                    
-                    if 'stories' not in data or not data['stories']:
-                        self.logger.info(f"第 {page} 页没有更多需求")
-                        break
-                    
-                    stories = data['stories']
-                    self.logger.info(f"第 {page} 页返回 {len(stories)} 个需求")
-                    
-                    # 处理每个需求
-                    page_matched_count = 0
-                    for story in stories:
-                        # 如果配置了产品过滤，检查需求是否属于配置的产品
-                        if configured_products:
-                            product_name = story.get('productTitle', '')
-                            if product_name not in configured_products:
-                                continue
-                            page_matched_count += 1
-                        
-                        # 转换需求格式
-                        story_detail = {
-                            'id': story.get('id'),
-                            'title': story.get('title'),
-                            'status': story.get('status'),
-                            'stage': story.get('stage'),
-                            'assigned_to': story.get('assignedTo'),
-                            'opened_by': story.get('openedBy'),
-                            'opened_date': story.get('openedDate'),
-                            'pri': story.get('pri'),
-                            'estimate': story.get('estimate'),
-                            'product': story.get('productTitle', ''),
-                            'plan': story.get('planTitle', '')
-                        }
-                        all_stories.append(story_detail)
-                    
-                    self.logger.info(f"第 {page} 页匹配 {page_matched_count} 个需求（产品过滤后）")
-                    
-                    # 如果返回的需求数少于limit，说明没有更多数据了
-                    if len(stories) < limit:
-                        self.logger.info(f"返回 {len(stories)} < {limit}，没有更多数据")
-                        break
-                    
-                    # 继续下一页
-                    page += 1
-                    
-                    # 安全限制：最多查询10页（2000条需求）
-                    if page > 10:
-                        self.logger.warning("达到最大页数限制（10页），停止查询")
-                        break
-                        
-                except Exception as e:
-                    self.logger.error(f"解析响应失败: {str(e)}")
-                    break
-            
+
+            all_stories = list(self.iter_my_stories(story_filter, limit))
+
             self.logger.info(f"总共找到 {len(all_stories)} 个指派给我的需求")
             
             return ApiResponse.success_response({
@@ -564,6 +814,344 @@ class ZentaoApiClient:
                 f"{ErrorMessage.API_ERROR}: {str(e)}"
             )
 
+    def iter_my_stories(self, story_filter: Optional[StoryFilter] = None, limit: Optional[int] = None,
+                        order_by: str = 'id_desc') -> Iterator[Dict]:
+        """
+        逐个获取指派给我的需求（转换为统一格式），每页到达后立即产出
+
+        找到 limit 个匹配的需求或调用方停止迭代后，不再请求后续页
+
+        Args:
+            story_filter: 过滤条件，为空则不过滤
+            limit: 最多产出的需求数，为空则不限制
+            order_by: 排序方式，如 id_desc、lastEditedDate_desc
+
+        Yields:
+            匹配的需求
+        """
+        story_filter = story_filter or StoryFilter()
+        plan = self.plan_story_query(story_filter)
+        self.logger.info(f"需求查询计划: {plan.describe()}")
+
+        if plan.source == SOURCE_PRODUCT_BROWSE:
+            raw_stories = self._iter_planned_product_stories(plan, order_by)
+        else:
+            raw_stories = (story for page in self.iter_my_story_pages(order_by=order_by) for story in page)
+        stories = (self.build_story_list_item(story) for story in raw_stories)
+        try:
+            yield from plan.residual.apply(stories, limit)
+        finally:
+            raw_stories.close()
+
+    def plan_story_query(self, story_filter: StoryFilter) -> StoryQueryPlan:
+        """
+        生成需求查询计划（未开启 zentao.story_query.pushdown 时总是获取指派给我的全部需求）
+
+        Args:
+            story_filter: 过滤条件
+
+        Returns:
+            查询计划
+        """
+        product_ids = None
+        if self.story_pushdown and story_filter.products:
+            result = self.get_products()
+            if result.success:
+                product_ids = result.data
+            else:
+                self.logger.warning("获取产品列表失败，在本地按产品过滤需求")
+        return plan_story_query(story_filter, product_ids)
+
+    def _iter_planned_product_stories(self, plan: StoryQueryPlan, order_by: str) -> Iterator[Dict]:
+        """
+        按查询计划逐个产品获取需求原始数据
+
+        多个产品按ID倒序排序时合并为一个有序的需求流；
+        某个产品的第一页请求失败时（禅道版本不支持该接口），改为获取指派给我的全部需求并在本地按产品过滤
+
+        Args:
+            plan: 按产品浏览的查询计划
+            order_by: 排序方式
+
+        Yields:
+            原始需求
+        """
+        streams = []
+        try:
+            for product_id, product_name in plan.products:
+                url_template = self._product_story_url(product_id, order_by)
+                try:
+                    first = self._fetch_story_page(url_template, 1, strict=True)
+                except RuntimeError as e:
+                    self.logger.warning(f"按产品获取需求失败，改为获取指派给我的全部需求: {str(e)}")
+                    products = {name for _, name in plan.products}
+                    for stories in self.iter_my_story_pages(order_by=order_by):
+                        yield from (story for story in stories if story.get('productTitle', '') in products)
+                    return
+                if first is not None:
+                    pages = self._iter_story_pages(url_template, strict=False, first_page=first)
+                    streams.append((pages, product_name))
+
+            stories = [
+                (self._fill_product_title(story, product_name) for page in pages for story in page)
+                for pages, product_name in streams
+            ]
+            if len(stories) > 1 and order_by == 'id_desc':
+                yield from heapq.merge(*stories, key=lambda story: -int(story.get('id') or 0))
+            else:
+                yield from itertools.chain(*stories)
+        finally:
+            for pages, _ in streams:
+                pages.close()
+
+    def get_products(self) -> ApiResponse:
+        """
+        获取产品名称到产品ID的映射（带缓存，过期后后台刷新）
+
+        Returns:
+            {产品名称: 产品ID}
+        """
+        return self._products_cache.get()
+
+    def _fetch_products(self) -> ApiResponse:
+        """
+        请求产品列表 (适配 8.x 版本)
+
+        Returns:
+            {产品名称: 产品ID}
+        """
+        try:
+            url = f"{self.base_url}/product-all.json"
+            response = self.session.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                return ApiResponse.error_response(
+                    ErrorCode.API_ERROR,
+                    f"获取产品列表失败: HTTP {response.status_code}"
+                )
+
+            data = parsers.unwrap_data(response.json())
+            products = parsers.parse_products(data)
+            if not products:
+                return ApiResponse.error_response(ErrorCode.API_ERROR, "获取产品列表失败: 没有产品数据")
+            return ApiResponse.success_response(products)
+
+        except Exception as e:
+            self.logger.error(f"获取产品列表失败: {str(e)}")
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                f"获取产品列表失败: {str(e)}"
+            )
+
+    def iter_my_story_pages(self, order_by: str = 'id_desc', strict: bool = False) -> Iterator[List[Dict]]:
+        """
+        逐页获取指派给我的需求原始数据
+
+        禅道 8.x my-story-assignedTo-{orderBy}-{total}-{limit}-{page}.json API
+        total: 记录总数（传 0 时禅道查询总数，否则原样返回传入的值）
+        limit: 分页大小（最大200）
+        page: 页码（从1开始）
+
+        第一页传入记录总数 0，返回了分页信息（pager.recTotal）时，按总数并发获取剩余页
+        （并发数 zentao.story_query.page_workers，按页码顺序产出，最多预取并发数个页）；
+        没有分页信息时逐页获取，直到返回的需求数少于分页大小。
+        最多获取 zentao.story_query.max_stories 个需求，超过时记录警告
+
+        调用方可随时停止迭代，未请求的页不会被获取
+
+        Args:
+            order_by: 排序方式，如 id_desc、lastEditedDate_desc
+            strict: 为 True 时请求失败或超过需求数上限会抛出 RuntimeError，
+                    用于需要区分"数据已取完"和"中途失败"的场景（如全量同步）
+
+        Yields:
+            每页的原始需求列表
+
+        Raises:
+            RuntimeError: strict 模式下请求失败或数据不完整
+        """
+        url_template = (
+            f"{self.base_url}/my-story-assignedTo-{order_by}-{{total}}-{self.STORY_PAGE_LIMIT}-{{page}}.json"
+        )
+        yield from self._iter_story_pages(url_template, strict)
+
+    def iter_product_story_pages(self, product_id: int, product_name: str, order_by: str = 'id_desc',
+                                 strict: bool = False) -> Iterator[List[Dict]]:
+        """
+        逐页获取指定产品中指派给我的需求原始数据
+
+        禅道 8.x product-browse-{productID}-{branch}-assignedtome-{param}-{orderBy}-{total}-{limit}-{page}.json API，
+        分页方式与 iter_my_story_pages 相同。浏览接口的需求没有产品名称，使用 product_name 补全
+
+        Args:
+            product_id: 产品ID
+            product_name: 产品名称
+            order_by: 排序方式
+            strict: 为 True 时请求失败或超过需求数上限会抛出 RuntimeError
+
+        Yields:
+            每页的原始需求列表
+        """
+        url_template = self._product_story_url(product_id, order_by)
+        for stories in self._iter_story_pages(url_template, strict):
+            yield [self._fill_product_title(story, product_name) for story in stories]
+
+    def _product_story_url(self, product_id: int, order_by: str) -> str:
+        """产品中指派给我的需求列表地址，记录总数和页码位置为 {total}、{page}"""
+        return (
+            f"{self.base_url}/product-browse-{product_id}-0-assignedtome-0-{order_by}-"
+            f"{{total}}-{self.STORY_PAGE_LIMIT}-{{page}}.json"
+        )
+
+    @staticmethod
+    def _fill_product_title(story: Dict, product_name: str) -> Dict:
+        """浏览接口的需求没有产品名称，用查询的产品补全"""
+        if not story.get('productTitle'):
+            story['productTitle'] = product_name
+        return story
+
+    def _iter_story_pages(self, url_template: str, strict: bool,
+                          first_page: Optional[tuple] = None) -> Iterator[List[Dict]]:
+        """
+        按分页信息逐页（或并发）获取需求列表
+
+        Args:
+            url_template: 需求列表地址，记录总数和页码位置为 {total}、{page}
+            strict: 为 True 时请求失败或超过需求数上限会抛出 RuntimeError
+            first_page: 已获取的第一页（_fetch_story_page 的结果），为空则请求第一页
+
+        Yields:
+            每页的原始需求列表
+        """
+        limit = self.STORY_PAGE_LIMIT  # 每页最多200条
+        max_pages = self.story_max_pages
+
+        first = first_page or self._fetch_story_page(url_template, 1, strict)
+        if first is None:
+            return
+        stories, rec_total = first
+        yield stories
+        # 如果返回的需求数少于limit，说明没有更多数据了
+        if len(stories) < limit:
+            self.logger.info(f"返回 {len(stories)} < {limit}，没有更多数据")
+            return
+
+        # 第一页传入的记录总数为 0，禅道返回查询得到的总数；剩余页传入该总数，禅道不再重复查询总数
+        if rec_total is not None and rec_total >= len(stories):
+            page_count = -(-rec_total // limit)
+            if page_count > max_pages:
+                self._on_story_limit_reached(rec_total, strict)
+            pages = range(2, min(page_count, max_pages) + 1)
+            self.logger.info(f"需求总数 {rec_total}，并发获取剩余 {len(pages)} 页")
+            fetched = prefetch_map(
+                lambda page: self._fetch_story_page(url_template, page, strict, total=rec_total),
+                pages,
+                max_workers=self.story_page_workers
+            )
+            try:
+                for page_result in fetched:
+                    if page_result is None:
+                        return
+                    yield page_result[0]
+            finally:
+                fetched.close()
+            return
+
+        page = 2
+        while True:
+            # 安全限制：最多获取 max_stories 个需求
+            if page > max_pages:
+                self._on_story_limit_reached(None, strict)
+                return
+
+            page_result = self._fetch_story_page(url_template, page, strict)
+            if page_result is None:
+                return
+            stories = page_result[0]
+            yield stories
+
+            if len(stories) < limit:
+                self.logger.info(f"返回 {len(stories)} < {limit}，没有更多数据")
+                return
+
+            # 继续下一页
+            page += 1
+
+    @property
+    def story_max_pages(self) -> int:
+        """按 zentao.story_query.max_stories 换算的最大页数"""
+        return max(1, -(-self.story_max_stories // self.STORY_PAGE_LIMIT))
+
+    def _on_story_limit_reached(self, rec_total: Optional[int], strict: bool):
+        """
+        需求数超过上限时记录警告（strict 模式下抛出异常）
+
+        Args:
+            rec_total: 分页信息中的需求总数，未知时为 None
+            strict: 是否抛出异常
+        """
+        total_text = f"需求总数 {rec_total} " if rec_total is not None else "需求数"
+        self.logger.warning(
+            f"{total_text}超过上限 {self.story_max_stories}（zentao.story_query.max_stories），"
+            f"只获取前 {self.story_max_pages} 页"
+        )
+        if strict:
+            raise RuntimeError("需求数量超过上限，数据不完整")
+
+    def _fetch_story_page(self, url_template: str, page: int, strict: bool, total: int = 0) -> Optional[tuple]:
+        """
+        获取一页需求
+
+        Args:
+            url_template: 需求列表地址，记录总数和页码位置为 {total}、{page}
+            page: 页码
+            strict: 为 True 时请求失败抛出 RuntimeError
+            total: 记录总数，0 表示由禅道查询总数
+
+        Returns:
+            (原始需求列表, 分页信息中的需求总数)，请求失败或没有需求时返回 None
+
+        Raises:
+            RuntimeError: strict 模式下请求失败
+        """
+        url = url_template.format(total=total, page=page)
+        self.logger.info(f"获取需求列表第 {page} 页: {url}")
+
+        response = self.session.get(url, timeout=self.timeout)
+        response.encoding = 'utf-8'
+
+        if response.status_code != 200:
+            self.logger.error(f"获取需求列表失败: HTTP {response.status_code}")
+            if strict:
+                raise RuntimeError(f"获取需求列表失败: HTTP {response.status_code}")
+            return None
+
+        try:
+            result = response.json()
+            data = parsers.unwrap_data(result)
+            if data is None:
+                self.logger.warning(f"API返回错误: {result}")
+                if strict:
+                    raise RuntimeError("获取需求列表失败: API返回错误")
+                return None
+        except RuntimeError:
+            raise
+        except Exception as e:
+            self.logger.error(f"解析响应失败: {str(e)}")
+            if strict:
+                raise RuntimeError(f"解析需求列表失败: {str(e)}")
+            return None
+
+        page_result = parsers.parse_story_page(data)
+        if page_result is None:
+            self.logger.info(f"第 {page} 页没有更多需求")
+            return None
+
+        self.logger.info(f"第 {page} 页返回 {len(page_result[0])} 个需求")
+        return page_result
+
+    # 将需求列表接口返回的原始需求转换为统一格式
+    build_story_list_item = staticmethod(parsers.build_story_list_item)
+
     def _get_my_stories_fallback(self, status: Optional[str] = None) -> ApiResponse:
         """
         获取需求列表的备用方法（使用 my-story.json）
@@ -582,37 +1170,18 @@ class ZentaoApiClient:
 
             if response.status_code == 200:
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        story_data = json.loads(result['data'])
-                        
-                        if 'stories' in story_data:
-                            stories_raw = story_data['stories']
-                            stories = []
-                            
-                            for story in stories_raw:
-                                stories.append({
-                                    'id': story.get('id', 0),
-                                    'title': story.get('title', ''),
-                                    'status': story.get('status', ''),
-                                    'priority': story.get('pri', 0),
-                                    'assigned_to': story.get('assignedTo', ''),
-                                    'opened_by': story.get('openedBy', ''),
-                                    'opened_date': story.get('openedDate', ''),
-                                    'product': story.get('productTitle', ''),
-                                    'plan': story.get('planTitle', ''),
-                                    'stage': story.get('stage', ''),
-                                    'estimate': story.get('estimate', 0)
-                                })
-                            
-                            return ApiResponse.success_response({
-                                'stories': stories,
-                                'total': len(stories),
-                                'page': 1,
-                                'page_size': len(stories)
-                            })
-                        
-                except json.JSONDecodeError as e:
+                    story_data = parsers.unwrap_data(response.json())
+                    if story_data is not None and 'stories' in story_data:
+                        stories = [parsers.build_story_summary(story) for story in story_data['stories']]
+
+                        return ApiResponse.success_response({
+                            'stories': stories,
+                            'total': len(stories),
+                            'page': 1,
+                            'page_size': len(stories)
+                        })
+
+                except ValueError as e:
                     self.logger.error(f"解析 JSON 失败: {str(e)}")
 
             return ApiResponse.error_response(
@@ -627,60 +1196,219 @@ class ZentaoApiClient:
                 f"{ErrorMessage.API_ERROR}: {str(e)}"
             )
 
-    def get_story_task_count(self, story_id: int) -> int:
+    def get_story_task_counts(
+        self,
+        story_ids: List[int],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[int, int]:
+        """
+        获取多个需求的有效任务数量
+
+        开启 zentao.story_tasks.enabled 时先查需求与任务的关联索引，按集合差得到没有任务的需求；
+        verify_missing 为 true 时再逐个请求需求详情确认这些需求；索引获取失败时全部逐个请求
+
+        Args:
+            story_ids: 需求ID列表
+            max_workers: 最大并发数，默认读取 zentao.concurrency.story_check_workers
+            timeout: 单次请求超时（秒），默认读取 zentao.concurrency.request_timeout
+            on_progress: 每个需求检查完成时的回调 (story_id, task_count)，在调用线程中执行
+
+        Returns:
+            需求ID到有效任务数量的映射（获取失败的需求计为 0）
+        """
+        if self.story_task_index_enabled:
+            result = self.get_story_task_index()
+            if result.success:
+                return self._story_task_counts_from_index(
+                    result.data, story_ids, max_workers, timeout, on_progress
+                )
+            self.logger.warning(f"获取需求任务关联索引失败，改为逐个检查需求: {result.error.message}")
+
+        return self._fetch_story_task_counts(story_ids, max_workers, timeout, on_progress)
+
+    def _story_task_counts_from_index(
+        self,
+        index: StoryTaskIndex,
+        story_ids: List[int],
+        max_workers: Optional[int],
+        timeout: Optional[float],
+        on_progress: Optional[Callable[[int, int], None]]
+    ) -> Dict[int, int]:
+        """
+        根据关联索引统计任务数量
+
+        索引只包含我参与的进行中项目的任务，索引中没有任务的需求可能在已完成、已关闭
+        或未参与的项目中有任务。verify_missing 为 true（默认）时逐个请求需求详情确认
+        （每个没有任务的需求一次请求），为 false 时直接按没有任务处理
+
+        Returns:
+            需求ID到有效任务数量的映射
+        """
+        missing = set(index.stories_without_tasks(story_ids))
+        counts = {}
+        for story_id in story_ids:
+            if story_id in missing:
+                continue
+            counts[story_id] = index.task_count(story_id)
+            if on_progress:
+                on_progress(story_id, counts[story_id])
+
+        self.logger.info(
+            f"关联索引中 {len(counts)} 个需求已创建任务，{len(missing)} 个需求未找到任务"
+        )
+        missing_ids = [story_id for story_id in story_ids if story_id in missing]
+        if self.story_task_verify_missing:
+            counts.update(self._fetch_story_task_counts(missing_ids, max_workers, timeout, on_progress))
+        else:
+            for story_id in missing_ids:
+                counts[story_id] = 0
+                if on_progress:
+                    on_progress(story_id, 0)
+        return counts
+
+    def _fetch_story_task_counts(
+        self,
+        story_ids: List[int],
+        max_workers: Optional[int],
+        timeout: Optional[float],
+        on_progress: Optional[Callable[[int, int], None]]
+    ) -> Dict[int, int]:
+        """
+        并发请求需求详情，统计有效任务数量
+
+        Returns:
+            需求ID到有效任务数量的映射（获取失败的需求计为 0）
+        """
+        if not story_ids:
+            return {}
+
+        workers = max_workers or self.story_check_workers
+        request_timeout = timeout or self.batch_request_timeout
+
+        self.logger.info(f"开始检查 {len(story_ids)} 个需求的任务数 (并发数: {workers})")
+
+        def on_result(story_id: int, task_count: Optional[int]):
+            if on_progress:
+                on_progress(story_id, task_count or 0)
+
+        counts = bounded_map(
+            lambda story_id: self.get_story_task_count(story_id, timeout=request_timeout),
+            story_ids,
+            max_workers=workers,
+            on_result=on_result
+        )
+
+        return {story_id: count or 0 for story_id, count in zip(story_ids, counts)}
+
+    def get_story_task_index(self) -> ApiResponse:
+        """
+        获取需求与任务的关联索引（带缓存）
+
+        缓存有效期内直接返回；过期后先返回旧索引并在后台刷新，超过最长可用时间才同步获取
+
+        Returns:
+            StoryTaskIndex
+        """
+        return self._story_task_index.get()
+
+    def _fetch_story_task_index(self) -> ApiResponse:
+        """
+        按项目批量获取任务列表，建立需求与任务的关联索引
+
+        Returns:
+            StoryTaskIndex，任一项目的任务列表获取失败时返回错误
+        """
+        executions = self.get_executions()
+        if not executions.success:
+            return executions
+
+        project_ids = [execution['id'] for execution in executions.data]
+        task_lists = bounded_map(self._fetch_project_tasks, project_ids, max_workers=self.max_workers)
+
+        failed = [project_id for project_id, tasks in zip(project_ids, task_lists) if tasks is None]
+        if failed:
+            self.logger.warning(f"获取项目任务列表失败: {failed}")
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                f"获取项目任务列表失败: {', '.join(str(project_id) for project_id in failed)}"
+            )
+
+        index = StoryTaskIndex.from_tasks(task for tasks in task_lists for task in tasks)
+        self.logger.info(
+            f"需求任务关联索引已建立: {len(project_ids)} 个项目, "
+            f"{sum(len(tasks) for tasks in task_lists)} 个任务, {len(index)} 个需求"
+        )
+        return ApiResponse.success_response(index)
+
+    def _fetch_project_tasks(self, project_id: int) -> List[Dict]:
+        """
+        逐页获取项目的全部任务（project-task-{项目ID}-all）
+
+        Args:
+            project_id: 项目ID
+
+        Returns:
+            任务列表
+
+        Raises:
+            RuntimeError: 请求失败或响应无法解析
+        """
+        tasks: List[Dict] = []
+        seen_ids = set()
+        page = 1
+        while True:
+            url = (f"{self.base_url}/project-task-{project_id}-all-0-id_desc-0-"
+                   f"{self.TASK_PAGE_LIMIT}-{page}.json")
+            response = self.session.get(url, timeout=self.batch_request_timeout)
+            response.encoding = 'utf-8'
+            if response.status_code != 200:
+                raise RuntimeError(f"获取项目 {project_id} 任务列表失败: HTTP {response.status_code}")
+
+            data = parsers.unwrap_data(response.json())
+            page_tasks = data.get('tasks') if isinstance(data, dict) else None
+            if isinstance(page_tasks, dict):
+                page_tasks = list(page_tasks.values())
+            if not isinstance(page_tasks, list):
+                raise RuntimeError(f"项目 {project_id} 任务列表格式无法识别")
+
+            # 页码超出范围时禅道返回最后一页，出现重复的任务说明已经取完
+            page_ids = {str(task.get('id')) for task in page_tasks}
+            if page_ids and page_ids <= seen_ids:
+                return tasks
+            seen_ids |= page_ids
+            tasks.extend(page_tasks)
+
+            # 没有分页信息时一直翻页，直到某一页不满
+            total = parsers.parse_pager_total(data)
+            if len(page_tasks) < self.TASK_PAGE_LIMIT or (total is not None and len(tasks) >= total):
+                return tasks
+            page += 1
+
+    def get_story_task_count(self, story_id: int, timeout: Optional[float] = None) -> int:
         """
         获取需求关联的有效任务数量（排除已删除的任务）
 
         Args:
             story_id: 需求ID
+            timeout: 请求超时（秒），默认使用 zentao.timeout
 
         Returns:
             有效任务数量（未删除的）
         """
         try:
             url = f"{self.base_url}/story-view-{story_id}.json"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=timeout or self.timeout)
             response.encoding = 'utf-8'
 
             if response.status_code == 200:
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        story_data = json.loads(result['data'])
-
-                        if 'story' in story_data:
-                            story = story_data['story']
-                            tasks = story.get('tasks', {})
-
-                            # 调试日志：打印任务数据结构
-                            self.logger.debug(f"需求 #{story_id} 任务数据类型: {type(tasks)}")
-                            self.logger.debug(f"需求 #{story_id} 任务数据: {tasks}")
-
-                            # tasks 是字典格式: {project_id: [task_list]}
-                            if isinstance(tasks, dict):
-                                total_tasks = 0
-                                for project_id, project_tasks in tasks.items():
-                                    self.logger.debug(f"项目 {project_id} 任务数: {len(project_tasks) if isinstance(project_tasks, list) else 'N/A'}")
-                                    if isinstance(project_tasks, list):
-                                        for task in project_tasks:
-                                            self.logger.debug(f"  任务 #{task.get('id')}: deleted={task.get('deleted')}, status={task.get('status')}")
-                                        # 过滤掉已删除的任务（deleted 字段为 '1' 表示已删除）
-                                        valid_tasks = [
-                                            task for task in project_tasks
-                                            if task.get('deleted') != '1' and task.get('deleted') != 1
-                                        ]
-                                        total_tasks += len(valid_tasks)
-                                self.logger.debug(f"需求 #{story_id} 有效任务数: {total_tasks}")
-                                return total_tasks
-                            elif isinstance(tasks, list):
-                                self.logger.debug(f"需求 #{story_id} 任务列表长度: {len(tasks)}")
-                                # 过滤掉已删除的任务
-                                valid_tasks = [
-                                    task for task in tasks
-                                    if task.get('deleted') != '1' and task.get('deleted') != 1
-                                ]
-                                self.logger.debug(f"需求 #{story_id} 有效任务数: {len(valid_tasks)}")
-                                return len(valid_tasks)
+                    story_data = parsers.unwrap_data(response.json())
+                    if story_data and 'story' in story_data:
+                        task_count = parsers.count_valid_tasks(story_data['story'], story_id)
+                        if task_count is not None:
+                            return task_count
 
                 except Exception as e:
                     self.logger.warning(f"解析需求 {story_id} 任务信息失败: {str(e)}")
@@ -700,6 +1428,10 @@ class ZentaoApiClient:
         Returns:
             需求详情
         """
+        if self._story_cache is not None and int(story_id) in self._story_cache:
+            self.logger.debug(f"需求 #{story_id} 使用请求内快照")
+            return ApiResponse.success_response(copy.deepcopy(self._story_cache[int(story_id)]))
+
         try:
             url = f"{self.base_url}/story-view-{story_id}.json"
             response = self.session.get(url, timeout=self.timeout)
@@ -708,68 +1440,17 @@ class ZentaoApiClient:
             if response.status_code == 200:
                 try:
                     result = response.json()
-                    self.logger.debug(f"需求 #{story_id} API 响应: {json.dumps(result, ensure_ascii=False)[:1000]}")
-                    if result.get('status') == 'success' and 'data' in result:
-                        story_data = json.loads(result['data'])
-                        self.logger.debug(f"需求 #{story_id} 数据内容: {json.dumps(story_data, ensure_ascii=False)[:1000]}")
-                        
-                        story = None
-                        # 尝试不同的数据结构
-                        if 'story' in story_data:
-                            story = story_data['story']
-                        elif isinstance(story_data, dict):
-                            # 如果 story_data 本身就是 story 数据
-                            story = story_data
+                    if self.logger.is_enabled_for('debug'):
+                        self.logger.debug(f"需求 #{story_id} API 响应: {json.dumps(result, ensure_ascii=False)[:1000]}")
+                    story_data = parsers.unwrap_data(result)
+                    if story_data is not None:
+                        if self.logger.is_enabled_for('debug'):
+                            self.logger.debug(f"需求 #{story_id} 数据内容: {json.dumps(story_data, ensure_ascii=False)[:1000]}")
                         
-                        if story:
-                            # 处理计划字段（可能是字典或字符串）
-                            plan = story.get('planTitle', '')
-                            if isinstance(plan, dict):
-                                plan = list(plan.values())[0] if plan else ''
-                            
-                            # 获取关联的执行/项目ID
-                            # 禅道8.x中，需求可能关联多个执行（项目）
-                            execution_id = 0
-                            execution_name = ''
-                            executions = []
-                            
-                            # 方式1: 从 executions 数组获取
-                            if 'executions' in story:
-                                executions = story['executions']
-                                if executions and isinstance(executions, list) and len(executions) > 0:
-                                    # 取第一个执行（项目）
-                                    first_exec = executions[0] if isinstance(executions[0], dict) else {'id': executions[0]}
-                                    execution_id = first_exec.get('id', 0) if isinstance(first_exec, dict) else int(first_exec)
-                                    execution_name = first_exec.get('name', '') if isinstance(first_exec, dict) else ''
-                            # 方式2: 从 plan 字段获取（可能是字典）
-                            elif 'plan' in story and isinstance(story['plan'], dict):
-                                plan_keys = list(story['plan'].keys())
-                                if plan_keys:
-                                    execution_id = int(plan_keys[0])
-                            # 方式3: 直接从 execution 字段获取
-                            elif 'execution' in story:
-                                execution_id = story['execution']
-                            
-                            self.logger.info(f"需求 #{story_id} 关联的执行ID: {execution_id}, 执行名称: {execution_name}")
-                            
-                            story_detail = {
-                                'id': story.get('id', 0),
-                                'title': story.get('title', ''),
-                                'content': story.get('spec', ''),  # 禅道API使用spec字段存储需求内容
-                                'status': story.get('status', ''),
-                                'priority': story.get('pri', 0),
-                                'assigned_to': story.get('assignedTo', ''),
-                                'opened_by': story.get('openedBy', ''),
-                                'opened_date': story.get('openedDate', ''),
-                                'product': story.get('productTitle', ''),
-                                'product_id': story.get('product', 0),
-                                'plan': plan,
-                                'stage': story.get('stage', ''),
-                                'estimate': story.get('estimate', 0),
-                                'execution': execution_id,
-                                'execution_name': execution_name,
-                                'executions': executions
-                            }
+                        story_detail = parsers.parse_story_detail(story_data, story_id)
+                        if story_detail:
+                            if self._story_cache is not None:
+                                self._story_cache[int(story_id)] = copy.deepcopy(story_detail)
                             
                             return ApiResponse.success_response(story_detail)
                         else:
@@ -849,6 +1530,7 @@ class ZentaoApiClient:
             # 发送 POST 请求
             response = self.session.post(url, data=form_data, timeout=self.timeout)
             response.encoding = 'utf-8'
+            self.invalidate_story_cache(story_id)
             
             if response.status_code == 200:
                 try:
@@ -903,7 +1585,8 @@ class ZentaoApiClient:
             )
 
     def review_story(self, story_id: int, result: str = 'pass', assigned_to: str = None, 
-                     estimate: float = None, comment: str = '') -> ApiResponse:
+                     estimate: float = None, comment: str = '',
+                     story_data: Optional[Dict] = None) -> ApiResponse:
         """
         评审需求 (适配 8.x 版本)
         用于在变更需求后，将需求状态从"已变更"改回"已激活"
@@ -914,20 +1597,22 @@ class ZentaoApiClient:
             assigned_to: 指派给（用户名）
             estimate: 预计工时
             comment: 评审备注
+            story_data: 已知的需求详情（如刚变更完成的需求），提供时不再请求 story-view
             
         Returns:
             评审结果
         """
         try:
             # 首先获取需求的当前信息
-            story_result = self.get_story(story_id)
-            if not story_result.success:
-                return ApiResponse.error_response(
-                    ErrorCode.STORY_NOT_FOUND,
-                    f"需求 #{story_id} 不存在或无法访问"
-                )
-            
-            story_data = story_result.data
+            if story_data is None:
+                story_result = self.get_story(story_id)
+                if not story_result.success:
+                    return ApiResponse.error_response(
+                        ErrorCode.STORY_NOT_FOUND,
+                        f"需求 #{story_id} 不存在或无法访问"
+                    )
+
+                story_data = story_result.data
             
             # 如果需求状态不是 changed（已变更），则不需要评审
             if story_data.get('status') != 'changed':
@@ -942,59 +1627,16 @@ class ZentaoApiClient:
             url = f"{self.base_url}/story-review-{story_id}.json"
             
             # 准备表单数据
-            form_data = {
-                'result': result,
-                'assignedTo': assigned_to if assigned_to else story_data.get('assigned_to', ''),
-                'estimate': estimate if estimate else story_data.get('estimate', 0),
-                'reviewedDate': '',  # 空字符串表示今天
-                'comment': comment if comment else '需求已评审，准备开发',
-            }
+            form_data = parsers.build_story_review_form(story_data, result, assigned_to, estimate, comment)
             
             self.logger.info(f"评审需求 #{story_id}，结果: {result}")
             
             # 发送 POST 请求
             response = self.session.post(url, data=form_data, timeout=self.timeout)
             response.encoding = 'utf-8'
+            self.invalidate_story_cache(story_id)
             
-            if response.status_code == 200:
-                # 检查响应（禅道通常会返回重定向脚本）
-                if 'parent.location' in response.text or 'story-view' in response.text:
-                    self.logger.info(f"需求 #{story_id} 评审成功")
-                    return ApiResponse.success_response({
-                        'story_id': story_id,
-                        'result': result,
-                        'message': '需求评审成功'
-                    })
-                else:
-                    try:
-                        result_data = response.json()
-                        if result_data.get('status') == 'success' or result_data.get('result') == 'success':
-                            self.logger.info(f"需求 #{story_id} 评审成功")
-                            return ApiResponse.success_response({
-                                'story_id': story_id,
-                                'result': result,
-                                'message': '需求评审成功'
-                            })
-                        else:
-                            error_msg = result_data.get('message', result_data.get('reason', '评审失败'))
-                            self.logger.error(f"需求评审失败: {error_msg}")
-                            return ApiResponse.error_response(
-                                ErrorCode.API_ERROR,
-                                f"需求评审失败: {error_msg}"
-                            )
-                    except ValueError:
-                        self.logger.info(f"需求 #{story_id} 可能已评审成功")
-                        return ApiResponse.success_response({
-                            'story_id': story_id,
-                            'result': result,
-                            'message': '需求可能已评审成功'
-                        })
-            else:
-                self.logger.error(f"评审需求失败: HTTP {response.status_code}")
-                return ApiResponse.error_response(
-                    ErrorCode.API_ERROR,
-                    f"评审需求失败: HTTP {response.status_code}"
-                )
+            return parsers.parse_story_review_response(response, story_id, result)
                 
         except requests.Timeout:
             self.logger.error("评审需求超时")
@@ -1042,56 +1684,9 @@ class ZentaoApiClient:
                 timeout=self.timeout
             )
             response.encoding = 'utf-8'
+            self.invalidate_story_cache(story_id)
             
-            if response.status_code == 200:
-                try:
-                    result = response.json()
-                    if result.get('status') == 'success':
-                        self.logger.info(f"✓ 需求 #{story_id} 已成功关联到项目 #{execution_id}")
-                        return ApiResponse.success_response({
-                            'story_id': story_id,
-                            'execution_id': execution_id,
-                            'message': f'需求 #{story_id} 已成功关联到项目 #{execution_id}'
-                        })
-                    else:
-                        error_msg = result.get('message', '未知错误')
-                        self.logger.warning(f"关联需求到项目失败: {error_msg}")
-                        return ApiResponse.error_response(
-                            ErrorCode.API_ERROR,
-                            f"关联需求到项目失败: {error_msg}"
-                        )
-                except json.JSONDecodeError:
-                    # 禅道 8.x 经常返回 HTML 页面而不是 JSON
-                    # 检查响应内容中是否包含错误提示
-                    response_text = response.text.lower()
-                    error_keywords = ['error', '失败', '错误', 'denied', 'permission', '无权']
-                    has_error = any(keyword in response_text for keyword in error_keywords)
-                    
-                    # 检查是否包含成功相关的提示
-                    success_keywords = ['success', '成功', 'linkstory', '关联', 'linked']
-                    has_success = any(keyword in response_text for keyword in success_keywords)
-                    
-                    if has_error and not has_success:
-                        self.logger.warning(f"关联需求到项目返回错误页面")
-                        return ApiResponse.error_response(
-                            ErrorCode.API_ERROR,
-                            "关联需求到项目失败: 返回错误页面"
-                        )
-                    else:
-                        # 对于 HTML 响应，如果没有明显的错误提示，认为可能成功
-                        # 禅道经常返回跳转页面或成功页面
-                        self.logger.info(f"✓ 需求 #{story_id} 已关联到项目 #{execution_id} (HTML响应)")
-                        return ApiResponse.success_response({
-                            'story_id': story_id,
-                            'execution_id': execution_id,
-                            'message': f'需求 #{story_id} 已关联到项目 #{execution_id}'
-                        })
-            else:
-                self.logger.error(f"关联需求到项目失败: HTTP {response.status_code}")
-                return ApiResponse.error_response(
-                    ErrorCode.API_ERROR,
-                    f"关联需求到项目失败: HTTP {response.status_code}"
-                )
+            return parsers.parse_link_story_response(response, story_id, execution_id)
                 
         except requests.Timeout:
             self.logger.error("关联需求到项目超时")
@@ -1123,32 +1718,10 @@ class ZentaoApiClient:
             
             if response.status_code == 200:
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        story_data = json.loads(result['data'])
-                        
-                        if 'story' in story_data:
-                            story = story_data['story']
-                            
-                            # 处理计划字段（可能是字典或字符串）
-                            plan = story.get('planTitle', '')
-                            if isinstance(plan, dict):
-                                plan = list(plan.values())[0] if plan else ''
-                            
-                            return {
-                                'id': story.get('id', 0),
-                                'title': story.get('title', ''),
-                                'status': story.get('status', ''),
-                                'priority': story.get('pri', 0),
-                                'assigned_to': story.get('assignedTo', ''),
-                                'opened_by': story.get('openedBy', ''),
-                                'opened_date': story.get('openedDate', ''),
-                                'product': story.get('productTitle', ''),
-                                'plan': plan,
-                                'stage': story.get('stage', ''),
-                                'estimate': story.get('estimate', 0)
-                            }
-                            
+                    story_data = parsers.unwrap_data(response.json())
+                    if story_data and 'story' in story_data:
+                        return parsers.build_story_summary(story_data['story'])
+
                 except Exception as e:
                     self.logger.warning(f"解析需求 {story_id} 详情失败: {str(e)}")
                     
@@ -1179,78 +1752,22 @@ class ZentaoApiClient:
             url = f"{self.base_url}/task-create-{execution_id}-0.html"
             
             # 准备表单数据
-            form_data = {
-                'name': name,
-                'type': 'devel' if not parent_id else 'devel',  # 任务类型
-                'pri': 3,  # 优先级 (1-4)
-                'estimate': estimate if estimate else '',
-                'assignedTo[]': assigned_to if assigned_to else '',  # 注意：禅道8.x使用数组格式
-                'module': 0,  # 模块ID
-                'estStarted': '',  # 预计开始时间
-                'desc': '',
-                'mailto[]': '',  # 抄送给
-                'after': 'toTaskList',  # 创建后跳转到任务列表
-            }
-            
-            # 如果有父任务，添加 parent 字段
-            if parent_id:
-                form_data['parent'] = parent_id
-            
-            # 如果有关联的需求，添加 story 字段
-            if story_id:
-                form_data['story'] = story_id
-            
-            # 如果有截止日期
-            if deadline:
-                form_data['deadline'] = deadline
+            form_data = parsers.build_task_create_form(
+                name, assigned_to, estimate, deadline, parent_id, story_id
+            )
             
             self.logger.info(f"创建任务: {name} (execution: {execution_id}, story: {story_id})")
             
             # 发送 POST 请求
             response = self.session.post(url, data=form_data, timeout=self.timeout)
             response.encoding = 'utf-8'
+            if story_id:
+                self.invalidate_story_cache(story_id)
             
-            if response.status_code == 200:
-                # 检查是否创建成功（通常重定向到任务列表或任务详情）
-                # 禅道创建成功后通常会跳转到 project-task-{execution_id}.html
-                if 'project-task' in response.url or 'task-view' in response.url:
-                    # 尝试从 URL 中提取新创建的任务ID
-                    task_id_match = re.search(r'task-view-(\d+)\.html', response.url)
-                    if task_id_match:
-                        task_id = int(task_id_match.group(1))
-                        self.logger.info(f"任务创建成功: #{task_id}")
-                        return ApiResponse.success_response({
-                            'id': task_id,
-                            'name': name,
-                            'url': f"{self.base_url}/task-view-{task_id}.html"
-                        })
-                    else:
-                        # 创建成功但无法获取任务ID
-                        self.logger.info("任务创建成功")
-                        return ApiResponse.success_response({
-                            'name': name,
-                            'message': '任务创建成功'
-                        })
-                else:
-                    # 检查页面内容是否包含错误信息
-                    if 'error' in response.text.lower() or '错误' in response.text:
-                        self.logger.error("任务创建失败: 页面返回错误")
-                        return ApiResponse.error_response(
-                            ErrorCode.API_ERROR,
-                            "任务创建失败，请检查参数"
-                        )
-                    else:
-                        # 可能是创建成功，但无法确定
-                        return ApiResponse.success_response({
-                            'name': name,
-                            'message': '任务可能已创建成功，请检查任务列表'
-                        })
-            else:
-                self.logger.error(f"创建任务失败: HTTP {response.status_code}")
-                return ApiResponse.error_response(
-                    ErrorCode.API_ERROR,
-                    f"创建任务失败: HTTP {response.status_code}"
-                )
+            result = parsers.parse_task_create_response(response, name, self.base_url)
+            if story_id and result.success:
+                self._link_task_to_story(story_id, result.data.get('id'))
+            return result
                 
         except requests.Timeout:
             self.logger.error("创建任务超时")
@@ -1265,6 +1782,24 @@ class ZentaoApiClient:
                 f"{ErrorMessage.API_ERROR}: {str(e)}"
             )
 
+    def _link_task_to_story(self, story_id: int, task_id: Optional[int]):
+        """
+        创建任务后更新需求与任务的关联索引
+
+        无法获取新任务ID时丢弃索引，下次查询时重新建立
+
+        Args:
+            story_id: 需求ID
+            task_id: 新任务ID
+        """
+        cached = self._story_task_index.peek()
+        if cached is None:
+            return
+        if task_id:
+            cached.data.add(story_id, task_id)
+        else:
+            self._story_task_index.invalidate()
+
     def split_task(self, parent_task_id: int, subtask_names: List[str]) -> ApiResponse:
         """
         任务拆解 (适配 8.x 版本)
@@ -1337,7 +1872,48 @@ class ZentaoApiClient:
 
     def get_executions(self) -> ApiResponse:
         """
-        获取执行/项目列表 (适配 8.x 版本)
+        获取执行/项目列表（带缓存）
+
+        缓存有效期内直接返回；过期后先返回旧列表并在后台刷新（stale-while-revalidate），
+        超过最长可用时间才同步请求。有效期内返回同一个列表对象，调用方不要修改
+
+        Returns:
+            执行/项目列表
+        """
+        if self._executions_cache.loaded_at is None and self.local_store:
+            # 首次获取时用本地缓存预热
+            try:
+                executions, fetched_at = self.local_store.load_executions()
+                if executions and fetched_at:
+                    self._executions_cache.seed(ApiResponse.success_response(executions), fetched_at)
+            except Exception as e:
+                self.logger.warning(f"读取本地缓存的项目列表失败: {str(e)}")
+        return self._executions_cache.get()
+
+    def get_execution_index(self) -> ApiResponse:
+        """
+        获取执行/项目名称索引
+
+        索引跟随项目列表的缓存条目：条目不变时复用，刷新、失效或切换账号后重新建立
+
+        Returns:
+            ApiResponse，成功时 data 为 ExecutionIndex
+        """
+        executions = self.get_executions()
+        if not executions.success:
+            return executions
+
+        with self._execution_index_lock:
+            cached = self._execution_index
+            if cached is not None and cached[0] is executions:
+                return cached[1]
+            result = ApiResponse.success_response(ExecutionIndex(executions.data or []))
+            self._execution_index = (executions, result)
+            return result
+
+    def _fetch_executions(self) -> ApiResponse:
+        """
+        请求执行/项目列表 (适配 8.x 版本)
         
         Returns:
             执行/项目列表
@@ -1351,79 +1927,16 @@ class ZentaoApiClient:
             if response.status_code == 200:
                 try:
                     result = response.json()
-                    self.logger.debug(f"项目列表 API 响应: {json.dumps(result, ensure_ascii=False)[:1000]}")
-                    if result.get('status') == 'success' and 'data' in result:
-                        projects_data = json.loads(result['data'])
-                        self.logger.debug(f"项目列表数据内容: {json.dumps(projects_data, ensure_ascii=False)[:1000]}")
-                        
-                        # 处理项目数据
-                        executions = []
-                        
-                        # 尝试不同的数据结构
-                        if 'projects' in projects_data:
-                            projects_list = projects_data['projects']
-                        else:
-                            # 如果没有 projects 字段，尝试直接使用 projects_data
-                            projects_list = projects_data
-                        
-                        # 如果是列表格式
-                        if isinstance(projects_list, list):
-                            for project in projects_list:
-                                # 过滤掉已完成(done)和已关闭(closed)的项目
-                                status = project.get('status', '')
-                                if status in ['done', 'closed']:
-                                    continue
-                                executions.append({
-                                    'id': int(project.get('id', 0)),
-                                    'name': project.get('name', ''),
-                                    'status': status,
-                                    'begin': project.get('begin', ''),
-                                    'end': project.get('end', '')
-                                })
-                        # 如果是字典格式，尝试不同的结构
-                        elif isinstance(projects_list, dict):
-                            # 首先检查字典是否包含 id 和 name 字段
-                            if 'id' in projects_list and 'name' in projects_list:
-                                # 这是一个单个项目的字典
-                                status = projects_list.get('status', '')
-                                if status not in ['done', 'closed']:
-                                    executions.append({
-                                        'id': int(projects_list.get('id', 0)),
-                                        'name': projects_list.get('name', ''),
-                                        'status': status,
-                                        'begin': projects_list.get('begin', ''),
-                                        'end': projects_list.get('end', '')
-                                    })
-                            else:
-                                # 尝试遍历字典的键值对
-                                for key, value in projects_list.items():
-                                    # 检查值是否是字典且包含 id 和 name 字段
-                                    if isinstance(value, dict) and 'id' in value and 'name' in value:
-                                        status = value.get('status', '')
-                                        if status not in ['done', 'closed']:
-                                            executions.append({
-                                                'id': int(value.get('id', 0)),
-                                                'name': value.get('name', ''),
-                                                'status': status,
-                                                'begin': value.get('begin', ''),
-                                                'end': value.get('end', '')
-                                            })
-                                    # 检查值是否是字符串，尝试将 key 作为 id
-                                    elif isinstance(value, str):
-                                        try:
-                                            project_id = int(key)
-                                            executions.append({
-                                                'id': project_id,
-                                                'name': value,
-                                                'status': '',
-                                                'begin': '',
-                                                'end': ''
-                                            })
-                                        except ValueError:
-                                            # key 不是数字，跳过
-                                            continue
-                        
+                    if self.logger.is_enabled_for('debug'):
+                        self.logger.debug(f"项目列表 API 响应: {json.dumps(result, ensure_ascii=False)[:1000]}")
+                    projects_data = parsers.unwrap_data(result)
+                    if projects_data is not None:
+                        if self.logger.is_enabled_for('debug'):
+                            self.logger.debug(f"项目列表数据内容: {json.dumps(projects_data, ensure_ascii=False)[:1000]}")
+
+                        executions = parsers.parse_executions(projects_data)
                         self.logger.info(f"获取到 {len(executions)} 个执行/项目")
+                        self._save_to_local_store('save_executions', executions)
                         return ApiResponse.success_response(executions)
                     else:
                         self.logger.warning(f"获取执行列表失败: {result}")
@@ -1494,26 +2007,7 @@ class ZentaoApiClient:
             response = self.session.post(url, data=form_data, timeout=self.timeout)
             response.encoding = 'utf-8'
             
-            if response.status_code == 200:
-                # 检查是否分配成功
-                if 'execution-task' in response.url or 'task-view' in response.url:
-                    self.logger.info(f"任务 #{task_id} 分配成功")
-                    return ApiResponse.success_response({
-                        'task_id': task_id,
-                        'assigned_to': username,
-                        'message': f'任务已成功分配给 {username}'
-                    })
-                else:
-                    return ApiResponse.error_response(
-                        ErrorCode.API_ERROR,
-                        "任务分配可能失败，请检查任务状态"
-                    )
-            else:
-                self.logger.error(f"分配任务失败: HTTP {response.status_code}")
-                return ApiResponse.error_response(
-                    ErrorCode.API_ERROR,
-                    f"分配任务失败: HTTP {response.status_code}"
-                )
+            return parsers.parse_task_assign_response(response, task_id, username)
                 
         except requests.Timeout:
             self.logger.error("分配任务超时")
@@ -1545,28 +2039,9 @@ class ZentaoApiClient:
             
             if response.status_code == 200:
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        task_data = json.loads(result['data'])
-                        
-                        if 'task' in task_data:
-                            task = task_data['task']
-                            
-                            task_detail = {
-                                'id': task.get('id', 0),
-                                'title': task.get('name', ''),
-                                'status': task.get('status', ''),
-                                'priority': task.get('pri', 0),
-                                'assigned_to': task.get('assignedTo', ''),
-                                'opened_by': task.get('openedBy', ''),
-                                'opened_date': task.get('openedDate', ''),
-                                'estimate': task.get('estimate', 0),
-                                'execution': task.get('execution', 0),
-                                'project': task.get('project', 0),
-                                'parent': task.get('parent', 0)
-                            }
-                            
-                            return ApiResponse.success_response(task_detail)
+                    task_data = parsers.unwrap_data(response.json())
+                    if task_data and 'task' in task_data:
+                        return ApiResponse.success_response(parsers.build_task_summary(task_data['task']))
                             
                 except Exception as e:
                     self.logger.warning(f"解析任务 {task_id} 详情失败: {str(e)}")
@@ -1605,11 +2080,9 @@ class ZentaoApiClient:
             if response.status_code == 200:
                 response.encoding = 'utf-8'
                 try:
-                    result = response.json()
-                    if result.get('status') == 'success' and 'data' in result:
-                        task_data = json.loads(result['data'])
-                        if 'task' in task_data:
-                            return task_data['task']
+                    task_data = parsers.unwrap_data(response.json())
+                    if task_data and 'task' in task_data:
+                        return task_data['task']
                 except Exception as e:
                     self.logger.warning(f"解析任务 {task_id} 详情失败: {str(e)}")
         except Exception as e:
@@ -0,0 +1,791 @@
+"""
+禅道异步 API 客户端 (支持禅道 8.x 版本)
+方法与 ZentaoApiClient 一致，批量操作可通过 asyncio.gather 并发执行，
+响应解析复用 parsers 模块
+
+安装了 aiohttp 时使用 aiohttp 发送请求（重试策略与同步客户端一致，熔断器和请求指标与同步客户端共享；
+不使用响应缓存，但修改数据的请求会使其失效）；
+未安装时在线程池中复用同步客户端的 requests 会话
+"""
+
+import asyncio
+import copy
+import heapq
+import itertools
+import json
+import time
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterator, Dict, List, Optional
+
+import requests
+from urllib3.util.retry import Retry
+
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+from ..utils.response import ApiResponse, ErrorCode, ErrorMessage
+from .api_client import ZentaoApiClient
+from .circuit_breaker import CircuitOpenError
+from .endpoints import endpoint_family
+from .metrics import STATUS_ERROR, STATUS_REJECTED
+from .story_filter import StoryFilter, with_status
+from .story_query import SOURCE_PRODUCT_BROWSE, StoryQueryPlan
+from . import parsers
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp 为可选依赖
+    aiohttp = None
+
+
+@dataclass
+class HttpResult:
+    """
+    HTTP 响应结果
+    提供与 requests.Response 一致的 status_code、url、text 和 json()，供 parsers 解析
+    """
+    status_code: int
+    url: str
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def json(self):
+        """解析 JSON 响应体"""
+        return json.loads(self.text)
+
+
+def aiohttp_available() -> bool:
+    """是否安装了 aiohttp（未安装时异步客户端只是在线程池中执行同步请求）"""
+    return aiohttp is not None
+
+
+class AsyncZentaoApiClient:
+    """
+    禅道异步 API 客户端
+    与同步客户端共享登录会话（cookies/请求头）、熔断器、会话验证状态和请求作用域的需求快照
+    """
+
+    def __init__(self, sync_client: ZentaoApiClient, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            sync_client: 已登录的同步客户端
+            max_concurrency: 最大并发请求数，默认读取 zentao.concurrency.max_workers
+        """
+        self.logger = get_logger()
+        self.sync_client = sync_client
+        self.base_url = sync_client.base_url
+        self.timeout = sync_client.timeout
+        self.max_concurrency = max_concurrency or sync_client.max_workers
+
+        self._http = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncZentaoApiClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """关闭 aiohttp 会话"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    # ------------------------------------------------------------------
+    # 传输
+    # ------------------------------------------------------------------
+
+    async def _request(self, method: str, url: str, data: Optional[Dict] = None,
+                       timeout: Optional[float] = None) -> HttpResult:
+        """
+        发送请求（受 max_concurrency 限制）
+
+        Args:
+            method: HTTP 方法
+            url: 请求地址
+            data: 表单数据
+            timeout: 超时时间（秒），默认使用 zentao.timeout
+
+        Returns:
+            HTTP 响应结果
+
+        Raises:
+            requests.Timeout: 请求超时
+            requests.ConnectionError: 连接失败或熔断器打开
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            return await self._send(method, url, data, timeout or self.timeout)
+
+    async def _send(self, method: str, url: str, data: Optional[Dict], timeout: float) -> HttpResult:
+        """发送单个请求，按是否安装 aiohttp 选择实现"""
+        if aiohttp is None:
+            return await asyncio.to_thread(self._send_with_requests, method, url, data, timeout)
+        return await self._send_with_aiohttp(method, url, data, timeout)
+
+    def _send_with_requests(self, method: str, url: str, data: Optional[Dict], timeout: float) -> HttpResult:
+        """使用同步客户端的会话发送请求（在线程池中执行，重试/熔断由同步客户端的适配器处理）"""
+        response = self.sync_client.session.request(method, url, data=data, timeout=timeout)
+        response.encoding = 'utf-8'
+        return HttpResult(response.status_code, response.url, response.text, dict(response.headers))
+
+    async def _send_with_aiohttp(self, method: str, url: str, data: Optional[Dict], timeout: float) -> HttpResult:
+        """
+        使用 aiohttp 发送请求，熔断统计和请求指标与同步客户端共享
+
+        重试策略与同步客户端的 urllib3 重试一致：连接失败、超时和 429/502/503/504 响应
+        最多重试 zentao.retry_times 次，第一次重试立即发送，之后按 retry_backoff 指数退避。
+        一次调用（含重试）计为一次熔断统计和一次请求指标
+        """
+        family = endpoint_family(url)
+        metrics = self.sync_client.metrics
+        breakers = self.sync_client.circuit_breakers
+        breaker = breakers.get(family) if breakers else None
+        start = time.perf_counter()
+        if breaker:
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                metrics.record(family, method, STATUS_REJECTED, time.perf_counter() - start)
+                raise
+
+        retries = 0
+        error = None
+        try:
+            while True:
+                try:
+                    result, size = await self._aiohttp_request(method, url, data, timeout)
+                except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                    if retries < self.sync_client.retry_times:
+                        retries += 1
+                        self.logger.warning(f"请求失败，第 {retries} 次重试: {url} ({type(e).__name__})")
+                        await asyncio.sleep(self._retry_delay(retries))
+                        continue
+                    error = e
+                    break
+
+                if result.status_code in ZentaoApiClient.RETRY_STATUSES and retries < self.sync_client.retry_times:
+                    retries += 1
+                    self.logger.warning(f"HTTP {result.status_code}，第 {retries} 次重试: {url}")
+                    await asyncio.sleep(self._retry_delay(retries))
+                    continue
+                break
+        except BaseException:
+            # 任务被取消或与服务端健康无关的异常，释放半开状态的探测名额
+            if breaker:
+                breaker.release()
+            raise
+
+        if error is not None:
+            if breaker:
+                breaker.record_failure()
+            metrics.record(family, method, STATUS_ERROR, time.perf_counter() - start, retries=retries)
+            if isinstance(error, asyncio.TimeoutError):
+                raise requests.Timeout(f"请求超时: {url}") from error
+            raise requests.ConnectionError(f"连接失败: {str(error)}") from error
+
+        metrics.record(family, method, result.status_code, time.perf_counter() - start,
+                       size=size, retries=retries)
+
+        # 修改数据的请求使同步客户端的响应缓存失效
+        if method != 'GET' and self.sync_client.response_cache is not None:
+            self.sync_client.response_cache.invalidate_for(url)
+
+        if breaker:
+            if result.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        if result.status_code == 401 or 'user-login' in result.url or (
+            result.status_code == 200
+            and parsers.is_login_script_page(result.url, result.headers.get('Content-Type'), result.text)
+        ):
+            self.sync_client.invalidate_session_verification()
+
+        return result
+
+    async def _aiohttp_request(self, method: str, url: str, data: Optional[Dict], timeout: float) -> tuple:
+        """
+        发送一次 aiohttp 请求
+
+        Returns:
+            (HTTP 响应结果, 响应体字节数)
+        """
+        async with self._get_http_session().request(
+            method, url, data=data, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            body = await response.read()
+            text = body.decode('utf-8', errors='replace')
+            return HttpResult(response.status, str(response.url), text, dict(response.headers)), len(body)
+
+    def _retry_delay(self, retries: int) -> float:
+        """第 retries 次重试前的等待时间（秒），与 urllib3 的退避算法一致"""
+        if retries <= 1:
+            return 0
+        return min(self.sync_client.retry_backoff * 2 ** (retries - 1), Retry.DEFAULT_BACKOFF_MAX)
+
+    def _get_http_session(self):
+        """懒创建 aiohttp 会话，复制同步客户端的 cookies 和请求头"""
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                cookies=self.sync_client.get_cookies(),
+                headers=dict(self.sync_client.session.headers),
+                cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+        return self._http
+
+    async def _get_data(self, url: str, timeout: Optional[float] = None):
+        """
+        请求 JSON 接口并解码 data 字段
+
+        Returns:
+            解码后的数据，HTTP 状态码不是 200 或 status 不是 success 时返回 None
+        """
+        response = await self._request('GET', url, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        return parsers.unwrap_data(response.json())
+
+    # ------------------------------------------------------------------
+    # 任务
+    # ------------------------------------------------------------------
+
+    async def get_my_tasks(self, status: Optional[str] = None, with_detail: bool = True) -> ApiResponse:
+        """
+        获取指派给我的任务
+
+        Args:
+            status: 任务状态过滤 (all, wait, doing, done, closed)
+            with_detail: 是否并发获取每个任务的详细信息
+
+        Returns:
+            任务列表
+        """
+        try:
+            account = self.sync_client.DEFAULT_TASK_ACCOUNT
+            status_param = status if status else 'all'
+            url = f"{self.base_url}/task-ajaxGetUserTasks-{account}-0-{status_param}.json"
+
+            self.logger.info(f"获取用户任务列表: {url}")
+            response = await self._request('GET', url)
+
+            if response.status_code != 200:
+                return ApiResponse.error_response(
+                    ErrorCode.API_ERROR,
+                    f"获取任务列表失败，状态码: {response.status_code}"
+                )
+
+            tasks = parsers.parse_task_select_html(response.text)
+            if with_detail and tasks:
+                details = await self.get_task_details([task['id'] for task in tasks])
+                for task in tasks:
+                    if details.get(task['id']):
+                        task.update(details[task['id']])
+
+            self.logger.info(f"成功获取 {len(tasks)} 个任务")
+
+            return ApiResponse.success_response({
+                'tasks': tasks,
+                'total': len(tasks),
+                'page': 1,
+                'page_size': len(tasks)
+            })
+
+        except requests.Timeout:
+            self.logger.error("获取任务列表超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"获取任务列表失败: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"{ErrorMessage.API_ERROR}: {str(e)}")
+
+    async def get_task_details(self, task_ids: List[int]) -> Dict[int, Optional[Dict]]:
+        """
+        并发获取多个任务的详细信息
+
+        Args:
+            task_ids: 任务ID列表
+
+        Returns:
+            任务ID到详情的映射，获取失败的任务对应 None
+        """
+        details = await asyncio.gather(*(self._get_task_detail(task_id) for task_id in task_ids))
+        return dict(zip(task_ids, details))
+
+    async def _get_task_detail(self, task_id: int) -> Optional[Dict]:
+        """获取任务列表需要的任务详情，失败返回 None"""
+        try:
+            task_data = await self._get_data(f"{self.base_url}/task-view-{task_id}.json")
+            if task_data is not None:
+                return parsers.parse_task_detail(task_data, f"{self.base_url}/task-view-{task_id}.html")
+        except Exception as e:
+            self.logger.warning(f"获取任务 {task_id} 详情失败: {str(e)}")
+        return None
+
+    async def _get_task_detail_full(self, task_id: int) -> Optional[Dict]:
+        """获取任务完整详情，失败返回 None"""
+        try:
+            task_data = await self._get_data(f"{self.base_url}/task-view-{task_id}.json")
+            if task_data and 'task' in task_data:
+                return task_data['task']
+        except Exception as e:
+            self.logger.warning(f"获取任务 {task_id} 详情失败: {str(e)}")
+        return None
+
+    async def create_task(self, execution_id: int, name: str, assigned_to: str = None,
+                          estimate: float = 0, deadline: str = None, parent_id: int = None,
+                          story_id: int = None) -> ApiResponse:
+        """
+        创建任务
+
+        Args:
+            execution_id: 执行ID/项目ID（必须提供）
+            name: 任务名称
+            assigned_to: 指派给（用户名）
+            estimate: 预计工时
+            deadline: 截止日期 (格式: YYYY-MM-DD)
+            parent_id: 父任务ID（用于创建子任务）
+            story_id: 需求ID（用于从需求创建任务）
+
+        Returns:
+            创建结果
+        """
+        try:
+            url = f"{self.base_url}/task-create-{execution_id}-0.html"
+            form_data = parsers.build_task_create_form(
+                name, assigned_to, estimate, deadline, parent_id, story_id
+            )
+
+            self.logger.info(f"创建任务: {name} (execution: {execution_id}, story: {story_id})")
+            response = await self._request('POST', url, data=form_data)
+            if story_id:
+                self.sync_client.invalidate_story_cache(story_id)
+
+            result = parsers.parse_task_create_response(response, name, self.base_url)
+            if story_id and result.success:
+                self.sync_client._link_task_to_story(story_id, result.data.get('id'))
+            return result
+
+        except requests.Timeout:
+            self.logger.error("创建任务超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"创建任务异常: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"{ErrorMessage.API_ERROR}: {str(e)}")
+
+    async def assign_task(self, task_id: int, username: str) -> ApiResponse:
+        """
+        任务分配
+
+        Args:
+            task_id: 任务ID
+            username: 用户名
+
+        Returns:
+            分配结果
+        """
+        try:
+            task_detail = await self._get_task_detail_full(task_id)
+            if not task_detail:
+                return ApiResponse.error_response(
+                    ErrorCode.TASK_NOT_FOUND,
+                    f"未找到任务 #{task_id}"
+                )
+
+            if not task_detail.get('project'):
+                return ApiResponse.error_response(
+                    ErrorCode.API_ERROR,
+                    "无法获取任务的项目信息"
+                )
+
+            url = f"{self.base_url}/task-assign-{task_id}.html"
+            form_data = {
+                'assignedTo': username,
+                'comment': ''
+            }
+
+            self.logger.info(f"分配任务 #{task_id} 给 {username}")
+            response = await self._request('POST', url, data=form_data)
+
+            return parsers.parse_task_assign_response(response, task_id, username)
+
+        except requests.Timeout:
+            self.logger.error("分配任务超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"分配任务异常: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"分配任务失败: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # 需求
+    # ------------------------------------------------------------------
+
+    async def get_my_stories(self, status: Optional[str] = None, story_filter: Optional[StoryFilter] = None,
+                             limit: Optional[int] = None) -> ApiResponse:
+        """
+        获取指派给我的需求，过滤条件、查询计划（产品条件下推）和数量上限与同步客户端一致
+
+        第一页返回了分页信息时并发获取剩余页，否则逐页获取；
+        最多获取 zentao.story_query.max_stories 个需求，超过时记录警告
+
+        Args:
+            status: 需求状态或阶段，与 story_filter 一起在获取时过滤
+            story_filter: 过滤条件，未指定产品时使用配置的产品列表
+            limit: 最多返回的需求数，为空则不限制
+
+        Returns:
+            需求列表
+        """
+        story_filter = with_status(story_filter, status)
+
+        try:
+            configured_products = get_config().get('zentao.story_query.products', [])
+            if story_filter.products is None and configured_products:
+                story_filter = replace(story_filter, products=configured_products)
+
+            # 下推产品条件时需要产品列表（带缓存，可能同步请求），在线程池中生成查询计划
+            plan = await asyncio.to_thread(self.sync_client.plan_story_query, story_filter)
+            self.logger.info(f"需求查询计划: {plan.describe()}")
+
+            if plan.source == SOURCE_PRODUCT_BROWSE:
+                raw_stories = await self._get_planned_product_stories(plan)
+                all_stories = list(plan.residual.apply(
+                    (parsers.build_story_list_item(story) for story in raw_stories), limit
+                ))
+            else:
+                all_stories = []
+                async for stories in self._iter_story_pages(self._my_story_url()):
+                    remaining = None if limit is None else limit - len(all_stories)
+                    all_stories.extend(plan.residual.apply(
+                        (parsers.build_story_list_item(story) for story in stories), remaining
+                    ))
+                    if limit is not None and len(all_stories) >= limit:
+                        break
+
+            self.logger.info(f"总共找到 {len(all_stories)} 个指派给我的需求")
+
+            return ApiResponse.success_response({
+                'stories': all_stories,
+                'total': len(all_stories),
+                'page': 1,
+                'page_size': len(all_stories)
+            })
+
+        except requests.Timeout:
+            self.logger.error("获取需求列表超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"获取需求列表失败: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"{ErrorMessage.API_ERROR}: {str(e)}")
+
+    def _my_story_url(self) -> str:
+        """指派给我的需求列表地址，记录总数和页码位置为 {total}、{page}"""
+        return (
+            f"{self.base_url}/my-story-assignedTo-id_desc-{{total}}-"
+            f"{self.sync_client.STORY_PAGE_LIMIT}-{{page}}.json"
+        )
+
+    async def _get_planned_product_stories(self, plan: StoryQueryPlan) -> List[Dict]:
+        """
+        按查询计划并发获取各产品的需求原始数据，多个产品按ID倒序合并
+
+        某个产品的第一页请求失败时（禅道版本不支持该接口），改为获取指派给我的全部需求并在本地按产品过滤
+
+        Args:
+            plan: 按产品浏览的查询计划
+
+        Returns:
+            原始需求列表
+        """
+        async def fetch_product(product_id: int, product_name: str) -> List[Dict]:
+            url_template = self.sync_client._product_story_url(product_id, 'id_desc')
+            return [
+                self.sync_client._fill_product_title(story, product_name)
+                async for stories in self._iter_story_pages(url_template, strict_first=True)
+                for story in stories
+            ]
+
+        try:
+            streams = await asyncio.gather(*(fetch_product(*product) for product in plan.products))
+        except RuntimeError as e:
+            self.logger.warning(f"按产品获取需求失败，改为获取指派给我的全部需求: {str(e)}")
+            products = {name for _, name in plan.products}
+            return [
+                story
+                async for stories in self._iter_story_pages(self._my_story_url())
+                for story in stories
+                if story.get('productTitle', '') in products
+            ]
+
+        if len(streams) > 1:
+            return list(heapq.merge(*streams, key=lambda story: -int(story.get('id') or 0)))
+        return list(itertools.chain(*streams))
+
+    async def _iter_story_pages(self, url_template: str, strict_first: bool = False) -> AsyncIterator[List[Dict]]:
+        """
+        逐页获取需求列表原始数据，分页方式与同步客户端的 _iter_story_pages 一致
+
+        Args:
+            url_template: 需求列表地址，记录总数和页码位置为 {total}、{page}
+            strict_first: 为 True 时第一页请求失败抛出 RuntimeError
+
+        Yields:
+            每页的原始需求列表
+        """
+        limit = self.sync_client.STORY_PAGE_LIMIT
+        max_pages = self.sync_client.story_max_pages
+
+        first = await self._fetch_story_page(url_template, 1, strict=strict_first)
+        if first is None:
+            return
+        stories, rec_total = first
+        yield stories
+        if len(stories) < limit:
+            return
+
+        # 第一页返回了记录总数时，剩余页传入该总数并发获取
+        if rec_total is not None and rec_total >= len(stories):
+            page_count = -(-rec_total // limit)
+            if page_count > max_pages:
+                self.sync_client._on_story_limit_reached(rec_total, strict=False)
+            pages = range(2, min(page_count, max_pages) + 1)
+            self.logger.info(f"需求总数 {rec_total}，并发获取剩余 {len(pages)} 页")
+            results = await asyncio.gather(
+                *(self._fetch_story_page(url_template, page, total=rec_total) for page in pages)
+            )
+            for page_result in results:
+                if page_result is None:
+                    return
+                yield page_result[0]
+            return
+
+        page = 2
+        while True:
+            if page > max_pages:
+                self.sync_client._on_story_limit_reached(None, strict=False)
+                return
+            page_result = await self._fetch_story_page(url_template, page)
+            if page_result is None:
+                return
+            yield page_result[0]
+            if len(page_result[0]) < limit:
+                return
+            page += 1
+
+    async def _fetch_story_page(self, url_template: str, page: int, total: int = 0,
+                                strict: bool = False) -> Optional[tuple]:
+        """
+        获取一页需求
+
+        Args:
+            url_template: 需求列表地址，记录总数和页码位置为 {total}、{page}
+            page: 页码
+            total: 记录总数，0 表示由禅道查询总数
+            strict: 为 True 时请求失败抛出 RuntimeError
+
+        Returns:
+            (原始需求列表, 分页信息中的需求总数)，请求失败或没有需求时返回 None
+
+        Raises:
+            RuntimeError: strict 模式下请求失败
+        """
+        url = url_template.format(total=total, page=page)
+        self.logger.info(f"获取需求列表第 {page} 页: {url}")
+
+        response = await self._request('GET', url)
+        if response.status_code != 200:
+            self.logger.error(f"获取需求列表失败: HTTP {response.status_code}")
+            if strict:
+                raise RuntimeError(f"获取需求列表失败: HTTP {response.status_code}")
+            return None
+
+        try:
+            data = parsers.unwrap_data(response.json())
+        except ValueError as e:
+            self.logger.error(f"解析响应失败: {str(e)}")
+            if strict:
+                raise RuntimeError(f"解析需求列表失败: {str(e)}")
+            return None
+        if data is None:
+            if strict:
+                raise RuntimeError("获取需求列表失败: API返回错误")
+            return None
+
+        return parsers.parse_story_page(data)
+
+    async def get_story(self, story_id: int) -> ApiResponse:
+        """
+        获取需求详情
+
+        Args:
+            story_id: 需求ID
+
+        Returns:
+            需求详情（同步客户端开启了 story_cache_scope 时复用作用域内的快照）
+        """
+        story_cache = self.sync_client._story_cache
+        if story_cache is not None and int(story_id) in story_cache:
+            self.logger.debug(f"需求 #{story_id} 使用请求内快照")
+            return ApiResponse.success_response(copy.deepcopy(story_cache[int(story_id)]))
+
+        try:
+            response = await self._request('GET', f"{self.base_url}/story-view-{story_id}.json")
+            if response.status_code != 200:
+                self.logger.error(f"获取需求详情失败: HTTP {response.status_code}")
+                return ApiResponse.error_response(
+                    ErrorCode.API_ERROR,
+                    f"获取需求详情失败: HTTP {response.status_code}"
+                )
+
+            story_data = parsers.unwrap_data(response.json())
+            story_detail = parsers.parse_story_detail(story_data, story_id) if story_data else None
+            if not story_detail:
+                return ApiResponse.error_response(
+                    ErrorCode.STORY_NOT_FOUND,
+                    f"需求 #{story_id} 不存在或无法访问"
+                )
+
+            # 作用域可能在请求期间结束，写入前重新读取
+            story_cache = self.sync_client._story_cache
+            if story_cache is not None:
+                story_cache[int(story_id)] = copy.deepcopy(story_detail)
+
+            return ApiResponse.success_response(story_detail)
+
+        except Exception as e:
+            self.logger.error(f"获取需求详情异常: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"获取需求详情失败: {str(e)}")
+
+    async def get_story_task_count(self, story_id: int, timeout: Optional[float] = None) -> int:
+        """
+        获取需求关联的有效任务数量（排除已删除的任务）
+
+        Args:
+            story_id: 需求ID
+            timeout: 请求超时（秒），默认使用 zentao.timeout
+
+        Returns:
+            有效任务数量，获取失败时为 0
+        """
+        try:
+            story_data = await self._get_data(f"{self.base_url}/story-view-{story_id}.json", timeout)
+            if story_data and 'story' in story_data:
+                return parsers.count_valid_tasks(story_data['story'], story_id) or 0
+        except Exception as e:
+            self.logger.warning(f"获取需求 {story_id} 任务信息失败: {str(e)}")
+        return 0
+
+    async def get_story_task_counts(self, story_ids: List[int], timeout: Optional[float] = None) -> Dict[int, int]:
+        """
+        获取多个需求的有效任务数量
+
+        与同步客户端一致：开启 zentao.story_tasks.enabled 时先查需求与任务的关联索引，
+        verify_missing 为 true 时再并发请求索引中没有任务的需求详情确认；索引获取失败时全部并发请求
+
+        Args:
+            story_ids: 需求ID列表
+            timeout: 单次请求超时（秒），默认读取 zentao.concurrency.request_timeout
+
+        Returns:
+            需求ID到有效任务数量的映射（获取失败的需求计为 0）
+        """
+        if self.sync_client.story_task_index_enabled:
+            # 关联索引带缓存，过期或首次获取时同步请求，在线程池中执行
+            result = await asyncio.to_thread(self.sync_client.get_story_task_index)
+            if result.success:
+                missing = set(result.data.stories_without_tasks(story_ids))
+                counts = {
+                    story_id: result.data.task_count(story_id) for story_id in story_ids if story_id not in missing
+                }
+                missing_ids = [story_id for story_id in story_ids if story_id in missing]
+                if self.sync_client.story_task_verify_missing:
+                    counts.update(await self._fetch_story_task_counts(missing_ids, timeout))
+                else:
+                    counts.update((story_id, 0) for story_id in missing_ids)
+                return {story_id: counts[story_id] for story_id in story_ids}
+            self.logger.warning(f"获取需求任务关联索引失败，改为逐个检查需求: {result.error.message}")
+
+        return await self._fetch_story_task_counts(story_ids, timeout)
+
+    async def _fetch_story_task_counts(self, story_ids: List[int], timeout: Optional[float]) -> Dict[int, int]:
+        """并发请求需求详情，统计有效任务数量（获取失败的需求计为 0）"""
+        request_timeout = timeout or self.sync_client.batch_request_timeout
+        counts = await asyncio.gather(
+            *(self.get_story_task_count(story_id, timeout=request_timeout) for story_id in story_ids)
+        )
+        return dict(zip(story_ids, counts))
+
+    async def review_story(self, story_id: int, result: str = 'pass', assigned_to: str = None,
+                           estimate: float = None, comment: str = '') -> ApiResponse:
+        """
+        评审需求，将需求状态从"已变更"改回"已激活"
+
+        Args:
+            story_id: 需求ID
+            result: 评审结果 ('pass' 通过, 'revert' 撤销变更, 'clarify' 有待明确)
+            assigned_to: 指派给（用户名）
+            estimate: 预计工时
+            comment: 评审备注
+
+        Returns:
+            评审结果
+        """
+        try:
+            story_result = await self.get_story(story_id)
+            if not story_result.success:
+                return ApiResponse.error_response(
+                    ErrorCode.STORY_NOT_FOUND,
+                    f"需求 #{story_id} 不存在或无法访问"
+                )
+
+            story_data = story_result.data
+            if story_data.get('status') != 'changed':
+                self.logger.info(f"需求 #{story_id} 状态为 {story_data.get('status')}，无需评审")
+                return ApiResponse.success_response({
+                    'story_id': story_id,
+                    'status': story_data.get('status'),
+                    'message': '需求状态不是已变更，无需评审'
+                })
+
+            url = f"{self.base_url}/story-review-{story_id}.json"
+            form_data = parsers.build_story_review_form(story_data, result, assigned_to, estimate, comment)
+
+            self.logger.info(f"评审需求 #{story_id}，结果: {result}")
+            response = await self._request('POST', url, data=form_data)
+            self.sync_client.invalidate_story_cache(story_id)
+
+            return parsers.parse_story_review_response(response, story_id, result)
+
+        except requests.Timeout:
+            self.logger.error("评审需求超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"评审需求异常: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"评审需求失败: {str(e)}")
+
+    async def link_story_to_execution(self, story_id: int, execution_id: int) -> ApiResponse:
+        """
+        将需求关联到项目
+
+        Args:
+            story_id: 需求ID
+            execution_id: 项目ID
+
+        Returns:
+            关联结果
+        """
+        try:
+            url = f"{self.base_url}/project-linkStory-{execution_id}.json"
+            response = await self._request('POST', url, data={'stories[]': story_id})
+            self.sync_client.invalidate_story_cache(story_id)
+
+            return parsers.parse_link_story_response(response, story_id, execution_id)
+
+        except requests.Timeout:
+            self.logger.error("关联需求到项目超时")
+            return ApiResponse.error_response(ErrorCode.TIMEOUT, ErrorMessage.TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"关联需求到项目异常: {str(e)}")
+            return ApiResponse.error_response(ErrorCode.API_ERROR, f"关联需求到项目失败: {str(e)}")
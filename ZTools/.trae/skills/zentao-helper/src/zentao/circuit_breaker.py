@@ -0,0 +1,173 @@
+"""
+熔断器
+按接口族统计连续失败，禅道不可用时快速失败，避免批量请求逐个等待超时
+"""
+
+import threading
+import time
+from typing import Dict
+
+import requests
+
+from ..utils.logger import get_logger
+
+
+class CircuitState:
+    """熔断器状态"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    熔断器打开时拒绝请求
+
+    继承 requests.ConnectionError，调用方按网络错误处理即可
+    """
+
+
+class CircuitBreaker:
+    """
+    单个接口族的熔断器
+
+    - closed: 正常放行，连续失败达到阈值后打开
+    - open: 直接拒绝请求，经过恢复时间后进入半开
+    - half_open: 只放行一个探测请求，成功则关闭，失败则重新打开
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """
+        初始化熔断器
+
+        Args:
+            name: 接口族名称
+            failure_threshold: 连续失败多少次后打开
+            recovery_timeout: 打开后多久进入半开（秒）
+        """
+        self.logger = get_logger()
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failure_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """当前状态（打开超过恢复时间后视为半开）"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def before_request(self):
+        """
+        请求前检查是否放行
+
+        Raises:
+            CircuitOpenError: 熔断器打开，或半开状态下已有探测请求
+        """
+        with self._lock:
+            self._refresh_state()
+
+            if self._state == CircuitState.OPEN:
+                remaining = self.recovery_timeout - (time.time() - self._opened_at)
+                raise CircuitOpenError(f"禅道接口 {self.name} 熔断中，{max(remaining, 0):.0f} 秒后重试")
+
+            if self._state == CircuitState.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"禅道接口 {self.name} 熔断恢复探测中")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        """记录请求成功"""
+        with self._lock:
+            self._failure_count = 0
+            self._probe_in_flight = False
+            if self._state != CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """记录请求失败"""
+        with self._lock:
+            self._failure_count += 1
+            self._probe_in_flight = False
+
+            if self._state == CircuitState.HALF_OPEN or (
+                self._state == CircuitState.CLOSED and self._failure_count >= self.failure_threshold
+            ):
+                self._opened_at = time.time()
+                self._transition(CircuitState.OPEN)
+
+    def release(self):
+        """释放半开状态的探测名额（请求异常但与服务端健康无关时调用）"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _refresh_state(self):
+        """打开超过恢复时间后进入半开（调用方持有锁）"""
+        if self._state == CircuitState.OPEN and time.time() - self._opened_at >= self.recovery_timeout:
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _transition(self, state: str):
+        """切换状态并记录日志（调用方持有锁）"""
+        previous, self._state = self._state, state
+
+        if state == CircuitState.OPEN:
+            self.logger.warning(
+                f"熔断器打开: {self.name}（连续失败 {self._failure_count} 次），"
+                f"{self.recovery_timeout} 秒内快速失败"
+            )
+        elif state == CircuitState.HALF_OPEN:
+            self.logger.info(f"熔断器半开: {self.name}，放行探测请求")
+        else:
+            self.logger.info(f"熔断器关闭: {self.name}（{previous} -> {state}）")
+
+
+class CircuitBreakerRegistry:
+    """
+    熔断器注册表
+    按接口族懒创建熔断器，同一客户端的所有会话共享
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """
+        Args:
+            failure_threshold: 连续失败多少次后打开
+            recovery_timeout: 打开后多久进入半开（秒）
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, family: str) -> CircuitBreaker:
+        """
+        获取接口族的熔断器
+
+        Args:
+            family: 接口族名称
+
+        Returns:
+            熔断器
+        """
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = CircuitBreaker(family, self.failure_threshold, self.recovery_timeout)
+                self._breakers[family] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        """
+        获取所有熔断器的状态
+
+        Returns:
+            接口族到状态的映射
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
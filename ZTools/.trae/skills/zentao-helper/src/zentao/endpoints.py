@@ -0,0 +1,35 @@
+"""
+禅道接口地址工具
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+
+def endpoint_family(url: str) -> str:
+    """
+    获取请求地址所属的接口族
+
+    禅道 8.x 使用 PATH_INFO 风格的地址，如 /task-view-123.json，
+    取模块名和方法名作为接口族（task-view），忽略参数和扩展名；
+    同时兼容 index.php?m=task&f=view 风格的地址
+
+    Args:
+        url: 请求地址
+
+    Returns:
+        接口族名称，无法识别时返回 'other'
+    """
+    parts = urlsplit(url)
+
+    query = parse_qs(parts.query)
+    if 'm' in query:
+        module = query['m'][0]
+        method = query.get('f', ['index'])[0]
+        return f"{module}-{method}"
+
+    name = parts.path.rstrip('/').rsplit('/', 1)[-1]
+    name = name.split('.', 1)[0]
+    if not name or name == 'index':
+        return 'other'
+
+    return '-'.join(name.split('-')[:2])
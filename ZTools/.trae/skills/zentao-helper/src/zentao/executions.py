@@ -0,0 +1,143 @@
+"""
+执行/项目名称索引
+按规范化名称建立索引，提供精确、前缀、包含和模糊匹配，
+用于匹配配置的默认项目和交互式选择项目
+"""
+
+import bisect
+import difflib
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    规范化项目名称：全角转半角、转小写、去掉空白
+
+    Args:
+        name: 项目名称
+
+    Returns:
+        规范化后的名称
+    """
+    return _SPACES.sub('', unicodedata.normalize('NFKC', name or '')).lower()
+
+
+class ExecutionIndex:
+    """
+    执行/项目名称索引
+    索引在构造时建立，查询结果按名称缓存
+    """
+
+    # 模糊匹配的最低相似度
+    FUZZY_CUTOFF = 0.5
+
+    def __init__(self, executions: List[Dict]):
+        """
+        Args:
+            executions: 执行/项目列表（get_executions 的结果），索引保存一份副本
+        """
+        self.executions = list(executions)
+        self._names = [normalize_name(execution.get('name', '')) for execution in self.executions]
+
+        # 同名项目保留列表中靠前的
+        self._by_name: Dict[str, Dict] = {}
+        for name, execution in zip(self._names, self.executions):
+            self._by_name.setdefault(name, execution)
+
+        # 按名称排序，用于前缀查找
+        self._sorted = sorted((name, index) for index, name in enumerate(self._names))
+        self._sorted_names = [name for name, _ in self._sorted]
+        self._find_cache: Dict[str, Optional[Dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self.executions)
+
+    def find(self, name: str) -> Optional[Dict]:
+        """
+        按名称查找单个项目
+
+        依次尝试精确匹配、前缀匹配、包含匹配（配置 "都江堰" 可以匹配 "都江堰项目"），
+        同一优先级有多个项目时取列表中靠前的
+
+        Args:
+            name: 项目名称
+
+        Returns:
+            匹配的项目，未找到时返回 None
+        """
+        key = normalize_name(name)
+        if not key:
+            return None
+        if key in self._find_cache:
+            return self._find_cache[key]
+
+        execution = self._by_name.get(key)
+        if execution is None:
+            prefixed = self._prefix_indexes(key)
+            if prefixed:
+                execution = self.executions[min(prefixed)]
+        if execution is None:
+            execution = next(
+                (item for item, item_name in zip(self.executions, self._names) if key in item_name),
+                None
+            )
+
+        self._find_cache[key] = execution
+        return execution
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        按名称搜索项目，结果按匹配程度排序
+
+        精确匹配 > 前缀匹配 > 包含匹配 > 模糊匹配（相似度不低于 FUZZY_CUTOFF）
+
+        Args:
+            query: 搜索内容
+            limit: 最多返回的项目数
+
+        Returns:
+            匹配的项目列表
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        seen = set()
+        ordered = []
+
+        def add(indexes):
+            for index in indexes:
+                if index not in seen:
+                    seen.add(index)
+                    ordered.append(index)
+
+        add(index for index, name in enumerate(self._names) if name == key)
+        add(sorted(self._prefix_indexes(key)))
+        add(index for index, name in enumerate(self._names) if key in name)
+
+        if len(ordered) < limit:
+            scored = []
+            for index, name in enumerate(self._names):
+                if index in seen or not name:
+                    continue
+                ratio = difflib.SequenceMatcher(None, key, name).ratio()
+                if ratio >= self.FUZZY_CUTOFF:
+                    scored.append((-ratio, index))
+            add(index for _, index in sorted(scored))
+
+        return [self.executions[index] for index in ordered[:limit]]
+
+    def _prefix_indexes(self, key: str) -> List[int]:
+        """名称以 key 开头的项目在列表中的位置"""
+        start = bisect.bisect_left(self._sorted_names, key)
+        indexes = []
+        for name, index in self._sorted[start:]:
+            if not name.startswith(key):
+                break
+            indexes.append(index)
+        return indexes
@@ -0,0 +1,458 @@
+"""
+本地缓存存储
+使用 SQLite 持久化需求、任务详情、项目和用户数据，减少重复请求禅道
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .title_index import TITLE_INDEX_VERSION, title_matches, title_tokens
+from ..utils.logger import get_logger
+from ..utils.config_loader import get_config
+
+
+SKILL_ROOT = Path(__file__).parent.parent.parent
+
+
+class LocalStore:
+    """
+    本地 SQLite 缓存
+    所有数据按当前登录账号隔离，账号变化时自动清空
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS stories (
+            id INTEGER PRIMARY KEY,
+            product TEXT,
+            last_edited_date TEXT,
+            data TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS story_title_tokens (
+            token TEXT NOT NULL,
+            story_id INTEGER NOT NULL,
+            PRIMARY KEY (token, story_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_story_title_tokens_story ON story_title_tokens (story_id);
+        CREATE TABLE IF NOT EXISTS task_details (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS executions (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            account TEXT,
+            data TEXT NOT NULL
+        );
+    """
+
+    # 随账号切换需要清空的数据表
+    DATA_TABLES = ['stories', 'story_title_tokens', 'task_details', 'executions', 'users']
+
+    def __init__(self, db_path: str):
+        """
+        初始化本地缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径，':memory:' 表示内存数据库
+        """
+        self.logger = get_logger()
+        self.db_path = db_path
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+        self._ensure_title_index()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # 元数据
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """获取元数据"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        """设置元数据"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, str(value))
+            )
+            self._conn.commit()
+
+    def bind_account(self, account: str):
+        """
+        绑定当前登录账号
+
+        账号与缓存中记录的账号不一致时清空所有数据，避免串用他人数据
+
+        Args:
+            account: 禅道账号
+        """
+        if not account:
+            return
+
+        current = self.get_meta('account')
+        if current == account:
+            return
+
+        with self._lock:
+            for table in self.DATA_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('account', ?)", (account,))
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('stories.title_index', ?)", (TITLE_INDEX_VERSION,)
+            )
+            self._conn.commit()
+
+        if current:
+            self.logger.info(f"登录账号已变化，本地缓存已清空: {current} -> {account}")
+
+    # ------------------------------------------------------------------
+    # 需求
+    # ------------------------------------------------------------------
+
+    def get_story_edit_dates(self) -> Dict[int, str]:
+        """
+        获取已缓存需求的最后编辑时间
+
+        Returns:
+            需求ID到最后编辑时间的映射
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, last_edited_date FROM stories").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def upsert_stories(self, stories: Iterable[Tuple[Dict, str]]) -> int:
+        """
+        写入或更新需求（同时更新标题索引）
+
+        Args:
+            stories: (需求字典, 最后编辑时间) 列表
+
+        Returns:
+            写入的需求数量
+        """
+        now = time.time()
+        stories = list(stories)
+        rows = [
+            (int(story['id']), story.get('product', ''), last_edited,
+             json.dumps(story, ensure_ascii=False), now)
+            for story, last_edited in stories
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stories (id, product, last_edited_date, data, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._index_titles((int(story['id']), story.get('title', '')) for story, _ in stories)
+            self._conn.commit()
+        return len(rows)
+
+    def retain_stories(self, story_ids: Iterable[int]) -> int:
+        """
+        只保留指定的需求，删除其余需求（全量同步后清理已不再指派给我的需求）
+
+        Args:
+            story_ids: 需要保留的需求ID
+
+        Returns:
+            删除的需求数量
+        """
+        keep = {int(story_id) for story_id in story_ids}
+        with self._lock:
+            existing = {row[0] for row in self._conn.execute("SELECT id FROM stories").fetchall()}
+            removed = existing - keep
+            self._conn.executemany("DELETE FROM stories WHERE id = ?", [(story_id,) for story_id in removed])
+            self._conn.executemany(
+                "DELETE FROM story_title_tokens WHERE story_id = ?", [(story_id,) for story_id in removed]
+            )
+            self._conn.commit()
+        return len(removed)
+
+    def list_stories(self, products: Optional[List[str]] = None,
+                     keywords: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        查询缓存的需求（按ID倒序，与禅道 id_desc 一致）
+
+        Args:
+            products: 产品名称过滤，为空则返回所有产品
+            keywords: 标题关键字过滤，包含任一关键字即匹配，为空则不过滤（通过标题索引查找）
+
+        Returns:
+            需求列表
+        """
+        clauses, params = [], []
+        if products:
+            clauses.append(f"product IN ({','.join('?' * len(products))})")
+            params.extend(products)
+        if keywords:
+            candidates = self._title_candidates(keywords, match_all=False)
+            if candidates is not None:
+                clauses.append(f"id IN ({candidates[0]})")
+                params.extend(candidates[1])
+
+        sql = "SELECT data FROM stories"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY id DESC", params).fetchall()
+
+        stories = [json.loads(row[0]) for row in rows]
+        if keywords:
+            stories = [story for story in stories if title_matches(story.get('title'), keywords)]
+        return stories
+
+    def search_story_ids(self, keywords: Sequence[str], match_all: bool = False) -> Set[int]:
+        """
+        按标题关键字查找需求ID（不区分大小写）
+
+        Args:
+            keywords: 标题关键字
+            match_all: True 时需要包含所有关键字，否则包含任一关键字即可
+
+        Returns:
+            匹配的需求ID集合
+        """
+        if not keywords:
+            return set()
+
+        candidates = self._title_candidates(keywords, match_all)
+        with self._lock:
+            if candidates is None:
+                rows = self._conn.execute("SELECT id, data FROM stories").fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM stories WHERE id IN ({candidates[0]})", candidates[1]
+                ).fetchall()
+        return {
+            row[0] for row in rows
+            if title_matches(json.loads(row[1]).get('title'), keywords, match_all)
+        }
+
+    def _title_candidates(self, keywords: Sequence[str], match_all: bool) -> Optional[Tuple[str, List]]:
+        """
+        生成按标题索引查找候选需求ID的子查询
+
+        每个关键字的候选需求为包含该关键字所有词元的需求，多个关键字按 match_all 取交集或并集
+
+        Args:
+            keywords: 标题关键字
+            match_all: 是否需要包含所有关键字
+
+        Returns:
+            (SQL, 参数)，无法通过索引缩小范围时（如只有单个字符的关键字）返回 None
+        """
+        subqueries, params = [], []
+        for keyword in keywords:
+            tokens = sorted(title_tokens(keyword))
+            if not tokens:
+                if match_all:
+                    continue
+                return None
+            subqueries.append(
+                f"SELECT story_id FROM story_title_tokens WHERE token IN ({','.join('?' * len(tokens))}) "
+                f"GROUP BY story_id HAVING COUNT(*) = ?"
+            )
+            params.extend(tokens)
+            params.append(len(tokens))
+
+        if not subqueries:
+            return None
+        return (' INTERSECT ' if match_all else ' UNION ').join(subqueries), params
+
+    def _index_titles(self, titles: Iterable[Tuple[int, str]]):
+        """
+        更新需求的标题索引（调用方持有锁并提交事务）
+
+        Args:
+            titles: (需求ID, 标题) 列表
+        """
+        titles = list(titles)
+        self._conn.executemany(
+            "DELETE FROM story_title_tokens WHERE story_id = ?", [(story_id,) for story_id, _ in titles]
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO story_title_tokens (token, story_id) VALUES (?, ?)",
+            [(token, story_id) for story_id, title in titles for token in title_tokens(title)]
+        )
+
+    def _ensure_title_index(self):
+        """标题索引不存在或分词规则变化时，根据已缓存的需求重建索引"""
+        if self.get_meta('stories.title_index') == TITLE_INDEX_VERSION:
+            return
+
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM stories").fetchall()
+            self._conn.execute("DELETE FROM story_title_tokens")
+            self._index_titles((row[0], json.loads(row[1]).get('title', '')) for row in rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('stories.title_index', ?)",
+                (TITLE_INDEX_VERSION,)
+            )
+            self._conn.commit()
+        if rows:
+            self.logger.info(f"已重建需求标题索引: {len(rows)} 个需求")
+
+    # ------------------------------------------------------------------
+    # 任务详情
+    # ------------------------------------------------------------------
+
+    def get_task_details(self, task_ids: Iterable[int], max_age: float) -> Dict[int, Dict]:
+        """
+        获取未过期的任务详情
+
+        Args:
+            task_ids: 任务ID列表
+            max_age: 最大缓存时长（秒）
+
+        Returns:
+            任务ID到详情的映射（只包含未过期的任务）
+        """
+        task_ids = [int(task_id) for task_id in task_ids]
+        if not task_ids:
+            return {}
+
+        min_fetched_at = time.time() - max_age
+        placeholders = ','.join('?' * len(task_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM task_details WHERE id IN ({placeholders}) AND fetched_at >= ?",
+                task_ids + [min_fetched_at]
+            ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def save_task_details(self, details: Dict[int, Dict]):
+        """
+        保存任务详情
+
+        Args:
+            details: 任务ID到详情的映射
+        """
+        now = time.time()
+        rows = [
+            (int(task_id), json.dumps(detail, ensure_ascii=False), now)
+            for task_id, detail in details.items() if detail
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO task_details (id, data, fetched_at) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # 项目 / 用户
+    # ------------------------------------------------------------------
+
+    def save_executions(self, executions: List[Dict]):
+        """保存执行/项目列表（整体替换）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM executions")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO executions (id, data) VALUES (?, ?)",
+                [(int(execution.get('id', 0)), json.dumps(execution, ensure_ascii=False))
+                 for execution in executions]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('executions.fetched_at', ?)",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+
+    def load_executions(self) -> Tuple[List[Dict], Optional[float]]:
+        """
+        加载执行/项目列表
+
+        Returns:
+            (项目列表, 获取时间戳)，从未保存过时时间戳为 None
+        """
+        fetched_at = self.get_meta('executions.fetched_at')
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM executions ORDER BY id").fetchall()
+        return [json.loads(row[0]) for row in rows], float(fetched_at) if fetched_at else None
+
+    def save_users(self, users: List[Dict]):
+        """保存用户列表（整体替换）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM users")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO users (id, account, data) VALUES (?, ?, ?)",
+                [(str(user.get('id', '')), user.get('account', ''), json.dumps(user, ensure_ascii=False))
+                 for user in users]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('users.fetched_at', ?)",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+
+    def load_users(self) -> Tuple[List[Dict], Optional[float]]:
+        """
+        加载用户列表
+
+        Returns:
+            (用户列表, 获取时间戳)，从未保存过时时间戳为 None
+        """
+        fetched_at = self.get_meta('users.fetched_at')
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM users").fetchall()
+        return [json.loads(row[0]) for row in rows], float(fetched_at) if fetched_at else None
+
+
+# 全局本地缓存实例
+_local_store = None
+
+
+def get_local_store() -> Optional[LocalStore]:
+    """
+    获取全局本地缓存实例
+
+    Returns:
+        LocalStore 实例，配置 cache.local_store.enabled 为 false 或初始化失败时返回 None
+    """
+    global _local_store
+    if _local_store is None:
+        store_config = get_config().get('cache.local_store', {}) or {}
+        if not store_config.get('enabled', False):
+            return None
+
+        db_path = SKILL_ROOT / store_config.get('path', '.cache/zentao.db')
+        try:
+            _local_store = LocalStore(str(db_path))
+        except Exception as e:
+            get_logger().warning(f"初始化本地缓存失败，将直接请求禅道: {str(e)}")
+            return None
+    return _local_store
@@ -0,0 +1,270 @@
+"""
+请求指标
+按接口族统计请求数、耗时直方图、响应字节数和重试次数，
+可导出为 JSON 或 Prometheus 文本格式
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 耗时直方图的桶上界（秒）
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 请求异常（连接失败、超时）和熔断拒绝时记录的状态
+STATUS_ERROR = 'error'
+STATUS_REJECTED = 'circuit_open'
+
+
+class _Series:
+    """单个（接口族, 方法, 状态）的统计"""
+
+    __slots__ = ('count', 'duration_sum', 'duration_max', 'bucket_counts', 'bytes_sum', 'retries_sum')
+
+    def __init__(self):
+        self.count = 0
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        # 每个桶单独计数（非累计），最后一个为 +Inf
+        self.bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.bytes_sum = 0
+        self.retries_sum = 0
+
+    def observe(self, duration: float, size: int, retries: int):
+        self.count += 1
+        self.duration_sum += duration
+        self.duration_max = max(self.duration_max, duration)
+        self.bucket_counts[_bucket_index(duration)] += 1
+        self.bytes_sum += size
+        self.retries_sum += retries
+
+
+def _bucket_index(duration: float) -> int:
+    for index, bound in enumerate(DURATION_BUCKETS):
+        if duration <= bound:
+            return index
+    return len(DURATION_BUCKETS)
+
+
+def _quantile(bucket_counts: List[int], q: float) -> Optional[float]:
+    """
+    按直方图估算分位数（取所在桶的上界）
+
+    Returns:
+        分位数（秒），落在 +Inf 桶时返回 None
+    """
+    total = sum(bucket_counts)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(bucket_counts):
+        seen += count
+        if seen >= rank:
+            return DURATION_BUCKETS[index] if index < len(DURATION_BUCKETS) else None
+    return None
+
+
+class RequestMetrics:
+    """
+    请求指标注册表
+    线程安全，客户端内所有会话共享
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: 是否记录指标
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+
+    def record(self, family: str, method: str, status, duration: float, size: int = 0, retries: int = 0):
+        """
+        记录一次请求
+
+        Args:
+            family: 接口族
+            method: 请求方法
+            status: HTTP 状态码，或 STATUS_ERROR / STATUS_REJECTED
+            duration: 耗时（秒，含重试）
+            size: 响应体字节数
+            retries: 重试次数
+        """
+        if not self.enabled:
+            return
+        key = (family, method.upper(), str(status))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.observe(duration, size, retries)
+
+    def reset(self):
+        """清空已记录的指标"""
+        with self._lock:
+            self._series.clear()
+
+    @property
+    def total_requests(self) -> int:
+        """已记录的请求总数"""
+        with self._lock:
+            return sum(series.count for series in self._series.values())
+
+    def snapshot(self) -> Dict:
+        """
+        导出为可 JSON 序列化的字典
+
+        Returns:
+            {'buckets': [...], 'series': [...], 'families': {...}}，
+            series 为每个（接口族, 方法, 状态）的明细，families 为按接口族的汇总
+        """
+        with self._lock:
+            items = [
+                (key, series.count, series.duration_sum, series.duration_max,
+                 list(series.bucket_counts), series.bytes_sum, series.retries_sum)
+                for key, series in sorted(self._series.items())
+            ]
+
+        series_list = []
+        families: Dict[str, Dict] = {}
+        for (family, method, status), count, duration_sum, duration_max, buckets, bytes_sum, retries_sum in items:
+            series_list.append({
+                'family': family,
+                'method': method,
+                'status': status,
+                'count': count,
+                'duration_sum': round(duration_sum, 6),
+                'duration_max': round(duration_max, 6),
+                'bucket_counts': buckets,
+                'bytes': bytes_sum,
+                'retries': retries_sum,
+            })
+
+            summary = families.setdefault(family, {
+                'count': 0, 'errors': 0, 'duration_sum': 0.0, 'duration_max': 0.0,
+                'bucket_counts': [0] * len(buckets), 'bytes': 0, 'retries': 0,
+            })
+            summary['count'] += count
+            if not status.isdigit() or int(status) >= 400:
+                summary['errors'] += count
+            summary['duration_sum'] += duration_sum
+            summary['duration_max'] = max(summary['duration_max'], duration_max)
+            summary['bucket_counts'] = [a + b for a, b in zip(summary['bucket_counts'], buckets)]
+            summary['bytes'] += bytes_sum
+            summary['retries'] += retries_sum
+
+        for summary in families.values():
+            summary['duration_sum'] = round(summary['duration_sum'], 6)
+            summary['duration_max'] = round(summary['duration_max'], 6)
+            summary['p50'] = _quantile(summary['bucket_counts'], 0.5)
+            summary['p95'] = _quantile(summary['bucket_counts'], 0.95)
+
+        return {'buckets': list(DURATION_BUCKETS), 'series': series_list, 'families': families}
+
+    def to_prometheus(self, prefix: str = 'zentao_http') -> str:
+        """
+        导出为 Prometheus 文本格式
+
+        Args:
+            prefix: 指标名前缀
+
+        Returns:
+            Prometheus 文本
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds 禅道请求耗时（含重试）",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for item in snapshot['series']:
+            labels = f'family="{item["family"]}",method="{item["method"]}",status="{item["status"]}"'
+            cumulative = 0
+            for bound, count in zip(snapshot['buckets'], item['bucket_counts']):
+                cumulative += count
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {item["count"]}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {item["duration_sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {item["count"]}')
+
+        for name, field, help_text in (
+            ('response_bytes_total', 'bytes', '禅道响应体字节数'),
+            ('retries_total', 'retries', '禅道请求重试次数'),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for item in snapshot['series']:
+                labels = f'family="{item["family"]}",method="{item["method"]}",status="{item["status"]}"'
+                lines.append(f'{prefix}_{name}{{{labels}}} {item[field]}')
+
+        return "\n".join(lines) + "\n"
+
+    def format_table(self) -> str:
+        """
+        格式化为按接口族的耗时明细表（按总耗时降序）
+
+        Returns:
+            格式化的文本
+        """
+        families = self.snapshot()['families']
+        if not families:
+            return "没有记录到禅道请求"
+
+        def format_ms(value: Optional[float]) -> str:
+            return '>30000' if value is None else f"{value * 1000:.0f}"
+
+        lines = []
+        lines.append("=" * 92)
+        lines.append(
+            f"{'接口族':<28} {'请求数':>6} {'失败':>5} {'重试':>5} {'总耗时(ms)':>11} "
+            f"{'P50(ms)':>8} {'P95(ms)':>8} {'最大(ms)':>9} {'字节数':>10}"
+        )
+        lines.append("-" * 92)
+        ordered = sorted(families.items(), key=lambda item: item[1]['duration_sum'], reverse=True)
+        for family, summary in ordered:
+            lines.append(
+                f"{family:<28} {summary['count']:>6} {summary['errors']:>5} {summary['retries']:>5} "
+                f"{summary['duration_sum'] * 1000:>11.1f} {format_ms(summary['p50']):>8} "
+                f"{format_ms(summary['p95']):>8} {summary['duration_max'] * 1000:>9.1f} {summary['bytes']:>10}"
+            )
+        lines.append("-" * 92)
+        total_count = sum(summary['count'] for summary in families.values())
+        total_duration = sum(summary['duration_sum'] for summary in families.values())
+        total_bytes = sum(summary['bytes'] for summary in families.values())
+        lines.append(f"合计: {total_count} 个请求，累计耗时 {total_duration * 1000:.1f}ms，{total_bytes} 字节")
+        lines.append("=" * 92)
+        return "\n".join(lines)
+
+    def export(self, fmt: str = 'table') -> str:
+        """
+        按格式导出
+
+        Args:
+            fmt: table / json / prometheus
+
+        Returns:
+            导出的文本
+        """
+        if fmt == 'json':
+            return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        if fmt == 'prometheus':
+            return self.to_prometheus()
+        return self.format_table()
+
+    def dump(self, path: Path, fmt: str = 'json') -> Path:
+        """
+        导出到文件
+
+        Args:
+            path: 文件路径
+            fmt: json / prometheus
+
+        Returns:
+            文件路径
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.export(fmt), encoding='utf-8')
+        return path
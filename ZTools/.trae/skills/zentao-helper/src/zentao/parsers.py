@@ -0,0 +1,787 @@
+"""
+禅道接口解析层
+封装禅道 8.x 响应的 HTML/JSON 解码和请求表单构造，同步客户端和异步客户端共享，
+不涉及网络 I/O
+
+写操作的解析函数接收"类响应对象"，只需提供 status_code、url、text 属性和 json() 方法，
+requests.Response 和异步客户端的 HttpResult 都满足要求
+"""
+
+import html
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from ..utils.logger import get_logger
+from ..utils.response import ApiResponse, ErrorCode
+
+
+# ------------------------------------------------------------------
+# 通用
+# ------------------------------------------------------------------
+
+def unwrap_data(result: Dict) -> Optional[Any]:
+    """
+    解码禅道 8.x JSON 响应的 data 字段
+
+    禅道 8.x 的 JSON 接口返回 {"status": "success", "data": "<JSON 字符串>"}
+
+    Args:
+        result: 响应 JSON
+
+    Returns:
+        解码后的数据，status 不是 success 或没有 data 字段时返回 None
+
+    Raises:
+        ValueError: data 字段不是合法的 JSON
+    """
+    if result.get('status') == 'success' and 'data' in result:
+        return json.loads(result['data'])
+    return None
+
+
+# 会话失效时禅道对 JSON 接口返回的登录跳转脚本，如 <script>self.location='/user-login-xxx.html';</script>
+LOGIN_SCRIPT_PATTERN = re.compile(r'<script[^>]*>[^<]*user-login', re.IGNORECASE)
+
+
+def is_login_script_page(url: str, content_type: Optional[str], body) -> bool:
+    """
+    是否是会话失效时 JSON 接口返回的登录跳转页面
+
+    会话失效后请求 .json 接口，禅道不跳转也不返回 401，而是返回 200 的 text/html 页面，
+    由页面中的脚本跳转到 user-login。只有 .json 接口的 HTML 响应才会解码响应体
+
+    Args:
+        url: 请求地址
+        content_type: 响应的 Content-Type
+        body: 响应体（bytes 或 str）
+
+    Returns:
+        是否是登录跳转页面
+    """
+    path = url.split('?', 1)[0]
+    if not path.endswith('.json') or 'text/html' not in (content_type or '').lower():
+        return False
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    return LOGIN_SCRIPT_PATTERN.search(body or '') is not None
+
+
+def parse_pager_total(data: Any) -> Optional[int]:
+    """
+    读取列表接口分页信息中的记录总数
+
+    禅道 8.x 列表接口的 data 中带有 pager（recTotal、recPerPage、pageID），
+    部分版本或接口没有 pager
+
+    Args:
+        data: 列表接口解码后的数据
+
+    Returns:
+        记录总数，没有分页信息时返回 None
+    """
+    pager = data.get('pager') if isinstance(data, dict) else None
+    if not isinstance(pager, dict):
+        return None
+    try:
+        total = int(pager.get('recTotal'))
+    except (TypeError, ValueError):
+        return None
+    return total if total >= 0 else None
+
+
+def parse_products(data: Any) -> Dict[str, int]:
+    """
+    从 product-all 数据中提取产品名称到产品ID的映射
+
+    禅道 8.x 的 products 为 {产品ID: 产品名称}，productStats 为产品对象列表（或以ID为键的字典），
+    两者都会读取；同名产品取先出现的
+
+    Args:
+        data: product-all 接口解码后的数据
+
+    Returns:
+        {产品名称: 产品ID}
+    """
+    if not isinstance(data, dict):
+        return {}
+
+    products: Dict[str, int] = {}
+
+    def add(product_id: Any, name: Any):
+        try:
+            product_id = int(product_id)
+        except (TypeError, ValueError):
+            return
+        if isinstance(name, str) and name and product_id > 0:
+            products.setdefault(name, product_id)
+
+    pairs = data.get('products')
+    if isinstance(pairs, dict):
+        for product_id, name in pairs.items():
+            if isinstance(name, dict):
+                add(name.get('id', product_id), name.get('name'))
+            else:
+                add(product_id, name)
+
+    for key in ('products', 'productStats'):
+        items = data.get(key)
+        if isinstance(items, dict) and key == 'productStats':
+            items = list(items.values())
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict):
+                    add(item.get('id'), item.get('name'))
+
+    return products
+
+
+def _build_execution(project: Dict) -> Dict:
+    """将项目数据转换为统一格式"""
+    return {
+        'id': int(project.get('id', 0)),
+        'name': project.get('name', ''),
+        'status': project.get('status', ''),
+        'begin': project.get('begin', ''),
+        'end': project.get('end', '')
+    }
+
+
+def parse_executions(projects_data: Any) -> List[Dict]:
+    """
+    从 my-project 数据中提取进行中的执行/项目（过滤掉已完成和已关闭的项目）
+
+    projects 字段可能是项目列表、单个项目，或以项目ID为键的字典（值为项目对象或项目名称）
+
+    Args:
+        projects_data: my-project 接口解码后的数据
+
+    Returns:
+        执行/项目列表
+    """
+    executions = []
+
+    # 尝试不同的数据结构
+    if isinstance(projects_data, dict) and 'projects' in projects_data:
+        projects_list = projects_data['projects']
+    else:
+        # 如果没有 projects 字段，尝试直接使用 projects_data
+        projects_list = projects_data
+
+    # 如果是列表格式
+    if isinstance(projects_list, list):
+        for project in projects_list:
+            # 过滤掉已完成(done)和已关闭(closed)的项目
+            if project.get('status', '') in ['done', 'closed']:
+                continue
+            executions.append(_build_execution(project))
+    # 如果是字典格式，尝试不同的结构
+    elif isinstance(projects_list, dict):
+        # 首先检查字典是否包含 id 和 name 字段
+        if 'id' in projects_list and 'name' in projects_list:
+            # 这是一个单个项目的字典
+            if projects_list.get('status', '') not in ['done', 'closed']:
+                executions.append(_build_execution(projects_list))
+        else:
+            # 尝试遍历字典的键值对
+            for key, value in projects_list.items():
+                # 检查值是否是字典且包含 id 和 name 字段
+                if isinstance(value, dict) and 'id' in value and 'name' in value:
+                    if value.get('status', '') not in ['done', 'closed']:
+                        executions.append(_build_execution(value))
+                # 检查值是否是字符串，尝试将 key 作为 id
+                elif isinstance(value, str):
+                    try:
+                        project_id = int(key)
+                    except ValueError:
+                        # key 不是数字，跳过
+                        continue
+                    executions.append({'id': project_id, 'name': value, 'status': '', 'begin': '', 'end': ''})
+
+    return executions
+
+
+# ------------------------------------------------------------------
+# 任务
+# ------------------------------------------------------------------
+
+def parse_task_select_html(html_text: str) -> List[Dict]:
+    """
+    解析任务选择框 HTML，提取任务信息
+
+    Args:
+        html_text: HTML 内容
+
+    Returns:
+        任务列表
+    """
+    tasks = []
+
+    # 匹配 <option value='taskID'>任务标题</option>
+    pattern = r"<option value='(\d+)'>(.*?)</option>"
+    matches = re.findall(pattern, html_text, re.DOTALL)
+
+    for task_id, task_title in matches:
+        # 解码 HTML 实体
+        task_title = html.unescape(task_title.strip())
+
+        # 尝试解析任务标题格式：项目 / 任务名称
+        parts = task_title.split(' / ', 1)
+        if len(parts) == 2:
+            project_name = parts[0]
+            task_name = parts[1]
+        else:
+            project_name = ''
+            task_name = task_title
+
+        tasks.append({
+            'id': int(task_id),
+            'name': task_name,
+            'project_name': project_name,
+            'title': task_title,
+            'status': 'unknown',  # HTML 中不包含状态信息
+            'assignedTo': 'me'
+        })
+
+    return tasks
+
+
+def parse_task_detail(task_data: Dict, task_url: str) -> Dict:
+    """
+    从 task-view 数据中提取任务列表需要的字段
+
+    Args:
+        task_data: task-view 接口解码后的数据
+        task_url: 任务的禅道链接
+
+    Returns:
+        任务详细信息字典，包含创建时间、截止时间、状态等
+    """
+    detail = {}
+
+    # 创建时间 - 从 task 对象中获取 openedDate
+    if 'task' in task_data:
+        task = task_data['task']
+        detail['created_at'] = task.get('openedDate', '')
+
+        # 截止时间 - 从 task 对象中获取
+        deadline = task.get('deadline', '')
+        if deadline and deadline != '0000-00-00':
+            detail['deadline'] = deadline
+
+        # 任务状态
+        detail['status'] = task.get('status', 'unknown')
+
+    # 禅道链接
+    detail['url'] = task_url
+
+    return detail
+
+
+def build_task_summary(task: Dict) -> Dict:
+    """
+    将 task-view 数据中的 task 对象转换为任务详情
+
+    Args:
+        task: task-view 数据中的 task 对象
+
+    Returns:
+        任务详情字典
+    """
+    return {
+        'id': task.get('id', 0),
+        'title': task.get('name', ''),
+        'status': task.get('status', ''),
+        'priority': task.get('pri', 0),
+        'assigned_to': task.get('assignedTo', ''),
+        'opened_by': task.get('openedBy', ''),
+        'opened_date': task.get('openedDate', ''),
+        'estimate': task.get('estimate', 0),
+        'execution': task.get('execution', 0),
+        'project': task.get('project', 0),
+        'parent': task.get('parent', 0)
+    }
+
+
+def build_task_create_form(name: str, assigned_to: str = None, estimate: float = 0,
+                           deadline: str = None, parent_id: int = None, story_id: int = None) -> Dict:
+    """
+    构造 task-create 表单
+
+    Args:
+        name: 任务名称
+        assigned_to: 指派给（用户名）
+        estimate: 预计工时
+        deadline: 截止日期 (格式: YYYY-MM-DD)
+        parent_id: 父任务ID（用于创建子任务）
+        story_id: 需求ID（用于从需求创建任务）
+
+    Returns:
+        表单数据
+    """
+    form_data = {
+        'name': name,
+        'type': 'devel' if not parent_id else 'devel',  # 任务类型
+        'pri': 3,  # 优先级 (1-4)
+        'estimate': estimate if estimate else '',
+        'assignedTo[]': assigned_to if assigned_to else '',  # 注意：禅道8.x使用数组格式
+        'module': 0,  # 模块ID
+        'estStarted': '',  # 预计开始时间
+        'desc': '',
+        'mailto[]': '',  # 抄送给
+        'after': 'toTaskList',  # 创建后跳转到任务列表
+    }
+
+    # 如果有父任务，添加 parent 字段
+    if parent_id:
+        form_data['parent'] = parent_id
+
+    # 如果有关联的需求，添加 story 字段
+    if story_id:
+        form_data['story'] = story_id
+
+    # 如果有截止日期
+    if deadline:
+        form_data['deadline'] = deadline
+
+    return form_data
+
+
+def parse_task_create_response(response, name: str, base_url: str) -> ApiResponse:
+    """
+    解析 task-create 的响应
+
+    Args:
+        response: 类响应对象
+        name: 任务名称
+        base_url: 禅道地址
+
+    Returns:
+        创建结果
+    """
+    logger = get_logger()
+
+    if response.status_code != 200:
+        logger.error(f"创建任务失败: HTTP {response.status_code}")
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            f"创建任务失败: HTTP {response.status_code}"
+        )
+
+    # 检查是否创建成功（通常重定向到任务列表或任务详情）
+    # 禅道创建成功后通常会跳转到 project-task-{execution_id}.html
+    if 'project-task' in response.url or 'task-view' in response.url:
+        # 尝试从 URL 中提取新创建的任务ID
+        task_id_match = re.search(r'task-view-(\d+)\.html', response.url)
+        if task_id_match:
+            task_id = int(task_id_match.group(1))
+            logger.info(f"任务创建成功: #{task_id}")
+            return ApiResponse.success_response({
+                'id': task_id,
+                'name': name,
+                'url': f"{base_url}/task-view-{task_id}.html"
+            })
+
+        # 创建成功但无法获取任务ID
+        logger.info("任务创建成功")
+        return ApiResponse.success_response({
+            'name': name,
+            'message': '任务创建成功'
+        })
+
+    # 检查页面内容是否包含错误信息
+    if 'error' in response.text.lower() or '错误' in response.text:
+        logger.error("任务创建失败: 页面返回错误")
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            "任务创建失败，请检查参数"
+        )
+
+    # 可能是创建成功，但无法确定
+    return ApiResponse.success_response({
+        'name': name,
+        'message': '任务可能已创建成功，请检查任务列表'
+    })
+
+
+def parse_task_assign_response(response, task_id: int, username: str) -> ApiResponse:
+    """
+    解析 task-assign 的响应
+
+    Args:
+        response: 类响应对象
+        task_id: 任务ID
+        username: 用户名
+
+    Returns:
+        分配结果
+    """
+    logger = get_logger()
+
+    if response.status_code != 200:
+        logger.error(f"分配任务失败: HTTP {response.status_code}")
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            f"分配任务失败: HTTP {response.status_code}"
+        )
+
+    # 检查是否分配成功
+    if 'execution-task' in response.url or 'task-view' in response.url:
+        logger.info(f"任务 #{task_id} 分配成功")
+        return ApiResponse.success_response({
+            'task_id': task_id,
+            'assigned_to': username,
+            'message': f'任务已成功分配给 {username}'
+        })
+
+    return ApiResponse.error_response(
+        ErrorCode.API_ERROR,
+        "任务分配可能失败，请检查任务状态"
+    )
+
+
+# ------------------------------------------------------------------
+# 需求
+# ------------------------------------------------------------------
+
+def build_story_list_item(story: Dict) -> Dict:
+    """
+    将需求列表接口返回的原始需求转换为统一格式
+
+    Args:
+        story: 原始需求数据
+
+    Returns:
+        需求字典
+    """
+    return {
+        'id': story.get('id'),
+        'title': story.get('title'),
+        'status': story.get('status'),
+        'stage': story.get('stage'),
+        'assigned_to': story.get('assignedTo'),
+        'opened_by': story.get('openedBy'),
+        'opened_date': story.get('openedDate'),
+        'pri': story.get('pri'),
+        'estimate': story.get('estimate'),
+        'product': story.get('productTitle', ''),
+        'plan': story.get('planTitle', '')
+    }
+
+
+def build_story_summary(story: Dict) -> Dict:
+    """
+    将原始需求转换为需求摘要（my-story 备用接口和批量查询需求详情使用）
+
+    Args:
+        story: 原始需求数据
+
+    Returns:
+        需求字典
+    """
+    # 处理计划字段（可能是字典或字符串）
+    plan = story.get('planTitle', '')
+    if isinstance(plan, dict):
+        plan = list(plan.values())[0] if plan else ''
+
+    return {
+        'id': story.get('id', 0),
+        'title': story.get('title', ''),
+        'status': story.get('status', ''),
+        'priority': story.get('pri', 0),
+        'assigned_to': story.get('assignedTo', ''),
+        'opened_by': story.get('openedBy', ''),
+        'opened_date': story.get('openedDate', ''),
+        'product': story.get('productTitle', ''),
+        'plan': plan,
+        'stage': story.get('stage', ''),
+        'estimate': story.get('estimate', 0)
+    }
+
+
+def parse_story_page(data: Any) -> Optional[tuple]:
+    """
+    从需求列表接口（my-story-assignedTo、product-browse）数据中提取一页需求
+
+    Args:
+        data: 需求列表接口解码后的数据
+
+    Returns:
+        (原始需求列表, 分页信息中的需求总数)，没有需求时返回 None
+    """
+    stories = data.get('stories') if isinstance(data, dict) else None
+    if not stories:
+        return None
+    if isinstance(stories, dict):
+        # 产品浏览接口的需求以ID为键
+        stories = list(stories.values())
+    return stories, parse_pager_total(data)
+
+
+def parse_story_detail(story_data: Any, story_id: int) -> Optional[Dict]:
+    """
+    从 story-view 数据中提取需求详情
+
+    Args:
+        story_data: story-view 接口解码后的数据
+        story_id: 需求ID（用于日志）
+
+    Returns:
+        需求详情字典，数据中没有需求信息时返回 None
+    """
+    logger = get_logger()
+
+    story = None
+    # 尝试不同的数据结构
+    if 'story' in story_data:
+        story = story_data['story']
+    elif isinstance(story_data, dict):
+        # 如果 story_data 本身就是 story 数据
+        story = story_data
+
+    if not story:
+        return None
+
+    # 处理计划字段（可能是字典或字符串）
+    plan = story.get('planTitle', '')
+    if isinstance(plan, dict):
+        plan = list(plan.values())[0] if plan else ''
+
+    # 获取关联的执行/项目ID
+    # 禅道8.x中，需求可能关联多个执行（项目）
+    execution_id = 0
+    execution_name = ''
+    executions = []
+
+    # 方式1: 从 executions 数组获取
+    if 'executions' in story:
+        executions = story['executions']
+        if executions and isinstance(executions, list) and len(executions) > 0:
+            # 取第一个执行（项目）
+            first_exec = executions[0] if isinstance(executions[0], dict) else {'id': executions[0]}
+            execution_id = first_exec.get('id', 0) if isinstance(first_exec, dict) else int(first_exec)
+            execution_name = first_exec.get('name', '') if isinstance(first_exec, dict) else ''
+    # 方式2: 从 plan 字段获取（可能是字典）
+    elif 'plan' in story and isinstance(story['plan'], dict):
+        plan_keys = list(story['plan'].keys())
+        if plan_keys:
+            execution_id = int(plan_keys[0])
+    # 方式3: 直接从 execution 字段获取
+    elif 'execution' in story:
+        execution_id = story['execution']
+
+    logger.info(f"需求 #{story_id} 关联的执行ID: {execution_id}, 执行名称: {execution_name}")
+
+    return {
+        'id': story.get('id', 0),
+        'title': story.get('title', ''),
+        'content': story.get('spec', ''),  # 禅道API使用spec字段存储需求内容
+        'status': story.get('status', ''),
+        'priority': story.get('pri', 0),
+        'assigned_to': story.get('assignedTo', ''),
+        'opened_by': story.get('openedBy', ''),
+        'opened_date': story.get('openedDate', ''),
+        'product': story.get('productTitle', ''),
+        'product_id': story.get('product', 0),
+        'plan': plan,
+        'stage': story.get('stage', ''),
+        'estimate': story.get('estimate', 0),
+        'execution': execution_id,
+        'execution_name': execution_name,
+        'executions': executions
+    }
+
+
+def _is_valid_task(task: Dict) -> bool:
+    """任务是否未删除（deleted 字段为 '1' 表示已删除）"""
+    return task.get('deleted') != '1' and task.get('deleted') != 1
+
+
+def count_valid_tasks(story: Dict, story_id: int) -> Optional[int]:
+    """
+    统计需求关联的有效任务数量（排除已删除的任务）
+
+    Args:
+        story: story-view 数据中的 story 对象
+        story_id: 需求ID（用于日志）
+
+    Returns:
+        有效任务数量，tasks 字段格式无法识别时返回 None
+    """
+    logger = get_logger()
+    tasks = story.get('tasks', {})
+    # 逐个任务的调试日志开销较大，只在输出调试日志时构造
+    debug = logger.is_enabled_for('debug')
+
+    # 调试日志：打印任务数据结构
+    if debug:
+        logger.debug(f"需求 #{story_id} 任务数据类型: {type(tasks)}")
+        logger.debug(f"需求 #{story_id} 任务数据: {tasks}")
+
+    # tasks 是字典格式: {project_id: [task_list]}
+    if isinstance(tasks, dict):
+        total_tasks = 0
+        for project_id, project_tasks in tasks.items():
+            if debug:
+                logger.debug(f"项目 {project_id} 任务数: {len(project_tasks) if isinstance(project_tasks, list) else 'N/A'}")
+            if isinstance(project_tasks, list):
+                if debug:
+                    for task in project_tasks:
+                        logger.debug(f"  任务 #{task.get('id')}: deleted={task.get('deleted')}, status={task.get('status')}")
+                total_tasks += len([task for task in project_tasks if _is_valid_task(task)])
+        if debug:
+            logger.debug(f"需求 #{story_id} 有效任务数: {total_tasks}")
+        return total_tasks
+
+    if isinstance(tasks, list):
+        valid_count = len([task for task in tasks if _is_valid_task(task)])
+        if debug:
+            logger.debug(f"需求 #{story_id} 任务列表长度: {len(tasks)}")
+            logger.debug(f"需求 #{story_id} 有效任务数: {valid_count}")
+        return valid_count
+
+    return None
+
+
+def build_story_review_form(story_data: Dict, result: str = 'pass', assigned_to: str = None,
+                            estimate: float = None, comment: str = '') -> Dict:
+    """
+    构造 story-review 表单
+
+    Args:
+        story_data: 需求详情（parse_story_detail 的返回值）
+        result: 评审结果 ('pass' 通过, 'revert' 撤销变更, 'clarify' 有待明确)
+        assigned_to: 指派给（用户名）
+        estimate: 预计工时
+        comment: 评审备注
+
+    Returns:
+        表单数据
+    """
+    return {
+        'result': result,
+        'assignedTo': assigned_to if assigned_to else story_data.get('assigned_to', ''),
+        'estimate': estimate if estimate else story_data.get('estimate', 0),
+        'reviewedDate': '',  # 空字符串表示今天
+        'comment': comment if comment else '需求已评审，准备开发',
+    }
+
+
+def parse_story_review_response(response, story_id: int, result: str) -> ApiResponse:
+    """
+    解析 story-review 的响应
+
+    Args:
+        response: 类响应对象
+        story_id: 需求ID
+        result: 评审结果
+
+    Returns:
+        评审结果
+    """
+    logger = get_logger()
+
+    if response.status_code != 200:
+        logger.error(f"评审需求失败: HTTP {response.status_code}")
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            f"评审需求失败: HTTP {response.status_code}"
+        )
+
+    success = ApiResponse.success_response({
+        'story_id': story_id,
+        'result': result,
+        'message': '需求评审成功'
+    })
+
+    # 检查响应（禅道通常会返回重定向脚本）
+    if 'parent.location' in response.text or 'story-view' in response.text:
+        logger.info(f"需求 #{story_id} 评审成功")
+        return success
+
+    try:
+        result_data = response.json()
+    except ValueError:
+        logger.info(f"需求 #{story_id} 可能已评审成功")
+        return ApiResponse.success_response({
+            'story_id': story_id,
+            'result': result,
+            'message': '需求可能已评审成功'
+        })
+
+    if result_data.get('status') == 'success' or result_data.get('result') == 'success':
+        logger.info(f"需求 #{story_id} 评审成功")
+        return success
+
+    error_msg = result_data.get('message', result_data.get('reason', '评审失败'))
+    logger.error(f"需求评审失败: {error_msg}")
+    return ApiResponse.error_response(
+        ErrorCode.API_ERROR,
+        f"需求评审失败: {error_msg}"
+    )
+
+
+def parse_link_story_response(response, story_id: int, execution_id: int) -> ApiResponse:
+    """
+    解析 project-linkStory 的响应
+
+    Args:
+        response: 类响应对象
+        story_id: 需求ID
+        execution_id: 项目ID
+
+    Returns:
+        关联结果
+    """
+    logger = get_logger()
+
+    if response.status_code != 200:
+        logger.error(f"关联需求到项目失败: HTTP {response.status_code}")
+        return ApiResponse.error_response(
+            ErrorCode.API_ERROR,
+            f"关联需求到项目失败: HTTP {response.status_code}"
+        )
+
+    try:
+        result = response.json()
+    except ValueError:
+        # 禅道 8.x 经常返回 HTML 页面而不是 JSON
+        # 检查响应内容中是否包含错误提示
+        response_text = response.text.lower()
+        error_keywords = ['error', '失败', '错误', 'denied', 'permission', '无权']
+        has_error = any(keyword in response_text for keyword in error_keywords)
+
+        # 检查是否包含成功相关的提示
+        success_keywords = ['success', '成功', 'linkstory', '关联', 'linked']
+        has_success = any(keyword in response_text for keyword in success_keywords)
+
+        if has_error and not has_success:
+            logger.warning("关联需求到项目返回错误页面")
+            return ApiResponse.error_response(
+                ErrorCode.API_ERROR,
+                "关联需求到项目失败: 返回错误页面"
+            )
+
+        # 对于 HTML 响应，如果没有明显的错误提示，认为可能成功
+        # 禅道经常返回跳转页面或成功页面
+        logger.info(f"✓ 需求 #{story_id} 已关联到项目 #{execution_id} (HTML响应)")
+        return ApiResponse.success_response({
+            'story_id': story_id,
+            'execution_id': execution_id,
+            'message': f'需求 #{story_id} 已关联到项目 #{execution_id}'
+        })
+
+    if result.get('status') == 'success':
+        logger.info(f"✓ 需求 #{story_id} 已成功关联到项目 #{execution_id}")
+        return ApiResponse.success_response({
+            'story_id': story_id,
+            'execution_id': execution_id,
+            'message': f'需求 #{story_id} 已成功关联到项目 #{execution_id}'
+        })
+
+    error_msg = result.get('message', '未知错误')
+    logger.warning(f"关联需求到项目失败: {error_msg}")
+    return ApiResponse.error_response(
+        ErrorCode.API_ERROR,
+        f"关联需求到项目失败: {error_msg}"
+    )
@@ -0,0 +1,300 @@
+"""
+HTTP 响应缓存
+缓存只读接口（story-view、task-view、my-project、user-ajaxGetUser 等）的 GET 响应，
+按登录账号和 URL 隔离，内存 + SQLite 两级存储，过期后用 ETag/Last-Modified 条件请求重新验证
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ..utils.logger import get_logger
+from .endpoints import endpoint_family
+
+
+SKILL_ROOT = Path(__file__).parent.parent.parent
+
+# POST 请求的模块对应需要失效的接口族（未列出的模块使所有缓存失效）
+INVALIDATES: Dict[str, Iterable[str]] = {
+    'story': ('story-view',),
+    'task': ('task-view', 'story-view'),
+    'project': ('story-view', 'my-project'),
+    'execution': ('story-view', 'my-project'),
+    'user': ('user-ajaxGetUser',),
+}
+
+# 不修改数据的 POST 接口族
+NON_MUTATING_FAMILIES = {'user-login'}
+
+# 不随缓存响应保存的响应头（响应体已解压，cookie 不重放）
+_DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'set-cookie', 'connection'}
+
+
+@dataclass
+class CachedResponse:
+    """缓存的响应"""
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float = field(default_factory=time.time)
+
+    def header(self, name: str) -> Optional[str]:
+        """获取响应头（不区分大小写）"""
+        name = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return None
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.header('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.header('Last-Modified')
+
+    @property
+    def has_validator(self) -> bool:
+        """是否可以条件请求重新验证"""
+        return bool(self.etag or self.last_modified)
+
+
+class ResponseCache:
+    """
+    HTTP 响应缓存
+    线程安全；未绑定账号时不缓存，避免串用他人数据
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            account TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            stored_at REAL NOT NULL,
+            PRIMARY KEY (account, url)
+        );
+    """
+
+    def __init__(self, ttls: Dict[str, float], db_path: Optional[str] = None,
+                 max_entries: int = 2000, max_age: float = 86400):
+        """
+        初始化响应缓存
+
+        Args:
+            ttls: 接口族到缓存有效期（秒）的映射，未列出的接口族不缓存；
+                有效期为 0 表示每次都条件请求重新验证
+            db_path: SQLite 文件路径，为空时只使用内存
+            max_entries: 内存中最多保留的响应数
+            max_age: 磁盘中响应的最长保留时间（秒），超过后在启动时清理
+        """
+        self.logger = get_logger()
+        self.ttls = {family: float(ttl) for family, ttl in (ttls or {}).items() if ttl is not None}
+        self.max_entries = max_entries
+        self.account: Optional[str] = None
+
+        self._lock = threading.RLock()
+        self._memory: 'OrderedDict[tuple, CachedResponse]' = OrderedDict()
+        # 每次失效递增，请求开始后发生过失效的响应不写入缓存
+        self._generation = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.executescript(self.SCHEMA)
+                self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - max_age,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"初始化响应缓存文件失败，只使用内存缓存: {str(e)}")
+                self._conn = None
+
+    @property
+    def generation(self) -> int:
+        """当前失效代数"""
+        return self._generation
+
+    def ttl_for(self, url: str) -> Optional[float]:
+        """
+        获取请求地址的缓存有效期
+
+        Returns:
+            有效期（秒），不缓存时返回 None
+        """
+        if not self.account:
+            return None
+        return self.ttls.get(endpoint_family(url))
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """获取当前账号下该地址的缓存响应（不判断是否过期）"""
+        key = (self.account, url)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT status, headers, body, stored_at FROM responses WHERE account = ? AND url = ?", key
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning(f"读取响应缓存失败: {str(e)}")
+                return None
+            if row is None:
+                return None
+            entry = CachedResponse(row[0], json.loads(row[1]), bytes(row[2]), row[3])
+            self._remember(key, entry)
+            return entry
+
+    @staticmethod
+    def is_cacheable(body: bytes, url: str = '') -> bool:
+        """
+        响应体是否可以缓存
+
+        禅道在业务失败（如数据不存在、无权限）时同样返回 200，JSON 的 status 不是 success 的响应不缓存；
+        会话失效时 .json 接口返回 200 的登录跳转脚本页面，.json 接口的非 JSON 响应体同样不缓存
+
+        Args:
+            body: 响应体
+            url: 请求地址
+        """
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return not url.split('?', 1)[0].endswith('.json')
+        return not isinstance(payload, dict) or payload.get('status', 'success') == 'success'
+
+    @staticmethod
+    def is_fresh(entry: CachedResponse, ttl: float) -> bool:
+        """缓存响应是否仍在有效期内"""
+        return time.time() - entry.stored_at < ttl
+
+    def put(self, url: str, status_code: int, headers: Dict[str, str], body: bytes,
+            generation: Optional[int] = None):
+        """
+        写入缓存
+
+        Args:
+            url: 请求地址
+            status_code: 状态码
+            headers: 响应头
+            body: 响应体
+            generation: 发出请求时的失效代数，期间发生过失效则不写入
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            key = (self.account, url)
+            headers = {name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS}
+            entry = CachedResponse(status_code, headers, body)
+            self._remember(key, entry)
+            self._write(key, entry)
+
+    def touch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        条件请求返回 304 后刷新缓存时间（并合并新的验证头）
+
+        Returns:
+            刷新后的缓存响应，缓存已被失效时返回 None
+        """
+        with self._lock:
+            entry = self.get(url)
+            if entry is None:
+                return None
+            for name in ('ETag', 'Last-Modified'):
+                value = (headers or {}).get(name)
+                if value:
+                    entry.headers = {key: old for key, old in entry.headers.items() if key.lower() != name.lower()}
+                    entry.headers[name] = value
+            entry.stored_at = time.time()
+            self._write((self.account, url), entry)
+            return entry
+
+    def invalidate_for(self, url: str):
+        """
+        POST 修改数据后使相关接口族的缓存失效
+
+        Args:
+            url: POST 请求地址
+        """
+        family = endpoint_family(url)
+        if family in NON_MUTATING_FAMILIES:
+            return
+        self.invalidate(INVALIDATES.get(family.split('-', 1)[0]))
+
+    def invalidate(self, families: Optional[Iterable[str]] = None):
+        """
+        使当前账号的缓存失效
+
+        Args:
+            families: 接口族列表，为 None 时使所有缓存失效
+        """
+        families = set(families) if families is not None else None
+        with self._lock:
+            self._generation += 1
+            keys = [
+                key for key in self._memory
+                if key[0] == self.account and (families is None or endpoint_family(key[1]) in families)
+            ]
+            for key in keys:
+                del self._memory[key]
+
+            if self._conn is None:
+                return
+            try:
+                if families is None:
+                    self._conn.execute("DELETE FROM responses WHERE account = ?", (self.account,))
+                else:
+                    rows = self._conn.execute("SELECT url FROM responses WHERE account = ?", (self.account,)).fetchall()
+                    urls = [(self.account, row[0]) for row in rows if endpoint_family(row[0]) in families]
+                    self._conn.executemany("DELETE FROM responses WHERE account = ? AND url = ?", urls)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"清除响应缓存失败: {str(e)}")
+
+    def clear(self):
+        """清空所有账号的缓存"""
+        with self._lock:
+            self._generation += 1
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+    def close(self):
+        """关闭缓存文件"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: tuple, entry: CachedResponse):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _write(self, key: tuple, entry: CachedResponse):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (account, url, status, headers, body, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key[0], key[1], entry.status_code, json.dumps(entry.headers), entry.body, entry.stored_at)
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"写入响应缓存失败: {str(e)}")
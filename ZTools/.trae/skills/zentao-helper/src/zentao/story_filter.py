@@ -0,0 +1,108 @@
+"""
+需求列表过滤条件
+在逐页获取需求时过滤，配合数量上限提前停止翻页
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+
+# 需求状态（status 字段）
+STORY_STATUSES = ('draft', 'active', 'closed', 'changed')
+
+# 需求阶段（stage 字段）
+STORY_STAGES = (
+    'wait', 'planned', 'projected', 'developing', 'developed', 'testing', 'tested', 'verified', 'released'
+)
+
+
+@dataclass(frozen=True)
+class StoryFilter:
+    """
+    需求过滤条件（作用于 build_story_list_item 转换后的需求）
+
+    各条件为空时不过滤
+    """
+    # 产品名称
+    products: Optional[Sequence[str]] = None
+    # 需求阶段（wait、planned、projected 等）
+    stages: Optional[Sequence[str]] = None
+    # 标题关键字，包含任一关键字即匹配（不区分大小写）
+    keywords: Optional[Sequence[str]] = None
+    # 需求状态（draft、active、closed、changed）
+    statuses: Optional[Sequence[str]] = None
+
+    def __post_init__(self):
+        # 预先转换为集合和小写关键字，过滤时不重复计算
+        object.__setattr__(self, '_products', frozenset(self.products) if self.products else None)
+        object.__setattr__(self, '_stages', frozenset(self.stages) if self.stages else None)
+        object.__setattr__(self, '_statuses', frozenset(self.statuses) if self.statuses else None)
+        object.__setattr__(
+            self, '_keywords', tuple(keyword.lower() for keyword in self.keywords) if self.keywords else None
+        )
+
+    def matches(self, story: Dict) -> bool:
+        """
+        需求是否满足过滤条件
+
+        Args:
+            story: 需求字典
+
+        Returns:
+            是否匹配
+        """
+        if self._products is not None and (story.get('product') or '') not in self._products:
+            return False
+        if self._stages is not None and story.get('stage') not in self._stages:
+            return False
+        if self._statuses is not None and story.get('status') not in self._statuses:
+            return False
+        if self._keywords is not None:
+            title = (story.get('title') or '').lower()
+            if not any(keyword in title for keyword in self._keywords):
+                return False
+        return True
+
+    def apply(self, stories: Iterable[Dict], limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        过滤需求，找到 limit 个后停止读取
+
+        Args:
+            stories: 需求（可以是逐页获取的生成器）
+            limit: 最多返回的需求数，为空则不限制
+
+        Yields:
+            匹配的需求
+        """
+        if limit is not None and limit <= 0:
+            return
+        matched = 0
+        for story in stories:
+            if not self.matches(story):
+                continue
+            yield story
+            matched += 1
+            if limit is not None and matched >= limit:
+                return
+
+
+def with_status(story_filter: Optional[StoryFilter], status: Optional[str]) -> StoryFilter:
+    """
+    把指令中的状态合并到过滤条件
+
+    需求状态（如 active）按 status 字段过滤，需求阶段（如 wait）按 stage 字段过滤；
+    all、为空或需求没有的状态（如从"进行中""已完成"识别出的任务状态 doing、done）不过滤
+
+    Args:
+        story_filter: 原过滤条件
+        status: 状态
+
+    Returns:
+        合并后的过滤条件
+    """
+    story_filter = story_filter or StoryFilter()
+    if status in STORY_STATUSES:
+        return replace(story_filter, statuses=[status])
+    if status in STORY_STAGES:
+        return replace(story_filter, stages=[status])
+    return story_filter
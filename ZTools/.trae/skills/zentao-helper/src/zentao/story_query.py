@@ -0,0 +1,66 @@
+"""
+需求查询计划
+把需求过滤条件转换为禅道 8.x 上最具选择性的列表接口，
+接口无法表达的条件留在本地过滤
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional, Tuple
+
+from .story_filter import StoryFilter
+
+
+# 获取方式：指派给我的全部需求 / 按产品浏览指派给我的需求
+SOURCE_MY_STORY = 'my-story'
+SOURCE_PRODUCT_BROWSE = 'product-browse'
+
+
+@dataclass(frozen=True)
+class StoryQueryPlan:
+    """需求查询计划"""
+    # 获取方式（SOURCE_MY_STORY / SOURCE_PRODUCT_BROWSE）
+    source: str
+    # 按产品浏览时的产品 (产品ID, 产品名称)
+    products: Tuple[Tuple[int, str], ...] = ()
+    # 需要在本地过滤的条件
+    residual: StoryFilter = field(default_factory=StoryFilter)
+
+    def describe(self) -> str:
+        """查询计划的说明（用于日志）"""
+        if self.source == SOURCE_PRODUCT_BROWSE:
+            names = '、'.join(name for _, name in self.products)
+            return f"按产品浏览指派给我的需求（{names}）"
+        return "获取指派给我的全部需求"
+
+
+def plan_story_query(story_filter: StoryFilter, product_ids: Optional[Dict[str, int]],
+                     max_products: int = 5) -> StoryQueryPlan:
+    """
+    生成需求查询计划
+
+    - 产品条件：所有产品都能解析为产品ID且产品数不超过 max_products 时，
+      改为逐个产品请求 product-browse（assignedtome），本地不再按产品过滤
+    - 阶段、标题关键字：8.x 的列表接口不支持与"指派给我"组合过滤（搜索需要先提交搜索表单），
+      始终在本地过滤
+
+    Args:
+        story_filter: 过滤条件
+        product_ids: 产品名称到产品ID的映射，获取失败时为 None
+        max_products: 下推产品条件的最大产品数（产品过多时逐个请求不如一次获取全部）
+
+    Returns:
+        查询计划
+    """
+    products = list(dict.fromkeys(story_filter.products or []))
+    if not products or not product_ids or len(products) > max_products:
+        return StoryQueryPlan(SOURCE_MY_STORY, residual=story_filter)
+
+    # 有产品无法解析为ID时不能下推，否则会漏掉该产品的需求
+    if any(name not in product_ids for name in products):
+        return StoryQueryPlan(SOURCE_MY_STORY, residual=story_filter)
+
+    return StoryQueryPlan(
+        SOURCE_PRODUCT_BROWSE,
+        products=tuple((int(product_ids[name]), name) for name in products),
+        residual=replace(story_filter, products=None)
+    )
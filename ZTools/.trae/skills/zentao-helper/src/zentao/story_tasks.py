@@ -0,0 +1,85 @@
+"""
+需求与任务的关联索引
+根据项目任务列表批量建立需求到任务的映射，
+查询"未创建任务的需求"时不需要逐个请求需求详情
+"""
+
+import threading
+from typing import Dict, Iterable, List, Set
+
+
+class StoryTaskIndex:
+    """
+    需求到任务的关联索引
+    只包含建立索引时扫描过的项目中未删除的任务，创建任务后通过 add 增量更新
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, Set[int]] = {}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Dict]) -> 'StoryTaskIndex':
+        """
+        根据任务列表建立索引
+
+        Args:
+            tasks: 项目任务列表中的任务（包含 id、story、deleted 字段）
+
+        Returns:
+            索引
+        """
+        index = cls()
+        for task in tasks:
+            if task.get('deleted') in ('1', 1):
+                continue
+            index.add(task.get('story'), task.get('id'))
+        return index
+
+    def __len__(self) -> int:
+        """已关联任务的需求数"""
+        with self._lock:
+            return len(self._tasks)
+
+    def add(self, story_id, task_id):
+        """
+        记录需求关联的任务（需求ID为空或 0 时忽略）
+
+        Args:
+            story_id: 需求ID
+            task_id: 任务ID
+        """
+        try:
+            story_id, task_id = int(story_id or 0), int(task_id or 0)
+        except (TypeError, ValueError):
+            return
+        if story_id <= 0 or task_id <= 0:
+            return
+        with self._lock:
+            self._tasks.setdefault(story_id, set()).add(task_id)
+
+    def task_count(self, story_id: int) -> int:
+        """
+        需求关联的任务数
+
+        Args:
+            story_id: 需求ID
+
+        Returns:
+            任务数，索引中没有该需求时为 0
+        """
+        with self._lock:
+            return len(self._tasks.get(int(story_id), ()))
+
+    def stories_without_tasks(self, story_ids: Iterable[int]) -> List[int]:
+        """
+        筛选索引中没有关联任务的需求
+
+        Args:
+            story_ids: 需求ID列表
+
+        Returns:
+            没有关联任务的需求ID（保持输入顺序）
+        """
+        with self._lock:
+            return [story_id for story_id in story_ids if int(story_id) not in self._tasks]
@@ -0,0 +1,56 @@
+"""
+需求标题分词
+为本地缓存的需求标题倒排索引生成词元：
+- 连续的文字（汉字、字母、数字）按二元组切分，如"首页面板" -> 首页、页面、面板
+- 【特2】、[前端] 这类标签整体作为一个词元
+
+标题包含关键字时，关键字的所有词元必然都在标题的词元中，
+因此按词元求交集得到的是候选集合，再用子串匹配确认即可得到精确结果
+"""
+
+import re
+from typing import Iterable, Set
+
+
+# 分词规则变化时递增，本地缓存据此重建索引
+TITLE_INDEX_VERSION = '1'
+
+_TAG_PATTERN = re.compile(r'【[^【】]+】|\[[^\[\]]+\]')
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def title_tokens(text: str) -> Set[str]:
+    """
+    切分标题或关键字
+
+    单个字符的文字不生成词元（无法与所在的较长文字的二元组对应），
+    只由单个字符组成的关键字不能通过索引缩小范围
+
+    Args:
+        text: 标题或关键字
+
+    Returns:
+        词元集合
+    """
+    text = (text or '').lower()
+    tokens = set(_TAG_PATTERN.findall(text))
+    for word in _WORD_PATTERN.findall(text):
+        tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def title_matches(title: str, keywords: Iterable[str], match_all: bool = False) -> bool:
+    """
+    标题是否包含关键字（不区分大小写，与 StoryFilter 的匹配规则一致）
+
+    Args:
+        title: 需求标题
+        keywords: 关键字
+        match_all: True 时需要包含所有关键字，否则包含任一关键字即可
+
+    Returns:
+        是否匹配
+    """
+    title = (title or '').lower()
+    found = (keyword.lower() in title for keyword in keywords)
+    return all(found) if match_all else any(found)
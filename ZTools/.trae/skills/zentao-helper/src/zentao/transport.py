@@ -0,0 +1,172 @@
+"""
+禅道 HTTP 传输层
+在 requests 连接适配器上实现只读接口响应缓存、按接口族熔断和请求指标统计
+"""
+
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import MaxRetryError
+
+from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from .endpoints import endpoint_family
+from .metrics import RequestMetrics, STATUS_ERROR, STATUS_REJECTED
+from .response_cache import CachedResponse, ResponseCache
+
+
+class ZentaoHTTPAdapter(HTTPAdapter):
+    """
+    禅道连接适配器
+
+    urllib3 的重试在 send 内部完成，因此一次 send 调用（含重试）计为一次熔断统计；
+    连接失败、超时和 5xx 响应计为失败；请求指标同样按一次 send 调用记录，重试次数取自 urllib3 的重试记录。
+    响应缓存在最外层：命中未过期缓存时不发请求，也不计入熔断和请求指标
+    """
+
+    def __init__(self, circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 metrics: Optional[RequestMetrics] = None,
+                 response_cache: Optional[ResponseCache] = None, **kwargs):
+        """
+        Args:
+            circuit_breakers: 熔断器注册表，为 None 时不熔断
+            metrics: 请求指标注册表，为 None 时不统计
+            response_cache: 只读接口的响应缓存，为 None 时不缓存
+            **kwargs: 传给 HTTPAdapter 的参数
+        """
+        self.circuit_breakers = circuit_breakers
+        self.metrics = metrics
+        self.response_cache = response_cache
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        cache = self.response_cache
+        if cache is None:
+            return self._send_with_metrics(request, **kwargs)
+
+        if request.method != 'GET':
+            # 修改数据的请求不走缓存，完成后（无论成败）使相关缓存失效
+            try:
+                return self._send_with_metrics(request, **kwargs)
+            finally:
+                if request.method not in ('HEAD', 'OPTIONS'):
+                    cache.invalidate_for(request.url)
+
+        ttl = cache.ttl_for(request.url)
+        if ttl is None or kwargs.get('stream'):
+            return self._send_with_metrics(request, **kwargs)
+        return self._send_cached(cache, ttl, request, **kwargs)
+
+    def _send_cached(self, cache: ResponseCache, ttl: float, request: requests.PreparedRequest,
+                     **kwargs) -> requests.Response:
+        """
+        带缓存发送只读 GET 请求
+
+        未过期直接返回缓存；过期且有 ETag/Last-Modified 时发条件请求，304 则刷新缓存时间
+        """
+        generation = cache.generation
+        entry = cache.get(request.url)
+        if entry is not None and cache.is_fresh(entry, ttl):
+            return self._build_response(request, entry)
+
+        conditional = entry is not None and entry.has_validator
+        if conditional:
+            if entry.etag:
+                request.headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request.headers['If-Modified-Since'] = entry.last_modified
+
+        response = self._send_with_metrics(request, **kwargs)
+
+        if conditional:
+            request.headers.pop('If-None-Match', None)
+            request.headers.pop('If-Modified-Since', None)
+            if response.status_code == 304:
+                refreshed = cache.touch(request.url, response.headers)
+                if refreshed is not None:
+                    return self._build_response(request, refreshed)
+                # 等待期间缓存已被 POST 失效，重新完整请求
+                return self._send_with_metrics(request, **kwargs)
+
+        if response.status_code == 200 and cache.is_cacheable(response.content, request.url):
+            cache.put(request.url, response.status_code, response.headers, response.content, generation)
+        return response
+
+    @staticmethod
+    def _build_response(request: requests.PreparedRequest, entry: CachedResponse) -> requests.Response:
+        """用缓存构造响应"""
+        response = requests.Response()
+        response.status_code = entry.status_code
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.from_cache = True
+        return response
+
+    def _send_with_metrics(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.metrics is None or not self.metrics.enabled:
+            return self._send_with_breaker(request, **kwargs)
+
+        family = endpoint_family(request.url)
+        start = time.perf_counter()
+        try:
+            response = self._send_with_breaker(request, **kwargs)
+            # 非流式请求在这里读取响应体，耗时包含下载时间（requests 随后也会立即读取）
+            if kwargs.get('stream'):
+                size = int(response.headers.get('Content-Length') or 0)
+            else:
+                size = len(response.content)
+        except CircuitOpenError:
+            self.metrics.record(family, request.method, STATUS_REJECTED, time.perf_counter() - start)
+            raise
+        except requests.RequestException as e:
+            self.metrics.record(family, request.method, STATUS_ERROR, time.perf_counter() - start,
+                                retries=self._exhausted_retries(e))
+            raise
+
+        self.metrics.record(family, request.method, response.status_code, time.perf_counter() - start,
+                            size=size, retries=self._retry_count(response))
+        return response
+
+    def _send_with_breaker(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.circuit_breakers is None:
+            return super().send(request, **kwargs)
+
+        breaker = self.circuit_breakers.get(endpoint_family(request.url))
+        breaker.before_request()
+
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            raise
+        except Exception:
+            # 与服务端健康无关的异常（如地址错误）不计入统计
+            breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    @staticmethod
+    def _retry_count(response: requests.Response) -> int:
+        """从 urllib3 的重试记录中取重试次数（重定向由 requests 处理，不计入）"""
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        history = getattr(retries, 'history', None)
+        return len(history) if isinstance(history, tuple) else 0
+
+    def _exhausted_retries(self, error: Exception) -> int:
+        """重试耗尽（MaxRetryError）时返回配置的重试次数"""
+        if error.args and isinstance(error.args[0], MaxRetryError):
+            total = getattr(self.max_retries, 'total', 0)
+            return total if isinstance(total, int) else 0
+        return 0
@@ -0,0 +1,217 @@
+"""
+用户目录
+按账号、姓名和姓名拼音首字母建立索引，提供精确匹配和前缀搜索，
+用于指派任务时在本地解析执行人
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .executions import normalize_name
+from .models import User
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # pypinyin 为可选依赖，未安装时按 GB2312 编码区间取首字母
+    lazy_pinyin = None
+
+
+# GB2312 一级汉字按拼音排序，各声母首字母对应的起始区位码
+_GB2312_INITIALS = (
+    (45217, 'a'), (45253, 'b'), (45761, 'c'), (46318, 'd'), (46826, 'e'), (47010, 'f'),
+    (47297, 'g'), (47614, 'h'), (48119, 'j'), (49062, 'k'), (49324, 'l'), (49896, 'm'),
+    (50371, 'n'), (50614, 'o'), (50622, 'p'), (50906, 'q'), (51387, 'r'), (51446, 's'),
+    (52218, 't'), (52698, 'w'), (52980, 'x'), (53689, 'y'), (54481, 'z'),
+)
+_GB2312_STARTS = [start for start, _ in _GB2312_INITIALS]
+# 一级汉字的结束区位码（二级汉字按部首排序，无法推算拼音）
+_GB2312_LEVEL1_END = 55289
+
+
+def _char_initial(char: str) -> str:
+    """单个字符的拼音首字母（字母和数字原样返回，无法识别时返回空字符串）"""
+    if char.isascii():
+        return char.lower() if char.isalnum() else ''
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(encoded) != 2:
+        return ''
+    code = encoded[0] * 256 + encoded[1]
+    if code < _GB2312_STARTS[0] or code > _GB2312_LEVEL1_END:
+        return ''
+    return _GB2312_INITIALS[bisect.bisect_right(_GB2312_STARTS, code) - 1][1]
+
+
+def pinyin_initials(text: str) -> str:
+    """
+    获取姓名的拼音首字母，例如 "张三" -> "zs"
+
+    安装了 pypinyin 时使用其结果（支持生僻字），否则按 GB2312 一级汉字推算
+
+    Args:
+        text: 姓名
+
+    Returns:
+        小写的拼音首字母，无法识别的字符被忽略
+    """
+    text = normalize_name(text)
+    if not text:
+        return ''
+    if lazy_pinyin is not None:
+        return ''.join(
+            char for part in lazy_pinyin(text, style=Style.FIRST_LETTER)
+            for char in part.lower() if char.isascii() and char.isalnum()
+        )
+    return ''.join(_char_initial(char) for char in text)
+
+
+class UserDirectory:
+    """
+    用户目录
+    索引在首次查询时建立，查询结果按关键字缓存
+    """
+
+    def __init__(self, users: Dict[str, User]):
+        """
+        Args:
+            users: 用户ID到用户对象的映射
+        """
+        self.users = users
+        self._lock = threading.Lock()
+        self._indexed = False
+        self._order: Dict[int, int] = {}
+        self._by_account: Dict[str, User] = {}
+        self._by_realname: Dict[str, List[User]] = {}
+        self._by_initials: Dict[str, List[User]] = {}
+        # (索引键, 用户在目录中的位置)，按索引键排序，用于前缀查找
+        self._sorted: List[tuple] = []
+        self._sorted_keys: List[str] = []
+        self._search_cache: Dict[str, List[User]] = {}
+
+    @classmethod
+    def from_api(cls, users: Iterable[Dict]) -> 'UserDirectory':
+        """
+        从 user-ajaxGetUser 接口（或本地缓存）的用户数据创建目录
+
+        Args:
+            users: 用户数据列表
+
+        Returns:
+            用户目录
+        """
+        directory = {}
+        for user_data in users:
+            user = User.from_api(user_data)
+            directory[str(user.id)] = user
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def get(self, account: str) -> Optional[User]:
+        """
+        按账号获取用户（不区分大小写）
+
+        Args:
+            account: 禅道账号
+
+        Returns:
+            用户对象，不存在时返回 None
+        """
+        self._ensure_index()
+        return self._by_account.get(normalize_name(account))
+
+    def resolve(self, name: str) -> List[User]:
+        """
+        精确解析账号、姓名或姓名拼音首字母
+
+        账号或姓名完全匹配的用户优先，没有时才按拼音首字母匹配（"zs" -> 张三）
+
+        Args:
+            name: 账号、姓名或拼音首字母
+
+        Returns:
+            匹配的用户列表（按目录顺序）
+        """
+        self._ensure_index()
+        key = normalize_name(name)
+        if not key:
+            return []
+        exact = list(self._by_realname.get(key, []))
+        user = self._by_account.get(key)
+        if user is not None and user not in exact:
+            exact.append(user)
+        if exact:
+            return self._in_order(exact)
+        return list(self._by_initials.get(key, []))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[User]:
+        """
+        搜索用户，结果按匹配程度排序
+
+        账号/姓名/拼音首字母前缀匹配 > 账号/姓名包含匹配，同一优先级按目录顺序
+
+        Args:
+            query: 搜索内容
+            limit: 最多返回的用户数，为空则不限制
+
+        Returns:
+            匹配的用户列表
+        """
+        self._ensure_index()
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        matches = self._search_cache.get(key)
+        if matches is None:
+            users = list(self.users.values())
+            prefixed = self._prefix_positions(key)
+            contained = [
+                position for position, user in enumerate(users)
+                if position not in prefixed
+                and (key in normalize_name(user.account) or key in normalize_name(user.realname))
+            ]
+            matches = [users[position] for position in sorted(prefixed) + contained]
+            self._search_cache[key] = matches
+        return list(matches if limit is None else matches[:limit])
+
+    def _ensure_index(self):
+        """建立索引（只建立一次）"""
+        if self._indexed:
+            return
+        with self._lock:
+            if self._indexed:
+                return
+            keys = []
+            for position, user in enumerate(self.users.values()):
+                self._order[id(user)] = position
+                account = normalize_name(user.account)
+                realname = normalize_name(user.realname)
+                initials = pinyin_initials(user.realname)
+                if account:
+                    self._by_account.setdefault(account, user)
+                if realname:
+                    self._by_realname.setdefault(realname, []).append(user)
+                if initials:
+                    self._by_initials.setdefault(initials, []).append(user)
+                keys.extend((key, position) for key in {account, realname, initials} if key)
+            self._sorted = sorted(keys)
+            self._sorted_keys = [key for key, _ in self._sorted]
+            self._indexed = True
+
+    def _prefix_positions(self, key: str) -> set:
+        """账号、姓名或拼音首字母以 key 开头的用户在目录中的位置"""
+        start = bisect.bisect_left(self._sorted_keys, key)
+        positions = set()
+        for name, position in self._sorted[start:]:
+            if not name.startswith(key):
+                break
+            positions.add(position)
+        return positions
+
+    def _in_order(self, users: List[User]) -> List[User]:
+        return sorted(users, key=lambda user: self._order[id(user)])
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+端到端测试：真实的 ZentaoApiClient / ZenTaoHelperSkill 对接本地模拟禅道
+"""
+
+import json
+
+import pytest
+
+import src.utils.config_loader as config_loader
+from src.utils.config_loader import ConfigLoader
+from src.zentao.api_client import ZentaoApiClient
+from tests.support.fake_zentao import FakeZentaoServer
+
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def fresh_config(monkeypatch):
+    """使用独立的配置实例，测试中的配置修改不影响其他测试"""
+    config = ConfigLoader()
+    config.load()
+    config.config.setdefault('cache', {}).setdefault('local_store', {})['enabled'] = False
+    config.config.setdefault('daemon', {})['enabled'] = False
+    config.config.setdefault('zentao', {}).setdefault('response_cache', {})['path'] = ''
+    monkeypatch.setattr(config_loader, '_config_loader', config)
+    return config
+
+
+@pytest.fixture
+def server():
+    with FakeZentaoServer(story_count=250, task_count=12) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fresh_config, server):
+    client = ZentaoApiClient()
+    client.base_url = server.base_url
+    assert client.login('zhuxu', 'password').success
+    server.reset_counts()
+    return client
+
+
+class TestFakeZentaoClient:
+    """测试客户端对接模拟禅道"""
+
+    def test_get_my_stories_paginated(self, client, server):
+        """测试分页获取全部需求"""
+        result = client.get_my_stories()
+
+        assert result.success
+        assert result.data['total'] == 250
+        assert len({story['id'] for story in result.data['stories']}) == 250
+        assert sum(server.request_counts.values()) >= 2
+
+    def test_story_pages_fetched_concurrently(self, client, server):
+        """测试模拟禅道按传入的记录总数返回分页信息时，剩余页仍按总数并发获取"""
+        from unittest.mock import patch
+        from src.utils.concurrency import prefetch_map
+
+        with patch('src.zentao.api_client.prefetch_map', wraps=prefetch_map) as mock_prefetch:
+            pages = list(client.iter_my_story_pages())
+
+        assert [len(page) for page in pages] == [200, 50]
+        mock_prefetch.assert_called_once()
+        assert server.request_counts['my-story'] == 2
+
+    def test_get_my_tasks(self, client):
+        """测试获取我的任务"""
+        result = client.get_my_tasks(with_detail=False)
+
+        assert result.success
+        assert len(result.data['tasks']) == 12
+
+    def test_create_and_assign_task(self, client, server):
+        """测试创建并分配任务"""
+        create_result = client.create_task(execution_id=1, name='【研发】测试任务', story_id=1000)
+        assert create_result.success
+        task_id = int(create_result.data['id'])
+        assert server.state.tasks[task_id]['story'] == 1000
+
+        assign_result = client.assign_task(task_id, 'user1')
+        assert assign_result.success
+        assert server.state.tasks[task_id]['assignedTo'] == 'user1'
+
+    def test_injected_server_error(self, client, server):
+        """测试注入的 5xx 错误返回错误响应"""
+        server.inject_error('story-view', status=500, times=10)
+
+        result = client.get_story(1000)
+
+        assert not result.success
+        assert server.request_counts['story-view'] >= 1
+
+    def test_search_user(self, client):
+        """测试搜索用户"""
+        result = client.search_user('user1')
+
+        assert result.success
+        assert result.data[0]['account'] == 'user1'
+
+
+class TestBenchmarkSmoke:
+    """基准测试脚本冒烟测试"""
+
+    def test_run_benchmarks(self, fresh_config):
+        """测试小数据量下所有场景执行成功"""
+        from benchmarks.bench_skill import compare, format_report, run_benchmarks
+
+        report = run_benchmarks(sizes=[5], repeat=1)
+
+        failures = {item['intent']: item['failures'] for item in report['results'] if item['failures']}
+        assert failures == {}
+        assert {item['intent'] for item in report['results']} == {
+            'query_stories', 'query_unassigned_stories', 'query_tasks', 'split_task', 'assign_task'
+        }
+
+        comparisons = compare(report, report)
+        assert all(item['ratio'] == 1.0 for item in comparisons)
+        assert 'query_stories' in format_report(report, comparisons)
+
+
+class TestSkillStats:
+    """测试 Skill 输出请求指标"""
+
+    def test_execute_with_stats(self, fresh_config, server):
+        """测试 stats 参数返回本次指令的请求指标"""
+        from benchmarks.bench_skill import create_skill
+
+        skill = create_skill(server)
+        server.reset_counts()
+
+        result = skill.execute('查看我的需求', stats='json')
+
+        assert result['success']
+        families = json.loads(result['stats'])['families']
+        assert sum(item['count'] for item in families.values()) == sum(server.request_counts.values())
+
+
+class TestResponseCache:
+    """测试响应缓存对接模拟禅道"""
+
+    @pytest.fixture
+    def server(self):
+        with FakeZentaoServer(story_count=5, task_count=5, etag=True) as server:
+            yield server
+
+    def test_cached_and_revalidated(self, client, server):
+        """测试有效期内不重复请求，过期后条件请求返回 304，POST 后重新获取"""
+        assert client.get_story(1000).success
+        assert client.get_story(1000).success
+        assert server.request_counts['story-view'] == 1
+
+        client.response_cache.ttls['story-view'] = 0
+        assert client.get_story(1000).success
+        assert server.request_counts['story-view'] == 2
+        assert client.metrics.snapshot()['families']['story-view']['count'] == 2
+
+        assert client.update_story_title(1000, '特2 新标题').success
+        result = client.get_story(1000)
+        assert result.data['title'] == '特2 新标题'
+
+
+class TestStoryQueryPushdown:
+    """测试产品过滤下推对接模拟禅道"""
+
+    @pytest.fixture
+    def server(self):
+        with FakeZentaoServer(story_count=90, task_count=5, product_count=3) as server:
+            yield server
+
+    def test_pushdown_matches_client_side_filter(self, client, server):
+        """测试下推与本地过滤结果一致，且下推时只获取该产品的需求"""
+        from src.zentao.story_filter import StoryFilter
+
+        story_filter = StoryFilter(products=['产品2'])
+
+        client.story_pushdown = False
+        expected = client.get_my_stories(story_filter=story_filter)
+        assert server.request_counts['product-browse'] == 0
+
+        server.reset_counts()
+        client.story_pushdown = True
+        result = client.get_my_stories(story_filter=story_filter)
+
+        assert result.success
+        assert len(result.data['stories']) == 30
+        assert [story['id'] for story in result.data['stories']] == \
+            [story['id'] for story in expected.data['stories']]
+        assert {story['product'] for story in result.data['stories']} == {'产品2'}
+        assert server.request_counts['product-browse'] >= 1
+        assert server.request_counts['my-story'] == 0
+
+
+class TestStoryTaskIndex:
+    """测试需求与任务的关联索引对接模拟禅道"""
+
+    def test_counts_without_story_views(self, client, server):
+        """测试按项目批量获取任务统计任务数，与逐个请求需求详情的结果一致"""
+        story_ids = [1000 + i for i in range(30)]
+        client.story_task_index_enabled = False
+        expected = client.get_story_task_counts(story_ids)
+        assert server.request_counts['story-view'] == 30
+        server.reset_counts()
+
+        client.story_task_index_enabled = True
+        client.story_task_verify_missing = False
+        counts = client.get_story_task_counts(story_ids)
+
+        assert counts == expected
+        assert server.request_counts['story-view'] == 0
+        # 每个进行中的项目请求一次任务列表
+        assert server.request_counts['project-task'] == 2
+
+        assert client.create_task(execution_id=1, name='【研发】新任务', story_id=1001).success
+        assert client.get_story_task_counts([1001]) == {1001: 1}
+
+
+class TestLoginScript:
+    """测试会话失效时禅道返回登录跳转脚本页面"""
+
+    @pytest.fixture
+    def server(self):
+        with FakeZentaoServer(story_count=5, task_count=5, require_login=True, login_script=True) as server:
+            yield server
+
+    def test_session_verification_invalidated(self, client, server):
+        """测试 JSON 接口返回登录跳转脚本时会话验证状态失效"""
+        client.session.cookies.clear()
+        client.mark_session_verified()
+
+        result = client.get_story(1000)
+
+        assert not result.success
+        assert client.session_verified_at is None
+
+    def test_login_script_not_cached(self, client, server):
+        """测试会话失效时的登录跳转脚本不进入响应缓存，重新登录后正常获取数据"""
+        url = f'{server.base_url}/my-project.json'
+        client.session.cookies.clear()
+        expired = client.session.get(url)
+        assert 'user-login' in expired.text
+
+        assert client.login('zhuxu', 'password').success
+        server.reset_counts()
+        response = client.session.get(url)
+
+        assert response.json()['status'] == 'success'
+        assert not getattr(response, 'from_cache', False)
+        assert server.request_counts['my-project'] == 1
@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*-
+"""
+本地模拟禅道 8.x 服务
+模拟客户端用到的接口，用于端到端测试和性能基准测试，不访问真实禅道
+
+支持：
+    - 数据量: 需求数、任务数、用户数
+    - 延迟: 全局延迟或按接口族设置延迟
+    - 错误注入: 按接口族注入指定次数的错误状态码，或按比例随机返回 500
+    - 条件请求: 可选为 JSON 响应生成 ETag，If-None-Match 匹配时返回 304
+
+用法:
+    with FakeZentaoServer(story_count=100, task_count=50, latency=0.01) as server:
+        client = ZentaoApiClient()
+        client.base_url = server.base_url
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+from src.zentao.endpoints import endpoint_family
+
+
+PRODUCT_TITLE = '都江堰系统'
+
+
+class FakeZentaoState:
+    """模拟禅道的数据"""
+
+    PROJECTS = [
+        {'id': 1, 'name': '研发中心项目', 'status': 'doing', 'begin': '2024-01-01', 'end': '2024-12-31'},
+        {'id': 2, 'name': '运维项目', 'status': 'wait', 'begin': '2024-01-01', 'end': '2024-12-31'},
+        {'id': 3, 'name': '已关闭项目', 'status': 'closed', 'begin': '2023-01-01', 'end': '2023-12-31'},
+    ]
+    STAGES = ['planned', 'projected', 'wait', 'developing']
+    TASK_STATUSES = ['wait', 'doing', 'done']
+
+    def __init__(self, story_count: int = 10, task_count: int = 10, user_count: int = 20,
+                 product: str = PRODUCT_TITLE, title_prefix: str = '特2', product_count: int = 1):
+        self.lock = threading.RLock()
+
+        # 第一个产品为 product，需求按顺序轮流分配到各产品
+        self.products = {1: product}
+        for product_id in range(2, product_count + 1):
+            self.products[product_id] = f'产品{product_id}'
+
+        self.users = [{'id': 1, 'account': 'zhuxu', 'realname': '朱旭'}] + [
+            {'id': i + 1, 'account': f'user{i}', 'realname': f'用户{i}'}
+            for i in range(1, user_count)
+        ]
+
+        self.tasks: Dict[int, Dict] = {}
+        for i in range(task_count):
+            task_id = 5000 + i
+            self.tasks[task_id] = {
+                'id': task_id,
+                'project': 1,
+                'projectName': self.PROJECTS[0]['name'],
+                'name': f'开发任务{task_id}',
+                'status': self.TASK_STATUSES[i % len(self.TASK_STATUSES)],
+                'assignedTo': 'zhuxu',
+                'openedDate': '2024-01-01 09:00:00',
+                'deadline': '2024-02-01',
+                'story': 0,
+                'deleted': '0',
+            }
+
+        self.stories: Dict[int, Dict] = {}
+        for i in range(story_count):
+            story_id = 1000 + i
+            self.stories[story_id] = {
+                'id': str(story_id),
+                'title': f'{title_prefix} 需求{story_id}',
+                'spec': f'<p>需求{story_id}的描述</p>',
+                'status': 'active',
+                'stage': self.STAGES[i % len(self.STAGES)],
+                'pri': str(i % 4 + 1),
+                'estimate': '0',
+                'assignedTo': 'zhuxu',
+                'openedBy': 'zhuxu',
+                'openedDate': '2024-01-01 09:00:00',
+                'lastEditedDate': f'2024-01-{i % 28 + 1:02d} 10:00:00',
+                'product': str(i % product_count + 1),
+                'productTitle': self.products[i % product_count + 1],
+                'planTitle': '',
+                'version': '1',
+                'executions': [],
+                'tasks': {},
+            }
+            # 每三个需求中有一个已创建任务（指派给其他人）
+            if i % 3 == 0:
+                task_id = 9000 + i
+                self.stories[story_id]['executions'] = [{'id': 1, 'name': self.PROJECTS[0]['name']}]
+                self.stories[story_id]['tasks'] = {'1': [{'id': str(task_id), 'status': 'wait', 'deleted': '0'}]}
+                self.tasks[task_id] = {
+                    'id': task_id,
+                    'project': 1,
+                    'projectName': self.PROJECTS[0]['name'],
+                    'name': f'需求{story_id}开发',
+                    'status': 'wait',
+                    'assignedTo': 'user1',
+                    'openedDate': '2024-01-01 09:00:00',
+                    'deadline': '2024-02-01',
+                    'story': story_id,
+                    'deleted': '0',
+                }
+
+        self.next_task_id = 100000
+
+    def sorted_stories(self, order_by: str) -> List[Dict]:
+        """按排序方式返回需求列表"""
+        with self.lock:
+            stories = list(self.stories.values())
+        if order_by.startswith('lastEditedDate'):
+            return sorted(stories, key=lambda story: (story['lastEditedDate'], int(story['id'])), reverse=True)
+        return sorted(stories, key=lambda story: int(story['id']), reverse=True)
+
+    def create_task(self, execution_id: int, form: Dict[str, str]) -> int:
+        """创建任务，返回新任务ID"""
+        with self.lock:
+            task_id = self.next_task_id
+            self.next_task_id += 1
+            story_id = int(form.get('story') or 0)
+            self.tasks[task_id] = {
+                'id': task_id,
+                'project': execution_id,
+                'name': form.get('name', ''),
+                'status': 'wait',
+                'assignedTo': form.get('assignedTo', ''),
+                'openedDate': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'deadline': form.get('deadline') or '0000-00-00',
+                'story': story_id,
+                'deleted': '0',
+            }
+            story = self.stories.get(story_id)
+            if story is not None:
+                story['tasks'].setdefault(str(execution_id), []).append(
+                    {'id': str(task_id), 'status': 'wait', 'deleted': '0'}
+                )
+            return task_id
+
+
+class FakeZentaoServer:
+    """
+    本地模拟禅道服务
+    在 127.0.0.1 的随机端口上监听，可作为上下文管理器使用
+    """
+
+    def __init__(
+        self,
+        story_count: int = 10,
+        task_count: int = 10,
+        user_count: int = 20,
+        latency: Union[float, Dict[str, float]] = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        require_login: bool = False,
+        login_script: bool = False,
+        etag: bool = False,
+        **state_kwargs
+    ):
+        """
+        Args:
+            story_count: 指派给我的需求数
+            task_count: 指派给我的任务数
+            user_count: 用户数
+            latency: 每个请求的延迟（秒），或接口族到延迟的映射（'*' 为默认值）
+            error_rate: 随机返回 500 的比例（0~1）
+            seed: 随机数种子
+            require_login: 未登录（没有会话 cookie）的请求是否跳转到登录页
+            login_script: 未登录时 .json 接口是否像禅道一样返回 200 的登录跳转脚本页面，而不是 302 跳转
+            etag: JSON 响应是否带 ETag，并对 If-None-Match 匹配的请求返回 304
+            **state_kwargs: 传给 FakeZentaoState 的其他参数
+        """
+        self.state = FakeZentaoState(story_count, task_count, user_count, **state_kwargs)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.require_login = require_login
+        self.login_script = login_script
+        self.etag = etag
+        self.random = random.Random(seed)
+
+        self.request_counts: Counter = Counter()
+        self._injected_errors: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _FakeZentaoHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake_server = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """服务地址"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeZentaoServer':
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'FakeZentaoServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def inject_error(self, family: str, status: int = 500, times: int = 1):
+        """
+        为接口族注入错误
+
+        Args:
+            family: 接口族，如 story-view、task-create
+            status: 返回的状态码
+            times: 注入次数
+        """
+        with self._lock:
+            self._injected_errors.setdefault(family, []).extend([status] * times)
+
+    def reset_counts(self):
+        """清空请求计数"""
+        with self._lock:
+            self.request_counts.clear()
+
+    def _before_request(self, family: str) -> Optional[int]:
+        """记录请求、模拟延迟，返回需要注入的错误状态码"""
+        with self._lock:
+            self.request_counts[family] += 1
+            injected = self._injected_errors.get(family)
+            status = injected.pop(0) if injected else None
+            if status is None and self.error_rate and self.random.random() < self.error_rate:
+                status = 500
+
+        delay = self.latency.get(family, self.latency.get('*', 0.0)) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+        return status
+
+
+class _FakeZentaoHandler(BaseHTTPRequestHandler):
+    """模拟禅道请求处理器"""
+
+    protocol_version = 'HTTP/1.1'
+    # 响应头和响应体分两次写入，关闭 Nagle 算法避免额外的 40ms 延迟
+    disable_nagle_algorithm = True
+
+    # 路由：(方法, 正则, 处理方法名)
+    ROUTES = [
+        ('GET', r'user-login\.html', '_login_page'),
+        ('POST', r'user-login\.json', '_login'),
+        ('GET', r'my-index\.html', '_index'),
+        ('GET', r'user-ajaxGetUser\.json', '_users'),
+        ('GET', r'my-story-assignedTo-(\w+)-(\d+)-(\d+)-(\d+)\.json', '_my_stories'),
+        ('GET', r'my-story\.json', '_my_stories_recent'),
+        ('GET', r'product-all\.json', '_products'),
+        ('GET', r'product-browse-(\d+)-\d+-(\w+)-\w+-(\w+)-(\d+)-(\d+)-(\d+)\.json', '_product_stories'),
+        ('GET', r'task-ajaxGetUserTasks-(\w+)-0-(\w+)\.json', '_user_tasks'),
+        ('GET', r'project-task-(\d+)-(\w+)-\d+-\w+-(\d+)-(\d+)-(\d+)\.json', '_project_tasks'),
+        ('GET', r'task-view-(\d+)\.json', '_task_view'),
+        ('GET', r'task-view-(\d+)\.html', '_task_view_html'),
+        ('GET', r'story-view-(\d+)\.json', '_story_view'),
+        ('GET', r'my-project\.json', '_projects'),
+        ('POST', r'story-change-(\d+)\.json', '_story_change'),
+        ('POST', r'story-review-(\d+)\.json', '_story_review'),
+        ('POST', r'project-linkStory-(\d+)\.json', '_link_story'),
+        ('POST', r'task-create-(\d+)-0\.html', '_task_create'),
+        ('POST', r'task-assign-(\d+)\.html', '_task_assign'),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def fake(self) -> FakeZentaoServer:
+        return self.server.fake_server
+
+    @property
+    def state(self) -> FakeZentaoState:
+        return self.fake.state
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        name = parsed.path.rsplit('/', 1)[-1]
+        self.form = {}
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8') if length else ''
+            self.form = {key: values[-1] for key, values in parse_qs(body).items()}
+
+        status = self.fake._before_request(endpoint_family(self.path))
+        if status:
+            self._send(status, 'text/html', f'<h1>{status}</h1>')
+            return
+
+        if (self.fake.require_login and not name.startswith('user-login')
+                and 'zentaosid=' not in (self.headers.get('Cookie') or '')):
+            if self.fake.login_script and name.endswith('.json'):
+                self._send(200, 'text/html', "<script>self.location='/user-login.html';</script>")
+            else:
+                self._redirect('user-login.html')
+            return
+
+        for route_method, pattern, handler in self.ROUTES:
+            match = re.fullmatch(pattern, name)
+            if route_method == method and match:
+                getattr(self, handler)(*match.groups())
+                return
+
+        self._send(404, 'text/html', '<h1>404</h1>')
+
+    # ------------------------------------------------------------------
+    # 响应
+    # ------------------------------------------------------------------
+
+    def _send(self, status: int, content_type: str, body: str, headers: Optional[Dict] = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload, ensure_ascii=False)
+        if self.fake.etag and self.command == 'GET':
+            etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            headers = dict(headers or {}, ETag=etag)
+        self._send(200, 'application/json', body, headers)
+
+    def _data(self, data):
+        """禅道 8.x 格式：data 字段是 JSON 字符串"""
+        self._json({'status': 'success', 'data': json.dumps(data, ensure_ascii=False)})
+
+    def _redirect(self, location: str):
+        self.send_response(302)
+        self.send_header('Location', f'/{location}')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    # ------------------------------------------------------------------
+    # 接口
+    # ------------------------------------------------------------------
+
+    def _login_page(self):
+        self._send(200, 'text/html', '<form></form>', {'Set-Cookie': 'zentaosid=fake-session; Path=/'})
+
+    def _login(self):
+        if not self.form.get('account') or not self.form.get('password'):
+            self._json({'status': 'failed', 'reason': '用户名或密码错误'})
+            return
+        self._json({'status': 'success'}, {'Set-Cookie': 'zentaosid=fake-session; Path=/'})
+
+    def _index(self):
+        self._send(200, 'text/html', '<html>我的地盘</html>')
+
+    def _users(self):
+        self._json({'status': 'success', 'users': self.state.users})
+
+    @staticmethod
+    def _pager(total: str, records: list, limit: int, page: int) -> dict:
+        """分页信息：与禅道一致，传入的记录总数为 0 时才查询总数，否则原样返回"""
+        return {'recTotal': int(total) or len(records), 'recPerPage': limit, 'pageID': page}
+
+    def _my_stories(self, order_by: str, total: str, limit: str, page: str):
+        limit, page = int(limit), int(page)
+        stories = self.state.sorted_stories(order_by)
+        start = (page - 1) * limit
+        self._data({'stories': stories[start:start + limit], 'pager': self._pager(total, stories, limit, page)})
+
+    def _products(self):
+        self._data({'products': {str(product_id): name for product_id, name in self.state.products.items()}})
+
+    def _product_stories(self, product_id: str, browse_type: str, order_by: str, total: str, limit: str,
+                         page: str):
+        """按产品浏览需求：需求以ID为键，没有 productTitle"""
+        limit, page = int(limit), int(page)
+        stories = [
+            {key: value for key, value in story.items() if key != 'productTitle'}
+            for story in self.state.sorted_stories(order_by)
+            if story['product'] == product_id and (browse_type != 'assignedtome' or story['assignedTo'] == 'zhuxu')
+        ]
+        start = (page - 1) * limit
+        self._data({
+            'stories': {story['id']: story for story in stories[start:start + limit]},
+            'pager': self._pager(total, stories, limit, page),
+        })
+
+    def _my_stories_recent(self):
+        self._data({'stories': self.state.sorted_stories('id_desc')[:20]})
+
+    def _user_tasks(self, account: str, status: str):
+        with self.state.lock:
+            tasks = [
+                task for task in self.state.tasks.values()
+                if task['assignedTo'] == account and (status == 'all' or task['status'] == status)
+            ]
+        options = ''.join(
+            f"<option value='{task['id']}'>{task.get('projectName', '研发中心项目')} / {task['name']}</option>"
+            for task in tasks
+        )
+        self._send(200, 'application/json', f"<select id='task'>{options}</select>")
+
+    def _project_tasks(self, project_id: str, browse_type: str, total: str, limit: str, page: str):
+        """项目任务列表：任务以ID为键，带分页信息"""
+        limit, page = int(limit), int(page)
+        with self.state.lock:
+            tasks = sorted(
+                (task for task in self.state.tasks.values()
+                 if task['project'] == int(project_id) and task['deleted'] != '1'),
+                key=lambda task: task['id'], reverse=True
+            )
+        start = (page - 1) * limit
+        self._data({
+            'tasks': {str(task['id']): task for task in tasks[start:start + limit]},
+            'pager': self._pager(total, tasks, limit, page),
+        })
+
+    def _task_view(self, task_id: str):
+        task = self.state.tasks.get(int(task_id))
+        if task is None:
+            self._json({'status': 'failed', 'message': '任务不存在'})
+            return
+        self._data({'task': task, 'project': {'id': task['project']}})
+
+    def _task_view_html(self, task_id: str):
+        self._send(200, 'text/html', f'<html>任务 #{task_id}</html>')
+
+    def _story_view(self, story_id: str):
+        story = self.state.stories.get(int(story_id))
+        if story is None:
+            self._json({'status': 'failed', 'message': '需求不存在'})
+            return
+        with self.state.lock:
+            self._data({'story': story})
+
+    def _projects(self):
+        self._data({'projects': self.state.PROJECTS})
+
+    def _story_change(self, story_id: str):
+        story = self.state.stories.get(int(story_id))
+        if story is None:
+            self._json({'status': 'failed', 'message': '需求不存在'})
+            return
+        with self.state.lock:
+            story['title'] = self.form.get('title', story['title'])
+            story['status'] = 'changed'
+            story['lastEditedDate'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        self._json({'status': 'success'})
+
+    def _story_review(self, story_id: str):
+        story = self.state.stories.get(int(story_id))
+        if story is None:
+            self._json({'status': 'failed', 'message': '需求不存在'})
+            return
+        with self.state.lock:
+            story['status'] = 'active'
+        self._json({'status': 'success'})
+
+    def _link_story(self, execution_id: str):
+        story = self.state.stories.get(int(self.form.get('stories[]') or 0))
+        if story is None:
+            self._json({'status': 'failed', 'message': '需求不存在'})
+            return
+        with self.state.lock:
+            project = next((p for p in self.state.PROJECTS if p['id'] == int(execution_id)), None)
+            if project and not story['executions']:
+                story['executions'] = [{'id': project['id'], 'name': project['name']}]
+        self._json({'status': 'success'})
+
+    def _task_create(self, execution_id: str):
+        if not self.form.get('name'):
+            self._send(200, 'text/html', '<script>alert("错误: 任务名称不能为空")</script>')
+            return
+        task_id = self.state.create_task(int(execution_id), self.form)
+        self._redirect(f'task-view-{task_id}.html')
+
+    def _task_assign(self, task_id: str):
+        task = self.state.tasks.get(int(task_id))
+        if task is None:
+            self._send(200, 'text/html', '<script>alert("错误: 任务不存在")</script>')
+            return
+        with self.state.lock:
+            task['assignedTo'] = self.form.get('assignedTo', '')
+        self._redirect(f'task-view-{task_id}.html')
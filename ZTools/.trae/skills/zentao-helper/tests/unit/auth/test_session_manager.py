@@ -4,6 +4,7 @@
 """
 
 import json
+import time
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock, mock_open
@@ -437,4 +438,90 @@ class TestSessionManager:
                 assert result is True
                 mock_save.assert_called_once_with(session_data)
 
+    class TestVerifiedAt:
+        """测试会话验证时间"""
 
+        def test_get_verified_at_missing(self, session_manager, mock_config):
+            """测试没有验证记录"""
+            assert session_manager.get_verified_at({'user': 'test_user'}) is None
+
+        def test_get_verified_at_within_interval(self, session_manager, mock_config):
+            """测试有效期内的验证记录"""
+            # Arrange
+            mock_config.return_value.get_session_config.return_value = {'check_interval': 300}
+            verified_at = time.time() - 10
+
+            # Act
+            result = session_manager.get_verified_at({'verified_at': verified_at})
+
+            # Assert
+            assert result == verified_at
+
+        def test_get_verified_at_expired(self, session_manager, mock_config):
+            """测试超过有效期的验证记录"""
+            # Arrange
+            mock_config.return_value.get_session_config.return_value = {'check_interval': 300}
+
+            # Act
+            result = session_manager.get_verified_at({'verified_at': time.time() - 600})
+
+            # Assert
+            assert result is None
+
+        def test_mark_verified_keeps_expires_at(self, session_manager):
+            """测试记录验证时间不改变会话过期时间"""
+            # Arrange
+            session_data = {'user': 'test_user', 'expires_at': '2030-01-01T00:00:00'}
+            session_manager.cipher = Mock()
+            session_manager.cipher.encrypt.return_value = b'encrypted_data'
+
+            with patch('builtins.open', mock_open()):
+                # Act
+                result = session_manager.mark_verified(session_data, 123.0)
+
+            # Assert
+            assert result is True
+            saved = json.loads(session_manager.cipher.encrypt.call_args[0][0].decode())
+            assert saved['verified_at'] == 123.0
+            assert saved['expires_at'] == '2030-01-01T00:00:00'
+
+        def test_mark_verified_without_cipher(self, session_manager):
+            """测试加密器未初始化时不保存"""
+            # Arrange
+            session_manager.cipher = None
+
+            # Act
+            result = session_manager.mark_verified({'user': 'test_user'})
+
+            # Assert
+            assert result is False
+
+        def test_clear_verified(self, session_manager):
+            """测试清除验证时间"""
+            # Arrange
+            session_manager.cipher = Mock()
+            session_manager.cipher.encrypt.return_value = b'encrypted_data'
+
+            with patch.object(session_manager, 'load_session', return_value={
+                'user': 'test_user', 'verified_at': 123.0
+            }), patch('builtins.open', mock_open()):
+                # Act
+                result = session_manager.clear_verified()
+
+            # Assert
+            assert result is True
+            saved = json.loads(session_manager.cipher.encrypt.call_args[0][0].decode())
+            assert 'verified_at' not in saved
+
+        def test_clear_verified_without_record(self, session_manager):
+            """测试没有验证记录时不写文件"""
+            # Arrange
+            session_manager.cipher = Mock()
+
+            with patch.object(session_manager, 'load_session', return_value={'user': 'test_user'}):
+                # Act
+                result = session_manager.clear_verified()
+
+            # Assert
+            assert result is True
+            session_manager.cipher.encrypt.assert_not_called()
@@ -7,7 +7,7 @@ import pytest
 from unittest.mock import Mock, patch
 
 from src.automators.base import BaseAutomator
-from src.utils.response import ApiResponse
+from src.utils.response import ApiResponse, ErrorCode
 
 
 class TestAutomator(BaseAutomator):
@@ -60,3 +60,22 @@ class TestBaseAutomator:
         assert automator._confirm_action("消息1") is True
         assert automator._confirm_action("消息2") is True
         assert automator._confirm_action("") is True
+
+    def test_resolve_account_unique(self, automator, mock_api_client):
+        """测试唯一匹配时返回账号"""
+        mock_api_client.search_user.return_value = ApiResponse.success_response([{'account': 'zhangsan'}])
+
+        assert automator._resolve_account('张三') == ('zhangsan', [])
+
+    def test_resolve_account_unknown(self, automator, mock_api_client):
+        """测试未找到用户时默认按原名称返回，keep_unknown=False 时返回 None"""
+        mock_api_client.search_user.return_value = ApiResponse.success_response([])
+
+        assert automator._resolve_account('nobody') == ('nobody', [])
+        assert automator._resolve_account('nobody', keep_unknown=False) == (None, [])
+
+    def test_resolve_account_user_list_unavailable(self, automator, mock_api_client):
+        """测试用户列表获取失败时总是按原名称返回"""
+        mock_api_client.search_user.return_value = ApiResponse.error_response(ErrorCode.API_ERROR, "获取用户列表失败")
+
+        assert automator._resolve_account('wangwu', keep_unknown=False) == ('wangwu', [])
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+测试批量任务创建器
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+from contextlib import nullcontext
+
+from src.automators.batch_task_splitter import BatchTaskSplitter
+from src.utils.response import ApiResponse, ErrorCode
+from src.zentao.executions import ExecutionIndex
+
+
+def index_of(executions):
+    """与 ZentaoApiClient.get_execution_index 一致：由项目列表建立名称索引"""
+    if not executions.success:
+        return executions
+    return ApiResponse.success_response(ExecutionIndex(executions.data or []))
+
+
+class TestBatchTaskSplitter:
+    """测试批量任务创建器"""
+
+    @pytest.fixture
+    def mock_api_client(self):
+        """创建 Mock API 客户端"""
+        client = Mock()
+        client.story_cache_scope.return_value = nullcontext()
+        client.get_execution_index.side_effect = lambda: index_of(client.get_executions())
+        client.get_executions.return_value = ApiResponse.success_response([
+            {'id': 1, 'name': '其他项目'},
+            {'id': 7, 'name': '研发中心项目'},
+        ])
+        client.get_story.side_effect = lambda story_id: ApiResponse.success_response({
+            'id': story_id,
+            'title': f'需求{story_id}',
+            'status': 'active',
+            'execution': 0,
+        })
+        client.update_story_title.return_value = ApiResponse.success_response({})
+        client.review_story.return_value = ApiResponse.success_response({})
+        client.link_story_to_execution.return_value = ApiResponse.success_response({})
+        client.create_task.side_effect = lambda **kwargs: ApiResponse.success_response({
+            'id': kwargs['story_id'] + 1000
+        })
+        return client
+
+    @pytest.fixture
+    def splitter(self, mock_api_client):
+        """创建批量拆解器实例"""
+        config = {
+            'zentao.task_creation.batch_max_in_flight': 3,
+            'zentao.task_creation.default_project_name': '研发中心',
+        }
+        with patch('src.automators.batch_task_splitter.get_config') as mock_config:
+            mock_config.return_value.get.side_effect = lambda key, default=None: config.get(key, default)
+            yield BatchTaskSplitter(mock_api_client)
+
+    class TestCollectStoryIds:
+        """测试合并需求ID"""
+
+        def test_merge_and_dedupe(self):
+            """测试合并ID列表与查询结果并去重"""
+            ids = BatchTaskSplitter.collect_story_ids(['#3', '1', 'abc'], [{'id': '1'}, {'id': 2}])
+
+            assert ids == [3, 1, 2]
+
+    class TestExecute:
+        """测试批量拆解"""
+
+        def test_missing_story_ids(self, splitter):
+            """测试未指定需求"""
+            result = splitter.execute(story_ids=[])
+
+            assert not result.success
+            assert result.error.code == ErrorCode.MISSING_PARAMETER
+
+        def test_batch_success(self, splitter, mock_api_client):
+            """测试批量拆解成功，项目列表只获取一次"""
+            progress = []
+
+            # Act
+            result = splitter.execute(story_ids=[1, 2], stories=[{'id': 3}], grade='A+', on_progress=progress.append)
+
+            # Assert
+            assert result.success
+            assert result.data['total'] == 3
+            assert result.data['succeeded'] == 3
+            assert [item['task_id'] for item in result.data['results']] == [1001, 1002, 1003]
+            assert len(progress) == 3
+            mock_api_client.get_executions.assert_called_once()
+            for call in mock_api_client.link_story_to_execution.call_args_list:
+                assert call.args[1] == 7
+
+        def test_default_assignee_resolved_once(self, mock_api_client):
+            """测试配置的默认执行人（姓名）只解析一次，所有任务使用解析后的账号"""
+            config = {
+                'zentao.task_creation.default_project_name': '研发中心',
+                'zentao.task_creation.default_assigned_to': '陈科宇',
+            }
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {'account': 'chenkeyu', 'realname': '陈科宇'}
+            ])
+            with patch('src.automators.batch_task_splitter.get_config') as mock_config:
+                mock_config.return_value.get.side_effect = lambda key, default=None: config.get(key, default)
+                result = BatchTaskSplitter(mock_api_client).execute(story_ids=[1, 2], grade='A')
+
+            assert result.data['succeeded'] == 2
+            mock_api_client.search_user.assert_called_once_with('陈科宇')
+            assert {call.kwargs['assigned_to'] for call in mock_api_client.create_task.call_args_list} == {'chenkeyu'}
+
+        def test_ambiguous_assignee(self, splitter, mock_api_client):
+            """测试执行人匹配到多个用户时不拆解任何需求"""
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {'account': 'zhangsan', 'realname': '张三'},
+                {'account': 'zhangshuai', 'realname': '张帅'}
+            ])
+
+            result = splitter.execute(story_ids=[1], grade='A', assigned_to='zs')
+
+            assert not result.success
+            assert result.error.code == ErrorCode.INVALID_PARAMETER
+            mock_api_client.update_story_title.assert_not_called()
+
+        def test_review_skips_story_view_after_change(self, splitter, mock_api_client):
+            """测试标题变更成功后直接评审，不再请求需求详情"""
+            splitter.execute(story_ids=[1], grade='A')
+
+            story_data = mock_api_client.review_story.call_args.kwargs['story_data']
+            assert story_data['status'] == 'changed'
+
+        def test_review_fetches_when_change_failed(self, splitter, mock_api_client):
+            """测试标题变更失败时由评审自行获取需求状态"""
+            mock_api_client.update_story_title.return_value = ApiResponse.error_response(ErrorCode.API_ERROR, "变更失败")
+
+            result = splitter.execute(story_ids=[1], grade='A')
+
+            assert result.data['succeeded'] == 1
+            assert mock_api_client.review_story.call_args.kwargs['story_data'] is None
+            assert '变更标题失败' in result.data['results'][0]['warnings'][0]
+
+        def test_no_execution_fails_without_changes(self, splitter, mock_api_client):
+            """测试无法确定项目时该需求失败且不做修改"""
+            mock_api_client.get_executions.return_value = ApiResponse.error_response(ErrorCode.API_ERROR, "网络错误")
+
+            result = splitter.execute(story_ids=[1], grade='A')
+
+            item = result.data['results'][0]
+            assert not item['success']
+            assert item['stage'] == BatchTaskSplitter.STAGE_LINK
+            mock_api_client.update_story_title.assert_not_called()
+            mock_api_client.create_task.assert_not_called()
+
+        def test_partial_failure(self, splitter, mock_api_client):
+            """测试单个需求失败不影响其他需求"""
+            mock_api_client.get_story.side_effect = lambda story_id: (
+                ApiResponse.error_response(ErrorCode.STORY_NOT_FOUND, "需求不存在") if story_id == 2
+                else ApiResponse.success_response({'id': story_id, 'title': '需求', 'execution': 5})
+            )
+
+            result = splitter.execute(story_ids=[1, 2, 3], grade='A')
+
+            assert result.data['succeeded'] == 2
+            assert result.data['failed'] == 1
+            assert result.data['results'][1]['stage'] == BatchTaskSplitter.STAGE_FETCH
+            mock_api_client.link_story_to_execution.assert_not_called()
+
+        def test_bounded_in_flight(self, splitter, mock_api_client):
+            """测试同时处理的需求数不超过配置"""
+            lock = threading.Lock()
+            state = {'active': 0, 'max': 0}
+
+            def slow_create(**kwargs):
+                with lock:
+                    state['active'] += 1
+                    state['max'] = max(state['max'], state['active'])
+                time.sleep(0.02)
+                with lock:
+                    state['active'] -= 1
+                return ApiResponse.success_response({'id': 1})
+
+            mock_api_client.create_task.side_effect = slow_create
+
+            splitter.execute(story_ids=list(range(1, 9)), grade='A')
+
+            assert state['max'] <= 3
+
+    class TestFormatDisplay:
+        """测试格式化显示"""
+
+        def test_format_summary(self, splitter):
+            """测试汇总显示成功、失败和警告"""
+            text = splitter.format_display({
+                'total': 2, 'succeeded': 1, 'failed': 1,
+                'results': [
+                    {'story_id': 1, 'success': True, 'task_id': 11, 'task_name': '【研发】需求1',
+                     'warnings': ['评审需求失败: 超时']},
+                    {'story_id': 2, 'success': False, 'stage': '创建任务', 'error': '权限不足', 'warnings': []},
+                ]
+            })
+
+            assert '成功 1 个，失败 1 个' in text
+            assert '✓ 需求 #1 → 任务 #11' in text
+            assert '✗ 需求 #2 [创建任务] 权限不足' in text
+            assert '评审需求失败: 超时' in text
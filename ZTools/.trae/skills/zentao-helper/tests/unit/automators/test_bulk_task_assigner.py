@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+测试批量任务分配器
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.automators.bulk_task_assigner import BulkTaskAssigner
+from src.utils.response import ApiResponse, ErrorCode
+
+
+USERS = {
+    'zhangsan': [{'id': 1, 'account': 'zhangsan', 'realname': '张三'}],
+    '张三': [{'id': 1, 'account': 'zhangsan', 'realname': '张三'}],
+    'li': [{'id': 2, 'account': 'lisi', 'realname': '李四'}, {'id': 3, 'account': 'liwu', 'realname': '李五'}],
+}
+
+
+class TestBulkTaskAssigner:
+    """测试批量任务分配器"""
+
+    @pytest.fixture
+    def mock_api_client(self):
+        """创建 Mock API 客户端"""
+        client = Mock()
+        client.search_user.side_effect = lambda name: ApiResponse.success_response(USERS.get(name, []))
+        client.assign_task.side_effect = lambda task_id, username: (
+            ApiResponse.error_response(ErrorCode.TASK_NOT_FOUND, f"未找到任务 #{task_id}") if task_id == 404
+            else ApiResponse.success_response({'task_id': task_id, 'assigned_to': username})
+        )
+        return client
+
+    @pytest.fixture
+    def assigner(self, mock_api_client):
+        """创建批量分配器实例"""
+        with patch('src.automators.bulk_task_assigner.get_config') as mock_config:
+            mock_config.return_value.get.return_value = {'bulk_max_workers': 3, 'bulk_rate_limit': None}
+            return BulkTaskAssigner(mock_api_client)
+
+    class TestExecute:
+        """测试批量分配"""
+
+        def test_assign_task_ids(self, assigner, mock_api_client):
+            """测试按任务ID列表分配，用户按姓名解析为账号"""
+            # Act
+            result = assigner.execute(task_ids=['101', '#102', 404], username='张三')
+
+            # Assert
+            assert result.success
+            assert result.data['succeeded'] == 2
+            assert result.data['failed'] == 1
+            assert [item['task_id'] for item in result.data['results']] == [101, 102, 404]
+            assert all(call.args[1] == 'zhangsan' for call in mock_api_client.assign_task.call_args_list)
+            assert '未找到任务 #404' in result.data['results'][2]['error']
+
+        def test_users_validated_once(self, assigner, mock_api_client):
+            """测试相同用户只校验一次"""
+            assigner.execute(assignments=[(1, 'zhangsan'), (2, 'zhangsan'), (3, 'zhangsan')])
+
+            mock_api_client.search_user.assert_called_once_with('zhangsan')
+
+        def test_unknown_and_ambiguous_users_not_posted(self, assigner, mock_api_client):
+            """测试未找到或匹配多个用户的任务不发送分配请求"""
+            result = assigner.execute(assignments=[(1, 'nobody'), (2, 'li'), (3, 'zhangsan')])
+
+            errors = [item['error'] for item in result.data['results']]
+            assert errors[0] == '未找到用户: nobody'
+            assert errors[1] == "'li' 匹配到多个用户: 李四(lisi), 李五(liwu)，请指定账号"
+            mock_api_client.assign_task.assert_called_once_with(3, 'zhangsan')
+
+        def test_user_list_unavailable(self, assigner, mock_api_client):
+            """测试用户列表获取失败时按输入的用户名分配"""
+            mock_api_client.search_user.side_effect = None
+            mock_api_client.search_user.return_value = ApiResponse.error_response(ErrorCode.API_ERROR, "获取用户列表失败")
+
+            result = assigner.execute(task_ids=[1], username='wangwu')
+
+            assert result.data['succeeded'] == 1
+            mock_api_client.assign_task.assert_called_once_with(1, 'wangwu')
+
+        def test_filter_my_tasks(self, assigner, mock_api_client):
+            """测试按状态和关键字过滤我的任务"""
+            mock_api_client.get_my_tasks.return_value = ApiResponse.success_response({'tasks': [
+                {'id': 1, 'title': '都江堰 / 开发'},
+                {'id': 2, 'title': '其他 / 开发'},
+            ]})
+
+            result = assigner.execute(username='zhangsan', status='wait', keyword='都江堰')
+
+            mock_api_client.get_my_tasks.assert_called_once_with(status='wait', with_detail=False)
+            assert [item['task_id'] for item in result.data['results']] == [1]
+
+        def test_csv_and_dedupe(self, assigner, mock_api_client, tmp_path):
+            """测试读取 CSV 并按任务ID去重"""
+            csv_file = tmp_path / 'assign.csv'
+            csv_file.write_text('任务ID,用户\n#1,zhangsan\n2,张三\n1,li\n\n', encoding='utf-8')
+
+            result = assigner.execute(csv_path=str(csv_file))
+
+            assert [item['task_id'] for item in result.data['results']] == [1, 2]
+            assert result.data['succeeded'] == 2
+
+        def test_missing_tasks(self, assigner):
+            """测试没有需要分配的任务"""
+            result = assigner.execute(username='zhangsan')
+
+            assert not result.success
+            assert result.error.code == ErrorCode.MISSING_PARAMETER
+
+        def test_csv_not_found(self, assigner, tmp_path):
+            """测试 CSV 文件不存在"""
+            result = assigner.execute(csv_path=str(tmp_path / 'missing.csv'))
+
+            assert not result.success
+            assert result.error.code == ErrorCode.INVALID_PARAMETER
+
+    class TestFormatDisplay:
+        """测试格式化显示"""
+
+        def test_format_table(self, assigner):
+            """测试汇总表格"""
+            text = assigner.format_display({
+                'total': 2, 'succeeded': 1, 'failed': 1,
+                'results': [
+                    {'task_id': 1, 'assigned_to': 'zhangsan', 'success': True, 'error': None},
+                    {'task_id': 2, 'assigned_to': 'nobody', 'success': False, 'error': '未找到用户: nobody'},
+                ]
+            })
+
+            assert '成功 1 个，失败 1 个' in text
+            assert '未找到用户: nobody' in text
@@ -230,7 +230,28 @@ class TestTaskAssigner:
         """测试执行方法 - 扩展"""
 
         def test_execute_multiple_users_found(self, assigner, mock_api_client):
-            """测试找到多个匹配用户"""
+            """测试找到多个匹配用户时非交互模式返回候选用户，不分配"""
+            # Arrange
+            mock_api_client.get_task.return_value = ApiResponse.success_response({
+                "id": 123,
+                "name": "测试任务"
+            })
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {"account": "user1", "realname": "用户一"},
+                {"account": "user2", "realname": "用户二"}
+            ])
+
+            # Act
+            result = assigner.execute(task_id="123", username="user", interactive=False)
+
+            # Assert
+            assert result.success is False
+            assert result.error.code == ErrorCode.INVALID_PARAMETER
+            assert "用户一(user1), 用户二(user2)" in result.error.message
+            mock_api_client.assign_task.assert_not_called()
+
+        def test_execute_multiple_users_select(self, assigner, mock_api_client):
+            """测试找到多个匹配用户时交互模式让用户选择"""
             # Arrange
             mock_api_client.get_task.return_value = ApiResponse.success_response({
                 "id": 123,
@@ -245,11 +266,34 @@ class TestTaskAssigner:
             })
 
             # Act
-            result = assigner.execute(task_id="123", username="user")
+            with patch('builtins.input', side_effect=['3', '2']), patch('builtins.print'):
+                result = assigner.execute(task_id="123", username="user")
 
             # Assert
             assert result.success is True
-            assert result.data["assigned_to"] == "user1"  # 使用第一个匹配
+            assert result.data["assigned_to"] == "user2"
+            mock_api_client.assign_task.assert_called_once_with(123, "user2")
+
+        def test_execute_multiple_users_select_cancelled(self, assigner, mock_api_client):
+            """测试交互选择时直接回车取消，返回候选用户"""
+            # Arrange
+            mock_api_client.get_task.return_value = ApiResponse.success_response({
+                "id": 123,
+                "name": "测试任务"
+            })
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {"account": "user1", "realname": "用户一"},
+                {"account": "user2", "realname": "用户二"}
+            ])
+
+            # Act
+            with patch('builtins.input', return_value=''), patch('builtins.print'):
+                result = assigner.execute(task_id="123", username="user")
+
+            # Assert
+            assert result.success is False
+            assert result.error.code == ErrorCode.INVALID_PARAMETER
+            mock_api_client.assign_task.assert_not_called()
 
         def test_execute_no_users_found(self, assigner, mock_api_client):
             """测试未找到匹配用户"""
@@ -9,6 +9,14 @@ from unittest.mock import Mock, patch
 
 from src.automators.task_splitter import TaskSplitter
 from src.utils.response import ApiResponse, ErrorCode
+from src.zentao.executions import ExecutionIndex
+
+
+def index_of(executions):
+    """与 ZentaoApiClient.get_execution_index 一致：由项目列表建立名称索引"""
+    if not executions.success:
+        return executions
+    return ApiResponse.success_response(ExecutionIndex(executions.data or []))
 
 
 class TestTaskSplitter:
@@ -16,8 +24,11 @@ class TestTaskSplitter:
 
     @pytest.fixture
     def mock_api_client(self):
-        """创建 Mock API 客户端"""
-        return Mock()
+        """创建 Mock API 客户端（用户目录中没有匹配的用户，执行人按原名称使用）"""
+        client = Mock()
+        client.search_user.return_value = ApiResponse.success_response([])
+        client.get_execution_index.side_effect = lambda: index_of(client.get_executions())
+        return client
 
     @pytest.fixture
     def splitter(self, mock_api_client):
@@ -235,6 +246,49 @@ class TestTaskSplitter:
                     # Assert
                     assert result.success is True
 
+        def test_execute_resolves_default_assignee(self, splitter, mock_api_client):
+            """测试配置的默认执行人（姓名）通过用户目录解析为账号"""
+            # Arrange
+            mock_api_client.get_story.return_value = ApiResponse.success_response({
+                'id': 123, 'title': '测试需求', 'execution': 10
+            })
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {'account': 'chenkeyu', 'realname': '陈科宇'}
+            ])
+            mock_api_client.create_task.return_value = ApiResponse.success_response({'id': 456})
+            zentao_config = {'task_creation': {'default_assigned_to': '陈科宇', 'grade_hours': {'A': 2}}}
+
+            with patch.object(splitter.interactive_input.config, 'get_zentao_config', return_value=zentao_config), \
+                 patch.object(splitter, '_calculate_deadline', return_value='2024-03-15'):
+                # Act
+                result = splitter.execute(story_id='123', grade='A')
+
+            # Assert
+            assert result.success is True
+            mock_api_client.search_user.assert_called_once_with('陈科宇')
+            assert mock_api_client.create_task.call_args.kwargs['assigned_to'] == 'chenkeyu'
+
+        def test_execute_ambiguous_assignee(self, splitter, mock_api_client):
+            """测试执行人匹配到多个用户时返回候选用户，不修改需求"""
+            # Arrange
+            mock_api_client.get_story.return_value = ApiResponse.success_response({
+                'id': 123, 'title': '测试需求', 'execution': 10
+            })
+            mock_api_client.search_user.return_value = ApiResponse.success_response([
+                {'account': 'zhangsan', 'realname': '张三'},
+                {'account': 'zhangshuai', 'realname': '张帅'}
+            ])
+
+            # Act
+            result = splitter.execute(story_id='123', grade='A', assigned_to='zs')
+
+            # Assert
+            assert result.success is False
+            assert result.error.code == ErrorCode.INVALID_PARAMETER
+            assert '张三(zhangsan), 张帅(zhangshuai)' in result.error.message
+            mock_api_client.update_story_title.assert_not_called()
+            mock_api_client.create_task.assert_not_called()
+
         def test_execute_with_story_execution(self, splitter, mock_api_client):
             """测试使用需求关联的执行"""
             # Arrange
@@ -4,9 +4,11 @@
 """
 
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from src.collectors.story_collector import StoryCollector
+from src.zentao.api_client import ZentaoApiClient
+from src.zentao.local_store import LocalStore
 from src.utils.response import ApiResponse, ErrorCode
 
 
@@ -89,7 +91,7 @@ class TestStoryCollector:
 
             # Assert
             assert result.success is True
-            mock_api_client.get_my_stories.assert_called_once_with('active')
+            mock_api_client.get_my_stories.assert_called_once_with('active', story_filter=None, limit=None)
 
     class TestFormatDisplay:
         """测试格式化显示"""
@@ -315,3 +317,240 @@ class TestStoryCollector:
             assert "需求2" in result
             assert "需求3" in result
             assert "共 3 个" in result
+
+    class TestSyncLocalStore:
+        """测试需求同步到本地缓存"""
+
+        @pytest.fixture
+        def store(self):
+            """创建内存数据库缓存"""
+            local_store = LocalStore(':memory:')
+            yield local_store
+            local_store.close()
+
+        @pytest.fixture
+        def sync_collector(self, mock_api_client, store):
+            """创建带本地缓存的收集器实例"""
+            mock_api_client.build_story_list_item.side_effect = ZentaoApiClient.build_story_list_item
+            config = {
+                'cache.local_store.full_sync_interval': 3600,
+                'zentao.story_query.products': [],
+            }
+            with patch('src.collectors.story_collector.get_config') as mock_get_config:
+                mock_get_config.return_value.get.side_effect = lambda key, default=None: config.get(key, default)
+                yield StoryCollector(mock_api_client, store)
+
+        @staticmethod
+        def make_story(story_id, last_edited):
+            """构造禅道原始需求数据"""
+            return {
+                'id': str(story_id),
+                'title': f'需求{story_id}',
+                'status': 'active',
+                'product': '1',
+                'productTitle': '产品A',
+                'lastEditedDate': last_edited,
+            }
+
+        def test_full_sync(self, sync_collector, mock_api_client, store):
+            """测试首次同步为全量同步"""
+            # Arrange
+            mock_api_client.iter_my_story_pages.return_value = iter([
+                [self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')]
+            ])
+
+            # Act
+            stats = sync_collector.sync_local_store()
+
+            # Assert
+            assert stats['full'] is True
+            assert stats['updated'] == 2
+            assert [int(story['id']) for story in store.list_stories()] == [2, 1]
+            assert store.get_meta('stories.last_full_sync') is not None
+            mock_api_client.iter_my_story_pages.assert_called_once_with(order_by='id_desc', strict=True)
+
+        def test_full_sync_removes_unassigned(self, sync_collector, mock_api_client, store):
+            """测试全量同步删除不再指派给我的需求"""
+            # Arrange
+            store.upsert_stories([({'id': 9, 'title': '旧需求'}, '2023-12-01')])
+            mock_api_client.iter_my_story_pages.return_value = iter([
+                [self.make_story(1, '2024-01-01')]
+            ])
+
+            # Act
+            stats = sync_collector.sync_local_store(full=True)
+
+            # Assert
+            assert stats['removed'] == 1
+            assert [int(story['id']) for story in store.list_stories()] == [1]
+
+        def test_incremental_sync_stops_at_known_story(self, sync_collector, mock_api_client, store):
+            """测试增量同步遇到未变化的需求后停止翻页"""
+            # Arrange
+            store.upsert_stories([({'id': 1, 'title': '需求1'}, '2024-01-01')])
+            store.set_meta('stories.last_full_sync', 9999999999)
+            pages_by_order = {
+                'id_desc': [
+                    [self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')],
+                    [self.make_story(0, '2023-01-01')],
+                ],
+                'lastEditedDate_desc': [
+                    [self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')],
+                ],
+            }
+            mock_api_client.iter_my_story_pages.side_effect = (
+                lambda order_by, strict: iter(pages_by_order[order_by])
+            )
+
+            # Act
+            stats = sync_collector.sync_local_store()
+
+            # Assert
+            assert stats['full'] is False
+            assert stats['updated'] == 1
+            assert stats['removed'] == 0
+            assert [int(story['id']) for story in store.list_stories()] == [2, 1]
+
+        def test_incremental_sync_removes_reassigned_on_last_page(self, sync_collector, mock_api_client, store):
+            """测试增量同步在最后一页遇到已缓存的需求时，清理已转指派给他人的需求"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '需求1'}, '2024-01-01'),
+                ({'id': 5, 'title': '已转指派'}, '2024-01-05'),
+            ])
+            store.set_meta('stories.last_full_sync', 9999999999)
+            pages_by_order = {
+                'id_desc': [[self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')]],
+                'lastEditedDate_desc': [[self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')]],
+            }
+            mock_api_client.iter_my_story_pages.side_effect = (
+                lambda order_by, strict: iter(pages_by_order[order_by])
+            )
+
+            # Act
+            stats = sync_collector.sync_local_store()
+
+            # Assert
+            assert stats['full'] is False
+            assert stats['removed'] == 1
+            assert [int(story['id']) for story in store.list_stories()] == [2, 1]
+
+        def test_incremental_sync_keeps_stories_when_stopped_early(self, sync_collector, mock_api_client, store):
+            """测试增量同步在整页中遇到已缓存的需求提前停止时，不清理未扫描到的需求"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '需求1'}, '2024-01-01'),
+                ({'id': 0, 'title': '后续页的需求'}, '2023-01-01'),
+            ])
+            store.set_meta('stories.last_full_sync', 9999999999)
+            full_page = [self.make_story(1, '2024-01-01')] * ZentaoApiClient.STORY_PAGE_LIMIT
+            mock_api_client.iter_my_story_pages.side_effect = (
+                lambda order_by, strict: iter([full_page, [self.make_story(0, '2023-01-01')]])
+            )
+
+            # Act
+            stats = sync_collector.sync_local_store()
+
+            # Assert
+            assert stats['removed'] == 0
+            assert [int(story['id']) for story in store.list_stories()] == [1, 0]
+
+        def test_incremental_sync_updates_edited_story(self, sync_collector, mock_api_client, store):
+            """测试增量同步更新被修改的需求"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '旧标题'}, '2024-01-01'),
+                ({'id': 2, 'title': '需求2'}, '2024-01-02'),
+            ])
+            store.set_meta('stories.last_full_sync', 9999999999)
+            edited = self.make_story(1, '2024-02-01')
+            edited['title'] = '新标题'
+            pages_by_order = {
+                'id_desc': [[self.make_story(2, '2024-01-02'), edited]],
+                'lastEditedDate_desc': [[edited, self.make_story(2, '2024-01-02')]],
+            }
+            mock_api_client.iter_my_story_pages.side_effect = (
+                lambda order_by, strict: iter(pages_by_order[order_by])
+            )
+
+            # Act
+            sync_collector.sync_local_store()
+
+            # Assert
+            titles = {int(story['id']): story['title'] for story in store.list_stories()}
+            assert titles == {1: '新标题', 2: '需求2'}
+
+        def test_collect_from_local_store(self, sync_collector, mock_api_client, store):
+            """测试开启本地缓存后从缓存收集需求"""
+            # Arrange
+            mock_api_client.iter_my_story_pages.return_value = iter([
+                [self.make_story(1, '2024-01-01')]
+            ])
+
+            # Act
+            result = sync_collector.collect()
+
+            # Assert
+            assert result.success is True
+            assert result.data['count'] == 1
+            mock_api_client.get_my_stories.assert_not_called()
+
+        def test_collect_from_local_store_with_filter(self, sync_collector, mock_api_client, store):
+            """测试从本地缓存收集时应用过滤条件和数量限制"""
+            from src.zentao.story_filter import StoryFilter
+            mock_api_client.iter_my_story_pages.return_value = iter([
+                [self.make_story(story_id, '2024-01-01') for story_id in (13, 12, 11, 3, 2, 1)]
+            ])
+
+            result = sync_collector.collect(story_filter=StoryFilter(keywords=['需求1']), limit=2)
+
+            assert [story['id'] for story in result.data['stories']] == ['13', '12']
+
+        def test_collect_from_local_store_with_status(self, sync_collector, mock_api_client, store):
+            """测试从本地缓存收集时应用指令中的需求状态和阶段"""
+            # Arrange
+            closed = self.make_story(2, '2024-01-02')
+            closed['status'] = 'closed'
+            planned = self.make_story(3, '2024-01-03')
+            planned['stage'] = 'planned'
+            page = [planned, closed, self.make_story(1, '2024-01-01')]
+            mock_api_client.iter_my_story_pages.side_effect = lambda order_by, strict: iter([page])
+
+            # Act
+            by_status = sync_collector.collect(status='closed')
+            by_stage = sync_collector.collect(status='planned')
+            all_stories = sync_collector.collect(status='all')
+
+            # Assert
+            assert [story['id'] for story in by_status.data['stories']] == ['2']
+            assert [story['id'] for story in by_stage.data['stories']] == ['3']
+            assert all_stories.data['count'] == 3
+
+        def test_collect_ignores_non_story_status(self, sync_collector, mock_api_client):
+            """测试需求没有的状态（如"进行中的需求"识别出的 doing）不过滤，与直接请求禅道一致"""
+            # Arrange
+            page = [self.make_story(2, '2024-01-02'), self.make_story(1, '2024-01-01')]
+            mock_api_client.iter_my_story_pages.side_effect = lambda order_by, strict: iter([page])
+
+            # Act
+            result = sync_collector.collect(status='doing')
+
+            # Assert
+            assert result.success is True
+            assert result.data['count'] == 2
+
+        def test_collect_falls_back_on_sync_error(self, sync_collector, mock_api_client):
+            """测试同步失败时回退为直接请求禅道"""
+            # Arrange
+            mock_api_client.iter_my_story_pages.side_effect = RuntimeError("获取需求列表失败")
+            mock_api_client.get_my_stories.return_value = ApiResponse.success_response({
+                'stories': [{"id": 1, "title": "需求1"}],
+                'total': 1
+            })
+
+            # Act
+            result = sync_collector.collect()
+
+            # Assert
+            assert result.success is True
+            assert result.data['count'] == 1
@@ -4,9 +4,10 @@
 """
 
 import pytest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.collectors.task_collector import TaskCollector
+from src.zentao.local_store import LocalStore
 from src.utils.response import ApiResponse, ErrorCode
 
 
@@ -279,3 +280,75 @@ class TestTaskCollector:
             assert "任务 #2" in result
             assert "任务 #3" in result
             assert "共 3 个" in result
+
+    class TestCollectWithLocalStore:
+        """测试使用本地缓存收集任务"""
+
+        @pytest.fixture
+        def store(self):
+            """创建内存数据库缓存"""
+            local_store = LocalStore(':memory:')
+            yield local_store
+            local_store.close()
+
+        def test_only_fetch_missing_details(self, mock_api_client, store):
+            """测试只请求本地缓存中缺失的任务详情"""
+            # Arrange
+            store.save_task_details({1: {'status': 'doing'}})
+            mock_api_client.get_my_tasks.return_value = ApiResponse.success_response({
+                'tasks': [{'id': 1, 'title': '任务1'}, {'id': 2, 'title': '任务2'}],
+                'total': 2
+            })
+            mock_api_client.get_task_details.return_value = {2: {'status': 'wait'}}
+            collector = TaskCollector(mock_api_client, store)
+
+            # Act
+            result = collector.collect()
+
+            # Assert
+            assert result.success is True
+            statuses = {task['id']: task['status'] for task in result.data['tasks']}
+            assert statuses == {1: 'doing', 2: 'wait'}
+            mock_api_client.get_my_tasks.assert_called_once_with(None, with_detail=False)
+            mock_api_client.get_task_details.assert_called_once_with([2])
+            assert store.get_task_details([2], max_age=60) == {2: {'status': 'wait'}}
+
+        def test_all_details_cached(self, mock_api_client, store):
+            """测试任务详情全部命中缓存时不请求禅道"""
+            # Arrange
+            store.save_task_details({1: {'status': 'done'}})
+            mock_api_client.get_my_tasks.return_value = ApiResponse.success_response({
+                'tasks': [{'id': 1, 'title': '任务1'}],
+                'total': 1
+            })
+            collector = TaskCollector(mock_api_client, store)
+
+            # Act
+            result = collector.collect()
+
+            # Assert
+            assert result.data['tasks'][0]['status'] == 'done'
+            mock_api_client.get_task_details.assert_not_called()
+
+        def test_fetch_details_with_async_client(self, mock_api_client, store):
+            """测试安装了 aiohttp 时通过异步客户端并发获取缺失的任务详情"""
+            # Arrange
+            mock_api_client.max_workers = 4
+            mock_api_client.get_my_tasks.return_value = ApiResponse.success_response({
+                'tasks': [{'id': 1, 'title': '任务1'}, {'id': 2, 'title': '任务2'}],
+                'total': 2
+            })
+            collector = TaskCollector(mock_api_client, store)
+            get_task_details = AsyncMock(return_value={1: {'status': 'doing'}, 2: None})
+
+            # Act
+            with patch('src.collectors.task_collector.aiohttp_available', return_value=True), \
+                 patch('src.collectors.task_collector.AsyncZentaoApiClient.get_task_details', get_task_details):
+                result = collector.collect()
+
+            # Assert
+            statuses = {task['id']: task.get('status') for task in result.data['tasks']}
+            assert statuses == {1: 'doing', 2: None}
+            get_task_details.assert_awaited_once_with([1, 2])
+            mock_api_client.get_task_details.assert_not_called()
+            assert store.get_task_details([1, 2], max_age=60) == {1: {'status': 'doing'}}
@@ -121,6 +121,75 @@ class TestCommandParser:
                 # Assert
                 assert result['entities'] == entities
 
+    class TestParseCache:
+        """测试解析结果缓存"""
+
+        def test_repeated_text_uses_cache(self, parser):
+            """测试相同指令只解析一次"""
+            # Arrange
+            with patch.object(parser.intent_classifier, 'classify', return_value='query_stories') as classify, \
+                 patch.object(parser.entity_extractor, 'extract_all', return_value={'keywords': ['面板']}) as extract:
+
+                # Act
+                first = parser.parse("查看包含'面板'的需求")
+                second = parser.parse("查看包含'面板'的需求")
+
+                # Assert
+                assert first == second
+                assert classify.call_count == 1
+                assert extract.call_count == 1
+
+        def test_cached_result_is_copy(self, parser):
+            """测试修改返回结果不影响缓存"""
+            # Arrange
+            first = parser.parse("查看包含'面板'的需求")
+
+            # Act
+            first['entities']['keywords'].append('订单')
+            second = parser.parse("查看包含'面板'的需求")
+
+            # Assert
+            assert second['entities']['keywords'] == ['面板']
+
+        def test_evicts_least_recently_used(self, parser):
+            """测试超过容量时淘汰最久未使用的结果"""
+            # Arrange
+            parser._cache_size = 2
+            parser.parse("查看任务")
+            parser.parse("查看需求")
+            parser.parse("查看任务")
+
+            # Act
+            parser.parse("帮助")
+
+            # Assert
+            assert list(parser._cache) == ["查看任务", "帮助"]
+
+        def test_add_intent_invalidates_cache(self, parser):
+            """测试动态添加意图后重新解析"""
+            # Arrange
+            assert parser.parse("解析缓存意图")['intent'] == 'unknown'
+
+            # Act
+            parser.intent_classifier.add_intent("cache_test_intent", ["解析缓存意图"])
+
+            # Assert
+            assert parser.parse("解析缓存意图")['intent'] == 'cache_test_intent'
+
+        def test_cache_disabled(self, parser):
+            """测试缓存容量为 0 时每次都重新解析"""
+            # Arrange
+            parser._cache_size = 0
+            with patch.object(parser.intent_classifier, 'classify', return_value='help') as classify:
+
+                # Act
+                parser.parse("帮助")
+                parser.parse("帮助")
+
+                # Assert
+                assert classify.call_count == 2
+                assert not parser._cache
+
     class TestGetHelp:
         """测试获取帮助信息"""
 
@@ -177,6 +177,20 @@ class TestEntityExtractor:
             # Assert
             assert result is not None
 
+    class TestExtractLimit:
+        """测试提取数量限制"""
+
+        def test_extract_top_n(self, extractor):
+            """测试提取 前N个 / topN / 最近N条"""
+            assert extractor.extract_limit("查看前20个需求") == 20
+            assert extractor.extract_limit("查看top 5需求") == 5
+            assert extractor.extract_limit("最近10条需求") == 10
+
+        def test_extract_not_found(self, extractor):
+            """测试不把需求ID当作数量"""
+            assert extractor.extract_limit("查看需求#11754") is None
+            assert extractor.extract_limit("查看前端相关需求") is None
+
     class TestExtractAll:
         """测试提取所有实体"""
 
@@ -198,6 +212,26 @@ class TestEntityExtractor:
             assert isinstance(result, dict)
             assert result['task_id'] is None
 
+        def test_extract_all_without_digits(self, extractor):
+            """测试不含数字的文本不提取ID和数量"""
+            # Act
+            result = extractor.extract_all("查看包含'面板'的已完成需求")
+
+            # Assert
+            assert result['task_id'] is None
+            assert result['story_id'] is None
+            assert result['limit'] is None
+            assert result['status'] == 'done'
+            assert result['keywords'] == ['面板']
+
+        def test_earlier_pattern_takes_priority(self, extractor):
+            """测试多个格式都能匹配时靠前的格式优先"""
+            # Act
+            result = extractor.extract_all("12号任务 任务#34")
+
+            # Assert
+            assert result['task_id'] == '34'
+
     class TestExtractFilterNoTask:
         """测试提取未创建任务过滤条件"""
 
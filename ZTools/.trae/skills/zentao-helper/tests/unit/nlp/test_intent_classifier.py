@@ -95,6 +95,14 @@ class TestIntentClassifier:
             # Assert
             assert result == "assign_task"
 
+        def test_contained_keyword_not_counted(self, classifier):
+            """测试"指派给"中的"给"不重复计分"""
+            # Act
+            scores = classifier._get_matcher().scores("指派给张三")
+
+            # Assert
+            assert scores == {"assign_task": 2}
+
         def test_classify_with_story_keywords(self, classifier):
             """测试需求关键词"""
             # Act
@@ -135,6 +143,37 @@ class TestIntentClassifier:
             # Assert
             assert result == "unknown"
 
+    class TestMixedQueryAndSplit:
+        """
+        测试同时包含查询和拆解关键词的指令
+
+        "查看任务"中的"任务"等被更长关键词包含的匹配不再重复计分，查询词只计一次，
+        明确的拆解词（权重 2）优先于查询词。此前"拆成"与"查看任务"（任务 + 查看任务）同分时取查询意图，
+        而"拆解成"（拆解 + 拆解成）又会胜出，结果取决于拆解词的写法
+        """
+
+        @pytest.mark.parametrize('text, intent', [
+            ("查看任务#12拆成设计、开发", "split_task"),
+            ("展示需求#5拆成前端、后端", "split_task"),
+            ("查看需求#5拆解成前端和后端", "split_task"),
+            ("显示需求#5拆解任务", "split_task"),
+            ("我的需求拆分为前端、后端", "split_task"),
+        ])
+        def test_split_keyword_wins(self, classifier, text, intent):
+            """测试包含明确拆解词时识别为拆解"""
+            assert classifier._classify_with_keywords(text) == intent
+
+        @pytest.mark.parametrize('text, intent', [
+            ("查看我的任务", "query_tasks"),
+            ("显示任务列表", "query_tasks"),
+            ("查看任务#12", "query_tasks"),
+            ("查看需求列表", "query_stories"),
+            ("查看需求#5的任务", "query_stories"),
+        ])
+        def test_query_without_split_keyword(self, classifier, text, intent):
+            """测试没有拆解词时仍识别为查询"""
+            assert classifier._classify_with_keywords(text) == intent
+
     class TestGetAllIntents:
         """测试获取所有意图"""
 
@@ -173,6 +212,19 @@ class TestIntentClassifier:
             # Assert
             assert result == "test_intent"
 
+        def test_replace_intent_keywords(self, classifier):
+            """测试重新添加意图时替换原有关键词"""
+            # Arrange
+            classifier.add_intent("replace_intent", ["旧关键词"])
+            assert classifier._classify_with_keywords("旧关键词") == "replace_intent"
+
+            # Act
+            classifier.add_intent("replace_intent", ["新关键词"])
+
+            # Assert
+            assert classifier._classify_with_keywords("旧关键词") == "unknown"
+            assert classifier._classify_with_keywords("新关键词") == "replace_intent"
+
     class TestClassifyWithLLM:
         """测试 LLM 分类（预留）"""
 
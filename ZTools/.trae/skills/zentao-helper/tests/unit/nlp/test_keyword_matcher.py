@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+测试多关键词匹配器
+"""
+
+import pytest
+
+from src.nlp.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """测试多关键词匹配器"""
+
+    @pytest.fixture
+    def matcher(self):
+        """创建匹配器实例"""
+        matcher = KeywordMatcher()
+        matcher.add('指派', 'assign', 2)
+        matcher.add('给', 'assign', 1)
+        matcher.add('指派给', 'assign', 2)
+        matcher.add('任务', 'tasks')
+        matcher.add('Task', 'tasks')
+        return matcher
+
+    class TestFindAll:
+        """测试查找关键词"""
+
+        def test_find_overlapping(self, matcher):
+            """测试返回重叠的所有匹配"""
+            # Act
+            matches = matcher.find_all('指派给张三')
+
+            # Assert
+            assert sorted(matches) == [(0, 2, '指派'), (0, 3, '指派给'), (2, 3, '给')]
+
+        def test_find_case_insensitive(self, matcher):
+            """测试不区分大小写"""
+            # Act
+            matches = matcher.find_all('my TASKS')
+
+            # Assert
+            assert matches == [(3, 7, 'task')]
+
+        def test_find_after_failure_link(self):
+            """测试部分匹配失败后沿失败链接继续匹配"""
+            # Arrange
+            matcher = KeywordMatcher()
+            matcher.add('abcd', 'x')
+            matcher.add('bce', 'y')
+
+            # Act
+            matches = matcher.find_all('abce')
+
+            # Assert
+            assert matches == [(1, 4, 'bce')]
+
+    class TestScores:
+        """测试计算分数"""
+
+        def test_longest_match_suppresses_contained(self, matcher):
+            """测试被更长关键词包含的匹配不计分"""
+            # Act
+            scores = matcher.scores('指派给张三')
+
+            # Assert
+            assert scores == {'assign': 2}
+
+        def test_without_longest_match(self, matcher):
+            """测试关闭最长匹配时所有匹配都计分"""
+            # Act
+            scores = matcher.scores('指派给张三', longest_match=False)
+
+            # Assert
+            assert scores == {'assign': 5}
+
+        def test_keyword_counted_once(self, matcher):
+            """测试同一关键词出现多次只计一次"""
+            # Act
+            scores = matcher.scores('任务任务给我')
+
+            # Assert
+            assert scores == {'tasks': 1, 'assign': 1}
+
+        def test_no_match(self, matcher):
+            """测试没有匹配时返回空结果"""
+            # Act & Assert
+            assert matcher.scores('随便说说') == {}
+
+    class TestUpdate:
+        """测试更新关键词"""
+
+        def test_add_after_compile(self, matcher):
+            """测试匹配后添加的关键词在下次匹配时生效"""
+            # Arrange
+            assert matcher.scores('测试意图') == {}
+
+            # Act
+            matcher.add('测试', 'test')
+
+            # Assert
+            assert matcher.scores('测试意图') == {'test': 1}
+
+        def test_remove_label(self, matcher):
+            """测试移除标签后其关键词不再计分"""
+            # Act
+            matcher.remove_label('tasks')
+
+            # Assert
+            assert matcher.scores('查看任务') == {}
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+测试 skill.py 的导入开销
+在独立进程中导入，避免受其他测试已导入模块的影响
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+SKILL_ROOT = Path(__file__).parent.parent.parent
+
+# 帮助和指令解析不应加载的模块（网络、加密、SQLite、常驻进程）
+HEAVY_MODULES = [
+    'requests', 'urllib3', 'keyring', 'cryptography', 'sqlite3',
+    'src.zentao.api_client', 'src.auth.session_manager', 'src.utils.daemon',
+]
+# 导入 skill.py 的耗时上限（秒），只用于发现明显的退化
+IMPORT_BUDGET = 0.5
+
+
+def run_in_subprocess(code: str) -> dict:
+    """在 Skill 根目录下用新进程执行代码，返回最后一行输出的 JSON"""
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=SKILL_ROOT, capture_output=True, text=True, timeout=60, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestSkillImports:
+    """测试 Skill 按需导入子系统"""
+
+    def test_help_and_parse_without_heavy_modules(self):
+        """测试帮助和指令解析不加载网络和加密模块"""
+        result = run_in_subprocess(
+            "import json, sys\n"
+            "import skill\n"
+            "s = skill.ZenTaoHelperSkill(interactive=False)\n"
+            "help_result = s.execute('帮助')\n"
+            "command = s.command_parser.parse('查看我的需求')\n"
+            f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps({'help': help_result['success'], 'intent': command['intent'], 'loaded': loaded}))"
+        )
+
+        assert result == {'help': True, 'intent': 'query_stories', 'loaded': []}
+
+    def test_help_with_stats_without_api_client(self):
+        """测试帮助指令带 stats 参数时输出空指标，不为此创建 API 客户端"""
+        result = run_in_subprocess(
+            "import json, sys\n"
+            "import skill\n"
+            "s = skill.ZenTaoHelperSkill(interactive=False)\n"
+            "help_result = s.execute('帮助', stats='json')\n"
+            f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps({'help': help_result['success'], 'stats': json.loads(help_result['stats']),\n"
+            "                  'created': 'api_client' in s.__dict__, 'loaded': loaded}))"
+        )
+
+        assert result['help'] is True
+        assert result['stats']['families'] == {}
+        assert result['created'] is False
+        assert result['loaded'] == []
+
+    def test_import_time_budget(self):
+        """测试导入 skill.py 的耗时在预算内"""
+        result = run_in_subprocess(
+            "import json, time\n"
+            "start = time.perf_counter()\n"
+            "import skill\n"
+            "print(json.dumps({'seconds': time.perf_counter() - start}))"
+        )
+
+        assert result['seconds'] < IMPORT_BUDGET
+
+    def test_subsystems_created_on_first_use(self):
+        """测试首次访问时创建子系统，之后复用同一个实例"""
+        result = run_in_subprocess(
+            "import json, sys\n"
+            "import skill\n"
+            "config = skill.get_config().load()\n"
+            "# 不读写本地缓存文件\n"
+            "config['cache']['local_store']['enabled'] = False\n"
+            "config['zentao'].setdefault('response_cache', {})['path'] = ''\n"
+            "s = skill.ZenTaoHelperSkill(interactive=False)\n"
+            "same = s.story_collector.api_client is s.api_client is s.task_splitter.api_client\n"
+            "print(json.dumps({'same': same, 'loaded': 'src.zentao.api_client' in sys.modules}))"
+        )
+
+        assert result == {'same': True, 'loaded': True}
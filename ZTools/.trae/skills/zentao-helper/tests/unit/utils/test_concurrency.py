@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+测试并发工具模块
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.concurrency import RateLimiter, StaleWhileRevalidate, bounded_map, prefetch_map
+from src.utils.response import ApiResponse, ErrorCode
+
+
+class TestBoundedMap:
+    """测试有界并发执行"""
+
+    def test_results_keep_input_order(self):
+        """测试结果顺序与输入一致"""
+        # Arrange
+        def slow_square(x):
+            time.sleep(0.001 * (10 - x))
+            return x * x
+
+        # Act
+        results = bounded_map(slow_square, range(10), max_workers=4)
+
+        # Assert
+        assert results == [x * x for x in range(10)]
+
+    def test_empty_items(self):
+        """测试空输入"""
+        assert bounded_map(lambda x: x, [], max_workers=4) == []
+
+    def test_exception_returns_none(self):
+        """测试单个元素异常时返回 None"""
+        # Arrange
+        def func(x):
+            if x == 2:
+                raise ValueError("失败")
+            return x
+
+        # Act
+        results = bounded_map(func, [1, 2, 3], max_workers=3)
+
+        # Assert
+        assert results == [1, None, 3]
+
+    def test_max_workers_bound(self):
+        """测试并发数不超过上限"""
+        # Arrange
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def func(x):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return x
+
+        # Act
+        bounded_map(func, range(12), max_workers=3)
+
+        # Assert
+        assert state['peak'] <= 3
+
+    def test_serial_when_single_worker(self):
+        """测试并发数为 1 时串行执行"""
+        # Arrange
+        calls = []
+
+        # Act
+        results = bounded_map(lambda x: calls.append(x) or x, [3, 1, 2], max_workers=1)
+
+        # Assert
+        assert results == [3, 1, 2]
+        assert calls == [3, 1, 2]
+
+    def test_on_result_callback(self):
+        """测试完成回调在每个元素完成时调用"""
+        # Arrange
+        seen = []
+
+        # Act
+        bounded_map(lambda x: x * 2, [1, 2, 3], max_workers=2,
+                    on_result=lambda item, result: seen.append((item, result)))
+
+        # Assert
+        assert sorted(seen) == [(1, 2), (2, 4), (3, 6)]
+
+
+class TestPrefetchMap:
+    """测试按序预取"""
+
+    def test_results_in_input_order(self):
+        """测试结果顺序与输入一致"""
+        def slow_square(x):
+            time.sleep(0.01 * (5 - x))
+            return x * x
+
+        assert list(prefetch_map(slow_square, range(5), max_workers=3)) == [0, 1, 4, 9, 16]
+
+    def test_runs_concurrently(self):
+        """测试并发执行"""
+        def slow(x):
+            time.sleep(0.1)
+            return x
+
+        start = time.time()
+        list(prefetch_map(slow, range(4), max_workers=4))
+
+        assert time.time() - start < 0.3
+
+    def test_prefetch_bounded_and_cancelled_on_close(self):
+        """测试最多预取 max_workers 个，停止迭代后不再执行剩余元素"""
+        started = []
+
+        def record(x):
+            started.append(x)
+            return x
+
+        results = prefetch_map(record, range(100), max_workers=2)
+        assert next(results) == 0
+        results.close()
+        time.sleep(0.05)
+
+        assert len(started) <= 3
+
+    def test_exception_raised_in_order(self):
+        """测试元素异常在产出该元素时抛出"""
+        def fail_on_two(x):
+            if x == 2:
+                raise ValueError('失败')
+            return x
+
+        results = prefetch_map(fail_on_two, range(4), max_workers=2)
+
+        assert next(results) == 0
+        assert next(results) == 1
+        with pytest.raises(ValueError):
+            next(results)
+
+    def test_serial(self):
+        """测试 max_workers<=1 时串行执行"""
+        assert list(prefetch_map(lambda x: x + 1, [1, 2], max_workers=1)) == [2, 3]
+
+
+class TestRateLimiter:
+    """测试速率限制器"""
+
+    def test_unlimited(self):
+        """测试未设置速率时不等待"""
+        limiter = RateLimiter(None)
+
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+
+        assert time.monotonic() - start < 0.1
+
+    def test_rate_shared_across_threads(self):
+        """测试多线程共享时总速率不超过上限"""
+        # Arrange
+        limiter = RateLimiter(50)
+        times = []
+
+        def func(_):
+            limiter.acquire()
+            times.append(time.monotonic())
+
+        # Act
+        bounded_map(func, range(6), max_workers=3)
+
+        # Assert: 6 个请求至少间隔 5 个 20ms
+        times.sort()
+        assert times[-1] - times[0] >= 0.09
+
+
+class TestStaleWhileRevalidate:
+    """测试过期后后台刷新的缓存"""
+
+    @staticmethod
+    def _loader(values):
+        calls = []
+
+        def load():
+            calls.append(1)
+            value = values[min(len(calls), len(values)) - 1]
+            if isinstance(value, Exception):
+                return ApiResponse.error_response(ErrorCode.API_ERROR, str(value))
+            return ApiResponse.success_response(value)
+
+        return load, calls
+
+    def test_fresh_value_cached(self):
+        """测试有效期内只加载一次"""
+        loader, calls = self._loader(['v1'])
+        cache = StaleWhileRevalidate(loader, ttl=60)
+
+        assert cache.get().data == 'v1'
+        assert cache.get().data == 'v1'
+        assert len(calls) == 1
+
+    def test_stale_value_refreshed_in_background(self):
+        """测试过期后返回旧值并在后台刷新"""
+        loader, calls = self._loader(['v1', 'v2'])
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        cache.seed(ApiResponse.success_response('v0'), time.time() - 120)
+
+        assert cache.get().data == 'v0'
+        for _ in range(100):
+            if cache.get().data == 'v1':
+                break
+            time.sleep(0.01)
+        assert cache.get().data == 'v1'
+        assert len(calls) == 1
+
+    def test_background_failure_keeps_stale(self):
+        """测试后台刷新失败时保留旧值"""
+        loader, calls = self._loader([RuntimeError('网络错误')])
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        cache.seed(ApiResponse.success_response('v0'), time.time() - 120)
+
+        cache.get()
+        for _ in range(100):
+            if calls and not cache._refreshing:
+                break
+            time.sleep(0.01)
+
+        assert cache.get().data == 'v0'
+
+    def test_too_stale_loaded_synchronously(self):
+        """测试超过最长可用时间时同步加载"""
+        loader, _ = self._loader(['v1'])
+        cache = StaleWhileRevalidate(loader, ttl=60, max_stale=100)
+        cache.seed(ApiResponse.success_response('v0'), time.time() - 1000)
+
+        assert cache.get().data == 'v1'
+
+    def test_failed_load_returned_not_cached(self):
+        """测试同步加载失败返回失败结果，下次重新加载"""
+        loader, calls = self._loader([RuntimeError('网络错误'), 'v1'])
+        cache = StaleWhileRevalidate(loader, ttl=60)
+
+        assert not cache.get().success
+        assert cache.get().data == 'v1'
+        assert len(calls) == 2
+
+    def test_concurrent_cold_get_loads_once(self):
+        """测试并发首次获取只加载一次"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return ApiResponse.success_response('v1')
+
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        threads = [threading.Thread(target=cache.get) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_invalidate_discards_running_refresh(self):
+        """测试后台刷新期间失效（如切换账号）时，刷新结果不写入缓存"""
+        started, release = threading.Event(), threading.Event()
+
+        def loader():
+            started.set()
+            release.wait(5)
+            return ApiResponse.success_response('旧账号的数据')
+
+        cache = StaleWhileRevalidate(loader, ttl=60)
+        cache.seed(ApiResponse.success_response('v0'), time.time() - 120)
+        cache.get()
+        assert started.wait(5)
+
+        cache.invalidate()
+        release.set()
+        for _ in range(100):
+            if not cache._refreshing:
+                break
+            time.sleep(0.01)
+
+        assert cache.peek() is None
+
+    def test_peek_does_not_load(self):
+        """测试 peek 返回当前数据且不触发加载"""
+        loader, calls = self._loader(['v1'])
+        cache = StaleWhileRevalidate(loader, ttl=60)
+
+        assert cache.peek() is None
+        cache.seed(ApiResponse.success_response('v0'), time.time() - 120)
+
+        assert cache.peek().data == 'v0'
+        assert calls == []
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+测试常驻进程模块
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.utils.daemon import SkillDaemon, forward_execute, send_request, stop_daemon
+from src.utils.response import ErrorCode
+
+
+class TestSkillDaemon:
+    """测试常驻进程"""
+
+    @pytest.fixture
+    def token_file(self, tmp_path):
+        """令牌文件路径"""
+        return tmp_path / '.daemon.token'
+
+    @pytest.fixture
+    def execute(self):
+        """Mock 指令执行函数"""
+        return Mock(return_value={'success': True, 'data': {'message': '操作成功'}})
+
+    @pytest.fixture
+    def daemon(self, execute, token_file):
+        """在后台线程启动常驻进程（随机端口）"""
+        skill_daemon = SkillDaemon(execute, host='127.0.0.1', port=0, token_file=token_file)
+        thread = threading.Thread(target=skill_daemon.serve_forever, daemon=True)
+        thread.start()
+        # 等待令牌文件写入
+        for _ in range(100):
+            if token_file.exists():
+                break
+            threading.Event().wait(0.01)
+        yield skill_daemon
+        skill_daemon.shutdown()
+        thread.join(timeout=5)
+
+    class TestForwardExecute:
+        """测试转发指令"""
+
+        def test_forward_execute(self, daemon, execute, token_file):
+            """测试指令转发给常驻进程执行"""
+            # Act
+            result = forward_execute('查看我的任务', token_file=token_file, grade='A')
+
+            # Assert
+            assert result == {'success': True, 'data': {'message': '操作成功'}}
+            execute.assert_called_once_with('查看我的任务', grade='A')
+
+        def test_forward_execute_reuses_daemon(self, daemon, execute, token_file):
+            """测试多次转发复用同一个常驻进程"""
+            # Act
+            forward_execute('查看我的任务', token_file=token_file)
+            forward_execute('查看我的需求', token_file=token_file)
+
+            # Assert
+            assert execute.call_count == 2
+
+        def test_forward_execute_without_daemon(self, token_file):
+            """测试常驻进程未运行时返回 None"""
+            # Act
+            result = forward_execute('查看我的任务', token_file=token_file)
+
+            # Assert
+            assert result is None
+
+        def test_forward_execute_stale_token_file(self, tmp_path):
+            """测试令牌文件残留但常驻进程已退出时返回 None"""
+            # Arrange
+            stale_file = tmp_path / '.stale.token'
+            stale_file.write_text(json.dumps({'host': '127.0.0.1', 'port': 1, 'token': 'x'}))
+
+            # Act
+            result = forward_execute('查看我的任务', token_file=stale_file)
+
+            # Assert
+            assert result is None
+
+        def test_forward_execute_error(self, daemon, execute, token_file):
+            """测试执行函数抛出异常时返回错误结果（不交给调用方在本地重新执行）"""
+            # Arrange
+            execute.side_effect = RuntimeError("执行失败")
+
+            # Act
+            result = forward_execute('查看我的任务', token_file=token_file)
+
+            # Assert
+            assert result['success'] is False
+            assert result['error']['code'] == ErrorCode.API_ERROR
+            assert '执行失败' in result['error']['message']
+
+        def test_forward_execute_timeout(self, daemon, execute, token_file):
+            """测试等待响应超时时返回超时错误"""
+            # Arrange
+            execute.side_effect = lambda *args, **kwargs: time.sleep(0.5) or {'success': True}
+
+            # Act
+            with patch('src.utils.daemon._get_daemon_config', return_value={'request_timeout': 0.1}):
+                result = forward_execute('拆解需求#123', token_file=token_file)
+
+            # Assert
+            assert result['success'] is False
+            assert result['error']['code'] == ErrorCode.TIMEOUT
+            execute.assert_called_once()
+
+        def test_forward_execute_connection_closed(self, daemon, execute, token_file):
+            """测试常驻进程未返回响应就关闭连接时返回错误结果"""
+            # Arrange
+            with patch.object(daemon, 'handle_request', side_effect=lambda request: None), \
+                 patch('src.utils.daemon._DaemonRequestHandler._reply'):
+
+                # Act
+                result = forward_execute('查看我的任务', token_file=token_file)
+
+            # Assert
+            assert result['success'] is False
+            assert result['error']['code'] == ErrorCode.API_ERROR
+
+    class TestSkillMain:
+        """测试 skill_main 转发指令"""
+
+        def test_timeout_does_not_execute_locally(self, daemon, execute, token_file):
+            """测试常驻进程执行超时时不在本地重复执行"""
+            # Arrange
+            import skill
+            execute.side_effect = lambda *args, **kwargs: time.sleep(0.5) or {'success': True}
+            daemon_config = {'request_timeout': 0.1}
+
+            with patch('src.utils.daemon._get_daemon_config', return_value=daemon_config), \
+                 patch('src.utils.daemon.get_token_file', return_value=token_file), \
+                 patch.object(skill, 'ZenTaoHelperSkill') as local_skill:
+
+                # Act
+                result = skill.skill_main('拆解需求#123')
+
+            # Assert
+            assert result['error']['code'] == ErrorCode.TIMEOUT
+            execute.assert_called_once()
+            local_skill.assert_not_called()
+
+        def test_daemon_not_running_executes_locally(self, token_file):
+            """测试常驻进程未运行时在本地执行"""
+            # Arrange
+            import skill
+
+            with patch('src.utils.daemon.get_token_file', return_value=token_file), \
+                 patch.object(skill, 'ZenTaoHelperSkill') as local_skill:
+                local_skill.return_value.execute.return_value = {'success': True}
+
+                # Act
+                result = skill.skill_main('查看我的任务')
+
+            # Assert
+            assert result == {'success': True}
+            local_skill.return_value.execute.assert_called_once_with('查看我的任务')
+
+    class TestRequest:
+        """测试请求处理"""
+
+        def test_ping(self, daemon, token_file):
+            """测试 ping"""
+            # Act
+            response = send_request('ping', token_file=token_file)
+
+            # Assert
+            assert response['ok'] is True
+            assert 'pid' in response['result']
+
+        def test_invalid_token(self, daemon, token_file):
+            """测试令牌无效时拒绝请求"""
+            # Arrange
+            daemon_info = json.loads(token_file.read_text())
+            daemon_info['token'] = 'invalid'
+            token_file.write_text(json.dumps(daemon_info))
+
+            # Act
+            response = send_request('ping', token_file=token_file)
+
+            # Assert
+            assert response['ok'] is False
+
+        def test_unknown_op(self, daemon, token_file):
+            """测试未知操作"""
+            # Act
+            response = send_request('unknown', token_file=token_file)
+
+            # Assert
+            assert response['ok'] is False
+
+        def test_token_file_content(self, daemon, token_file):
+            """测试令牌文件记录监听地址"""
+            # Act
+            daemon_info = json.loads(token_file.read_text())
+
+            # Assert
+            assert (daemon_info['host'], daemon_info['port']) == tuple(daemon.address)
+            assert daemon_info['token'] == daemon.token
+
+    class TestStopDaemon:
+        """测试停止常驻进程"""
+
+        def test_stop_daemon(self, execute, token_file):
+            """测试停止后删除令牌文件"""
+            # Arrange
+            skill_daemon = SkillDaemon(execute, host='127.0.0.1', port=0, token_file=token_file)
+            thread = threading.Thread(target=skill_daemon.serve_forever, daemon=True)
+            thread.start()
+            for _ in range(100):
+                if token_file.exists():
+                    break
+                threading.Event().wait(0.01)
+
+            # Act
+            stopped = stop_daemon(token_file=token_file)
+            thread.join(timeout=5)
+
+            # Assert
+            assert stopped is True
+            assert not thread.is_alive()
+            assert not token_file.exists()
+
+        def test_stop_daemon_not_running(self, token_file):
+            """测试常驻进程未运行"""
+            assert stop_daemon(token_file=token_file) is False
@@ -307,6 +307,27 @@ class TestInteractiveInput:
                 result = interactive_input.select_execution(executions)
                 assert result is None
 
+        def test_select_execution_by_name_prefix(self, interactive_input):
+            """测试输入项目名称前缀选择"""
+            executions = [
+                {'id': 1, 'name': '运维项目'},
+                {'id': 2, 'name': '研发中心项目'}
+            ]
+            with patch('builtins.input', return_value='研发'):
+                result = interactive_input.select_execution(executions)
+                assert result == 2
+
+        def test_select_execution_by_name_ambiguous(self, interactive_input, capsys):
+            """测试名称匹配到多个项目时列出候选并重新输入"""
+            executions = [
+                {'id': 1, 'name': '都江堰一期'},
+                {'id': 2, 'name': '都江堰二期'}
+            ]
+            with patch('builtins.input', side_effect=['都江堰', '都江堰二期']):
+                result = interactive_input.select_execution(executions)
+                assert result == 2
+            assert '匹配到多个项目' in capsys.readouterr().out
+
     class TestInputGrade:
         """测试输入需求等级"""
 
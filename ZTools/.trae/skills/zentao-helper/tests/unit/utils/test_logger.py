@@ -6,11 +6,14 @@
 import pytest
 import json
 import logging
+import queue
 import sys
 from unittest.mock import Mock, patch, MagicMock
 from io import StringIO
 
-from src.utils.logger import JsonFormatter, Logger, get_logger
+from src.utils.logger import (
+    BoundedQueueHandler, JsonFormatter, Logger, SizeTimedRotatingFileHandler, get_logger, reset_loggers
+)
 
 
 class TestJsonFormatter:
@@ -140,6 +143,23 @@ class TestLogger:
         # 处理器应该被替换而不是累加
         assert len(logger2.logger.handlers) == initial_handlers_count
 
+    def test_is_enabled_for(self):
+        """测试按级别判断是否输出"""
+        log = Logger(name="LevelLogger", level="WARNING")
+
+        assert log.is_enabled_for('error')
+        assert not log.is_enabled_for('debug')
+
+    def test_disabled_level_skips_record(self):
+        """测试级别不够时不创建日志记录"""
+        log = Logger(name="SkipLogger", level="WARNING")
+
+        with patch.object(log.logger, 'makeRecord') as mock_make_record:
+            log.debug("调试消息")
+            log.info("信息消息")
+
+        mock_make_record.assert_not_called()
+
 
 class TestGetLogger:
     """测试获取日志实例"""
@@ -175,3 +195,111 @@ class TestGetLogger:
         # Assert
         assert logger.logger.name == "CustomLogger"
         assert logger.logger.level == logging.WARNING
+
+    @patch('src.utils.config_loader.get_config')
+    def test_get_logger_cached(self, mock_get_config):
+        """测试相同参数只创建一次日志实例，不重复读取配置"""
+        mock_get_config.return_value.get_logging_config.return_value = {'level': 'INFO', 'format': 'text'}
+
+        first = get_logger(name="CachedLogger")
+        second = get_logger(name="CachedLogger")
+
+        assert first is second
+        assert mock_get_config.call_count == 1
+
+    def test_get_logger_thread_safe(self):
+        """测试并发获取同一日志实例"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            loggers = list(executor.map(
+                lambda _: get_logger(name="ConcurrentLogger", level="INFO", format_type="text"), range(32)
+            ))
+
+        assert all(log is loggers[0] for log in loggers)
+
+    def test_reset_loggers(self):
+        """测试清空后重新创建日志实例"""
+        first = get_logger(name="ResetLogger", level="INFO", format_type="text")
+
+        reset_loggers()
+
+        assert get_logger(name="ResetLogger", level="INFO", format_type="text") is not first
+
+
+class TestQueueLogging:
+    """测试异步日志"""
+
+    @staticmethod
+    def make_record(message: str) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.INFO, "test.py", 1, message, None, None)
+
+    def test_queue_logger_writes_jsonl(self, tmp_path):
+        """测试日志经队列由后台线程写入 JSONL 文件"""
+        from src.utils import logger as logger_module
+        log_file = tmp_path / 'logs' / 'app.jsonl'
+
+        log = Logger(name="QueueLogger", level="INFO", format_type="text",
+                     queue_config={'enabled': True, 'file': str(log_file)})
+        log.info("异步消息", extra={'story_id': 1})
+        log.debug("不输出")
+        # 停止后台线程时输出队列中剩余的日志
+        logger_module._listeners.pop("QueueLogger").stop()
+
+        entries = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+        assert [entry['message'] for entry in entries] == ["异步消息"]
+        assert entries[0]['story_id'] == 1
+        assert isinstance(log.logger.handlers[0], BoundedQueueHandler)
+
+    def test_drop_new_when_full(self):
+        """测试队列满时丢弃新日志，放入成功时补一条丢弃提示"""
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue)
+
+        for i in range(3):
+            handler.emit(self.make_record(f"消息{i}"))
+
+        assert handler.dropped == 1
+        assert [log_queue.get_nowait().msg for _ in range(2)] == ["消息0", "消息1"]
+
+        handler.emit(self.make_record("消息3"))
+        messages = [log_queue.get_nowait().msg for _ in range(2)]
+        assert "丢弃了 1 条日志" in messages[0]
+        assert messages[1] == "消息3"
+
+    def test_drop_oldest_when_full(self):
+        """测试队列满时丢弃最早的日志"""
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, overflow=BoundedQueueHandler.DROP_OLDEST)
+
+        for i in range(3):
+            handler.emit(self.make_record(f"消息{i}"))
+
+        assert [log_queue.get_nowait().msg for _ in range(2)] == ["消息1", "消息2"]
+
+    def test_prepare_keeps_record_unformatted(self):
+        """测试放入队列时只合并参数，不格式化"""
+        handler = BoundedQueueHandler(queue.Queue())
+        record = logging.LogRecord("test", logging.INFO, "test.py", 1, "需求 %s", (123,), None)
+
+        prepared = handler.prepare(record)
+
+        assert prepared.msg == "需求 123"
+        assert prepared.args is None
+        assert record.args == (123,)
+
+    def test_size_rotation(self, tmp_path):
+        """测试文件超过大小后轮转，同一周期内的轮转文件不互相覆盖"""
+        log_file = tmp_path / 'app.jsonl'
+        handler = SizeTimedRotatingFileHandler(str(log_file), max_bytes=50, backup_count=10)
+        handler.setFormatter(JsonFormatter())
+        try:
+            for i in range(5):
+                handler.emit(self.make_record(f"消息{i}"))
+        finally:
+            handler.close()
+
+        files = sorted(path.name for path in tmp_path.iterdir())
+        assert len(files) == 5
+        lines = [line for path in tmp_path.iterdir() for line in path.read_text(encoding='utf-8').splitlines()]
+        assert sorted(json.loads(line)['message'] for line in lines) == [f"消息{i}" for i in range(5)]
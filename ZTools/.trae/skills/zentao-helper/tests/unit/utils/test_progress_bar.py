@@ -151,6 +151,34 @@ class TestProgressBar:
             # Assert
             assert pbar._closed is True
 
+    class TestThreadSafety:
+        """测试并发更新"""
+
+        def test_concurrent_update(self):
+            """测试多线程并发更新进度不丢失"""
+            # Arrange
+            import threading
+            output = StringIO()
+            pbar = ProgressBar(total=400, file=output)
+            pbar.start()
+
+            def worker():
+                for _ in range(100):
+                    pbar.update(1)
+                    pbar.set_postfix(已检查=pbar.current)
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+
+            # Act
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pbar.close()
+
+            # Assert
+            assert pbar.current == 400
+
 
 class TestSpinner:
     """测试加载动画"""
@@ -4,12 +4,15 @@
 """
 
 import json
+import time
 import requests
 import pytest
 from unittest.mock import Mock, patch
 
 from src.zentao.api_client import ZentaoApiClient
+from src.zentao.story_filter import StoryFilter
 from src.utils.response import ErrorCode, ApiResponse
+from src.utils.concurrency import prefetch_map
 
 
 class TestZentaoApiClient:
@@ -971,6 +974,54 @@ class TestZentaoApiClient:
             assert result.success is True
             assert len(result.data['stories']) == 0
 
+        @staticmethod
+        def _stories_page(start_id, count, stage='wait'):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "status": "success",
+                "data": json.dumps({"stories": [
+                    {"id": start_id - index, "title": f"需求{start_id - index}", "stage": stage,
+                     "productTitle": "产品A"}
+                    for index in range(count)
+                ]})
+            }
+            return response
+
+        def test_limit_stops_paging(self, client):
+            """测试找到 limit 个需求后不再请求后续页"""
+            client.session.get.side_effect = [self._stories_page(1000, 200), self._stories_page(800, 200)]
+
+            result = client.get_my_stories(story_filter=StoryFilter(products=['产品A']), limit=20)
+
+            assert [story['id'] for story in result.data['stories']] == list(range(1000, 980, -1))
+            assert client.session.get.call_count == 1
+
+        def test_filter_applied_across_pages(self, client):
+            """测试过滤条件逐页应用，第一页不够时继续请求"""
+            client.session.get.side_effect = [
+                self._stories_page(1000, 200, stage='developing'),
+                self._stories_page(800, 200),
+                self._stories_page(600, 200),
+            ]
+
+            result = client.get_my_stories(
+                story_filter=StoryFilter(products=['产品A'], stages=['wait']), limit=5
+            )
+
+            assert [story['id'] for story in result.data['stories']] == [800, 799, 798, 797, 796]
+            assert client.session.get.call_count == 2
+
+        def test_configured_products_applied(self, client):
+            """测试未指定产品时使用配置的产品列表"""
+            client.session.get.return_value = self._stories_page(10, 3)
+
+            with patch('src.utils.config_loader.get_config') as mock_get_config:
+                mock_get_config.return_value.get.return_value = ['产品B']
+                result = client.get_my_stories(story_filter=StoryFilter(stages=['wait']))
+
+            assert result.data['stories'] == []
+
     class TestVerifySession:
         """测试会话验证"""
 
@@ -1654,6 +1705,7 @@ class TestZentaoApiClient:
                      'realname': '测试用户'
                  }):
                 mock_session = Mock()
+                mock_session.hooks = {'response': []}
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -1673,11 +1725,36 @@ class TestZentaoApiClient:
                 assert result.success is True
                 assert 'cookies' in result.data
 
+        def test_login_clears_response_cache(self, client):
+            """测试登录成功后清除该账号的响应缓存，不再返回失效会话时缓存的响应"""
+            # Arrange
+            client.response_cache = Mock()
+            with patch('requests.Session') as mock_session_class, \
+                 patch.object(client, '_get_current_user_v8', return_value={'account': 'test_user'}):
+                mock_session = Mock()
+                mock_session.hooks = {'response': []}
+                mock_response = Mock()
+                mock_response.status_code = 200
+                mock_response.json.return_value = {'status': 'success'}
+                mock_session.get.return_value = mock_response
+                mock_session.post.return_value = mock_response
+                mock_session.cookies = {}
+                mock_session_class.return_value = mock_session
+
+                # Act
+                result = client.login('test_user', 'password123')
+
+            # Assert
+            assert result.success is True
+            assert client.response_cache.account == 'test_user'
+            client.response_cache.invalidate.assert_called_once_with()
+
         def test_login_failure(self, client):
             """测试登录失败"""
             # Arrange
             with patch('requests.Session') as mock_session_class:
                 mock_session = Mock()
+                mock_session.hooks = {'response': []}
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -1702,6 +1779,7 @@ class TestZentaoApiClient:
             import requests
             with patch('requests.Session') as mock_session_class:
                 mock_session = Mock()
+                mock_session.hooks = {'response': []}
                 mock_session.get.side_effect = requests.Timeout("连接超时")
                 mock_session_class.return_value = mock_session
 
@@ -1719,6 +1797,7 @@ class TestZentaoApiClient:
             import requests
             with patch('requests.Session') as mock_session_class:
                 mock_session = Mock()
+                mock_session.hooks = {'response': []}
                 mock_session.get.side_effect = requests.ConnectionError("连接被拒绝")
                 mock_session_class.return_value = mock_session
 
@@ -2895,6 +2974,57 @@ class TestZentaoApiClient:
             assert result.success is False
             assert result.error.code == ErrorCode.TIMEOUT
 
+        def test_get_my_tasks_detail_order_preserved(self, client):
+            """测试并发获取详情后任务顺序保持不变"""
+            # Arrange
+            options = ''.join(
+                f"<option value='{task_id}'>项目 / 任务{task_id}</option>"
+                for task_id in range(1, 21)
+            )
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.text = f"<select>{options}</select>"
+            client.session.get.return_value = mock_response
+            client.max_workers = 4
+
+            def fake_detail(task_id):
+                return {'status': 'doing', 'deadline': f'2024-01-{task_id:02d}'}
+
+            with patch.object(client, '_get_task_detail', side_effect=fake_detail):
+                # Act
+                result = client.get_my_tasks()
+
+            # Assert
+            tasks = result.data['tasks']
+            assert [task['id'] for task in tasks] == list(range(1, 21))
+            assert all(task['deadline'] == f"2024-01-{task['id']:02d}" for task in tasks)
+
+        def test_get_my_tasks_detail_partial_failure(self, client):
+            """测试单个任务详情获取失败时保留基础信息"""
+            # Arrange
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.text = """
+            <option value='201'>项目A / 任务1</option>
+            <option value='202'>项目B / 任务2</option>
+            """
+            client.session.get.return_value = mock_response
+
+            def fake_detail(task_id):
+                if task_id == 201:
+                    raise RuntimeError("网络错误")
+                return {'status': 'doing'}
+
+            with patch.object(client, '_get_task_detail', side_effect=fake_detail):
+                # Act
+                result = client.get_my_tasks()
+
+            # Assert
+            assert result.success is True
+            tasks = result.data['tasks']
+            assert tasks[0]['status'] == 'unknown'
+            assert tasks[1]['status'] == 'doing'
+
 
     class TestGetStoryDetailMinimal:
         """测试获取需求最小化详情"""
@@ -3134,8 +3264,9 @@ class TestZentaoApiClient:
             assert client.session.get.call_count == 1
 
         def test_get_my_stories_pagination_max_pages(self, client):
-            """测试达到最大页数限制"""
+            """测试达到配置的需求数上限"""
             # Arrange
+            client.story_max_stories = 2000  # 10页
             responses = []
             for _ in range(11):  # 超过10页限制
                 mock_response = Mock()
@@ -3159,6 +3290,101 @@ class TestZentaoApiClient:
             # 应该最多调用10次
             assert client.session.get.call_count == 10
 
+        @staticmethod
+        def _paged_responses(rec_total, pager=True):
+            """
+            按请求地址中的页码返回对应页（并发请求时调用顺序不固定）
+
+            与禅道一致：地址中的记录总数为 0 时返回实际总数，否则原样返回传入的值
+            """
+            def get(url, **kwargs):
+                params = url.rsplit('.', 1)[0].split('-')
+                requested_total, page = int(params[-3]), int(params[-1])
+                start = (page - 1) * 200
+                stories = [{'id': rec_total - index, 'title': '需求', 'status': 'active'}
+                           for index in range(start, min(start + 200, rec_total))]
+                data = {'stories': stories}
+                if pager:
+                    data['pager'] = {'recTotal': str(requested_total or rec_total), 'recPerPage': 200, 'pageID': page}
+                response = Mock()
+                response.status_code = 200
+                response.json.return_value = {'status': 'success', 'data': json.dumps(data)}
+                return response
+            return get
+
+        def test_pager_pages_fetched_concurrently_in_order(self, client):
+            """测试按分页信息并发获取剩余页，结果按页码顺序"""
+            client.session.get.side_effect = self._paged_responses(2650)
+
+            result = client.get_my_stories(story_filter=StoryFilter(products=[]))
+
+            assert [story['id'] for story in result.data['stories']] == list(range(2650, 0, -1))
+            assert client.session.get.call_count == 14
+
+        def test_pager_total_requested_from_server(self, client):
+            """测试第一页由禅道查询总数（传 0），剩余页传入该总数"""
+            client.session.get.side_effect = self._paged_responses(450)
+
+            with patch('src.zentao.api_client.prefetch_map', wraps=prefetch_map) as mock_prefetch:
+                pages = list(client.iter_my_story_pages())
+
+            urls = sorted(call[0][0] for call in client.session.get.call_args_list)
+            assert [len(page) for page in pages] == [200, 200, 50]
+            assert urls[0].endswith('-id_desc-0-200-1.json')
+            assert urls[1].endswith('-id_desc-450-200-2.json')
+            assert urls[2].endswith('-id_desc-450-200-3.json')
+            mock_prefetch.assert_called_once()
+
+        def test_pager_exact_page_no_extra_request(self, client):
+            """测试总数正好一页时不再请求下一页"""
+            client.session.get.side_effect = self._paged_responses(200)
+
+            pages = list(client.iter_my_story_pages())
+
+            assert len(pages) == 1
+            assert client.session.get.call_count == 1
+
+        def test_pager_total_over_limit(self, client):
+            """测试总数超过上限时只获取上限内的页并记录警告"""
+            client.story_max_stories = 500
+            client.session.get.side_effect = self._paged_responses(1000)
+
+            with patch.object(client.logger, 'warning') as mock_warning:
+                pages = list(client.iter_my_story_pages())
+
+            assert [len(page) for page in pages] == [200, 200, 200]
+            assert client.session.get.call_count == 3
+            assert '超过上限' in mock_warning.call_args[0][0]
+
+        def test_pager_total_over_limit_strict(self, client):
+            """测试 strict 模式下总数超过上限抛出异常"""
+            client.story_max_stories = 500
+            client.session.get.side_effect = self._paged_responses(1000)
+
+            with pytest.raises(RuntimeError):
+                list(client.iter_my_story_pages(strict=True))
+
+        def test_without_pager_not_capped_at_ten_pages(self, client):
+            """测试没有分页信息时逐页获取，不再限制为10页"""
+            client.session.get.side_effect = self._paged_responses(2650, pager=False)
+
+            result = client.get_my_stories(story_filter=StoryFilter(products=[]))
+
+            assert len(result.data['stories']) == 2650
+            assert client.session.get.call_count == 14
+
+        def test_stop_iteration_cancels_remaining_pages(self, client):
+            """测试提前停止迭代时不再请求剩余页"""
+            client.story_page_workers = 2
+            client.session.get.side_effect = self._paged_responses(4000)
+
+            pages = client.iter_my_story_pages()
+            next(pages)
+            next(pages)
+            pages.close()
+
+            assert client.session.get.call_count <= 4
+
         def test_get_my_stories_parse_error_in_loop(self, client):
             """测试分页过程中解析错误"""
             # Arrange
@@ -3445,6 +3671,862 @@ class TestZentaoApiClient:
             assert result is not None
             assert result.success is False
 
+    class TestGetStoryTaskCounts:
+        """测试并发检查需求任务数"""
+
+        def test_get_story_task_counts_success(self, client):
+            """测试并发获取多个需求任务数"""
+            # Arrange
+            counts = {1: 0, 2: 3, 3: 1}
+
+            def fake_count(story_id, timeout=None):
+                return counts[story_id]
+
+            with patch.object(client, 'get_story_task_count', side_effect=fake_count):
+                # Act
+                result = client.get_story_task_counts([1, 2, 3], max_workers=3)
+
+            # Assert
+            assert result == {1: 0, 2: 3, 3: 1}
+
+        def test_get_story_task_counts_uses_request_timeout(self, client):
+            """测试单次请求使用批量超时配置"""
+            # Arrange
+            client.batch_request_timeout = 5
+
+            with patch.object(client, 'get_story_task_count', return_value=0) as mock_count:
+                # Act
+                client.get_story_task_counts([1, 2])
+
+            # Assert
+            for call in mock_count.call_args_list:
+                assert call[1]['timeout'] == 5
+
+        def test_get_story_task_counts_progress_callback(self, client):
+            """测试每个需求完成时回调进度"""
+            # Arrange
+            progress = []
+
+            with patch.object(client, 'get_story_task_count', side_effect=[0, 2]):
+                # Act
+                client.get_story_task_counts(
+                    [10, 20],
+                    max_workers=1,
+                    on_progress=lambda story_id, count: progress.append((story_id, count))
+                )
+
+            # Assert
+            assert progress == [(10, 0), (20, 2)]
+
+        def test_get_story_task_counts_failure_counts_zero(self, client):
+            """测试单个需求检查异常时计为 0"""
+            # Arrange
+            def fake_count(story_id, timeout=None):
+                if story_id == 2:
+                    raise RuntimeError("网络错误")
+                return 1
+
+            with patch.object(client, 'get_story_task_count', side_effect=fake_count):
+                # Act
+                result = client.get_story_task_counts([1, 2], max_workers=2)
+
+            # Assert
+            assert result == {1: 1, 2: 0}
+
+        def test_get_story_task_count_custom_timeout(self, client):
+            """测试单个需求检查使用传入的超时"""
+            # Arrange
+            mock_response = Mock()
+            mock_response.status_code = 500
+            client.session.get.return_value = mock_response
+
+            # Act
+            client.get_story_task_count(123, timeout=3)
+
+            # Assert
+            assert client.session.get.call_args[1]['timeout'] == 3
+
+    class TestStoryCacheScope:
+        """测试请求作用域的需求快照缓存"""
+
+        @staticmethod
+        def _story_response(status='active'):
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "status": "success",
+                "data": json.dumps({
+                    "story": {
+                        "id": 123,
+                        "title": "测试需求",
+                        "status": status,
+                        "assignedTo": "user1",
+                        "estimate": 2
+                    }
+                })
+            }
+            return mock_response
+
+        def test_get_story_without_scope_not_cached(self, client):
+            """测试作用域外不缓存"""
+            # Arrange
+            client.session.get.return_value = self._story_response()
+
+            # Act
+            client.get_story(123)
+            client.get_story(123)
+
+            # Assert
+            assert client.session.get.call_count == 2
+
+        def test_get_story_within_scope_cached(self, client):
+            """测试作用域内只请求一次"""
+            # Arrange
+            client.session.get.return_value = self._story_response()
+
+            # Act
+            with client.story_cache_scope():
+                first = client.get_story(123)
+                first.data['title'] = '被调用方修改'
+                second = client.get_story(123)
+
+            # Assert
+            assert client.session.get.call_count == 1
+            assert second.data['title'] == '测试需求'
+
+        def test_scope_cleared_on_exit(self, client):
+            """测试退出作用域后清空快照"""
+            # Arrange
+            client.session.get.return_value = self._story_response()
+
+            # Act
+            with client.story_cache_scope():
+                client.get_story(123)
+            client.get_story(123)
+
+            # Assert
+            assert client._story_cache is None
+            assert client.session.get.call_count == 2
+
+        def test_nested_scope_keeps_outer_cache(self, client):
+            """测试嵌套作用域不清空外层快照"""
+            # Arrange
+            client.session.get.return_value = self._story_response()
+
+            # Act
+            with client.story_cache_scope():
+                with client.story_cache_scope():
+                    client.get_story(123)
+                client.get_story(123)
+
+            # Assert
+            assert client.session.get.call_count == 1
+
+        def test_story_change_invalidates_snapshot(self, client):
+            """测试变更需求标题后快照失效"""
+            # Arrange
+            client.session.get.return_value = self._story_response()
+            post_response = Mock()
+            post_response.status_code = 200
+            post_response.json.return_value = {"result": "success"}
+            client.session.post.return_value = post_response
+
+            # Act
+            with client.story_cache_scope():
+                client.get_story(123)
+                client.update_story_title(123, "新标题")
+                client.get_story(123)
+
+            # Assert
+            # 首次获取 + 变更前复用快照 + 变更后重新获取
+            assert client.session.get.call_count == 2
+
+        def test_review_story_invalidates_snapshot(self, client):
+            """测试评审需求后快照失效"""
+            # Arrange
+            client.session.get.return_value = self._story_response(status='changed')
+            post_response = Mock()
+            post_response.status_code = 200
+            post_response.text = "<script>parent.location='story-view-123.html'</script>"
+            client.session.post.return_value = post_response
+
+            # Act
+            with client.story_cache_scope():
+                client.review_story(123)
+                client.get_story(123)
+
+            # Assert
+            assert client.session.get.call_count == 2
+
+
+    class TestSessionVerificationMemo:
+        """测试会话验证结果缓存"""
+
+        @staticmethod
+        def _verify_response():
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.url = 'http://test.zentao.com/my-story-assignedTo-id_desc-9999-1-1.json'
+            mock_response.json.return_value = {
+                "status": "success",
+                "data": json.dumps({"stories": []})
+            }
+            return mock_response
+
+        @staticmethod
+        def _hook_response(url, status_code=200, location=None, content_type='application/json', content=b'{}'):
+            mock_response = Mock()
+            mock_response.status_code = status_code
+            mock_response.url = url
+            mock_response.is_redirect = location is not None
+            mock_response.headers = {'Content-Type': content_type}
+            if location:
+                mock_response.headers['Location'] = location
+            mock_response.content = content
+            return mock_response
+
+        def test_verify_session_memoized(self, client):
+            """测试有效期内只请求一次服务器"""
+            # Arrange
+            client.session_check_interval = 300
+            client.session.get.return_value = self._verify_response()
+
+            # Act
+            first = client.verify_session()
+            second = client.verify_session()
+
+            # Assert
+            assert first is True
+            assert second is True
+            assert client.session.get.call_count == 1
+            assert client.session_verified_at is not None
+
+        def test_verify_session_expired_memo(self, client):
+            """测试超过有效期重新验证"""
+            # Arrange
+            client.session_check_interval = 300
+            client.mark_session_verified(time.time() - 600)
+            client.session.get.return_value = self._verify_response()
+
+            # Act
+            result = client.verify_session()
+
+            # Assert
+            assert result is True
+            client.session.get.assert_called_once()
+
+        def test_verify_session_force(self, client):
+            """测试强制验证"""
+            # Arrange
+            client.session_check_interval = 300
+            client.mark_session_verified()
+            client.session.get.return_value = self._verify_response()
+
+            # Act
+            client.verify_session(force=True)
+
+            # Assert
+            client.session.get.assert_called_once()
+
+        def test_mark_session_verified_keeps_latest(self, client):
+            """测试只保留最新的验证时间"""
+            # Arrange
+            now = time.time()
+            client.mark_session_verified(now)
+
+            # Act
+            client.mark_session_verified(now - 100)
+
+            # Assert
+            assert client.session_verified_at == now
+
+        def test_login_redirect_invalidates(self, client):
+            """测试请求被重定向到登录页时验证状态失效"""
+            # Arrange
+            callback = Mock()
+            client.on_session_invalidated = callback
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response('http://test.zentao.com/user-login.html'))
+
+            # Assert
+            assert client.session_verified_at is None
+            callback.assert_called_once()
+
+        def test_unauthorized_invalidates(self, client):
+            """测试 401 响应使验证状态失效"""
+            # Arrange
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response('http://test.zentao.com/task-view-1.json', 401))
+
+            # Assert
+            assert client.session_verified_at is None
+
+        def test_redirect_location_invalidates(self, client):
+            """测试未跟随的登录跳转使验证状态失效"""
+            # Arrange
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response(
+                'http://test.zentao.com/my-index.html', 302, location='/user-login.html'
+            ))
+
+            # Assert
+            assert client.session_verified_at is None
+
+        def test_login_script_invalidates(self, client):
+            """测试 JSON 接口返回登录跳转脚本页面时验证状态失效"""
+            # Arrange
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response(
+                'http://test.zentao.com/task-view-1.json',
+                content_type='text/html; charset=utf-8',
+                content=b"<html><script>self.location='/user-login-L3Rhc2s=.html';</script></html>"
+            ))
+
+            # Assert
+            assert client.session_verified_at is None
+
+        def test_html_page_keeps_verification(self, client):
+            """测试普通 HTML 页面包含登录链接时不影响验证状态"""
+            # Arrange
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response(
+                'http://test.zentao.com/my-index.html',
+                content_type='text/html; charset=utf-8',
+                content=b"<script>var loginLink = '/user-login.html';</script>"
+            ))
+
+            # Assert
+            assert client.session_verified_at is not None
+
+        def test_normal_response_keeps_verification(self, client):
+            """测试正常响应不影响验证状态"""
+            # Arrange
+            callback = Mock()
+            client.on_session_invalidated = callback
+            client.mark_session_verified()
+
+            # Act
+            client._check_login_response(self._hook_response('http://test.zentao.com/task-view-1.json'))
+
+            # Assert
+            assert client.session_verified_at is not None
+            callback.assert_not_called()
+
+        def test_invalidate_clears_response_cache(self, client):
+            """测试会话失效时清除当前账号的响应缓存"""
+            # Arrange
+            client.response_cache = Mock()
+
+            # Act
+            client.invalidate_session_verification()
+
+            # Assert
+            client.response_cache.invalidate.assert_called_once_with()
+
+        def test_invalidate_without_verification_skips_callback(self, client):
+            """测试未验证过时失效不触发回调"""
+            # Arrange
+            callback = Mock()
+            client.on_session_invalidated = callback
+
+            # Act
+            client.invalidate_session_verification()
+
+            # Assert
+            callback.assert_not_called()
+
+        def test_session_has_login_hook(self):
+            """测试创建的会话注册了登录跳转钩子"""
+            with patch('src.zentao.api_client.get_config') as mock_config:
+                mock_config.return_value = Mock()
+                mock_config.return_value.get_zentao_config.return_value = {
+                    'base_url': 'http://test.zentao.com/'
+                }
+                client = ZentaoApiClient()
+
+            assert client._check_login_response in client.session.hooks['response']
+
+    class TestReviewStoryWithKnownData:
+        """测试使用已知需求详情评审需求"""
+
+        def test_review_without_story_view(self, client):
+            """测试提供需求详情时不再请求 story-view"""
+            # Arrange
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.text = '<script>parent.location="story-view-123.html"</script>'
+            client.session.post.return_value = mock_response
+
+            # Act
+            with patch.object(client, 'get_story') as mock_get_story:
+                result = client.review_story(
+                    123, story_data={'status': 'changed', 'assigned_to': 'user1', 'estimate': 4}
+                )
+
+            # Assert
+            assert result.success is True
+            mock_get_story.assert_not_called()
+            form_data = client.session.post.call_args.kwargs['data']
+            assert form_data['assignedTo'] == 'user1'
+
+
+    class TestSearchUser:
+        """测试搜索用户"""
+
+        @pytest.fixture
+        def users_client(self, client):
+            from src.zentao.models import User
+            client._users_cache = {
+                '1': User(id=1, account='zhangsan', realname='张三'),
+                '2': User(id=2, account='zhangsanfeng', realname='张三丰'),
+                '3': User(id=3, account='lisi', realname='李四'),
+            }
+            return client
+
+        def test_exact_match_preferred(self, users_client):
+            """测试完全匹配优先"""
+            result = users_client.search_user('张三')
+
+            assert [user['account'] for user in result.data] == ['zhangsan']
+
+        def test_partial_match(self, users_client):
+            """测试部分匹配"""
+            result = users_client.search_user('zhang')
+
+            assert [user['account'] for user in result.data] == ['zhangsan', 'zhangsanfeng']
+
+        def test_uses_cached_users(self, users_client):
+            """测试使用缓存的用户列表，不发送请求"""
+            users_client.search_user('lisi')
+
+            users_client.session.get.assert_not_called()
+
+        def test_users_unavailable(self, client):
+            """测试用户列表获取失败"""
+            client.session.get.side_effect = requests.ConnectionError()
+
+            result = client.search_user('zhangsan')
+
+            assert not result.success
+
+    class TestExecutionsCache:
+        """测试项目列表缓存"""
+
+        @staticmethod
+        def _projects_response(*names):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "status": "success",
+                "data": json.dumps({"projects": [
+                    {"id": index, "name": name, "status": "doing"} for index, name in enumerate(names, 1)
+                ]})
+            }
+            return response
+
+        def test_cached_within_ttl(self, client):
+            """测试有效期内只请求一次，返回同一个列表"""
+            client.session.get.return_value = self._projects_response('研发中心项目')
+
+            first = client.get_executions()
+            second = client.get_executions()
+
+            assert client.session.get.call_count == 1
+            assert second.data is first.data
+
+        def test_failure_not_cached(self, client):
+            """测试获取失败不缓存"""
+            client.session.get.side_effect = [requests.ConnectionError(), self._projects_response('项目1')]
+
+            assert not client.get_executions().success
+            assert client.get_executions().data[0]['name'] == '项目1'
+
+        def test_stale_returned_while_refreshing(self, client):
+            """测试过期后先返回旧列表，后台刷新"""
+            client.session.get.return_value = self._projects_response('旧项目')
+            client.get_executions()
+            client._executions_cache._loaded_at -= client._executions_cache.ttl + 1
+            client.session.get.return_value = self._projects_response('新项目')
+
+            stale = client.get_executions()
+            for _ in range(100):
+                if client.get_executions().data[0]['name'] == '新项目':
+                    break
+                time.sleep(0.01)
+
+            assert stale.data[0]['name'] == '旧项目'
+            assert client.get_executions().data[0]['name'] == '新项目'
+
+        def test_seeded_from_local_store(self, client):
+            """测试首次获取时使用本地缓存的项目列表"""
+            client.local_store = Mock()
+            client.local_store.load_executions.return_value = ([{'id': 7, 'name': '本地项目'}], time.time())
+
+            result = client.get_executions()
+
+            assert result.data[0]['id'] == 7
+            client.session.get.assert_not_called()
+
+        def test_account_switch_invalidates(self, client):
+            """测试切换账号后重新获取"""
+            client.session.get.return_value = self._projects_response('项目1')
+            client.bind_account('zhangsan')
+            client.get_executions()
+
+            client.bind_account('lisi')
+            client.get_executions()
+
+            assert client.session.get.call_count == 2
+
+        def test_index_reused_for_same_entry(self, client):
+            """测试缓存条目不变时复用项目名称索引"""
+            client.session.get.return_value = self._projects_response('研发中心项目')
+
+            first = client.get_execution_index()
+            second = client.get_execution_index()
+
+            assert second.data is first.data
+            assert first.data.find('研发中心')['id'] == 1
+
+        def test_index_rebuilt_after_invalidate(self, client):
+            """测试项目列表缓存失效后重新建立索引"""
+            client.session.get.return_value = self._projects_response('旧项目')
+            old = client.get_execution_index().data
+
+            client._executions_cache.invalidate()
+            client.session.get.return_value = self._projects_response('新项目')
+            new = client.get_execution_index().data
+
+            assert new is not old
+            assert new.find('新项目')['id'] == 1
+            assert new.find('旧项目') is None
+
+        def test_index_unaffected_by_list_mutation(self, client):
+            """测试调用方原地修改项目列表不影响已建立的索引"""
+            client.session.get.return_value = self._projects_response('研发中心项目')
+            index = client.get_execution_index().data
+
+            client.get_executions().data.clear()
+
+            assert client.get_execution_index().data is index
+            assert index.find('研发中心')['id'] == 1
+
+        def test_index_failure_returned(self, client):
+            """测试获取项目列表失败时返回错误"""
+            client.session.get.side_effect = requests.ConnectionError()
+
+            assert not client.get_execution_index().success
+
+    class TestUserDirectoryCache:
+        """测试用户目录缓存"""
+
+        @staticmethod
+        def _users_response(*users):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                'status': 'success',
+                'users': [
+                    {'id': index, 'account': account, 'realname': realname}
+                    for index, (account, realname) in enumerate(users, 1)
+                ]
+            }
+            return response
+
+        def test_cached_within_ttl(self, client):
+            """测试有效期内只请求一次"""
+            client.session.get.return_value = self._users_response(('zhangsan', '张三'))
+
+            client.search_user('张三')
+            client.search_user('zhangsan')
+
+            assert client.session.get.call_count == 1
+
+        def test_search_by_initials(self, client):
+            """测试按姓名拼音首字母搜索"""
+            client.session.get.return_value = self._users_response(
+                ('zhangsan', '张三'), ('zhangsanfeng', '张三丰'), ('lisi', '李四')
+            )
+
+            assert [user['account'] for user in client.search_user('zsf').data] == ['zhangsanfeng']
+            assert [user['account'] for user in client.search_user('zs').data] == ['zhangsan']
+
+        def test_expired_refetched(self, client):
+            """测试超过最长可用时间后重新获取"""
+            client.session.get.return_value = self._users_response(('zhangsan', '张三'))
+            client.search_user('张三')
+            client._users_directory._loaded_at -= client._users_directory.max_stale + 1
+            client.session.get.return_value = self._users_response(('lisi', '李四'))
+
+            result = client.search_user('李四')
+
+            assert [user['account'] for user in result.data] == ['lisi']
+            assert client.session.get.call_count == 2
+
+        def test_seeded_from_local_store(self, client):
+            """测试首次获取时使用本地缓存的用户列表"""
+            client.local_store = Mock()
+            client.local_store.load_users.return_value = (
+                [{'id': 9, 'account': 'wangwu', 'realname': '王五'}], time.time()
+            )
+
+            result = client.search_user('ww')
+
+            assert result.data == [{'id': 9, 'account': 'wangwu', 'realname': '王五'}]
+            client.session.get.assert_not_called()
+
+        def test_fetched_users_saved_to_local_store(self, client):
+            """测试获取的用户列表写入本地缓存"""
+            client.local_store = Mock()
+            client.local_store.load_users.return_value = ([], None)
+            client.session.get.return_value = self._users_response(('zhangsan', '张三'))
+
+            client.search_user('张三')
+
+            client.local_store.save_users.assert_called_once_with(
+                [{'id': 1, 'account': 'zhangsan', 'realname': '张三'}]
+            )
+
+    class TestStoryQueryPushdown:
+        """测试需求查询的产品过滤下推"""
+
+        @staticmethod
+        def _response(data, status_code=200):
+            response = Mock()
+            response.status_code = status_code
+            response.json.return_value = {'status': 'success', 'data': json.dumps(data)}
+            return response
+
+        @pytest.fixture
+        def pushdown_client(self, client):
+            """按请求地址返回产品列表、产品需求和全部需求"""
+            client.story_pushdown = True
+            stories = [
+                {'id': story_id, 'title': f'需求{story_id}', 'stage': 'wait' if story_id % 2 else 'developing',
+                 'productTitle': '产品A' if story_id % 3 else '产品B'}
+                for story_id in range(30, 0, -1)
+            ]
+
+            def get(url, **kwargs):
+                if 'product-all' in url:
+                    return self._response({'products': {'1': '产品A', '2': '产品B', '3': '产品C'}})
+                if 'product-browse' in url:
+                    product = {'1': '产品A', '2': '产品B', '3': '产品C'}[url.split('product-browse-')[1].split('-')[0]]
+                    matched = [dict(story) for story in stories if story['productTitle'] == product]
+                    for story in matched:
+                        del story['productTitle']
+                    return self._response({
+                        'stories': {str(story['id']): story for story in matched},
+                        'pager': {'recTotal': len(matched)}
+                    })
+                return self._response({'stories': stories, 'pager': {'recTotal': len(stories)}})
+
+            client.session.get.side_effect = get
+            return client
+
+        def _requested(self, client):
+            return [call.args[0].rsplit('/', 1)[1] for call in client.session.get.call_args_list]
+
+        def test_product_browse_used(self, pushdown_client):
+            """测试配置的产品按产品浏览获取，本地过滤阶段"""
+            result = pushdown_client.get_my_stories(story_filter=StoryFilter(products=['产品B'], stages=['wait']))
+
+            assert [story['id'] for story in result.data['stories']] == [27, 21, 15, 9, 3]
+            assert all(story['product'] == '产品B' for story in result.data['stories'])
+            requested = self._requested(pushdown_client)
+            assert requested[0] == 'product-all.json'
+            assert requested[1].startswith('product-browse-2-0-assignedtome-0-id_desc-')
+            assert not any(url.startswith('my-story') for url in requested)
+
+        def test_multiple_products_merged_by_id(self, pushdown_client):
+            """测试多个产品的需求按ID倒序合并，数量限制作用于合并后的结果"""
+            result = pushdown_client.get_my_stories(
+                story_filter=StoryFilter(products=['产品A', '产品B']), limit=4
+            )
+
+            assert [story['id'] for story in result.data['stories']] == [30, 29, 28, 27]
+
+        def test_same_result_as_my_story(self, pushdown_client):
+            """测试下推前后结果一致"""
+            story_filter = StoryFilter(products=['产品A'], stages=['wait'])
+            pushed = pushdown_client.get_my_stories(story_filter=story_filter).data['stories']
+
+            pushdown_client.story_pushdown = False
+            local = pushdown_client.get_my_stories(story_filter=story_filter).data['stories']
+
+            assert pushed == local
+
+        def test_unknown_product_falls_back(self, pushdown_client):
+            """测试产品找不到时获取全部需求并在本地过滤"""
+            result = pushdown_client.get_my_stories(story_filter=StoryFilter(products=['产品B', '产品X']))
+
+            assert len(result.data['stories']) == 10
+            assert not any(url.startswith('product-browse') for url in self._requested(pushdown_client))
+
+        def test_browse_failure_falls_back(self, pushdown_client):
+            """测试按产品浏览失败时改为获取全部需求"""
+            get = pushdown_client.session.get.side_effect
+
+            def fail_browse(url, **kwargs):
+                if 'product-browse' in url:
+                    return self._response({}, status_code=404)
+                return get(url, **kwargs)
+
+            pushdown_client.session.get.side_effect = fail_browse
+
+            result = pushdown_client.get_my_stories(story_filter=StoryFilter(products=['产品B']))
+
+            assert [story['id'] for story in result.data['stories']][:3] == [30, 27, 24]
+            assert len(result.data['stories']) == 10
+
+        def test_products_cached(self, pushdown_client):
+            """测试产品列表只请求一次"""
+            pushdown_client.get_my_stories(story_filter=StoryFilter(products=['产品A']))
+            pushdown_client.get_my_stories(story_filter=StoryFilter(products=['产品B']))
+
+            assert self._requested(pushdown_client).count('product-all.json') == 1
+
+    class TestStoryTaskIndex:
+        """测试需求与任务的关联索引"""
+
+        @staticmethod
+        def _response(data, status_code=200):
+            response = Mock()
+            response.status_code = status_code
+            response.json.return_value = {'status': 'success', 'data': json.dumps(data)}
+            return response
+
+        @pytest.fixture
+        def index_client(self, client):
+            """两个项目，项目 1 的任务分两页返回"""
+            client.story_task_index_enabled = True
+            client.TASK_PAGE_LIMIT = 2
+            client._executions_cache.seed(
+                ApiResponse.success_response([{'id': 1, 'name': '项目1'}, {'id': 2, 'name': '项目2'}]),
+                time.time()
+            )
+            pages = {
+                (1, 1): {'101': {'id': '101', 'story': '10'}, '102': {'id': '102', 'story': '0'}},
+                (1, 2): {'103': {'id': '103', 'story': '11', 'deleted': '1'}},
+                (2, 1): {'201': {'id': '201', 'story': '12'}},
+            }
+            totals = {1: 3, 2: 1}
+
+            def get(url, **kwargs):
+                params = url.split('project-task-')[1].split('.json')[0].split('-')
+                project_id, page = int(params[0]), int(params[-1])
+                return self._response({
+                    'tasks': pages.get((project_id, page), {}),
+                    'pager': {'recTotal': totals[project_id]}
+                })
+
+            client.session.get.side_effect = get
+            return client
+
+        def test_counts_from_index(self, index_client):
+            """测试按项目批量获取任务后统计，只逐个确认索引中没有任务的需求"""
+            index_client.story_task_verify_missing = True
+            with patch.object(index_client, 'get_story_task_count', return_value=0) as mock_count:
+                counts = index_client.get_story_task_counts([10, 11, 12, 13])
+
+            assert counts == {10: 1, 11: 0, 12: 1, 13: 0}
+            assert sorted(call[0][0] for call in mock_count.call_args_list) == [11, 13]
+            assert index_client.session.get.call_count == 3
+
+        def test_without_verify(self, index_client):
+            """测试不确认时不请求需求详情，进度回调覆盖所有需求"""
+            index_client.story_task_verify_missing = False
+            progress = []
+
+            with patch.object(index_client, 'get_story_task_count') as mock_count:
+                counts = index_client.get_story_task_counts(
+                    [13, 10], on_progress=lambda story_id, count: progress.append((story_id, count))
+                )
+
+            assert counts == {13: 0, 10: 1}
+            assert sorted(progress) == [(10, 1), (13, 0)]
+            mock_count.assert_not_called()
+
+        def test_index_cached(self, index_client):
+            """测试索引在有效期内复用"""
+            index_client.story_task_verify_missing = False
+            index_client.get_story_task_counts([10])
+            index_client.get_story_task_counts([12])
+
+            assert index_client.session.get.call_count == 3
+
+        def test_fallback_on_project_error(self, index_client):
+            """测试项目任务列表获取失败时逐个检查需求"""
+            index_client.session.get.side_effect = lambda url, **kwargs: self._response({}, status_code=500)
+
+            with patch.object(index_client, 'get_story_task_count', return_value=2) as mock_count:
+                counts = index_client.get_story_task_counts([10, 12])
+
+            assert counts == {10: 2, 12: 2}
+            assert mock_count.call_count == 2
+
+        def test_create_task_updates_index(self, index_client):
+            """测试创建任务成功后更新已建立的索引"""
+            index_client.story_task_verify_missing = False
+            index_client.get_story_task_counts([13])
+            response = Mock()
+            response.status_code = 200
+            response.url = 'http://test.zentao.com/task-view-301.html'
+            index_client.session.post.return_value = response
+
+            assert index_client.create_task(1, '开发', story_id=13).success
+            counts = index_client.get_story_task_counts([13])
+
+            assert counts == {13: 1}
+
+        def test_pages_without_pager(self, client):
+            """测试没有分页信息时一直翻页，直到某一页不满"""
+            client.TASK_PAGE_LIMIT = 2
+            pages = {
+                1: {'1': {'id': '1'}, '2': {'id': '2'}},
+                2: {'3': {'id': '3'}, '4': {'id': '4'}},
+                3: {'5': {'id': '5'}},
+            }
+            client.session.get.side_effect = lambda url, **kwargs: self._response(
+                {'tasks': pages.get(int(url.split('-')[-1].split('.')[0]), {})}
+            )
+
+            tasks = client._fetch_project_tasks(1)
+
+            assert [task['id'] for task in tasks] == ['1', '2', '3', '4', '5']
+            assert client.session.get.call_count == 3
+
+        def test_stops_on_repeated_page(self, client):
+            """测试页码超出范围返回重复的最后一页时停止翻页"""
+            client.TASK_PAGE_LIMIT = 2
+            last_page = {'1': {'id': '1'}, '2': {'id': '2'}}
+            client.session.get.side_effect = lambda url, **kwargs: self._response({'tasks': last_page})
+
+            tasks = client._fetch_project_tasks(1)
+
+            assert [task['id'] for task in tasks] == ['1', '2']
+            assert client.session.get.call_count == 2
+
+        def test_verify_missing_enabled_by_default(self, client):
+            """测试默认逐个确认索引中没有任务的需求，结果与逐个请求需求详情一致"""
+            assert client.story_task_verify_missing is True
+
+        def test_disabled_by_default(self, client):
+            """测试默认不使用索引"""
+            with patch.object(client, 'get_story_task_count', return_value=1):
+                assert client.get_story_task_counts([1]) == {1: 1}
+            client.session.get.assert_not_called()
+
 
 class TestErrorResponse:
     """测试错误响应"""
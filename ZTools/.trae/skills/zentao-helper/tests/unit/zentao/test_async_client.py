@@ -0,0 +1,531 @@
+# -*- coding: utf-8 -*-
+"""
+测试禅道异步 API 客户端
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+from src.zentao.api_client import ZentaoApiClient
+from src.zentao.async_client import AsyncZentaoApiClient, HttpResult
+from src.zentao.circuit_breaker import CircuitState
+from src.zentao.story_filter import StoryFilter
+from src.zentao.story_tasks import StoryTaskIndex
+from src.utils.response import ApiResponse
+from src.utils.response import ErrorCode
+
+
+def _json_response(data, url='http://test.zentao.com/'):
+    return HttpResult(200, url, json.dumps({'status': 'success', 'data': json.dumps(data)}))
+
+
+class FakeTransport:
+    """按 URL 返回预设响应，并记录请求和最大并发数"""
+
+    def __init__(self, routes, delay=0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, method, url, data, timeout):
+        self.requests.append((method, url, data))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            for fragment, response in self.routes.items():
+                if fragment in url:
+                    if isinstance(response, Exception):
+                        raise response
+                    return response
+            return HttpResult(404, url, '')
+        finally:
+            self.active -= 1
+
+
+class FakeAiohttp:
+    """模拟 aiohttp 模块：会话按顺序返回预设响应（或抛出预设异常），并记录请求"""
+
+    class ClientError(Exception):
+        pass
+
+    class ClientTimeout:
+        def __init__(self, total=None):
+            self.total = total
+
+    class CookieJar:
+        def __init__(self, unsafe=False):
+            self.unsafe = unsafe
+
+    class Response:
+        def __init__(self, status, url, body=b'', headers=None):
+            self.status = status
+            self.url = url
+            self.body = body
+            self.headers = headers or {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        async def read(self):
+            return self.body
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+        self.closed = False
+        fake = self
+
+        class ClientSession:
+            def __init__(self, cookies=None, headers=None, cookie_jar=None):
+                self.cookies = cookies
+
+            def request(self, method, url, data=None, timeout=None):
+                fake.requests.append((method, url, data, timeout.total))
+                outcome = fake.outcomes.pop(0)
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                return outcome
+
+            async def close(self):
+                fake.closed = True
+
+        self.ClientSession = ClientSession
+
+
+class TestAsyncZentaoApiClient:
+    """测试禅道异步 API 客户端"""
+
+    @pytest.fixture
+    def sync_client(self):
+        """创建同步客户端实例"""
+        with patch('src.zentao.api_client.get_config') as mock_config:
+            mock_config.return_value = Mock()
+            mock_config.return_value.get_zentao_config.return_value = {
+                'base_url': 'http://test.zentao.com/',
+                'timeout': 30,
+                'retry_times': 3,
+                'retry_backoff': 1
+            }
+            client = ZentaoApiClient()
+            client.session = Mock()
+            return client
+
+    @staticmethod
+    def _client(sync_client, routes, max_concurrency=None, delay=0):
+        client = AsyncZentaoApiClient(sync_client, max_concurrency=max_concurrency)
+        transport = FakeTransport(routes, delay)
+        client._send = transport
+        return client, transport
+
+    class TestAsyncTasks:
+        """测试任务接口"""
+
+        def test_get_my_tasks_with_detail(self, sync_client):
+            """测试并发获取任务详情并合并到任务列表"""
+            routes = {
+                'task-ajaxGetUserTasks': HttpResult(
+                    200, 'http://test.zentao.com/',
+                    "<option value='1'>项目A / 任务1</option><option value='2'>项目A / 任务2</option>"
+                ),
+                'task-view-1': _json_response({'task': {'openedDate': '2024-01-01', 'status': 'doing'}}),
+                'task-view-2': requests.ConnectionError("连接失败"),
+            }
+            client, transport = TestAsyncZentaoApiClient._client(sync_client, routes)
+
+            # Act
+            result = asyncio.run(client.get_my_tasks(status='doing'))
+
+            # Assert
+            assert result.success
+            tasks = result.data['tasks']
+            assert tasks[0]['status'] == 'doing'
+            assert tasks[0]['url'] == 'http://test.zentao.com/task-view-1.html'
+            assert tasks[1]['status'] == 'unknown'
+            assert transport.requests[0][1].endswith('task-ajaxGetUserTasks-zhuxu-0-doing.json')
+
+        def test_get_my_tasks_timeout(self, sync_client):
+            """测试任务列表请求超时"""
+            client, _ = TestAsyncZentaoApiClient._client(
+                sync_client, {'task-ajaxGetUserTasks': requests.Timeout()}
+            )
+
+            result = asyncio.run(client.get_my_tasks())
+
+            assert not result.success
+            assert result.error.code == ErrorCode.TIMEOUT
+
+        def test_concurrency_limit(self, sync_client):
+            """测试并发请求数不超过 max_concurrency"""
+            routes = {'task-view': _json_response({'task': {'status': 'wait'}})}
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, routes, max_concurrency=2, delay=0.01
+            )
+
+            details = asyncio.run(client.get_task_details(list(range(1, 7))))
+
+            assert len(details) == 6
+            assert all(detail['status'] == 'wait' for detail in details.values())
+            assert transport.max_active == 2
+
+        def test_assign_task_not_found(self, sync_client):
+            """测试分配不存在的任务"""
+            client, transport = TestAsyncZentaoApiClient._client(sync_client, {})
+
+            result = asyncio.run(client.assign_task(99, 'user1'))
+
+            assert not result.success
+            assert result.error.code == ErrorCode.TASK_NOT_FOUND
+            assert all(method == 'GET' for method, _, _ in transport.requests)
+
+        def test_create_task_invalidates_story_cache(self, sync_client):
+            """测试从需求创建任务后使需求快照失效"""
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, {'task-create': HttpResult(200, 'http://test.zentao.com/task-view-42.html', '')}
+            )
+
+            with sync_client.story_cache_scope():
+                sync_client._story_cache[10] = {'id': 10}
+                result = asyncio.run(client.create_task(1, '开发', story_id=10))
+                assert 10 not in sync_client._story_cache
+
+            assert result.success
+            assert result.data['id'] == 42
+            method, _, form_data = transport.requests[0]
+            assert method == 'POST'
+            assert form_data['story'] == 10
+
+        def test_create_task_updates_story_task_index(self, sync_client):
+            """测试从需求创建任务后与同步客户端一样更新需求与任务的关联索引"""
+            index = StoryTaskIndex()
+            sync_client._story_task_index.seed(ApiResponse.success_response(index), time.time())
+            client, _ = TestAsyncZentaoApiClient._client(
+                sync_client, {'task-create': HttpResult(200, 'http://test.zentao.com/task-view-42.html', '')}
+            )
+
+            asyncio.run(client.create_task(1, '开发', story_id=10))
+
+            assert index.task_count(10) == 1
+
+    class TestAsyncStories:
+        """测试需求接口"""
+
+        STORIES = [
+            {'id': str(story_id), 'title': f'需求{story_id}', 'stage': 'wait' if story_id % 2 else 'developing',
+             'productTitle': '产品A' if story_id % 3 else '产品B'}
+            for story_id in range(12, 0, -1)
+        ]
+
+        @classmethod
+        def _product_page(cls, product):
+            # 产品浏览接口的需求以ID为键，没有产品名称
+            stories = {
+                story['id']: {key: value for key, value in story.items() if key != 'productTitle'}
+                for story in cls.STORIES if story['productTitle'] == product
+            }
+            return _json_response({'stories': stories, 'pager': {'recTotal': len(stories)}})
+
+        def test_get_my_stories_pushdown(self, sync_client):
+            """测试开启下推时按产品并发获取并按ID倒序合并，过滤条件和数量上限与同步客户端一致"""
+            sync_client.story_pushdown = True
+            sync_client._products_cache.seed(ApiResponse.success_response({'产品A': 1, '产品B': 2}), time.time())
+            client, transport = TestAsyncZentaoApiClient._client(sync_client, {
+                'product-browse-1-': self._product_page('产品A'),
+                'product-browse-2-': self._product_page('产品B'),
+            })
+
+            result = asyncio.run(client.get_my_stories(
+                story_filter=StoryFilter(products=['产品A', '产品B'], stages=['wait']), limit=3
+            ))
+
+            assert result.success
+            assert [story['id'] for story in result.data['stories']] == ['11', '9', '7']
+            assert {story['product'] for story in result.data['stories']} == {'产品A', '产品B'}
+            assert not any('my-story' in url for _, url, _ in transport.requests)
+
+        def test_get_my_stories_pushdown_fallback(self, sync_client):
+            """测试产品浏览接口不可用时改为获取全部需求并在本地按产品过滤"""
+            sync_client.story_pushdown = True
+            sync_client._products_cache.seed(ApiResponse.success_response({'产品B': 2}), time.time())
+            client, _ = TestAsyncZentaoApiClient._client(
+                sync_client, {'my-story-assignedTo': _json_response({'stories': self.STORIES})}
+            )
+
+            result = asyncio.run(client.get_my_stories(story_filter=StoryFilter(products=['产品B'])))
+
+            assert [story['id'] for story in result.data['stories']] == ['12', '9', '6', '3']
+
+        def test_get_my_stories_limit(self, sync_client):
+            """测试找到 limit 个需求后不再请求后续页"""
+            sync_client.STORY_PAGE_LIMIT = 2
+            page = _json_response({'stories': self.STORIES[:2]})
+            client, transport = TestAsyncZentaoApiClient._client(sync_client, {'my-story-assignedTo': page})
+
+            with patch('src.zentao.async_client.get_config') as mock_config:
+                mock_config.return_value.get.return_value = []
+                result = asyncio.run(client.get_my_stories(limit=3))
+
+            assert len(result.data['stories']) == 3
+            assert len(transport.requests) == 2
+
+        def test_get_my_stories_filters_products(self, sync_client):
+            """测试分页获取需求并按产品过滤"""
+            stories = [
+                {'id': '1', 'title': '需求1', 'productTitle': '产品A'},
+                {'id': '2', 'title': '需求2', 'productTitle': '产品B'},
+            ]
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, {'my-story-assignedTo': _json_response({'stories': stories})}
+            )
+
+            with patch('src.zentao.async_client.get_config') as mock_config:
+                mock_config.return_value.get.return_value = ['产品A']
+                result = asyncio.run(client.get_my_stories())
+
+            assert result.success
+            assert [story['id'] for story in result.data['stories']] == ['1']
+            # 本页数量小于每页条数，不再请求下一页
+            assert len(transport.requests) == 1
+
+        def test_get_my_stories_limit_warning(self, sync_client):
+            """测试需求数超过上限时记录警告，第一页由禅道查询总数"""
+            sync_client.story_max_stories = 400
+            page = _json_response({'stories': [{'id': '1', 'title': '需求'}] * 200, 'pager': {'recTotal': 1000}})
+            client, transport = TestAsyncZentaoApiClient._client(sync_client, {'my-story-assignedTo': page})
+
+            with patch('src.zentao.async_client.get_config') as mock_config, \
+                 patch.object(sync_client.logger, 'warning') as mock_warning:
+                mock_config.return_value.get.return_value = []
+                result = asyncio.run(client.get_my_stories())
+
+            assert len(result.data['stories']) == 400
+            assert len(transport.requests) == 2
+            assert '-0-200-1.json' in transport.requests[0][1]
+            assert '需求总数 1000 超过上限' in mock_warning.call_args[0][0]
+
+        def test_get_story_task_counts(self, sync_client):
+            """测试并发统计需求的有效任务数量"""
+            routes = {
+                'story-view-1': _json_response({'story': {'tasks': [{'id': 1}, {'id': 2, 'deleted': '1'}]}}),
+                'story-view-2': requests.Timeout(),
+            }
+            client, _ = TestAsyncZentaoApiClient._client(sync_client, routes)
+
+            counts = asyncio.run(client.get_story_task_counts([1, 2]))
+
+            assert counts == {1: 1, 2: 0}
+
+        def test_get_story_task_counts_from_index(self, sync_client):
+            """测试开启关联索引时只确认索引中没有任务的需求"""
+            sync_client.story_task_index_enabled = True
+            sync_client.story_task_verify_missing = True
+            index = StoryTaskIndex.from_tasks([{'id': 1, 'story': 10}, {'id': 2, 'story': 10}])
+            sync_client._story_task_index.seed(ApiResponse.success_response(index), time.time())
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, {'story-view-11': _json_response({'story': {'tasks': [{'id': 3}]}})}
+            )
+
+            counts = asyncio.run(client.get_story_task_counts([11, 10, 12]))
+
+            assert counts == {11: 1, 10: 2, 12: 0}
+            assert sorted(url.rsplit('/', 1)[1] for _, url, _ in transport.requests) == \
+                ['story-view-11.json', 'story-view-12.json']
+
+            sync_client.story_task_verify_missing = False
+            assert asyncio.run(client.get_story_task_counts([11])) == {11: 0}
+            assert len(transport.requests) == 2
+
+        def test_review_story_skips_unchanged(self, sync_client):
+            """测试需求状态不是已变更时不提交评审"""
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, {'story-view-5': _json_response({'story': {'id': 5, 'status': 'active'}})}
+            )
+
+            result = asyncio.run(client.review_story(5))
+
+            assert result.success
+            assert result.data['status'] == 'active'
+            assert [method for method, _, _ in transport.requests] == ['GET']
+
+        def test_get_story_uses_story_cache_scope(self, sync_client):
+            """测试同步客户端开启需求快照作用域时，异步获取需求详情只请求一次"""
+            client, transport = TestAsyncZentaoApiClient._client(
+                sync_client, {'story-view-5': _json_response({'story': {'id': 5, 'title': '需求5'}})}
+            )
+
+            async def get_twice():
+                first = await client.get_story(5)
+                first.data['title'] = '被调用方修改'
+                return await client.get_story(5)
+
+            with sync_client.story_cache_scope():
+                result = asyncio.run(get_twice())
+
+            assert result.data['title'] == '需求5'
+            assert len(transport.requests) == 1
+
+            # 作用域外每次都请求
+            asyncio.run(client.get_story(5))
+            assert len(transport.requests) == 2
+
+        def test_get_story_not_found(self, sync_client):
+            """测试获取不存在的需求"""
+            client, _ = TestAsyncZentaoApiClient._client(sync_client, {})
+
+            result = asyncio.run(client.get_story(404))
+
+            assert not result.success
+            assert result.error.code == ErrorCode.API_ERROR
+
+    class TestAsyncTransport:
+        """测试未安装 aiohttp 时的线程池传输"""
+
+        def test_send_with_requests(self, sync_client):
+            """测试复用同步客户端会话发送请求"""
+            response = Mock()
+            response.status_code = 200
+            response.url = 'http://test.zentao.com/task-view-1.json'
+            response.text = '{"status": "success"}'
+            response.headers = {}
+            sync_client.session.request.return_value = response
+
+            client = AsyncZentaoApiClient(sync_client)
+            with patch('src.zentao.async_client.aiohttp', None):
+                result = asyncio.run(client._request('GET', response.url))
+
+            assert result.status_code == 200
+            assert result.json() == {'status': 'success'}
+            sync_client.session.request.assert_called_once_with(
+                'GET', response.url, data=None, timeout=30
+            )
+
+    class TestAiohttpTransport:
+        """测试安装了 aiohttp 时的传输"""
+
+        URL = 'http://test.zentao.com/task-view-1.json'
+
+        @pytest.fixture
+        def client(self, sync_client):
+            """创建异步客户端实例（不等待重试退避）"""
+            sync_client.retry_backoff = 0
+            sync_client.session.cookies = {'zentaosid': 'abc'}
+            sync_client.session.headers = {}
+            sync_client.invalidate_session_verification = Mock()
+            return AsyncZentaoApiClient(sync_client)
+
+        @staticmethod
+        def _send(client, fake, method='GET'):
+            async def send():
+                try:
+                    return await client._request(method, TestAsyncZentaoApiClient.TestAiohttpTransport.URL)
+                finally:
+                    await client.close()
+
+            with patch('src.zentao.async_client.aiohttp', fake):
+                return asyncio.run(send())
+
+        def test_success(self, client, sync_client):
+            """测试成功响应解码为 HttpResult 并记录请求指标"""
+            fake = FakeAiohttp([FakeAiohttp.Response(200, self.URL, '{"status": "成功"}'.encode('utf-8'))])
+
+            result = self._send(client, fake)
+
+            assert result.status_code == 200
+            assert result.json() == {'status': '成功'}
+            assert fake.requests == [('GET', self.URL, None, 30)]
+            assert fake.closed
+            assert sync_client.metrics.snapshot()['families']['task-view']['count'] == 1
+            sync_client.invalidate_session_verification.assert_not_called()
+
+        def test_non_200_not_retried(self, client):
+            """测试 404 等非重试状态码直接返回"""
+            fake = FakeAiohttp([FakeAiohttp.Response(404, self.URL)])
+
+            result = self._send(client, fake)
+
+            assert result.status_code == 404
+            assert len(fake.requests) == 1
+
+        def test_retry_on_server_error(self, client, sync_client):
+            """测试 503 响应和连接失败按同步客户端的重试次数重试"""
+            fake = FakeAiohttp([
+                FakeAiohttp.Response(503, self.URL),
+                FakeAiohttp.ClientError('连接被重置'),
+                FakeAiohttp.Response(200, self.URL, b'{}'),
+            ])
+
+            result = self._send(client, fake)
+
+            assert result.status_code == 200
+            assert len(fake.requests) == 3
+            stats = sync_client.metrics.snapshot()['families']['task-view']
+            assert stats['count'] == 1
+
+        def test_retry_exhausted_returns_last_response(self, client):
+            """测试重试次数用完后返回最后一次的 503 响应"""
+            fake = FakeAiohttp([FakeAiohttp.Response(503, self.URL)] * 4)
+
+            result = self._send(client, fake)
+
+            assert result.status_code == 503
+            assert len(fake.requests) == 4
+
+        def test_timeout(self, client):
+            """测试超时重试用完后抛出 requests.Timeout"""
+            fake = FakeAiohttp([asyncio.TimeoutError()] * 4)
+
+            with pytest.raises(requests.Timeout):
+                self._send(client, fake)
+
+            assert len(fake.requests) == 4
+
+        def test_cancelled_releases_probe(self, client, sync_client):
+            """测试半开状态的探测请求被取消时释放探测名额，之后的请求仍可放行"""
+            breaker = sync_client.circuit_breakers.get('task-view')
+            breaker.recovery_timeout = 0
+            for _ in range(breaker.failure_threshold):
+                breaker.record_failure()
+            fake = FakeAiohttp([asyncio.CancelledError()])
+
+            with pytest.raises(asyncio.CancelledError):
+                self._send(client, fake)
+
+            assert breaker.state == CircuitState.HALF_OPEN
+            breaker.before_request()
+
+        def test_login_redirect(self, client, sync_client):
+            """测试跳转到登录页时使会话验证状态失效"""
+            login_url = 'http://test.zentao.com/user-login-L3Rhc2s=.html'
+            fake = FakeAiohttp([FakeAiohttp.Response(200, login_url, b'<html></html>')])
+
+            result = self._send(client, fake)
+
+            assert result.url == login_url
+            sync_client.invalidate_session_verification.assert_called_once()
+
+        def test_login_script(self, client, sync_client):
+            """测试 JSON 接口返回登录跳转脚本页面时使会话验证状态失效"""
+            fake = FakeAiohttp([FakeAiohttp.Response(
+                200, self.URL, b"<script>self.location='/user-login.html';</script>",
+                headers={'Content-Type': 'text/html; charset=utf-8'}
+            )])
+
+            self._send(client, fake)
+
+            sync_client.invalidate_session_verification.assert_called_once()
+
+        def test_retry_delay(self, client, sync_client):
+            """测试退避时间与 urllib3 一致：第一次重试不等待，之后指数增长"""
+            sync_client.retry_backoff = 1
+
+            assert [client._retry_delay(retries) for retries in (1, 2, 3)] == [0, 2, 4]
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+测试熔断器
+"""
+
+import pytest
+import requests
+from unittest.mock import patch
+
+from src.zentao.circuit_breaker import (
+    CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, CircuitState
+)
+
+
+class TestCircuitBreaker:
+    """测试熔断器"""
+
+    @pytest.fixture
+    def breaker(self):
+        """创建熔断器实例"""
+        return CircuitBreaker('task-view', failure_threshold=3, recovery_timeout=30)
+
+    class TestClosed:
+        """测试关闭状态"""
+
+        def test_initial_state(self, breaker):
+            """测试初始为关闭状态"""
+            assert breaker.state == CircuitState.CLOSED
+            breaker.before_request()
+
+        def test_open_after_threshold(self, breaker):
+            """测试连续失败达到阈值后打开"""
+            # Act
+            for _ in range(3):
+                breaker.record_failure()
+
+            # Assert
+            assert breaker.state == CircuitState.OPEN
+
+        def test_success_resets_failures(self, breaker):
+            """测试成功后重新计数"""
+            # Act
+            breaker.record_failure()
+            breaker.record_failure()
+            breaker.record_success()
+            breaker.record_failure()
+
+            # Assert
+            assert breaker.state == CircuitState.CLOSED
+
+    class TestOpen:
+        """测试打开状态"""
+
+        def test_reject_when_open(self, breaker):
+            """测试打开时拒绝请求"""
+            # Arrange
+            for _ in range(3):
+                breaker.record_failure()
+
+            # Act & Assert
+            with pytest.raises(CircuitOpenError):
+                breaker.before_request()
+
+        def test_circuit_open_error_is_connection_error(self):
+            """测试熔断异常按网络错误处理"""
+            assert issubclass(CircuitOpenError, requests.ConnectionError)
+
+        def test_half_open_after_recovery_timeout(self, breaker):
+            """测试超过恢复时间后进入半开"""
+            # Arrange
+            with patch('src.zentao.circuit_breaker.time.time', return_value=1000):
+                for _ in range(3):
+                    breaker.record_failure()
+
+            # Act
+            with patch('src.zentao.circuit_breaker.time.time', return_value=1031):
+                state = breaker.state
+
+            # Assert
+            assert state == CircuitState.HALF_OPEN
+
+    class TestHalfOpen:
+        """测试半开状态"""
+
+        @pytest.fixture
+        def half_open_breaker(self, breaker):
+            """创建半开状态的熔断器"""
+            breaker.recovery_timeout = 0
+            for _ in range(3):
+                breaker.record_failure()
+            assert breaker.state == CircuitState.HALF_OPEN
+            return breaker
+
+        def test_only_one_probe(self, half_open_breaker):
+            """测试只放行一个探测请求"""
+            # Act
+            half_open_breaker.before_request()
+
+            # Assert
+            with pytest.raises(CircuitOpenError):
+                half_open_breaker.before_request()
+
+        def test_probe_success_closes(self, half_open_breaker):
+            """测试探测成功后关闭"""
+            # Act
+            half_open_breaker.before_request()
+            half_open_breaker.record_success()
+
+            # Assert
+            assert half_open_breaker.state == CircuitState.CLOSED
+
+        def test_probe_failure_reopens(self, half_open_breaker):
+            """测试探测失败后重新打开"""
+            # Arrange
+            half_open_breaker.recovery_timeout = 30
+            half_open_breaker._state = CircuitState.HALF_OPEN
+
+            # Act
+            half_open_breaker.before_request()
+            half_open_breaker.record_failure()
+
+            # Assert
+            assert half_open_breaker.state == CircuitState.OPEN
+
+        def test_release_probe(self, half_open_breaker):
+            """测试释放探测名额"""
+            # Act
+            half_open_breaker.before_request()
+            half_open_breaker.release()
+
+            # Assert
+            half_open_breaker.before_request()
+
+
+class TestCircuitBreakerRegistry:
+    """测试熔断器注册表"""
+
+    def test_same_family_shared(self):
+        """测试同一接口族共享熔断器"""
+        # Arrange
+        registry = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=10)
+
+        # Act
+        first = registry.get('task-view')
+        second = registry.get('task-view')
+
+        # Assert
+        assert first is second
+        assert first.failure_threshold == 2
+        assert first.recovery_timeout == 10
+
+    def test_families_isolated(self):
+        """测试不同接口族互不影响"""
+        # Arrange
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+
+        # Act
+        registry.get('task-view').record_failure()
+
+        # Assert
+        assert registry.states() == {'task-view': CircuitState.OPEN}
+        registry.get('story-view').before_request()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+测试禅道接口地址工具
+"""
+
+import pytest
+
+from src.zentao.endpoints import endpoint_family
+
+
+class TestEndpointFamily:
+    """测试接口族识别"""
+
+    @pytest.mark.parametrize('url, family', [
+        ('http://zentao.test/task-view-123.json', 'task-view'),
+        ('http://zentao.test/my-story-assignedTo-id_desc-9999-200-1.json', 'my-story'),
+        ('http://zentao.test/zentao/story-review-1.html', 'story-review'),
+        ('http://zentao.test/task-ajaxGetUserTasks-user1-0-wait.json', 'task-ajaxGetUserTasks'),
+        ('http://zentao.test/index.php?m=task&f=view&taskID=1', 'task-view'),
+        ('http://zentao.test/index.php?m=my', 'my-index'),
+        ('http://zentao.test/', 'other'),
+    ])
+    def test_endpoint_family(self, url, family):
+        """测试识别接口族"""
+        assert endpoint_family(url) == family
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+测试执行/项目名称索引
+"""
+
+from src.zentao.executions import ExecutionIndex, normalize_name
+
+
+EXECUTIONS = [
+    {'id': 1, 'name': '运维项目'},
+    {'id': 2, 'name': '都江堰二期项目'},
+    {'id': 3, 'name': '都江堰项目'},
+    {'id': 4, 'name': '研发中心项目'},
+    {'id': 5, 'name': 'ERP 升级'},
+]
+
+
+class TestNormalizeName:
+    """测试名称规范化"""
+
+    def test_normalize(self):
+        """测试全角转半角、转小写、去空白"""
+        assert normalize_name(' ＥＲＰ 升级 ') == 'erp升级'
+        assert normalize_name(None) == ''
+
+
+class TestExecutionIndex:
+    """测试项目名称索引"""
+
+    def test_find_exact_first(self):
+        """测试精确匹配优先于前缀匹配"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        assert index.find('都江堰项目')['id'] == 3
+
+    def test_find_prefix(self):
+        """测试前缀匹配取列表中靠前的项目"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        assert index.find('都江堰')['id'] == 2
+
+    def test_find_substring(self):
+        """测试部分匹配（与原有配置兼容）"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        assert index.find('研发中心')['id'] == 4
+        assert index.find('中心')['id'] == 4
+        assert index.find('erp升级')['id'] == 5
+
+    def test_find_not_found(self):
+        """测试未找到"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        assert index.find('不存在') is None
+        assert index.find('') is None
+
+    def test_search_ordering(self):
+        """测试搜索结果按匹配程度排序"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        ids = [execution['id'] for execution in index.search('都江堰项目')]
+
+        assert ids[0] == 3
+        assert 2 in ids
+
+    def test_search_fuzzy(self):
+        """测试模糊匹配"""
+        index = ExecutionIndex(EXECUTIONS)
+
+        assert index.search('研发项目')[0]['id'] == 4
+
+    def test_index_keeps_own_copy(self):
+        """测试原列表被原地修改后索引不受影响"""
+        executions = list(EXECUTIONS)
+        index = ExecutionIndex(executions)
+        executions.clear()
+
+        assert len(index) == len(EXECUTIONS)
+        assert index.find(EXECUTIONS[0]['name']) is EXECUTIONS[0]
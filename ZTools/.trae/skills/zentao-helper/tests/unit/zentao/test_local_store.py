@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+测试本地 SQLite 缓存
+"""
+
+import time
+
+import pytest
+
+from src.zentao.local_store import LocalStore
+
+
+@pytest.fixture
+def store():
+    """创建内存数据库缓存"""
+    local_store = LocalStore(':memory:')
+    yield local_store
+    local_store.close()
+
+
+class TestLocalStore:
+    """测试本地缓存"""
+
+    class TestMeta:
+        """测试元数据"""
+
+        def test_get_meta_default(self, store):
+            """测试不存在的元数据返回默认值"""
+            assert store.get_meta('missing', 'default') == 'default'
+
+        def test_set_and_get_meta(self, store):
+            """测试写入和读取元数据"""
+            # Act
+            store.set_meta('key', 123)
+
+            # Assert
+            assert store.get_meta('key') == '123'
+
+    class TestBindAccount:
+        """测试账号隔离"""
+
+        def test_bind_same_account_keeps_data(self, store):
+            """测试同一账号不清空数据"""
+            # Arrange
+            store.bind_account('user1')
+            store.upsert_stories([({'id': 1, 'title': '需求1'}, '2024-01-01')])
+
+            # Act
+            store.bind_account('user1')
+
+            # Assert
+            assert len(store.list_stories()) == 1
+
+        def test_bind_other_account_clears_data(self, store):
+            """测试切换账号清空数据"""
+            # Arrange
+            store.bind_account('user1')
+            store.upsert_stories([({'id': 1, 'title': '需求1'}, '2024-01-01')])
+            store.save_task_details({1: {'status': 'doing'}})
+
+            # Act
+            store.bind_account('user2')
+
+            # Assert
+            assert store.list_stories() == []
+            assert store.get_task_details([1], max_age=60) == {}
+            assert store.get_meta('account') == 'user2'
+
+        def test_bind_empty_account_ignored(self, store):
+            """测试空账号不做处理"""
+            # Act
+            store.bind_account('')
+
+            # Assert
+            assert store.get_meta('account') is None
+
+    class TestStories:
+        """测试需求缓存"""
+
+        def test_upsert_and_list_stories(self, store):
+            """测试写入并按ID倒序读取需求"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '需求1', 'product': '产品A'}, '2024-01-01'),
+                ({'id': 3, 'title': '需求3', 'product': '产品B'}, '2024-01-03'),
+                ({'id': 2, 'title': '需求2', 'product': '产品A'}, '2024-01-02'),
+            ])
+
+            # Act
+            stories = store.list_stories()
+
+            # Assert
+            assert [story['id'] for story in stories] == [3, 2, 1]
+
+        def test_list_stories_product_filter(self, store):
+            """测试按产品过滤"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '需求1', 'product': '产品A'}, ''),
+                ({'id': 2, 'title': '需求2', 'product': '产品B'}, ''),
+            ])
+
+            # Act
+            stories = store.list_stories(products=['产品B'])
+
+            # Assert
+            assert [story['id'] for story in stories] == [2]
+
+        def test_upsert_updates_existing(self, store):
+            """测试重复写入覆盖旧数据"""
+            # Arrange
+            store.upsert_stories([({'id': 1, 'title': '旧标题'}, '2024-01-01')])
+
+            # Act
+            store.upsert_stories([({'id': 1, 'title': '新标题'}, '2024-01-02')])
+
+            # Assert
+            assert store.list_stories()[0]['title'] == '新标题'
+            assert store.get_story_edit_dates() == {1: '2024-01-02'}
+
+        def test_upsert_empty(self, store):
+            """测试写入空列表"""
+            assert store.upsert_stories([]) == 0
+
+        def test_retain_stories(self, store):
+            """测试只保留指定需求"""
+            # Arrange
+            store.upsert_stories([
+                ({'id': 1, 'title': '需求1'}, ''),
+                ({'id': 2, 'title': '需求2'}, ''),
+            ])
+
+            # Act
+            removed = store.retain_stories([2])
+
+            # Assert
+            assert removed == 1
+            assert [story['id'] for story in store.list_stories()] == [2]
+
+    class TestTitleIndex:
+        """测试需求标题索引"""
+
+        @pytest.fixture
+        def indexed_store(self, store):
+            store.upsert_stories([
+                ({'id': 1, 'title': '【特2】首页面板优化', 'product': '产品A'}, ''),
+                ({'id': 2, 'title': '【特2】订单导出', 'product': '产品B'}, ''),
+                ({'id': 3, 'title': '首页改版 API', 'product': '产品A'}, ''),
+                ({'id': 4, 'title': '面板页面设置', 'product': '产品A'}, ''),
+            ])
+            return store
+
+        def test_search_any_keyword(self, indexed_store):
+            """测试包含任一关键字"""
+            assert indexed_store.search_story_ids(['面板', '订单']) == {1, 2, 4}
+
+        def test_search_all_keywords(self, indexed_store):
+            """测试包含所有关键字"""
+            assert indexed_store.search_story_ids(['【特2】', '首页'], match_all=True) == {1}
+
+        def test_search_verifies_substring(self, indexed_store):
+            """测试词元都匹配但不是连续子串时不返回"""
+            # "面板页面设置"包含"页面"和"面板"两个词元，但不包含"页面板"
+            assert indexed_store.search_story_ids(['页面板']) == {1}
+
+        def test_search_case_insensitive(self, indexed_store):
+            """测试不区分大小写"""
+            assert indexed_store.search_story_ids(['api']) == {3}
+
+        def test_search_single_char_keyword(self, indexed_store):
+            """测试单个字符的关键字回退为扫描"""
+            assert indexed_store.search_story_ids(['导']) == {2}
+            assert indexed_store.search_story_ids(['导', '首页'], match_all=True) == set()
+
+        def test_list_stories_with_keywords(self, indexed_store):
+            """测试按关键字和产品查询需求"""
+            stories = indexed_store.list_stories(products=['产品A'], keywords=['面板'])
+
+            assert [story['id'] for story in stories] == [4, 1]
+
+        def test_index_follows_upsert_and_retain(self, indexed_store):
+            """测试写入、更新和删除需求时维护索引"""
+            indexed_store.upsert_stories([({'id': 2, 'title': '订单面板'}, '2024-01-02')])
+            assert indexed_store.search_story_ids(['【特2】']) == {1}
+            assert indexed_store.search_story_ids(['面板']) == {1, 2, 4}
+
+            indexed_store.retain_stories([1, 3])
+            assert indexed_store.search_story_ids(['面板']) == {1}
+
+        def test_rebuild_index_for_existing_cache(self, tmp_path):
+            """测试打开没有标题索引的已有缓存时重建索引"""
+            db_path = str(tmp_path / 'zentao.db')
+            store = LocalStore(db_path)
+            store.upsert_stories([({'id': 1, 'title': '首页面板'}, '')])
+            store._conn.execute("DELETE FROM story_title_tokens")
+            store._conn.execute("DELETE FROM meta WHERE key = 'stories.title_index'")
+            store._conn.commit()
+            store.close()
+
+            reopened = LocalStore(db_path)
+            try:
+                assert reopened.search_story_ids(['面板']) == {1}
+                assert reopened._conn.execute("SELECT COUNT(*) FROM story_title_tokens").fetchone()[0] > 0
+            finally:
+                reopened.close()
+
+    class TestTaskDetails:
+        """测试任务详情缓存"""
+
+        def test_save_and_get_task_details(self, store):
+            """测试写入并读取任务详情"""
+            # Arrange
+            store.save_task_details({1: {'status': 'doing'}, 2: None})
+
+            # Act
+            details = store.get_task_details([1, 2], max_age=60)
+
+            # Assert
+            assert details == {1: {'status': 'doing'}}
+
+        def test_expired_task_details_ignored(self, store):
+            """测试过期的任务详情不返回"""
+            # Arrange
+            store.save_task_details({1: {'status': 'doing'}})
+            store._conn.execute("UPDATE task_details SET fetched_at = ?", (time.time() - 1000,))
+
+            # Act
+            details = store.get_task_details([1], max_age=60)
+
+            # Assert
+            assert details == {}
+
+        def test_get_task_details_empty_ids(self, store):
+            """测试空ID列表"""
+            assert store.get_task_details([], max_age=60) == {}
+
+    class TestExecutionsAndUsers:
+        """测试项目和用户缓存"""
+
+        def test_load_executions_never_saved(self, store):
+            """测试从未保存过项目列表"""
+            assert store.load_executions() == ([], None)
+
+        def test_save_and_load_executions(self, store):
+            """测试保存并加载项目列表"""
+            # Arrange
+            store.save_executions([{'id': 2, 'name': '项目B'}, {'id': 1, 'name': '项目A'}])
+
+            # Act
+            executions, fetched_at = store.load_executions()
+
+            # Assert
+            assert [execution['id'] for execution in executions] == [1, 2]
+            assert fetched_at is not None
+
+        def test_save_executions_replaces(self, store):
+            """测试保存项目列表整体替换"""
+            # Arrange
+            store.save_executions([{'id': 1, 'name': '项目A'}])
+
+            # Act
+            store.save_executions([{'id': 2, 'name': '项目B'}])
+
+            # Assert
+            executions, _ = store.load_executions()
+            assert [execution['id'] for execution in executions] == [2]
+
+        def test_save_and_load_users(self, store):
+            """测试保存并加载用户列表"""
+            # Arrange
+            store.save_users([{'id': 1, 'account': 'user1', 'realname': '用户1'}])
+
+            # Act
+            users, fetched_at = store.load_users()
+
+            # Assert
+            assert users == [{'id': 1, 'account': 'user1', 'realname': '用户1'}]
+            assert fetched_at is not None
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+测试请求指标
+"""
+
+import json
+
+import pytest
+
+from src.zentao.metrics import RequestMetrics, STATUS_ERROR
+
+
+class TestRequestMetrics:
+    """测试请求指标注册表"""
+
+    @pytest.fixture
+    def metrics(self):
+        """创建已记录若干请求的指标注册表"""
+        metrics = RequestMetrics()
+        metrics.record('story-view', 'get', 200, 0.02, size=1000)
+        metrics.record('story-view', 'GET', 200, 0.2, size=3000, retries=1)
+        metrics.record('story-view', 'GET', STATUS_ERROR, 3.0)
+        metrics.record('task-create', 'POST', 302, 0.05, size=10)
+        return metrics
+
+    def test_snapshot_families(self, metrics):
+        """测试按接口族汇总"""
+        # Act
+        families = metrics.snapshot()['families']
+
+        # Assert
+        story = families['story-view']
+        assert story['count'] == 3
+        assert story['errors'] == 1
+        assert story['bytes'] == 4000
+        assert story['retries'] == 1
+        assert story['duration_sum'] == pytest.approx(3.22)
+        assert story['duration_max'] == pytest.approx(3.0)
+        assert story['p50'] == 0.25
+        assert story['p95'] == 5.0
+        assert families['task-create']['errors'] == 0
+
+    def test_snapshot_is_json_serializable(self, metrics):
+        """测试导出 JSON"""
+        # Act
+        data = json.loads(metrics.export('json'))
+
+        # Assert
+        assert {item['status'] for item in data['series']} == {'200', STATUS_ERROR, '302'}
+        assert sum(item['count'] for item in data['series']) == 4
+
+    def test_prometheus_histogram_is_cumulative(self, metrics):
+        """测试 Prometheus 直方图桶为累计值"""
+        # Act
+        text = metrics.to_prometheus()
+
+        # Assert
+        labels = 'family="story-view",method="GET",status="200"'
+        assert f'zentao_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'zentao_http_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in text
+        assert f'zentao_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f'zentao_http_request_duration_seconds_count{{{labels}}} 2' in text
+        assert f'zentao_http_response_bytes_total{{{labels}}} 4000' in text
+        assert f'zentao_http_retries_total{{{labels}}} 1' in text
+
+    def test_format_table_sorted_by_duration(self, metrics):
+        """测试耗时明细表按总耗时降序"""
+        # Act
+        text = metrics.format_table()
+
+        # Assert
+        assert text.index('story-view') < text.index('task-create')
+        assert '合计: 4 个请求' in text
+
+    def test_reset(self, metrics):
+        """测试清空指标"""
+        # Act
+        metrics.reset()
+
+        # Assert
+        assert metrics.total_requests == 0
+        assert metrics.format_table() == "没有记录到禅道请求"
+
+    def test_disabled(self):
+        """测试关闭后不记录"""
+        # Arrange
+        metrics = RequestMetrics(enabled=False)
+
+        # Act
+        metrics.record('story-view', 'GET', 200, 0.01)
+
+        # Assert
+        assert metrics.total_requests == 0
+
+    def test_dump(self, metrics, tmp_path):
+        """测试导出到文件"""
+        # Act
+        path = metrics.dump(tmp_path / 'metrics' / 'metrics.prom', 'prometheus')
+
+        # Assert
+        assert path.read_text(encoding='utf-8').startswith('# HELP zentao_http_request_duration_seconds')
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+测试禅道接口解析层
+"""
+
+import json
+
+import pytest
+
+from src.utils.response import ErrorCode
+from src.zentao import parsers
+from src.zentao.async_client import HttpResult
+
+
+def _json_result(data, status='success'):
+    return {'status': status, 'data': json.dumps(data)}
+
+
+class TestUnwrapData:
+    """测试解码 data 字段"""
+
+    def test_success(self):
+        """测试解码成功响应"""
+        assert parsers.unwrap_data(_json_result({'task': {'id': 1}})) == {'task': {'id': 1}}
+
+    def test_failed_status(self):
+        """测试 status 不是 success 时返回 None"""
+        assert parsers.unwrap_data(_json_result({}, status='failed')) is None
+
+    def test_invalid_json(self):
+        """测试 data 不是合法 JSON 时抛出异常"""
+        with pytest.raises(ValueError):
+            parsers.unwrap_data({'status': 'success', 'data': '{invalid'})
+
+
+class TestIsLoginScriptPage:
+    """测试识别 JSON 接口返回的登录跳转脚本页面"""
+
+    URL = 'http://test.zentao.com/task-view-1.json'
+    SCRIPT = b"<html><script>self.location='/user-login-L3Rhc2s=.html';</script></html>"
+
+    def test_login_script(self):
+        """测试 JSON 接口返回登录跳转脚本"""
+        assert parsers.is_login_script_page(self.URL + '?t=1', 'text/html; charset=utf-8', self.SCRIPT)
+
+    def test_text_body(self):
+        """测试响应体为文本"""
+        assert parsers.is_login_script_page(self.URL, 'text/html', self.SCRIPT.decode())
+
+    @pytest.mark.parametrize('url, content_type, body', [
+        ('http://test.zentao.com/my-index.html', 'text/html', SCRIPT),
+        (URL, 'application/json', SCRIPT),
+        (URL, None, SCRIPT),
+        (URL, 'text/html', b'<html><a href="/user-login.html">login</a></html>'),
+        (URL, 'text/html', b''),
+    ])
+    def test_not_login_script(self, url, content_type, body):
+        """测试非 JSON 接口、非 HTML 响应或没有跳转脚本时不视为登录页"""
+        assert not parsers.is_login_script_page(url, content_type, body)
+
+
+class TestParsePagerTotal:
+    """测试读取分页信息中的记录总数"""
+
+    def test_rec_total(self):
+        """测试读取 recTotal（禅道返回字符串或数字）"""
+        assert parsers.parse_pager_total({'pager': {'recTotal': '650', 'recPerPage': 200}}) == 650
+        assert parsers.parse_pager_total({'pager': {'recTotal': 0}}) == 0
+
+    def test_missing_or_invalid(self):
+        """测试没有分页信息或格式不正确时返回 None"""
+        assert parsers.parse_pager_total({'stories': []}) is None
+        assert parsers.parse_pager_total({'pager': {'recTotal': 'abc'}}) is None
+        assert parsers.parse_pager_total({'pager': None}) is None
+        assert parsers.parse_pager_total([]) is None
+
+
+class TestParseProducts:
+    """测试提取产品名称到ID的映射"""
+
+    def test_product_pairs(self):
+        """测试读取 {产品ID: 产品名称}"""
+        assert parsers.parse_products({'products': {'1': '都江堰系统', '2': '点三ERP'}}) == {
+            '都江堰系统': 1, '点三ERP': 2
+        }
+
+    def test_product_stats(self):
+        """测试读取产品对象列表，同名产品取先出现的"""
+        data = {'productStats': [{'id': '5', 'name': '产品A'}, {'id': '6', 'name': '产品A'}, {'name': '无ID'}]}
+
+        assert parsers.parse_products(data) == {'产品A': 5}
+
+    def test_invalid(self):
+        """测试没有产品数据"""
+        assert parsers.parse_products(None) == {}
+        assert parsers.parse_products({'products': 'x'}) == {}
+
+
+class TestParseExecutions:
+    """测试解析项目列表"""
+
+    def test_list_excludes_finished(self):
+        """测试项目列表过滤掉已完成和已关闭的项目"""
+        data = {'projects': [
+            {'id': '1', 'name': '项目1', 'status': 'doing', 'begin': '2024-01-01', 'end': '2024-12-31'},
+            {'id': '2', 'name': '项目2', 'status': 'done'},
+            {'id': '3', 'name': '项目3', 'status': 'closed'},
+        ]}
+
+        assert parsers.parse_executions(data) == [
+            {'id': 1, 'name': '项目1', 'status': 'doing', 'begin': '2024-01-01', 'end': '2024-12-31'}
+        ]
+
+    def test_dict_formats(self):
+        """测试以项目ID为键的字典（值为项目对象或项目名称）"""
+        data = {'projects': {'1': {'id': '1', 'name': '项目1', 'status': 'wait'}, '2': '项目2', 'x': '无效'}}
+
+        assert [(item['id'], item['name']) for item in parsers.parse_executions(data)] == [(1, '项目1'), (2, '项目2')]
+
+    def test_single_project(self):
+        """测试 data 本身是单个项目"""
+        assert parsers.parse_executions({'id': '5', 'name': '项目5', 'status': 'doing'})[0]['id'] == 5
+
+
+class TestTaskParsers:
+    """测试任务相关解析"""
+
+    def test_build_task_summary(self):
+        """测试任务详情使用统一字段名"""
+        summary = parsers.build_task_summary({'id': '1', 'name': '任务1', 'pri': '2', 'project': '3'})
+
+        assert summary['title'] == '任务1'
+        assert summary['priority'] == '2'
+        assert summary['project'] == '3'
+        assert summary['parent'] == 0
+
+    def test_parse_task_select_html(self):
+        """测试解析任务选择框"""
+        html_text = "<option value='1'>项目A / 任务&amp;1</option><option value='2'>独立任务</option>"
+
+        tasks = parsers.parse_task_select_html(html_text)
+
+        assert [task['id'] for task in tasks] == [1, 2]
+        assert tasks[0]['project_name'] == '项目A'
+        assert tasks[0]['name'] == '任务&1'
+        assert tasks[1]['project_name'] == ''
+
+    def test_parse_task_detail_ignores_empty_deadline(self):
+        """测试空截止日期不写入详情"""
+        detail = parsers.parse_task_detail(
+            {'task': {'openedDate': '2024-01-01', 'deadline': '0000-00-00', 'status': 'wait'}},
+            'http://zentao.test/task-view-1.html'
+        )
+
+        assert detail == {
+            'created_at': '2024-01-01',
+            'status': 'wait',
+            'url': 'http://zentao.test/task-view-1.html'
+        }
+
+    def test_parse_task_create_response_extracts_id(self):
+        """测试从跳转地址中提取新任务ID"""
+        response = HttpResult(200, 'http://zentao.test/task-view-42.html', '')
+
+        result = parsers.parse_task_create_response(response, '任务', 'http://zentao.test')
+
+        assert result.success
+        assert result.data['id'] == 42
+
+    def test_parse_task_create_response_http_error(self):
+        """测试 HTTP 错误"""
+        response = HttpResult(500, 'http://zentao.test/task-create-1-0.html', '')
+
+        result = parsers.parse_task_create_response(response, '任务', 'http://zentao.test')
+
+        assert not result.success
+        assert result.error.code == ErrorCode.API_ERROR
+
+
+class TestStoryParsers:
+    """测试需求相关解析"""
+
+    def test_build_story_summary_plan_dict(self):
+        """测试计划字段为字典时取第一个计划名称"""
+        summary = parsers.build_story_summary({'id': '1', 'pri': '3', 'planTitle': {'7': '一月计划'}})
+
+        assert summary['plan'] == '一月计划'
+        assert summary['priority'] == '3'
+
+    def test_parse_story_page_dict_stories(self):
+        """测试产品浏览接口以ID为键的需求转换为列表，并读取分页总数"""
+        stories, total = parsers.parse_story_page({'stories': {'2': {'id': '2'}}, 'pager': {'recTotal': 1}})
+
+        assert stories == [{'id': '2'}]
+        assert total == 1
+
+    def test_parse_story_page_empty(self):
+        """测试没有需求时返回 None"""
+        assert parsers.parse_story_page({'stories': []}) is None
+        assert parsers.parse_story_page([]) is None
+
+    def test_count_valid_tasks_excludes_deleted(self):
+        """测试统计有效任务时排除已删除任务"""
+        story = {'tasks': {'1': [{'id': 1, 'deleted': '0'}, {'id': 2, 'deleted': '1'}], '2': [{'id': 3}]}}
+
+        assert parsers.count_valid_tasks(story, 1) == 2
+
+    def test_count_valid_tasks_unknown_format(self):
+        """测试无法识别的 tasks 格式"""
+        assert parsers.count_valid_tasks({'tasks': ''}, 1) is None
+
+    def test_parse_link_story_response_json(self):
+        """测试解析关联需求的 JSON 响应"""
+        response = HttpResult(200, 'http://zentao.test/project-linkStory-1.json', '{"status": "success"}')
+
+        result = parsers.parse_link_story_response(response, 10, 1)
+
+        assert result.success
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+测试 HTTP 响应缓存
+"""
+
+import time
+
+import pytest
+
+from src.zentao.response_cache import ResponseCache
+
+STORY_URL = 'http://zentao.test/story-view-1.json'
+TASK_URL = 'http://zentao.test/task-view-2.json'
+PROJECT_URL = 'http://zentao.test/my-project.json'
+
+
+class TestResponseCache:
+    """测试响应缓存"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """创建绑定账号、带缓存文件的响应缓存"""
+        cache = ResponseCache(
+            ttls={'story-view': 60, 'task-view': 60, 'my-project': 600},
+            db_path=str(tmp_path / 'http_cache.db')
+        )
+        cache.account = 'zhuxu'
+        yield cache
+        cache.close()
+
+    def test_ttl_for(self, cache):
+        """测试只缓存配置了有效期的接口族"""
+        assert cache.ttl_for(STORY_URL) == 60
+        assert cache.ttl_for('http://zentao.test/my-story-assignedTo-id_desc-0-200-1.json') is None
+
+    def test_no_cache_without_account(self, cache):
+        """测试未绑定账号时不缓存"""
+        # Arrange
+        cache.account = None
+
+        # Act & Assert
+        assert cache.ttl_for(STORY_URL) is None
+
+    def test_put_and_get(self, cache):
+        """测试写入后读取，并去掉不需要保存的响应头"""
+        # Act
+        cache.put(STORY_URL, 200, {'Content-Type': 'application/json', 'Set-Cookie': 'a=b', 'ETag': '"v1"'}, b'{}')
+        entry = cache.get(STORY_URL)
+
+        # Assert
+        assert entry.body == b'{}'
+        assert entry.etag == '"v1"'
+        assert 'Set-Cookie' not in entry.headers
+        assert cache.is_fresh(entry, 60)
+        assert not cache.is_fresh(entry, 0)
+
+    def test_isolated_by_account(self, cache):
+        """测试按账号隔离"""
+        # Arrange
+        cache.put(STORY_URL, 200, {}, b'{}')
+
+        # Act
+        cache.account = 'other'
+
+        # Assert
+        assert cache.get(STORY_URL) is None
+
+    def test_persisted_to_disk(self, cache, tmp_path):
+        """测试重新打开缓存文件后仍可读取"""
+        # Arrange
+        cache.put(STORY_URL, 200, {'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, b'{"status":"success"}')
+        cache.close()
+
+        # Act
+        reopened = ResponseCache(ttls={'story-view': 60}, db_path=str(tmp_path / 'http_cache.db'))
+        reopened.account = 'zhuxu'
+        entry = reopened.get(STORY_URL)
+        reopened.close()
+
+        # Assert
+        assert entry.body == b'{"status":"success"}'
+        assert entry.has_validator
+
+    def test_expired_entries_pruned_on_open(self, cache, tmp_path):
+        """测试启动时清理超过最长保留时间的响应"""
+        # Arrange
+        cache.put(STORY_URL, 200, {}, b'{}')
+        cache.close()
+
+        # Act
+        reopened = ResponseCache(ttls={'story-view': 60}, db_path=str(tmp_path / 'http_cache.db'), max_age=-1)
+        reopened.account = 'zhuxu'
+
+        # Assert
+        assert reopened.get(STORY_URL) is None
+        reopened.close()
+
+    def test_touch_refreshes_entry(self, cache):
+        """测试 304 后刷新缓存时间和验证头"""
+        # Arrange
+        cache.put(STORY_URL, 200, {'ETag': '"v1"'}, b'{}')
+        cache.get(STORY_URL).stored_at = time.time() - 120
+
+        # Act
+        entry = cache.touch(STORY_URL, {'ETag': '"v2"'})
+
+        # Assert
+        assert entry.etag == '"v2"'
+        assert cache.is_fresh(entry, 60)
+
+    def test_post_invalidates_related_families(self, cache):
+        """测试 POST 使相关接口族的缓存失效"""
+        # Arrange
+        for url in (STORY_URL, TASK_URL, PROJECT_URL):
+            cache.put(url, 200, {}, b'{}')
+
+        # Act
+        cache.invalidate_for('http://zentao.test/task-assign-2.html')
+
+        # Assert
+        assert cache.get(STORY_URL) is None
+        assert cache.get(TASK_URL) is None
+        assert cache.get(PROJECT_URL) is not None
+
+    def test_unknown_post_invalidates_all(self, cache):
+        """测试未知模块的 POST 使所有缓存失效，登录不使缓存失效"""
+        # Arrange
+        cache.put(PROJECT_URL, 200, {}, b'{}')
+
+        # Act & Assert
+        cache.invalidate_for('http://zentao.test/user-login.json')
+        assert cache.get(PROJECT_URL) is not None
+
+        cache.invalidate_for('http://zentao.test/bug-create-1.html')
+        assert cache.get(PROJECT_URL) is None
+
+    def test_put_skipped_after_invalidation(self, cache):
+        """测试请求期间发生失效时不写入旧响应"""
+        # Arrange
+        generation = cache.generation
+        cache.invalidate_for('http://zentao.test/story-change-1.json')
+
+        # Act
+        cache.put(STORY_URL, 200, {}, b'{}', generation)
+
+        # Assert
+        assert cache.get(STORY_URL) is None
+
+    def test_memory_only(self):
+        """测试不配置缓存文件时只使用内存，并限制条目数"""
+        # Arrange
+        cache = ResponseCache(ttls={'task-view': 60}, max_entries=2)
+        cache.account = 'zhuxu'
+
+        # Act
+        for task_id in range(3):
+            cache.put(f'http://zentao.test/task-view-{task_id}.json', 200, {}, b'{}')
+
+        # Assert
+        assert cache.get('http://zentao.test/task-view-0.json') is None
+        assert cache.get('http://zentao.test/task-view-2.json') is not None
+
+    @pytest.mark.parametrize('body, url, expected', [
+        (b'{"status":"success","data":"{}"}', 'http://zentao.test/story-view-1.json', True),
+        (b'{"status":"failed","message":"\\u9700\\u6c42\\u4e0d\\u5b58\\u5728"}',
+         'http://zentao.test/story-view-1.json', False),
+        (b'{"users":[]}', 'http://zentao.test/user-ajaxGetUser.json', True),
+        (b'<html></html>', 'http://zentao.test/task-view-1.html', True),
+        (b"<script>self.location='/user-login.html';</script>", 'http://zentao.test/my-project.json', False),
+        (b'<html></html>', 'http://zentao.test/my-project.json?t=1', False),
+    ])
+    def test_is_cacheable(self, body, url, expected):
+        """测试业务失败的 JSON 响应和 .json 接口的非 JSON 响应（如登录跳转脚本）不缓存"""
+        assert ResponseCache.is_cacheable(body, url) is expected
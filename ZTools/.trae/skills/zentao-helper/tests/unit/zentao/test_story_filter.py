@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+测试需求过滤条件
+"""
+
+import pytest
+
+from src.zentao.story_filter import StoryFilter, with_status
+
+
+STORIES = [
+    {'id': 5, 'title': '特2 面板优化', 'stage': 'wait', 'product': '都江堰系统'},
+    {'id': 4, 'title': '订单导出', 'stage': 'planned', 'product': '都江堰系统'},
+    {'id': 3, 'title': '特2 订单面板', 'stage': 'developing', 'product': '都江堰系统'},
+    {'id': 2, 'title': '特2 首页', 'stage': 'projected', 'product': '点三ERP'},
+    {'id': 1, 'title': None, 'stage': 'wait', 'product': None},
+]
+
+
+def ids(stories):
+    return [story['id'] for story in stories]
+
+
+class TestStoryFilter:
+    """测试需求过滤条件"""
+
+    def test_empty_filter_matches_all(self):
+        """测试没有条件时不过滤"""
+        assert ids(StoryFilter().apply(STORIES)) == [5, 4, 3, 2, 1]
+
+    def test_filter_by_product_stage_keyword(self):
+        """测试产品、阶段、关键字同时过滤"""
+        story_filter = StoryFilter(
+            products=['都江堰系统'], stages=['wait', 'planned', 'projected'], keywords=['特2']
+        )
+
+        assert ids(story_filter.apply(STORIES)) == [5]
+
+    def test_keywords_case_insensitive_any(self):
+        """测试关键字不区分大小写，包含任一即匹配"""
+        stories = [{'id': 1, 'title': 'ERP 升级'}, {'id': 2, 'title': '订单'}, {'id': 3, 'title': '首页'}]
+
+        assert ids(StoryFilter(keywords=['erp', '订单']).apply(stories)) == [1, 2]
+
+    def test_missing_fields_not_matched(self):
+        """测试缺少标题或产品的需求不匹配对应条件"""
+        assert ids(StoryFilter(keywords=['特2']).apply(STORIES[4:])) == []
+        assert ids(StoryFilter(products=['都江堰系统']).apply(STORIES[4:])) == []
+
+    def test_limit_stops_reading(self):
+        """测试找到 limit 个需求后不再读取后续需求"""
+        read = []
+
+        def stream():
+            for story in STORIES:
+                read.append(story['id'])
+                yield story
+
+        result = list(StoryFilter(stages=['wait', 'planned']).apply(stream(), limit=2))
+
+        assert ids(result) == [5, 4]
+        assert read == [5, 4]
+
+    def test_non_positive_limit(self):
+        """测试 limit 不大于 0 时不返回需求"""
+        assert list(StoryFilter().apply(STORIES, limit=0)) == []
+
+
+class TestWithStatus:
+    """测试合并指令中的状态"""
+
+    def test_story_status(self):
+        """测试需求状态按 status 字段过滤，保留原有条件"""
+        story_filter = with_status(StoryFilter(keywords=['特2']), 'closed')
+
+        assert story_filter == StoryFilter(keywords=['特2'], statuses=['closed'])
+        assert story_filter.matches({'title': '特2', 'status': 'closed'})
+        assert not story_filter.matches({'title': '特2', 'status': 'active'})
+
+    def test_story_stage(self):
+        """测试需求阶段按 stage 字段过滤"""
+        assert ids(with_status(None, 'wait').apply(STORIES)) == [5, 1]
+
+    def test_all_or_empty(self):
+        """测试 all 或为空时不过滤"""
+        assert with_status(None, 'all') == StoryFilter()
+        assert with_status(StoryFilter(stages=['wait']), None) == StoryFilter(stages=['wait'])
+
+    @pytest.mark.parametrize('status', ['doing', 'done', 'unknown'])
+    def test_non_story_status_ignored(self, status):
+        """测试需求没有的状态（如任务的进行中、已完成）不过滤"""
+        assert with_status(StoryFilter(keywords=['特2']), status) == StoryFilter(keywords=['特2'])
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+测试需求查询计划
+"""
+
+from src.zentao.story_filter import StoryFilter
+from src.zentao.story_query import SOURCE_MY_STORY, SOURCE_PRODUCT_BROWSE, plan_story_query
+
+
+PRODUCT_IDS = {'都江堰系统': 3, '点三ERP': 7}
+
+
+class TestPlanStoryQuery:
+    """测试生成需求查询计划"""
+
+    def test_products_pushed_down(self):
+        """测试产品条件下推为按产品浏览，本地只保留其他条件"""
+        story_filter = StoryFilter(products=['都江堰系统', '点三ERP'], stages=['wait'], keywords=['特2'])
+
+        plan = plan_story_query(story_filter, PRODUCT_IDS)
+
+        assert plan.source == SOURCE_PRODUCT_BROWSE
+        assert plan.products == ((3, '都江堰系统'), (7, '点三ERP'))
+        assert plan.residual == StoryFilter(stages=['wait'], keywords=['特2'])
+        assert '都江堰系统' in plan.describe()
+
+    def test_no_products(self):
+        """测试没有产品条件时获取全部需求"""
+        story_filter = StoryFilter(stages=['wait'])
+
+        plan = plan_story_query(story_filter, PRODUCT_IDS)
+
+        assert plan.source == SOURCE_MY_STORY
+        assert plan.residual is story_filter
+
+    def test_unknown_product_not_pushed_down(self):
+        """测试有产品找不到ID时不下推，避免漏掉需求"""
+        story_filter = StoryFilter(products=['都江堰系统', '不存在的产品'])
+
+        plan = plan_story_query(story_filter, PRODUCT_IDS)
+
+        assert plan.source == SOURCE_MY_STORY
+        assert plan.residual is story_filter
+
+    def test_product_ids_unavailable(self):
+        """测试获取产品列表失败时不下推"""
+        plan = plan_story_query(StoryFilter(products=['都江堰系统']), None)
+
+        assert plan.source == SOURCE_MY_STORY
+
+    def test_too_many_products(self):
+        """测试产品数超过上限时不下推"""
+        product_ids = {f'产品{index}': index for index in range(1, 8)}
+
+        plan = plan_story_query(StoryFilter(products=list(product_ids)), product_ids, max_products=5)
+
+        assert plan.source == SOURCE_MY_STORY
+
+    def test_duplicate_products(self):
+        """测试重复的产品只请求一次"""
+        plan = plan_story_query(StoryFilter(products=['点三ERP', '点三ERP']), PRODUCT_IDS)
+
+        assert plan.products == ((7, '点三ERP'),)
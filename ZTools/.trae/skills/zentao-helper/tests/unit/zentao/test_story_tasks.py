@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+测试需求与任务的关联索引
+"""
+
+from src.zentao.story_tasks import StoryTaskIndex
+
+
+class TestStoryTaskIndex:
+    """测试关联索引"""
+
+    def test_from_tasks(self):
+        """测试忽略已删除和未关联需求的任务"""
+        index = StoryTaskIndex.from_tasks([
+            {'id': '1', 'story': '10'},
+            {'id': '2', 'story': '10'},
+            {'id': '3', 'story': '11', 'deleted': '1'},
+            {'id': '4', 'story': '0'},
+            {'id': '5'},
+        ])
+
+        assert len(index) == 1
+        assert index.task_count(10) == 2
+        assert index.task_count(11) == 0
+
+    def test_add(self):
+        """测试增量添加任务，重复添加不重复计数"""
+        index = StoryTaskIndex()
+
+        index.add(10, 1)
+        index.add('10', '1')
+        index.add(None, 2)
+        index.add(10, 'x')
+
+        assert index.task_count(10) == 1
+
+    def test_stories_without_tasks(self):
+        """测试筛选没有任务的需求并保持顺序"""
+        index = StoryTaskIndex.from_tasks([{'id': 1, 'story': 20}])
+
+        assert index.stories_without_tasks([30, 20, 10]) == [30, 10]
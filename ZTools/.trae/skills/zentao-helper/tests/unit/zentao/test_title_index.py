@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+测试需求标题分词
+"""
+
+from src.zentao.title_index import title_matches, title_tokens
+
+
+class TestTitleTokens:
+    """测试标题分词"""
+
+    def test_cjk_bigrams(self):
+        """测试汉字按二元组切分"""
+        assert title_tokens('首页面板') == {'首页', '页面', '面板'}
+
+    def test_tags(self):
+        """测试标签整体作为词元"""
+        tokens = title_tokens('【特2】订单[前端]')
+
+        assert {'【特2】', '[前端]', '特2', '订单', '前端'} <= tokens
+
+    def test_nested_tag(self):
+        """测试不完整的标签不影响后面的标签"""
+        assert '【特2】' in title_tokens('【旧【特2】需求')
+
+    def test_lowercase_and_single_chars(self):
+        """测试转为小写，单个字符不生成词元"""
+        assert title_tokens('API 列表 a') == {'ap', 'pi', '列表'}
+        assert title_tokens('a') == set()
+        assert title_tokens('') == set()
+
+
+class TestTitleMatches:
+    """测试标题匹配"""
+
+    def test_any_and_all(self):
+        """测试包含任一关键字和包含所有关键字"""
+        assert title_matches('首页面板', ['面板', '订单'])
+        assert not title_matches('首页面板', ['面板', '订单'], match_all=True)
+        assert title_matches('首页API', ['api', '首页'], match_all=True)
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+测试禅道 HTTP 传输层
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from requests.adapters import HTTPAdapter
+
+from src.zentao.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError, CircuitState
+from src.zentao.metrics import RequestMetrics, STATUS_ERROR, STATUS_REJECTED
+from src.zentao.response_cache import ResponseCache
+from src.zentao.transport import ZentaoHTTPAdapter
+
+
+class TestZentaoHTTPAdapter:
+    """测试禅道连接适配器"""
+
+    @pytest.fixture
+    def registry(self):
+        """创建熔断器注册表"""
+        return CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=30)
+
+    @pytest.fixture
+    def adapter(self, registry):
+        """创建连接适配器"""
+        return ZentaoHTTPAdapter(circuit_breakers=registry)
+
+    @staticmethod
+    def _request(url='http://zentao.test/task-view-1.json'):
+        return requests.Request('GET', url).prepare()
+
+    @staticmethod
+    def _response(status_code):
+        response = Mock()
+        response.status_code = status_code
+        return response
+
+    def test_success_passthrough(self, adapter, registry):
+        """测试正常响应直接返回"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(200)) as mock_send:
+            # Act
+            response = adapter.send(self._request())
+
+        # Assert
+        assert response.status_code == 200
+        mock_send.assert_called_once()
+        assert registry.states() == {'task-view': CircuitState.CLOSED}
+
+    def test_connection_errors_open_circuit(self, adapter, registry):
+        """测试连续连接失败后快速失败"""
+        with patch.object(HTTPAdapter, 'send', side_effect=requests.ConnectionError("连接失败")) as mock_send:
+            # Act
+            for _ in range(2):
+                with pytest.raises(requests.ConnectionError):
+                    adapter.send(self._request())
+
+            with pytest.raises(CircuitOpenError):
+                adapter.send(self._request())
+
+        # Assert
+        assert mock_send.call_count == 2
+
+    def test_server_errors_count_as_failure(self, adapter, registry):
+        """测试 5xx 响应计为失败"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(503)):
+            # Act
+            adapter.send(self._request())
+            adapter.send(self._request())
+
+        # Assert
+        assert registry.get('task-view').state == CircuitState.OPEN
+
+    def test_client_errors_not_counted(self, adapter, registry):
+        """测试 4xx 响应不计为失败"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(404)):
+            # Act
+            adapter.send(self._request())
+            adapter.send(self._request())
+
+        # Assert
+        assert registry.get('task-view').state == CircuitState.CLOSED
+
+    def test_other_families_unaffected(self, adapter, registry):
+        """测试其他接口族不受影响"""
+        # Arrange
+        with patch.object(HTTPAdapter, 'send', side_effect=requests.Timeout("超时")):
+            for _ in range(2):
+                with pytest.raises(requests.Timeout):
+                    adapter.send(self._request())
+
+        # Act
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(200)):
+            response = adapter.send(self._request('http://zentao.test/story-view-1.json'))
+
+        # Assert
+        assert response.status_code == 200
+
+    def test_without_circuit_breakers(self):
+        """测试未配置熔断器时直接转发"""
+        # Arrange
+        adapter = ZentaoHTTPAdapter()
+
+        with patch.object(HTTPAdapter, 'send', side_effect=requests.ConnectionError("连接失败")):
+            # Act & Assert
+            for _ in range(5):
+                with pytest.raises(requests.ConnectionError):
+                    adapter.send(self._request())
+
+
+class TestZentaoHTTPAdapterMetrics:
+    """测试连接适配器的请求指标统计"""
+
+    @pytest.fixture
+    def metrics(self):
+        """创建请求指标注册表"""
+        return RequestMetrics()
+
+    @pytest.fixture
+    def adapter(self, metrics):
+        """创建带熔断和指标统计的连接适配器"""
+        registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=30)
+        return ZentaoHTTPAdapter(circuit_breakers=registry, metrics=metrics)
+
+    @staticmethod
+    def _request(url='http://zentao.test/task-view-1.json', method='GET'):
+        return requests.Request(method, url).prepare()
+
+    @staticmethod
+    def _response(status_code, content=b'{}', retries=0):
+        response = Mock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = {}
+        response.raw.retries.history = tuple(Mock() for _ in range(retries))
+        return response
+
+    def test_records_status_bytes_and_retries(self, adapter, metrics):
+        """测试记录状态码、响应字节数和重试次数"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(200, b'x' * 100, retries=2)):
+            # Act
+            adapter.send(self._request('http://zentao.test/task-view-1.json'))
+            adapter.send(self._request('http://zentao.test/task-view-2.json'))
+
+        # Assert
+        series = metrics.snapshot()['series']
+        assert len(series) == 1
+        assert series[0]['family'] == 'task-view'
+        assert series[0]['method'] == 'GET'
+        assert series[0]['status'] == '200'
+        assert series[0]['count'] == 2
+        assert series[0]['bytes'] == 200
+        assert series[0]['retries'] == 4
+
+    def test_records_errors_and_rejections(self, adapter, metrics):
+        """测试记录请求异常和熔断拒绝"""
+        with patch.object(HTTPAdapter, 'send', side_effect=requests.ConnectionError("连接失败")):
+            # Act
+            with pytest.raises(requests.ConnectionError):
+                adapter.send(self._request())
+            with pytest.raises(CircuitOpenError):
+                adapter.send(self._request())
+
+        # Assert
+        statuses = {item['status']: item['count'] for item in metrics.snapshot()['series']}
+        assert statuses == {STATUS_ERROR: 1, STATUS_REJECTED: 1}
+        assert metrics.snapshot()['families']['task-view']['errors'] == 2
+
+    def test_disabled_metrics(self, metrics):
+        """测试关闭指标时不统计"""
+        # Arrange
+        metrics.enabled = False
+        adapter = ZentaoHTTPAdapter(metrics=metrics)
+
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(200)):
+            # Act
+            adapter.send(self._request())
+
+        # Assert
+        assert metrics.total_requests == 0
+
+
+class TestZentaoHTTPAdapterCache:
+    """测试连接适配器的响应缓存"""
+
+    URL = 'http://zentao.test/story-view-1.json'
+
+    @pytest.fixture
+    def cache(self):
+        """创建内存响应缓存"""
+        cache = ResponseCache(ttls={'story-view': 60})
+        cache.account = 'zhuxu'
+        return cache
+
+    @pytest.fixture
+    def adapter(self, cache):
+        """创建带响应缓存的连接适配器"""
+        return ZentaoHTTPAdapter(metrics=RequestMetrics(), response_cache=cache)
+
+    @staticmethod
+    def _request(url=URL, method='GET'):
+        return requests.Request(method, url).prepare()
+
+    @staticmethod
+    def _response(status_code=200, content=b'{"status":"success","data":"{}"}', headers=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.headers.update(headers or {})
+        return response
+
+    def test_fresh_entry_served_from_cache(self, adapter):
+        """测试有效期内直接返回缓存，不发请求"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response()) as mock_send:
+            # Act
+            first = adapter.send(self._request())
+            second = adapter.send(self._request())
+
+        # Assert
+        assert mock_send.call_count == 1
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.from_cache
+        assert adapter.metrics.total_requests == 1
+
+    def test_login_script_not_cached(self, adapter, cache):
+        """测试会话失效时返回的登录跳转脚本页面不缓存"""
+        login_script = self._response(
+            content=b"<script>self.location='/user-login.html';</script>",
+            headers={'Content-Type': 'text/html; charset=utf-8'}
+        )
+        with patch.object(HTTPAdapter, 'send', return_value=login_script) as mock_send:
+            # Act
+            adapter.send(self._request())
+            adapter.send(self._request())
+
+        # Assert
+        assert mock_send.call_count == 2
+        assert cache.get(self.URL) is None
+
+    def test_stale_entry_revalidated(self, adapter, cache):
+        """测试过期后带 If-None-Match 条件请求，304 时返回缓存内容"""
+        # Arrange
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(headers={'ETag': '"v1"'})):
+            adapter.send(self._request())
+        cache.ttls['story-view'] = 0
+
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(304, b'')) as mock_send:
+            # Act
+            response = adapter.send(self._request())
+
+        # Assert
+        sent = mock_send.call_args[0][0]
+        assert mock_send.call_count == 1
+        assert response.status_code == 200
+        assert response.json()['status'] == 'success'
+        assert 'If-None-Match' not in sent.headers
+
+    def test_stale_entry_without_validator_refetched(self, adapter, cache):
+        """测试过期且没有验证头时重新完整请求"""
+        # Arrange
+        with patch.object(HTTPAdapter, 'send', return_value=self._response()):
+            adapter.send(self._request())
+        cache.ttls['story-view'] = 0
+
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(content=b'{"status":"success","data":"2"}')) as mock_send:
+            # Act
+            response = adapter.send(self._request())
+
+        # Assert
+        assert mock_send.call_count == 1
+        assert response.content == b'{"status":"success","data":"2"}'
+
+    def test_post_bypasses_and_invalidates(self, adapter, cache):
+        """测试 POST 不走缓存并使需求缓存失效"""
+        # Arrange
+        with patch.object(HTTPAdapter, 'send', return_value=self._response()):
+            adapter.send(self._request())
+
+        with patch.object(HTTPAdapter, 'send', return_value=self._response()) as mock_send:
+            # Act
+            adapter.send(self._request('http://zentao.test/story-change-1.json', 'POST'))
+            adapter.send(self._request())
+
+        # Assert
+        assert mock_send.call_count == 2
+        assert cache.get(self.URL) is not None
+
+    def test_error_responses_not_cached(self, adapter, cache):
+        """测试非 200 和业务失败的响应不缓存"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(500, b'')):
+            adapter.send(self._request())
+        with patch.object(HTTPAdapter, 'send', return_value=self._response(content=b'{"status":"failed"}')):
+            adapter.send(self._request())
+
+        # Assert
+        assert cache.get(self.URL) is None
+
+    def test_uncached_family_passthrough(self, adapter, cache):
+        """测试未配置有效期的接口不缓存"""
+        with patch.object(HTTPAdapter, 'send', return_value=self._response()) as mock_send:
+            # Act
+            adapter.send(self._request('http://zentao.test/my-story.json'))
+            adapter.send(self._request('http://zentao.test/my-story.json'))
+
+        # Assert
+        assert mock_send.call_count == 2
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+测试用户目录
+"""
+
+from unittest.mock import patch
+
+from src.zentao import users as users_module
+from src.zentao.users import UserDirectory, pinyin_initials
+
+
+USERS = [
+    {'id': 1, 'account': 'zhangsan', 'realname': '张三'},
+    {'id': 2, 'account': 'zhangsanfeng', 'realname': '张三丰'},
+    {'id': 3, 'account': 'lisi', 'realname': '李四'},
+    {'id': 4, 'account': 'chenkeyu', 'realname': '陈科宇'},
+    {'id': 5, 'account': 'zs', 'realname': '赵顺'},
+    {'id': 6, 'account': 'lisi2', 'realname': '李四'},
+]
+
+
+def accounts(users):
+    return [user.account for user in users]
+
+
+class TestPinyinInitials:
+    """测试拼音首字母"""
+
+    def test_chinese_name(self):
+        """测试汉字按 GB2312 推算首字母"""
+        with patch.object(users_module, 'lazy_pinyin', None):
+            assert pinyin_initials('张三丰') == 'zsf'
+            assert pinyin_initials('陈科宇') == 'cky'
+
+    def test_mixed_text(self):
+        """测试字母数字原样保留，其他字符忽略"""
+        with patch.object(users_module, 'lazy_pinyin', None):
+            assert pinyin_initials('Ａ李 四-2') == 'als2'
+            assert pinyin_initials('') == ''
+
+    def test_uses_pypinyin_when_available(self):
+        """测试安装了 pypinyin 时使用其结果"""
+        def fake_lazy_pinyin(text, style=None):
+            return ['x' for _ in text]
+
+        with patch.object(users_module, 'lazy_pinyin', fake_lazy_pinyin), \
+                patch.object(users_module, 'Style', create=True):
+            assert pinyin_initials('张三') == 'xx'
+
+
+class TestUserDirectory:
+    """测试用户目录"""
+
+    def test_from_api(self):
+        """测试从接口数据创建目录"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert len(directory) == 6
+        assert directory.users['3'].account == 'lisi'
+
+    def test_get_by_account(self):
+        """测试按账号获取（不区分大小写）"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert directory.get('LiSi').realname == '李四'
+        assert directory.get('wangwu') is None
+
+    def test_resolve_account_or_realname(self):
+        """测试账号或姓名完全匹配"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert accounts(directory.resolve('张三')) == ['zhangsan']
+        assert accounts(directory.resolve('李四')) == ['lisi', 'lisi2']
+
+    def test_resolve_exact_account_before_initials(self):
+        """测试账号完全匹配优先于拼音首字母"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert accounts(directory.resolve('zs')) == ['zs']
+
+    def test_resolve_initials(self):
+        """测试按拼音首字母解析"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert accounts(directory.resolve('zsf')) == ['zhangsanfeng']
+        assert accounts(directory.resolve('cky')) == ['chenkeyu']
+        assert directory.resolve('') == []
+
+    def test_search_prefix_then_contains(self):
+        """测试前缀匹配优先于包含匹配，同一优先级按目录顺序"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert accounts(directory.search('zhang')) == ['zhangsan', 'zhangsanfeng']
+        assert accounts(directory.search('san')) == ['zhangsan', 'zhangsanfeng']
+        assert accounts(directory.search('张三')) == ['zhangsan', 'zhangsanfeng']
+        assert accounts(directory.search('ck')) == ['chenkeyu']
+
+    def test_search_limit(self):
+        """测试限制返回数量，缓存的结果不受影响"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert accounts(directory.search('li', limit=1)) == ['lisi']
+        assert accounts(directory.search('li')) == ['lisi', 'lisi2']
+
+    def test_search_no_match(self):
+        """测试没有匹配"""
+        directory = UserDirectory.from_api(USERS)
+
+        assert directory.search('wangwu') == []
+        assert directory.search('  ') == []
@@ -18,8 +18,8 @@ if os.path.exists(_venv_site_packages):
 sys.path.insert(0, os.path.join(_script_dir, 'src'))
 
 from skill import ZenTaoHelperSkill
-from utils.config_loader import get_config
-from utils.story_title_updater import StoryTitleUpdater
+from src.utils.config_loader import get_config
+from src.utils.story_title_updater import StoryTitleUpdater
 
 
 def clear_screen():
@@ -40,6 +40,7 @@ def show_menu():
     print("  [3] 查看未分配的需求")
     print("  [4] 查看我的任务")
     print("  [5] 重新登录")
+    print("  [6] 批量拆解需求")
     print("  [0] 退出")
     print()
     print("=" * 43)
@@ -245,6 +246,80 @@ def split_story_interactive(skill):
     input("\n按回车键继续...")
 
 
+def batch_split_stories(skill):
+    """批量拆解需求"""
+    print()
+    print("=" * 43)
+    print("  批量拆解需求")
+    print("=" * 43)
+    print()
+    print("提示: 输入 b 或 B 可返回主菜单")
+    print()
+
+    ids_text = input("请输入需求ID，空格或逗号分隔 (直接回车=全部未分配的需求, 输入 b 返回): ").strip()
+    if ids_text.lower() == 'b':
+        return
+    story_ids = [story_id for story_id in ids_text.replace('，', ',').replace(',', ' ').split() if story_id]
+    query = None if story_ids else '查看未分配的需求'
+
+    # 输入需求等级
+    print()
+    grade = input("请输入需求等级 A-/A/A+/A++/B (默认: A+): ").strip() or 'A+'
+    if grade not in ('A-', 'A', 'A+', 'A++', 'B'):
+        print("无效的需求等级")
+        input("\n按回车键继续...")
+        return
+
+    # 输入执行人
+    assigned_to = input("请输入任务执行人 (默认: zhuxu): ").strip() or 'zhuxu'
+
+    # B等级没有默认时长，需要用户输入
+    config_loader = get_config()
+    grade_hours = config_loader.get('zentao.task_creation.grade_hours', {})
+    default_hours = grade_hours.get(grade, 8)
+    while True:
+        default_text = f" (默认: {default_hours})" if default_hours is not None else ""
+        hours = input(f"请输入任务时长/小时{default_text}: ").strip()
+        if not hours and default_hours is not None:
+            hours = str(default_hours)
+        if not hours:
+            print("任务时长不能为空，请重新输入")
+            continue
+        try:
+            task_hours = float(hours)
+        except ValueError:
+            task_hours = 0
+        if task_hours > 0:
+            break
+        print("无效的任务时长，请输入大于0的数字，例如 4 或 2.5")
+
+    print()
+    print("=" * 43)
+    print(f"  需求: {', '.join(story_ids) if story_ids else '全部未分配的需求'}")
+    print(f"  需求等级: {grade}  执行人: {assigned_to}  时长: {hours} 小时")
+    print("  上线时间: 下下周周一  截止时间: 本周周五")
+    print("=" * 43)
+    if input("确认执行? (Y/N): ").strip().upper() != 'Y':
+        return
+
+    print()
+    result = skill.batch_split(
+        story_ids=story_ids,
+        query=query,
+        grade=grade,
+        priority='非紧急',
+        online_time='下下周周一',
+        assigned_to=assigned_to,
+        task_hours=task_hours,
+        deadline='本周周五'
+    )
+    if result.get('success'):
+        print(result.get('data', {}).get('message', '执行完成'))
+    else:
+        print(f"错误: {result.get('error', {}).get('message', '未知错误')}")
+    input("\n按回车键继续...")
+
+
 def query_my_stories(skill):
     """查看我的需求"""
     print()
@@ -291,7 +366,7 @@ def main():
 
     while True:
         show_menu()
-        choice = input("请选择操作 (0-5): ").strip()
+        choice = input("请选择操作 (0-6): ").strip()
 
         if choice == '1':
             split_story_interactive(skill)
@@ -303,6 +378,8 @@ def main():
             query_my_tasks(skill)
         elif choice == '5':
             relogin(skill)
+        elif choice == '6':
+            batch_split_stories(skill)
         elif choice == '0':
             print()
             print("感谢使用 ZenTao Helper!")